@@ -0,0 +1,31 @@
+"""Custom Kedro datasets of the project."""
+
+from ._compressed_embeddings_dataset import CompressedEmbeddingsDataset
+from ._delta_published_json_dataset import (
+    DeltaPublishedJSONDataset,
+    apply_patch,
+    diff_visualization,
+)
+from ._multi_sink_dataset import MultiSinkDataset
+from ._serving_artifacts_dataset import ServingArtifactsDataset
+from ._streaming_json_dataset import (
+    JSONArrayStream,
+    JSONObjectStream,
+    StreamingJSONDataset,
+    materialize,
+    stream_json_to_files,
+)
+
+__all__ = [
+    "CompressedEmbeddingsDataset",
+    "DeltaPublishedJSONDataset",
+    "JSONArrayStream",
+    "JSONObjectStream",
+    "MultiSinkDataset",
+    "ServingArtifactsDataset",
+    "StreamingJSONDataset",
+    "apply_patch",
+    "diff_visualization",
+    "materialize",
+    "stream_json_to_files",
+]
@@ -0,0 +1,90 @@
+"""``CompressedEmbeddingsDataset`` stores paper embeddings as encoded arrays
+(float16, int8 or product-quantized) in a single ``.npz`` file.
+"""
+
+import logging
+from collections.abc import Mapping
+from copy import deepcopy
+from pathlib import PurePosixPath
+from typing import Any
+
+import fsspec
+import numpy as np
+from kedro.io.core import AbstractDataset, get_protocol_and_path
+
+from arxiv_discoverer.search import CompressedEmbeddings, EmbeddingCodec
+
+logger = logging.getLogger(__name__)
+
+_CODEC_PREFIX = "codec_"
+
+
+class CompressedEmbeddingsDataset(AbstractDataset[Mapping, CompressedEmbeddings]):
+    """``CompressedEmbeddingsDataset`` saves ``CompressedEmbeddings`` (paper ids,
+    codes and the codec state: int8 scales or PQ codebooks) to an uncompressed
+    ``.npz`` file, and loads them back as a read-only ``{paper_id: embedding}``
+    mapping decoding the vectors on access. The text digests of the embeddings
+    are stored along when set. Plain dicts are stored as float32.
+
+    Example:
+    ::
+
+        arxiv_embeddings_dict:
+          type: arxiv_discoverer.datasets.CompressedEmbeddingsDataset
+          filepath: data/01_raw/embeddings.npz
+    """
+
+    def __init__(
+        self,
+        *,
+        filepath: str,
+        credentials: dict[str, Any] | None = None,
+        fs_args: dict[str, Any] | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """Creates a new instance of ``CompressedEmbeddingsDataset``.
+
+        Args:
+            filepath: Path of the ``.npz`` file, prefixed with a protocol like `s3://`.
+                Local filesystem if no prefix is given.
+            credentials: Credentials passed to the underlying filesystem.
+            fs_args: Extra arguments passed to the underlying filesystem.
+            metadata: Any arbitrary metadata, ignored by Kedro.
+        """
+        _fs_args = deepcopy(fs_args) or {}
+        protocol, path = get_protocol_and_path(filepath)
+        if protocol == "file":
+            _fs_args.setdefault("auto_mkdir", True)
+
+        self._protocol = protocol
+        self._filepath = PurePosixPath(path)
+        self._fs = fsspec.filesystem(protocol, **(deepcopy(credentials) or {}), **_fs_args)
+        self.metadata = metadata
+
+    def _describe(self) -> dict[str, Any]:
+        return {"filepath": str(self._filepath), "protocol": self._protocol}
+
+    def _full_path(self) -> str:
+        return str(self._filepath) if self._protocol == "file" else f"{self._protocol}://{self._filepath}"
+
+    def load(self) -> CompressedEmbeddings:
+        with self._fs.open(self._full_path(), "rb") as f, np.load(f, allow_pickle=False) as npz:
+            state = {key[len(_CODEC_PREFIX) :]: npz[key] for key in npz.files if key.startswith(_CODEC_PREFIX)}
+            digests = npz["digests"] if "digests" in npz.files else None
+            return CompressedEmbeddings(npz["paper_ids"], npz["codes"], EmbeddingCodec.from_state(state), digests)
+
+    def save(self, data: Mapping) -> None:
+        if not isinstance(data, CompressedEmbeddings):
+            data = CompressedEmbeddings.encode(data, EmbeddingCodec("float32"))
+        arrays = {f"{_CODEC_PREFIX}{key}": np.asarray(value) for key, value in data.codec.get_state().items()}
+        if data.digests is not None:
+            arrays["digests"] = data.digests
+        with self._fs.open(self._full_path(), "wb") as f:
+            np.savez(f, paper_ids=np.asarray(data.paper_ids, dtype=str), codes=data.codes, **arrays)
+        logger.info(
+            f"Saved {len(data)} {data.codec.mode} embeddings ({data.nbytes / 2**20:.1f} MiB of codes) "
+            f"to {self._full_path()}"
+        )
+
+    def _exists(self) -> bool:
+        return self._fs.exists(self._full_path())
@@ -0,0 +1,369 @@
+"""``DeltaPublishedJSONDataset`` publishes the visualization JSON as a base snapshot
+plus a chain of patches, indexed by a manifest, so that a run only writes (and
+clients only download) what changed since the previous run.
+"""
+
+import json
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from pathlib import PurePosixPath
+from typing import Any
+
+import fsspec
+from kedro.io.core import AbstractDataset, DatasetError, get_protocol_and_path
+
+from arxiv_discoverer.storage import S3Sink, make_sink
+
+from ._streaming_json_dataset import stream_json_to_files, validate_compression
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+FORMAT_VERSION = 1
+
+
+def diff_visualization(
+    previous: dict[str, Any], current: dict[str, Any], move_tolerance: float = 1e-6
+) -> dict[str, Any]:
+    """
+    Compute the patch turning `previous` into `current`.
+
+    Args:
+        previous (dict[str, Any]): Previous visualization JSON.
+        current (dict[str, Any]): New visualization JSON.
+        move_tolerance (float): Coordinates closer than this are considered unmoved.
+
+    Returns:
+        dict[str, Any]: Patch with removed ids, moved and added [id, x, y, z]
+            points, details of added or changed papers and the new metadata.
+    """
+    previous_points = {point["id"]: point for point in previous["coordinates"]}
+    current_ids = {point["id"] for point in current["coordinates"]}
+
+    removed = [point_id for point_id in previous_points if point_id not in current_ids]
+    moved, added = [], []
+    for point in current["coordinates"]:
+        row = [point["id"], point["x"], point["y"], point["z"]]
+        old = previous_points.get(point["id"])
+        if old is None:
+            added.append(row)
+        elif any(not math.isclose(old[axis], point[axis], abs_tol=move_tolerance) for axis in "xyz"):
+            moved.append(row)
+
+    previous_details = previous["details"]
+    details = {
+        point_id: paper_details
+        for point_id, paper_details in current["details"].items()
+        if previous_details.get(point_id) != paper_details
+    }
+    return {
+        "coordinates": {"remove": removed, "move": moved, "add": added},
+        "details": details,
+        "metadata": current["metadata"],
+    }
+
+
+def apply_patch(state: dict[str, Any], patch: dict[str, Any]) -> dict[str, Any]:
+    """
+    Apply a patch produced by `diff_visualization`.
+
+    Removed points are dropped, moved points keep their position in the
+    `coordinates` array and added points are appended, in patch order.
+
+    Args:
+        state (dict[str, Any]): Visualization JSON, left untouched.
+        patch (dict[str, Any]): Patch to apply.
+
+    Returns:
+        dict[str, Any]: The patched visualization JSON.
+    """
+    changes = patch["coordinates"]
+    removed = set(changes["remove"])
+    moved = {point_id: (x, y, z) for point_id, x, y, z in changes["move"]}
+
+    coordinates = []
+    for point in state["coordinates"]:
+        if point["id"] in removed:
+            continue
+        if point["id"] in moved:
+            x, y, z = moved[point["id"]]
+            coordinates.append({"id": point["id"], "x": x, "y": y, "z": z})
+        else:
+            coordinates.append(point)
+    coordinates.extend({"id": point_id, "x": x, "y": y, "z": z} for point_id, x, y, z in changes["add"])
+
+    details = {point_id: value for point_id, value in state["details"].items() if point_id not in removed}
+    details.update(patch["details"])
+    return {"coordinates": coordinates, "details": details, "metadata": patch["metadata"]}
+
+
+def manifest_files(manifest: dict[str, Any] | None) -> dict[str, str]:
+    """
+    Files referenced by a manifest, with their compressed variants, mapped to
+    the sha256 of the content they hold.
+    """
+    if manifest is None:
+        return {}
+    files = {}
+    for entry in [manifest["base"], *manifest["patches"]]:
+        files[entry["file"]] = entry["sha256"]
+        for encoding, file_name in entry.get("encodings", {}).items():
+            files[file_name] = f"{entry['sha256']}:{encoding}"
+    return files
+
+
+class DeltaPublishedJSONDataset(AbstractDataset[dict[str, Any], dict[str, Any]]):
+    """``DeltaPublishedJSONDataset`` saves the visualization JSON under a directory as:
+
+        - ``manifest.json``: current version, base snapshot and ordered patch chain,
+        - ``base_<version>.json``: full snapshot,
+        - ``patch_<version>.json``: add / remove / move changes against the previous version.
+
+    Each save diffs the new data against the current published state and only
+    writes a compact patch and the manifest. The chain is compacted into a new
+    base when it gets longer than ``max_patches`` or heavier than
+    ``compact_ratio`` times the base. Diffing loads the published state into
+    memory, so unlike a new base snapshot, which is streamed to disk, a patch
+    save is not constant-memory.
+
+    Files are named by version, not by content: a save that fails after writing
+    its patch but before the manifest, or a directory whose manifest was
+    removed, publishes other content under the same name. Clients must therefore
+    key their caches on the ``sha256`` the manifest records for each file.
+
+    ``mirrors`` are other directories (local or ``s3://``) receiving a copy of the
+    published files: the JSON is serialized once and the files each mirror's
+    manifest does not reference yet are uploaded to all mirrors concurrently, the
+    manifest last so that mirrors never reference a file they do not have yet.
+    A mirror that missed a save is thus repaired by the next one.
+
+    Example:
+    ::
+
+        visualization_json:
+          type: arxiv_discoverer.datasets.DeltaPublishedJSONDataset
+          path: frontend/public/data/viz
+          mirrors: [s3://arxiv-file-storage/viz]
+          mirror_credentials: aws_s3
+          max_patches: 10
+          compact_ratio: 0.5
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        path: str,
+        max_patches: int = 10,
+        compact_ratio: float = 0.5,
+        move_tolerance: float = 1e-6,
+        compression: list[str] | None = None,
+        mirrors: list[str] | None = None,
+        mirror_credentials: dict[str, Any] | None = None,
+        credentials: dict[str, Any] | None = None,
+        fs_args: dict[str, Any] | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """Creates a new instance of ``DeltaPublishedJSONDataset``.
+
+        Args:
+            path: Directory of the published files, prefixed with a protocol like
+                `s3://`. Local filesystem if no prefix is given.
+            max_patches: Maximum length of the patch chain before compaction.
+            compact_ratio: Compact when the patches weigh more than this fraction
+                of the base snapshot.
+            move_tolerance: Coordinates closer than this are considered unmoved.
+            compression: Pre-compressed variants of every file, among "gzip" and "br".
+            mirrors: Directories receiving a copy of the published files.
+            mirror_credentials: S3 credentials of the mirrors.
+            credentials: Credentials passed to the underlying filesystem.
+            fs_args: Extra arguments passed to the underlying filesystem.
+            metadata: Any arbitrary metadata, ignored by Kedro.
+        """
+        _fs_args = deepcopy(fs_args) or {}
+        protocol, directory = get_protocol_and_path(path)
+        if protocol == "file":
+            _fs_args.setdefault("auto_mkdir", True)
+
+        self._protocol = protocol
+        self._directory = PurePosixPath(directory)
+        self._fs = fsspec.filesystem(protocol, **(deepcopy(credentials) or {}), **_fs_args)
+        self._max_patches = max_patches
+        self._compact_ratio = compact_ratio
+        self._move_tolerance = move_tolerance
+        self._compression = validate_compression(compression)
+        self._mirrors = [mirror.rstrip("/") for mirror in mirrors or []]
+        self._mirror_credentials = deepcopy(mirror_credentials)
+        self.metadata = metadata
+
+    def _describe(self) -> dict[str, Any]:
+        return {
+            "path": str(self._directory),
+            "protocol": self._protocol,
+            "max_patches": self._max_patches,
+            "compact_ratio": self._compact_ratio,
+            "compression": self._compression,
+            "mirrors": self._mirrors,
+        }
+
+    def _full_path(self, file_name: str) -> str:
+        path = str(self._directory / file_name)
+        return path if self._protocol == "file" else f"{self._protocol}://{path}"
+
+    def _read_json(self, file_name: str) -> Any:
+        with self._fs.open(self._full_path(file_name), "r") as f:
+            return json.load(f)
+
+    def _write_json(self, file_name: str, data: Any, compress: bool = True) -> dict[str, Any]:
+        written = stream_json_to_files(
+            self._fs,
+            self._protocol,
+            self._directory / file_name,
+            data,
+            self._compression if compress else None,
+        )
+        return {key: written[key] for key in ("file", "bytes", "sha256", "encodings")}
+
+    def load_manifest(self) -> dict[str, Any] | None:
+        """The current manifest, or None if nothing has been published yet."""
+        if not self._fs.exists(self._full_path(MANIFEST_FILE)):
+            return None
+        return self._read_json(MANIFEST_FILE)
+
+    def _load_state(self, manifest: dict[str, Any]) -> dict[str, Any]:
+        state = self._read_json(manifest["base"]["file"])
+        for patch in manifest["patches"]:
+            state = apply_patch(state, self._read_json(patch["file"]))
+        return state
+
+    def load(self) -> dict[str, Any]:
+        manifest = self.load_manifest()
+        if manifest is None:
+            raise DatasetError(f"No manifest found in {self._full_path('')}")
+        return self._load_state(manifest)
+
+    def save(self, data: dict[str, Any]) -> None:
+        previous_manifest = self.load_manifest()
+        version = previous_manifest["version"] + 1 if previous_manifest else 1
+
+        manifest = None
+        if previous_manifest is not None:
+            manifest = self._append_patch(previous_manifest, data, version)
+        if manifest is None:
+            base = self._write_json(f"base_{version:06d}.json", data)
+            manifest = {
+                "format_version": FORMAT_VERSION,
+                "version": version,
+                "base": {"version": version, **base},
+                "patches": [],
+            }
+            logger.info(f"Published base snapshot v{version} ({base['bytes']} bytes) to {self._full_path('')}")
+
+        self._write_json(MANIFEST_FILE, manifest, compress=False)
+        removed = self._remove_unreferenced_files(manifest, previous_manifest)
+        if self._mirrors:
+            self._publish_to_mirrors(manifest, previous_manifest, removed)
+
+    def _append_patch(
+        self, previous_manifest: dict[str, Any], data: dict[str, Any], version: int
+    ) -> dict[str, Any] | None:
+        """Write a patch against the published state, or return None when a new base is due."""
+        if len(previous_manifest["patches"]) >= self._max_patches:
+            return None
+
+        previous = self._load_state(previous_manifest)
+        patch = diff_visualization(previous, data, self._move_tolerance)
+        # Positional artifacts (search and facet indices) rely on the point order,
+        # so only publish a patch if replaying it reproduces the new order exactly.
+        patched_ids = [point["id"] for point in apply_patch(previous, patch)["coordinates"]]
+        if patched_ids != [point["id"] for point in data["coordinates"]]:
+            logger.info("Point order changed, publishing a new base snapshot.")
+            return None
+
+        patch_size = len(json.dumps(patch, separators=(",", ":")))
+        chain_size = sum(p["bytes"] for p in previous_manifest["patches"]) + patch_size
+        if chain_size > self._compact_ratio * previous_manifest["base"]["bytes"]:
+            logger.info("Patch chain too large compared to the base, compacting.")
+            return None
+
+        written = self._write_json(f"patch_{version:06d}.json", patch)
+        changes = patch["coordinates"]
+        logger.info(
+            f"Published patch v{version} ({written['bytes']} bytes): {len(changes['add'])} added, "
+            f"{len(changes['remove'])} removed, {len(changes['move'])} moved."
+        )
+        return {
+            **previous_manifest,
+            "version": version,
+            "patches": [*previous_manifest["patches"], {"version": version, **written}],
+        }
+
+    def _remove_unreferenced_files(
+        self, manifest: dict[str, Any], previous_manifest: dict[str, Any] | None
+    ) -> list[str]:
+        """Delete files no longer referenced, keeping the previous generation for clients mid-fetch."""
+        keep = {MANIFEST_FILE, *manifest_files(manifest), *manifest_files(previous_manifest)}
+
+        removed = []
+        for path in self._fs.ls(self._full_path(""), detail=False):
+            name = PurePosixPath(path).name
+            if name not in keep and name.startswith(("base_", "patch_")):
+                self._fs.rm(self._full_path(name))
+                removed.append(name)
+        return removed
+
+    def _publish_to_mirrors(
+        self, manifest: dict[str, Any], previous_manifest: dict[str, Any] | None, removed: list[str]
+    ) -> None:
+        """
+        Bring every mirror to `manifest`: upload the files it references that the
+        mirror's own manifest does not (a mirror that missed a save, e.g. on a
+        failed upload, gets them again), then the manifest, then delete the
+        mirror files no longer referenced.
+        """
+        clients = {}
+
+        def sink(mirror: str, file_name: str):
+            created = make_sink(f"{mirror}/{file_name}", self._mirror_credentials, clients.get(mirror))
+            if isinstance(created, S3Sink):
+                clients[mirror] = created.client
+            return created
+
+        def mirror_manifest(mirror: str) -> dict[str, Any] | None:
+            manifest_sink = sink(mirror, MANIFEST_FILE)
+            if not manifest_sink.exists():
+                return None
+            try:
+                with manifest_sink.open() as f:
+                    return json.load(f)
+            except (OSError, ValueError) as error:
+                logger.warning(f"Unreadable manifest in mirror {mirror}, uploading every file: {error}")
+                return None
+
+        def upload(target) -> None:
+            file_name, file_sink = target
+            if self._protocol == "file":
+                file_sink.write_file(self._full_path(file_name))
+            else:
+                file_sink.write_bytes(self._fs.cat_file(self._full_path(file_name)))
+
+        referenced = manifest_files(manifest)
+        keep = {*referenced, *manifest_files(previous_manifest)}
+        uploads, deletions = [], []
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for mirror, mirrored in zip(self._mirrors, executor.map(mirror_manifest, self._mirrors)):
+                mirrored_files = manifest_files(mirrored)
+                missing = [name for name, digest in referenced.items() if mirrored_files.get(name) != digest]
+                uploads += [(name, sink(mirror, name)) for name in missing]
+                stale = (set(removed) | set(mirrored_files)) - keep
+                deletions += [sink(mirror, name) for name in sorted(stale)]
+
+            # list() re-raises the first failure before the next step starts
+            list(executor.map(upload, uploads))
+            list(executor.map(upload, [(MANIFEST_FILE, sink(mirror, MANIFEST_FILE)) for mirror in self._mirrors]))
+            list(executor.map(lambda file_sink: file_sink.delete(), deletions))
+        logger.info(f"Mirrored {len(uploads) + len(self._mirrors)} files to {', '.join(self._mirrors)}")
+
+    def _exists(self) -> bool:
+        return self._fs.exists(self._full_path(MANIFEST_FILE))
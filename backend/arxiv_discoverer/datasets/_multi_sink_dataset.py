@@ -0,0 +1,130 @@
+"""``MultiSinkDataset`` serializes data once and writes the bytes to several
+destinations (local files, S3 objects) concurrently.
+"""
+
+import io
+import json
+import logging
+import pickle
+from copy import deepcopy
+from typing import Any
+
+import pandas as pd
+from kedro.io.core import AbstractDataset
+
+from arxiv_discoverer.storage import make_sink, write_to_sinks
+
+logger = logging.getLogger(__name__)
+
+MB = 1 << 20
+
+
+def _serialize(data: Any, file_format: str, save_args: dict[str, Any]) -> bytes:
+    if file_format == "csv":
+        return data.to_csv(**{"index": False, **save_args}).encode("utf-8", errors="replace")
+    if file_format == "json":
+        return json.dumps(data, **save_args).encode("utf-8")
+    return pickle.dumps(data, **save_args)
+
+
+def _deserialize(content: io.IOBase, file_format: str, load_args: dict[str, Any]) -> Any:
+    if file_format == "csv":
+        return pd.read_csv(content, **{"encoding": "utf-8", **load_args})
+    if file_format == "json":
+        return json.load(content, **load_args)
+    return pickle.load(content, **load_args)
+
+
+class MultiSinkDataset(AbstractDataset[Any, Any]):
+    """``MultiSinkDataset`` writes the same artifact to several ``sinks``.
+
+    The data is serialized a single time and the resulting bytes are written to
+    every sink concurrently. Each write is atomic: local files are written to a
+    temporary file then renamed, S3 objects only appear once their upload
+    completes. Objects larger than ``multipart_threshold`` are sent to S3 as
+    multipart uploads whose parts are uploaded in parallel. Loading reads the
+    first sink.
+
+    Supported formats are ``csv`` (pandas DataFrame), ``json`` and ``pickle``.
+    ``credentials`` are used for the S3 sinks. Sinks are created on first use,
+    so building the catalog neither imports boto3 nor creates S3 clients.
+
+    Example:
+    ::
+
+        downloaded_papers_df:
+          type: arxiv_discoverer.datasets.MultiSinkDataset
+          format: csv
+          sinks:
+            - data/01_raw/downloaded_papers.csv
+            - s3://arxiv-file-storage/metadata/downloaded_papers.csv
+          credentials: aws_s3
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        sinks: list[str],
+        format: str = "csv",  # noqa: A002
+        save_args: dict[str, Any] | None = None,
+        load_args: dict[str, Any] | None = None,
+        credentials: dict[str, Any] | None = None,
+        max_workers: int = 4,
+        multipart_threshold: int = 16 * MB,
+        part_size: int = 8 * MB,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """Creates a new instance of ``MultiSinkDataset``.
+
+        Args:
+            sinks: Destinations, local paths or `s3://bucket/key` URLs. The first
+                one is read on load.
+            format: Serialization format, one of "csv", "json" and "pickle".
+            save_args: Arguments of the serializer (`DataFrame.to_csv`, `json.dumps`
+                or `pickle.dumps`).
+            load_args: Arguments of the deserializer.
+            credentials: S3 credentials with "key", "secret", "token" and
+                "client_kwargs", as for the other S3 datasets.
+            max_workers: Number of sinks written concurrently.
+            multipart_threshold: Size in bytes above which S3 multipart uploads are used.
+            part_size: Size in bytes of the multipart upload parts.
+            metadata: Any arbitrary metadata, ignored by Kedro.
+        """
+        if not sinks:
+            raise ValueError("MultiSinkDataset needs at least one sink.")
+        if format not in ("csv", "json", "pickle"):
+            raise ValueError(f"Unsupported format '{format}', expected one of csv, json, pickle.")
+        for path in sinks:
+            if "://" in path and not path.startswith(("s3://", "file://")):
+                raise ValueError(f"Unsupported sink protocol: {path}")
+
+        self._paths = list(sinks)
+        self._format = format
+        self._save_args = deepcopy(save_args) or {}
+        self._load_args = deepcopy(load_args) or {}
+        self._max_workers = max_workers
+        self._credentials = deepcopy(credentials)
+        self._s3_args = {"multipart_threshold": multipart_threshold, "part_size": part_size}
+        self._sinks: list = [None] * len(self._paths)
+        self.metadata = metadata
+
+    def _describe(self) -> dict[str, Any]:
+        return {"sinks": self._paths, "format": self._format}
+
+    def _sink(self, index: int):
+        if self._sinks[index] is None:
+            self._sinks[index] = make_sink(self._paths[index], self._credentials, **self._s3_args)
+        return self._sinks[index]
+
+    def load(self) -> Any:
+        with self._sink(0).open() as f:
+            return _deserialize(f, self._format, self._load_args)
+
+    def save(self, data: Any) -> None:
+        content = _serialize(data, self._format, self._save_args)
+        sinks = [self._sink(index) for index in range(len(self._paths))]
+        write_to_sinks(sinks, content=content, max_workers=self._max_workers)
+        logger.info(f"Wrote {len(content)} bytes to {len(sinks)} sinks: {', '.join(self._paths)}")
+
+    def _exists(self) -> bool:
+        return self._sink(0).exists()
@@ -0,0 +1,60 @@
+"""``ServingArtifactsDataset`` writes the read-optimized files of the HTTP API
+and loads them back memory-mapped.
+"""
+
+from pathlib import Path
+from typing import Any
+
+from kedro.io.core import AbstractDataset, DatasetError
+
+from arxiv_discoverer.serving import ServingArtifacts, write_serving_artifacts
+from arxiv_discoverer.serving._artifacts import MANIFEST_FILE
+
+
+class ServingArtifactsDataset(AbstractDataset[dict[str, Any], ServingArtifacts]):
+    """``ServingArtifactsDataset`` saves the output of ``create_serving_artifacts``
+    (ids, coordinates and a stream of details) as raw arrays and NDJSON details
+    in a local directory, and loads them as memory-mapped ``ServingArtifacts``.
+    Files are memory-mapped, so the directory must be on the local filesystem.
+
+    Example:
+    ::
+
+        serving_artifacts:
+          type: arxiv_discoverer.datasets.ServingArtifactsDataset
+          path: data/07_model_output/serving
+          shard_size: 1000
+    """
+
+    def __init__(self, *, path: str, shard_size: int = 1000, metadata: dict[str, Any] | None = None) -> None:
+        """Creates a new instance of ``ServingArtifactsDataset``.
+
+        Args:
+            path: Local directory of the artifacts.
+            shard_size: Number of papers per detail shard.
+            metadata: Any arbitrary metadata, ignored by Kedro.
+        """
+        if "://" in path and not path.startswith("file://"):
+            raise DatasetError(f"Serving artifacts are memory-mapped and must be local, got {path}")
+        self._path = Path(path.removeprefix("file://"))
+        self._shard_size = shard_size
+        self.metadata = metadata
+
+    def _describe(self) -> dict[str, Any]:
+        return {"path": str(self._path), "shard_size": self._shard_size}
+
+    def load(self) -> ServingArtifacts:
+        return ServingArtifacts(self._path)
+
+    def save(self, data: dict[str, Any]) -> None:
+        write_serving_artifacts(
+            self._path,
+            ids=data["ids"],
+            coordinates=data["coordinates"],
+            details=data["details"],
+            shard_size=self._shard_size,
+            metadata=data.get("metadata"),
+        )
+
+    def _exists(self) -> bool:
+        return (self._path / MANIFEST_FILE).exists()
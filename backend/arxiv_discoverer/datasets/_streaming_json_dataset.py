@@ -0,0 +1,318 @@
+"""``StreamingJSONDataset`` writes JSON incrementally from record generators, with
+optional pre-compressed variants produced in the same pass.
+"""
+
+import gzip
+import json
+import logging
+import re
+from collections.abc import Callable, Iterable, Iterator
+from copy import deepcopy
+from hashlib import sha256
+from pathlib import PurePosixPath
+from typing import Any, BinaryIO
+
+import fsspec
+from kedro.io.core import AbstractDataset, get_protocol_and_path
+
+logger = logging.getLogger(__name__)
+
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "br": ".br"}
+_FLUSH_SIZE = 1 << 16
+_encoder = json.JSONEncoder(separators=(",", ":"))
+
+
+class JSONArrayStream:
+    """
+    Lazily produced JSON array. `factory` is called on every iteration, so the
+    stream can be written to several datasets without being materialized.
+
+    Args:
+        factory (Callable[[], Iterable]): Returns an iterable of the array items.
+    """
+
+    def __init__(self, factory: Callable[[], Iterable]):
+        self.factory = factory
+
+    def __iter__(self) -> Iterator:
+        return iter(self.factory())
+
+
+class JSONObjectStream(JSONArrayStream):
+    """
+    Lazily produced JSON object, `factory` returns an iterable of (key, value) pairs.
+    """
+
+    def items(self) -> Iterator[tuple[str, Any]]:
+        return iter(self.factory())
+
+
+def validate_compression(compression: list[str] | None) -> list[str]:
+    """Check the requested compressed variants, returning them as a list."""
+    compression = list(compression or [])
+    unsupported = set(compression) - set(COMPRESSION_SUFFIXES)
+    if unsupported:
+        raise ValueError(
+            f"Unsupported compression {sorted(unsupported)}, expected some of {list(COMPRESSION_SUFFIXES)}"
+        )
+    return compression
+
+
+def materialize(data: Any) -> Any:
+    """Turn JSON streams into plain lists and dicts, recursively."""
+    if isinstance(data, JSONObjectStream):
+        return {key: materialize(value) for key, value in data.items()}
+    if isinstance(data, JSONArrayStream):
+        return [materialize(item) for item in data]
+    if isinstance(data, dict):
+        return {key: materialize(value) for key, value in data.items()}
+    return data
+
+
+def iter_json_chunks(data: Any) -> Iterator[str]:
+    """
+    Compact JSON encoding of `data`, yielded chunk by chunk. Streams are
+    consumed one record at a time.
+
+    Args:
+        data (Any): JSON-serializable data, possibly containing streams.
+
+    Yields:
+        str: Consecutive pieces of the JSON document.
+    """
+    if isinstance(data, (JSONObjectStream, dict)):
+        yield "{"
+        for i, (key, value) in enumerate(data.items()):
+            yield ("," if i else "") + _encoder.encode(str(key)) + ":"
+            yield from iter_json_chunks(value)
+        yield "}"
+    elif isinstance(data, JSONArrayStream):
+        yield "["
+        for i, item in enumerate(data):
+            if i:
+                yield ","
+            yield from iter_json_chunks(item)
+        yield "]"
+    else:
+        yield _encoder.encode(data)
+
+
+class MultiWriter:
+    """
+    Fans bytes out to a raw file and compressed variants of it, while hashing
+    the uncompressed content.
+
+    Args:
+        raw (BinaryIO): Destination of the uncompressed bytes.
+        compressed (dict[str, BinaryIO]): {"gzip" | "br": destination}
+    """
+
+    def __init__(self, raw: BinaryIO, compressed: dict[str, BinaryIO] | None = None):
+        self.raw = raw
+        self.hash = sha256()
+        self.size = 0
+        self._compressors = {}
+        for encoding, file in (compressed or {}).items():
+            if encoding == "gzip":
+                self._compressors[encoding] = (gzip.GzipFile(fileobj=file, mode="wb", mtime=0), None)
+            else:
+                try:
+                    import brotli
+                except ImportError as exc:
+                    raise ImportError("Brotli compression requires the 'brotli' package.") from exc
+                self._compressors[encoding] = (file, brotli.Compressor(quality=9))
+
+    def write(self, content: bytes) -> None:
+        self.raw.write(content)
+        self.hash.update(content)
+        self.size += len(content)
+        for file, compressor in self._compressors.values():
+            file.write(compressor.process(content) if compressor else content)
+
+    def close(self) -> None:
+        for file, compressor in self._compressors.values():
+            if compressor:
+                file.write(compressor.finish())
+            else:
+                file.close()
+
+
+def write_json_stream(data: Any, writer: MultiWriter) -> None:
+    """Encode `data` into `writer`, buffering small chunks into larger writes."""
+    buffer, buffered = [], 0
+    for chunk in iter_json_chunks(data):
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= _FLUSH_SIZE:
+            writer.write("".join(buffer).encode("utf-8"))
+            buffer, buffered = [], 0
+    writer.write("".join(buffer).encode("utf-8"))
+    writer.close()
+
+
+def stream_json_to_files(  # noqa: PLR0913, PLR0917
+    fs: fsspec.AbstractFileSystem,
+    protocol: str,
+    filepath: PurePosixPath,
+    data: Any,
+    compression: list[str] | None = None,
+    content_hash: bool = False,
+) -> dict[str, Any]:
+    """
+    Stream `data` as compact JSON to `filepath` and its compressed variants.
+    Files are written under temporary names and renamed once complete, so
+    readers never see partial files; the temporary files of a failed write are
+    removed.
+
+    Args:
+        fs (fsspec.AbstractFileSystem): Destination filesystem.
+        protocol (str): Protocol of `fs`, e.g. "file" or "s3".
+        filepath (PurePosixPath): Destination path, without protocol.
+        data (Any): JSON-serializable data, possibly containing streams.
+        compression (list[str] | None): Variants to write, among "gzip" and "br".
+        content_hash (bool): Insert the content hash in the file names.
+
+    Returns:
+        dict[str, Any]: {"file", "sha256", "bytes", "encodings": {encoding: file}}
+    """
+
+    def full_path(path: PurePosixPath) -> str:
+        return str(path) if protocol == "file" else f"{protocol}://{path}"
+
+    compression = validate_compression(compression)
+    suffixes = {None: "", **{encoding: COMPRESSION_SUFFIXES[encoding] for encoding in compression}}
+    tmp_paths = {
+        encoding: filepath.with_name(f"{filepath.name}{suffix}.tmp") for encoding, suffix in suffixes.items()
+    }
+
+    try:
+        files = {}
+        try:
+            for encoding, path in tmp_paths.items():
+                files[encoding] = fs.open(full_path(path), "wb")
+            writer = MultiWriter(files[None], {encoding: files[encoding] for encoding in compression})
+            write_json_stream(data, writer)
+        finally:
+            for file in files.values():
+                file.close()
+
+        digest = writer.hash.hexdigest()
+        final_path = filepath
+        if content_hash:
+            final_path = filepath.with_name(f"{filepath.stem}.{digest[:16]}{filepath.suffix}")
+
+        encodings = {}
+        for encoding, tmp_path in tmp_paths.items():
+            path = final_path.with_name(final_path.name + suffixes[encoding])
+            fs.mv(full_path(tmp_path), full_path(path))
+            if encoding is not None:
+                encodings[encoding] = path.name
+    finally:
+        for tmp_path in tmp_paths.values():
+            if fs.exists(full_path(tmp_path)):
+                fs.rm(full_path(tmp_path))
+    return {"file": final_path.name, "sha256": digest, "bytes": writer.size, "encodings": encodings}
+
+
+class StreamingJSONDataset(AbstractDataset[Any, Any]):
+    """``StreamingJSONDataset`` writes compact JSON incrementally, consuming
+    ``JSONArrayStream`` / ``JSONObjectStream`` values record by record, so the
+    document is never held in memory as a whole. Compressed variants
+    (``.gz``, ``.br``) are produced in the same pass.
+
+    With ``content_hash``, files are named after the hash of their content
+    (``viz_data.<hash>.json``) for cache-busting, and ``filepath`` holds a small
+    pointer ``{"file": ..., "sha256": ..., "encodings": {...}}``. Once the
+    pointer is swapped, the files of earlier hashes are removed.
+
+    Example:
+    ::
+
+        search_index:
+          type: arxiv_discoverer.datasets.StreamingJSONDataset
+          filepath: frontend/public/data/search_index.json
+          compression: [gzip, br]
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        filepath: str,
+        compression: list[str] | None = None,
+        content_hash: bool = False,
+        credentials: dict[str, Any] | None = None,
+        fs_args: dict[str, Any] | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """Creates a new instance of ``StreamingJSONDataset``.
+
+        Args:
+            filepath: Path of the JSON file, prefixed with a protocol like `s3://`.
+                Local filesystem if no prefix is given.
+            compression: Pre-compressed variants to write, among "gzip" and "br".
+            content_hash: Name the files after their content hash and write a
+                pointer at `filepath`.
+            credentials: Credentials passed to the underlying filesystem.
+            fs_args: Extra arguments passed to the underlying filesystem.
+            metadata: Any arbitrary metadata, ignored by Kedro.
+        """
+        _fs_args = deepcopy(fs_args) or {}
+        protocol, path = get_protocol_and_path(filepath)
+        if protocol == "file":
+            _fs_args.setdefault("auto_mkdir", True)
+
+        self._protocol = protocol
+        self._filepath = PurePosixPath(path)
+        self._fs = fsspec.filesystem(protocol, **(deepcopy(credentials) or {}), **_fs_args)
+        self._compression = validate_compression(compression)
+        self._content_hash = content_hash
+        self.metadata = metadata
+
+    def _describe(self) -> dict[str, Any]:
+        return {
+            "filepath": str(self._filepath),
+            "protocol": self._protocol,
+            "compression": self._compression,
+            "content_hash": self._content_hash,
+        }
+
+    def _full_path(self, path: PurePosixPath) -> str:
+        return str(path) if self._protocol == "file" else f"{self._protocol}://{path}"
+
+    def load(self) -> Any:
+        with self._fs.open(self._full_path(self._filepath), "r") as f:
+            data = json.load(f)
+        if not self._content_hash:
+            return data
+        with self._fs.open(self._full_path(self._filepath.parent / data["file"]), "r") as f:
+            return json.load(f)
+
+    def save(self, data: Any) -> None:
+        written = stream_json_to_files(
+            self._fs, self._protocol, self._filepath, data, self._compression, self._content_hash
+        )
+        if self._content_hash:
+            self._swap_pointer(written)
+            self._prune(written)
+        logger.info(f"Wrote {written['bytes']} bytes to {self._full_path(self._filepath.parent / written['file'])}")
+
+    def _swap_pointer(self, written: dict[str, Any]) -> None:
+        """Replace the pointer at once, so readers never see a partial one."""
+        tmp_path = self._filepath.with_name(f"{self._filepath.name}.tmp")
+        with self._fs.open(self._full_path(tmp_path), "w") as f:
+            json.dump(written, f)
+        self._fs.mv(self._full_path(tmp_path), self._full_path(self._filepath))
+
+    def _prune(self, written: dict[str, Any]) -> None:
+        """Remove the content-hash files the pointer no longer references."""
+        stem, suffix = self._filepath.stem, self._filepath.suffix
+        variants = "|".join(re.escape(COMPRESSION_SUFFIXES[encoding]) for encoding in COMPRESSION_SUFFIXES)
+        hashed = re.compile(rf"{re.escape(stem)}\.[0-9a-f]{{16}}{re.escape(suffix)}(?:{variants})?")
+        current = {written["file"], *written["encodings"].values()}
+        pattern = self._filepath.with_name(f"{stem}.*{suffix}*")
+        for path in map(PurePosixPath, self._fs.glob(self._full_path(pattern))):
+            if hashed.fullmatch(path.name) and path.name not in current:
+                self._fs.rm(self._full_path(path))
+
+    def _exists(self) -> bool:
+        return self._fs.exists(self._full_path(self._filepath))
@@ -0,0 +1,17 @@
+"""Long-running embedding server keeping the model resident, and its asyncio client.
+
+Start it with ``python -m arxiv_discoverer.embedding_service --model all-MiniLM-L6-v2``.
+"""
+
+from ._client import EmbeddingClient, EmbeddingServiceError, encode_with_service
+from ._server import BatchStats, DynamicBatcher, EmbeddingServer, model_encoder
+
+__all__ = [
+    "BatchStats",
+    "DynamicBatcher",
+    "EmbeddingClient",
+    "EmbeddingServer",
+    "EmbeddingServiceError",
+    "encode_with_service",
+    "model_encoder",
+]
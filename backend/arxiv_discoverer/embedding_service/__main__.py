@@ -0,0 +1,35 @@
+"""Run the embedding server: ``python -m arxiv_discoverer.embedding_service --model all-MiniLM-L6-v2``."""
+
+import argparse
+import asyncio
+import logging
+
+from ._server import EmbeddingServer, model_encoder
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding server with dynamic request batching.")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2", help="SentenceTransformer path or name.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--stats-interval", type=float, default=60.0, help="Seconds between stats logs.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    server = EmbeddingServer(
+        model_encoder(args.model, batch_size=args.max_batch_size),
+        host=args.host,
+        port=args.port,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+    )
+    try:
+        asyncio.run(server.serve_forever(args.stats_interval))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
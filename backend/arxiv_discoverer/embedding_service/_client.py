@@ -0,0 +1,133 @@
+import asyncio
+import itertools
+import logging
+from typing import Any
+
+import numpy as np
+
+from ._protocol import encode_frame, frame_array, parse_address, read_frame
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingServiceError(RuntimeError):
+    """The embedding server failed to encode a request."""
+
+
+class EmbeddingClient:
+    """
+    asyncio client of an `EmbeddingServer`. Requests are pipelined over a
+    single connection, so concurrent `encode` calls, and the sub-requests of a
+    large call, are batched together by the server.
+
+    Example:
+    ::
+
+        async with EmbeddingClient("127.0.0.1:8765") as client:
+            vectors = await client.encode(["Title : ...\\n Abstract : ..."])
+
+    Args:
+        address (str): "host:port" of the server.
+        request_size (int): Maximum number of texts per request, larger inputs
+            are split into concurrent requests.
+    """
+
+    def __init__(self, address: str, request_size: int = 32):
+        self.address = address
+        self.request_size = request_size
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._responses: dict[int, asyncio.Future] = {}
+        self._ids = itertools.count()
+        self._receiver: asyncio.Task | None = None
+        self._failure: ConnectionError | None = None
+
+    async def connect(self) -> "EmbeddingClient":
+        host, port = parse_address(self.address)
+        self._reader, self._writer = await asyncio.open_connection(host, port)
+        self._failure = None
+        self._receiver = asyncio.create_task(self._receive())
+        return self
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+        if self._receiver is not None:
+            self._receiver.cancel()
+            try:
+                await self._receiver
+            except asyncio.CancelledError:
+                pass
+
+    async def __aenter__(self) -> "EmbeddingClient":
+        return await self.connect()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _receive(self) -> None:
+        try:
+            while True:
+                header, payload = await read_frame(self._reader)
+                future = self._responses.pop(header["id"], None)
+                if future is None or future.done():
+                    continue
+                if "error" in header:
+                    future.set_exception(EmbeddingServiceError(header["error"]))
+                else:
+                    future.set_result((header, payload))
+        except Exception as error:
+            # Whatever stopped the reader (EOF, reset, malformed frame), no
+            # response will come anymore: fail the pending and future requests.
+            if isinstance(error, (asyncio.IncompleteReadError, ConnectionError)):
+                message = f"Embedding server {self.address} closed the connection: {error}"
+            else:
+                message = f"Connection to embedding server {self.address} failed: {error!r}"
+            self._failure = ConnectionError(message)
+            self._failure.__cause__ = error
+            for future in self._responses.values():
+                if not future.done():
+                    future.set_exception(self._failure)
+            self._responses.clear()
+
+    async def _request(self, header: dict[str, Any]) -> tuple[dict[str, Any], bytes]:
+        if self._writer is None:
+            await self.connect()
+        if self._failure is not None:
+            raise ConnectionError(*self._failure.args) from self._failure.__cause__
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._responses[request_id] = future
+        self._writer.write(encode_frame({**header, "id": request_id}))
+        await self._writer.drain()
+        return await future
+
+    async def encode(self, texts: list[str]) -> np.ndarray:
+        """
+        Encode texts with the server model.
+
+        Args:
+            texts (list[str]): Texts to encode.
+
+        Returns:
+            np.ndarray: (N, dim) float32 embeddings, aligned with `texts`.
+        """
+        chunks = [texts[start : start + self.request_size] for start in range(0, len(texts), self.request_size)]
+        responses = await asyncio.gather(*(self._request({"type": "encode", "texts": chunk}) for chunk in chunks))
+        arrays = [frame_array(header, payload) for header, payload in responses]
+        return np.concatenate(arrays) if arrays else np.zeros((0, 0), dtype=np.float32)
+
+    async def stats(self) -> dict[str, Any]:
+        """Latency percentiles and batch-fill metrics of the server."""
+        header, _ = await self._request({"type": "stats"})
+        return header["stats"]
+
+
+async def encode_with_service(address: str, texts: list[str], request_size: int = 32) -> np.ndarray:
+    """Encode `texts` on the embedding server at `address` with a short-lived client."""
+    async with EmbeddingClient(address, request_size) as client:
+        return await client.encode(texts)
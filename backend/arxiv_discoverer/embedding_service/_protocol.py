@@ -0,0 +1,44 @@
+import asyncio
+import json
+import struct
+from typing import Any
+
+import numpy as np
+
+# Frame: 4-byte big-endian header length, JSON header, then `payload_bytes` raw bytes.
+_HEADER_LENGTH = struct.Struct("!I")
+MAX_HEADER_BYTES = 64 << 20
+
+
+async def read_frame(reader: asyncio.StreamReader) -> tuple[dict[str, Any], bytes]:
+    """Read one frame, raising `asyncio.IncompleteReadError` when the peer closed the connection."""
+    (length,) = _HEADER_LENGTH.unpack(await reader.readexactly(_HEADER_LENGTH.size))
+    if length > MAX_HEADER_BYTES:
+        raise ValueError(f"Frame header of {length} bytes exceeds {MAX_HEADER_BYTES}")
+    header = json.loads(await reader.readexactly(length))
+    payload = await reader.readexactly(header.get("payload_bytes", 0))
+    return header, payload
+
+
+def encode_frame(header: dict[str, Any], payload: bytes = b"") -> bytes:
+    """Serialize one frame."""
+    header = {**header, "payload_bytes": len(payload)}
+    raw_header = json.dumps(header, separators=(",", ":")).encode()
+    return _HEADER_LENGTH.pack(len(raw_header)) + raw_header + payload
+
+
+def array_frame(header: dict[str, Any], array: np.ndarray) -> bytes:
+    """Frame carrying a float32 matrix."""
+    array = np.ascontiguousarray(array, dtype=np.float32)
+    return encode_frame({**header, "shape": list(array.shape)}, array.tobytes())
+
+
+def frame_array(header: dict[str, Any], payload: bytes) -> np.ndarray:
+    """Matrix carried by an `array_frame`."""
+    return np.frombuffer(payload, dtype=np.float32).reshape(header["shape"])
+
+
+def parse_address(address: str) -> tuple[str, int]:
+    """("host", port) of a "host:port" address."""
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
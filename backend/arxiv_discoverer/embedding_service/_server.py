@@ -0,0 +1,264 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+
+from ._protocol import array_frame, encode_frame, read_frame
+
+logger = logging.getLogger(__name__)
+
+Encoder = Callable[[list[str]], np.ndarray]
+
+
+def model_encoder(model_path: str, batch_size: int = 64) -> Encoder:
+    """
+    Encoder of a SentenceTransformer, with the normalization of `create_embeddings`.
+
+    Args:
+        model_path (str): Path or name of the SentenceTransformer model.
+        batch_size (int): Batch size of the model forward passes.
+
+    Returns:
+        Encoder: Function mapping texts to a (N, dim) float32 matrix.
+    """
+    from arxiv_discoverer.search import get_model
+
+    model = get_model(model_path)
+
+    def encode(texts: list[str]) -> np.ndarray:
+        return model.encode(texts, normalize_embeddings=True, batch_size=batch_size)
+
+    return encode
+
+
+class BatchStats:
+    """
+    Latency and batch-fill metrics over the last `window` requests and batches.
+
+    Args:
+        max_batch_size (int): Batch size the fill ratio is relative to.
+        window (int): Number of requests and batches kept.
+    """
+
+    def __init__(self, max_batch_size: int, window: int = 10_000):
+        self.max_batch_size = max_batch_size
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.queue_waits: deque[float] = deque(maxlen=window)
+        self.batch_sizes: deque[int] = deque(maxlen=window)
+        self.requests = 0
+        self.texts = 0
+        self.batches = 0
+        self.errors = 0
+
+    def record_batch(self, n_texts: int) -> None:
+        self.batches += 1
+        self.batch_sizes.append(n_texts)
+
+    def record_request(self, n_texts: int, queue_wait: float, latency: float) -> None:
+        self.requests += 1
+        self.texts += n_texts
+        self.queue_waits.append(queue_wait)
+        self.latencies.append(latency)
+
+    def summary(self) -> dict[str, Any]:
+        """Counters, latency percentiles in milliseconds and mean batch fill."""
+        summary = {"requests": self.requests, "texts": self.texts, "batches": self.batches, "errors": self.errors}
+        if self.latencies:
+            latencies = np.asarray(self.latencies) * 1000
+            for percentile in (50, 90, 99):
+                summary[f"latency_p{percentile}_ms"] = float(np.percentile(latencies, percentile))
+            summary["queue_wait_p50_ms"] = float(np.percentile(np.asarray(self.queue_waits) * 1000, 50))
+        if self.batch_sizes:
+            sizes = np.asarray(self.batch_sizes)
+            summary["mean_batch_size"] = float(sizes.mean())
+            summary["mean_batch_fill"] = float(np.minimum(sizes / self.max_batch_size, 1.0).mean())
+        return summary
+
+
+class _Request:
+    __slots__ = ("texts", "future", "enqueued")
+
+    def __init__(self, texts: list[str], future: asyncio.Future):
+        self.texts = texts
+        self.future = future
+        self.enqueued = time.perf_counter()
+
+
+class DynamicBatcher:
+    """
+    Collects concurrent encoding requests into batches: a batch is encoded as
+    soon as it holds `max_batch_size` texts, or `max_wait_ms` after its first
+    request arrived. Batches are encoded one at a time in a worker thread, so
+    the event loop keeps accepting requests meanwhile.
+
+    Args:
+        encoder (Encoder): Function mapping texts to a (N, dim) matrix.
+        max_batch_size (int): Maximum number of texts per batch. A larger single
+            request is encoded as its own batch.
+        max_wait_ms (float): Maximum time a request waits for a batch to fill.
+    """
+
+    def __init__(self, encoder: Encoder, max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        self.encoder = encoder
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.stats = BatchStats(max_batch_size)
+        self._queue: asyncio.Queue[_Request] = asyncio.Queue()
+        self._pending: _Request | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def encode(self, texts: list[str]) -> np.ndarray:
+        """Encode `texts` within the next batch."""
+        request = _Request(texts, asyncio.get_running_loop().create_future())
+        await self._queue.put(request)
+        return await request.future
+
+    async def _next_batch(self) -> list[_Request]:
+        first = self._pending or await self._queue.get()
+        self._pending = None
+        batch, size = [first], len(first.texts)
+        deadline = first.enqueued + self.max_wait
+        while size < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            try:
+                request = self._queue.get_nowait() if timeout <= 0 else await asyncio.wait_for(self._queue.get(), timeout)
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+            if size + len(request.texts) > self.max_batch_size:
+                self._pending = request
+                break
+            batch.append(request)
+            size += len(request.texts)
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch()
+            texts = [text for request in batch for text in request.texts]
+            started = time.perf_counter()
+            self.stats.record_batch(len(texts))
+            try:
+                vectors = await loop.run_in_executor(None, self.encoder, texts)
+            except Exception as error:  # noqa: BLE001 - reported to every waiting client
+                self.stats.errors += len(batch)
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(error)
+                continue
+            finished = time.perf_counter()
+            offset = 0
+            for request in batch:
+                n_texts = len(request.texts)
+                if not request.future.done():
+                    request.future.set_result(np.asarray(vectors[offset : offset + n_texts], dtype=np.float32))
+                self.stats.record_request(n_texts, started - request.enqueued, finished - request.enqueued)
+                offset += n_texts
+
+
+class EmbeddingServer:
+    """
+    Local embedding server keeping a model resident and batching the requests
+    of all its clients with a `DynamicBatcher`. Clients connect with
+    `EmbeddingClient`; a connection carries any number of concurrent requests.
+
+    Args:
+        encoder (Encoder): Function mapping texts to a (N, dim) matrix, e.g. `model_encoder(model_path)`.
+        host (str): Interface to listen on.
+        port (int): Port to listen on, 0 picks a free port.
+        max_batch_size (int): Maximum number of texts per batch.
+        max_wait_ms (float): Maximum time a request waits for a batch to fill.
+    """
+
+    def __init__(
+        self,
+        encoder: Encoder,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+    ):
+        self.host = host
+        self.port = port
+        self.batcher = DynamicBatcher(encoder, max_batch_size, max_wait_ms)
+        self._server: asyncio.Server | None = None
+
+    @property
+    def address(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    async def start(self) -> "EmbeddingServer":
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Embedding server listening on {self.address}")
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.batcher.stop()
+        logger.info(f"Embedding server stopped: {self.batcher.stats.summary()}")
+
+    async def serve_forever(self, stats_interval: float | None = 60.0) -> None:
+        await self.start()
+        try:
+            while True:
+                await asyncio.sleep(stats_interval or 3600)
+                if stats_interval:
+                    logger.info(f"Embedding server stats: {self.batcher.stats.summary()}")
+        finally:
+            await self.stop()
+
+    async def __aenter__(self) -> "EmbeddingServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        write_lock = asyncio.Lock()
+        tasks = set()
+
+        async def respond(header: dict[str, Any]) -> None:
+            request_id = header.get("id")
+            try:
+                if header.get("type") == "stats":
+                    frame = encode_frame({"id": request_id, "stats": self.batcher.stats.summary()})
+                else:
+                    vectors = await self.batcher.encode(header["texts"])
+                    frame = array_frame({"id": request_id}, vectors)
+            except Exception as error:  # noqa: BLE001 - sent back to the client
+                frame = encode_frame({"id": request_id, "error": f"{type(error).__name__}: {error}"})
+            async with write_lock:
+                writer.write(frame)
+                await writer.drain()
+
+        try:
+            while True:
+                header, _ = await read_frame(reader)
+                task = asyncio.create_task(respond(header))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            writer.close()
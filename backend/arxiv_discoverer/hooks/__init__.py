@@ -0,0 +1,15 @@
+"""Project hooks registered in ``settings.HOOKS``."""
+
+from ._node_metrics import NodeMetricsHooks, data_size
+from ._node_profiler import NodeProfilerHooks, StackSampler, parse_node_names
+from ._run_cache import RunCacheHooks, node_fingerprint
+
+__all__ = [
+    "NodeMetricsHooks",
+    "NodeProfilerHooks",
+    "RunCacheHooks",
+    "StackSampler",
+    "data_size",
+    "node_fingerprint",
+    "parse_node_names",
+]
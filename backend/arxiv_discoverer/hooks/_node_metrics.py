@@ -0,0 +1,265 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+from kedro.framework.hooks import hook_impl
+
+from arxiv_discoverer.resources import current_rss
+
+logger = logging.getLogger(__name__)
+
+MB = 1 << 20
+TRACE_ALLOCATIONS_ENV = "ARXIV_TRACE_ALLOCATIONS"
+
+def data_size(data: Any) -> tuple[int | None, int]:
+    """
+    Rough (rows, bytes) of a node input or output.
+
+    Args:
+        data (Any): DataFrame, array, bytes, list, dict or any object.
+
+    Returns:
+        tuple[int | None, int]: Number of rows (None if not row-like) and size in bytes.
+    """
+    # Only modules already imported by the nodes are used, the hook imports nothing heavy.
+    pd = sys.modules.get("pandas")
+    np = sys.modules.get("numpy")
+    if pd is not None and isinstance(data, pd.DataFrame):
+        # deep: the Python objects of object columns (lists, strings) are counted too.
+        return len(data), int(data.memory_usage(index=True, deep=True).sum())
+    if np is not None and isinstance(data, np.ndarray):
+        return (len(data) if data.ndim else None), data.nbytes
+    if isinstance(data, (bytes, bytearray, str)):
+        return None, len(data)
+    if isinstance(data, dict):
+        array_types = tuple(t for t in (np and np.ndarray, pd and pd.DataFrame) if t)
+        arrays = [value for value in data.values() if isinstance(value, array_types)]
+        if arrays:
+            sizes = [data_size(value) for value in arrays]
+            return max((rows or 0) for rows, _ in sizes), sum(size for _, size in sizes)
+    if isinstance(data, (dict, list, tuple)):
+        return len(data), sys.getsizeof(data)
+    return None, sys.getsizeof(data)
+
+
+def _enabled(value: Any) -> bool:
+    """Truth of a flag given as a bool or a string ("1", "true", "yes")."""
+    return str(value).strip().lower() in ("1", "true", "yes")
+
+
+class _RSSSampler(threading.Thread):
+    """Polls the RSS while a node runs to capture its peak."""
+
+    def __init__(self, interval: float):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = current_rss()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.peak = max(self.peak, current_rss())
+
+    def stop(self) -> int:
+        self._stop_event.set()
+        self.join()
+        return max(self.peak, current_rss())
+
+
+class NodeMetricsHooks:
+    """
+    Records, for every node: wall and CPU time, peak RSS, input/output sizes,
+    rows per second and, when enabled, tracemalloc allocation deltas.
+
+    Allocation tracing slows allocation-heavy nodes down, so it is off unless
+    enabled with `trace_allocations`, the `ARXIV_TRACE_ALLOCATIONS` environment
+    variable or the `trace_allocations` runtime parameter, e.g.
+    ``kedro run --params "trace_allocations=true"``. tracemalloc has a single,
+    process-wide peak: the traced peak of a node that ran concurrently with
+    another one (ThreadRunner) cannot be attributed and is not recorded.
+
+    Each node appends a record to `<output_dir>/node_metrics.jsonl`; at the end of
+    the run the latest values are written as Prometheus gauges to
+    `<output_dir>/node_metrics.prom` (for the node_exporter textfile collector)
+    and a summary table is logged.
+
+    Args:
+        output_dir (str): Directory of the run log and Prometheus file.
+        trace_allocations (bool | None): Track Python allocations with
+            tracemalloc, from `ARXIV_TRACE_ALLOCATIONS` if None.
+        rss_interval (float): Seconds between two RSS samples.
+    """
+
+    def __init__(
+        self,
+        output_dir: str = "data/08_reporting",
+        trace_allocations: bool | None = None,
+        rss_interval: float = 0.05,
+    ):
+        self.output_dir = Path(output_dir)
+        if trace_allocations is None:
+            trace_allocations = _enabled(os.environ.get(TRACE_ALLOCATIONS_ENV))
+        self.trace_allocations = trace_allocations
+        self.rss_interval = rss_interval
+        self.records: list[dict[str, Any]] = []
+        self._running: dict[str, dict[str, Any]] = {}
+        self._run_id = None
+        self._started_tracing = False
+        self._lock = threading.Lock()
+
+    @property
+    def log_path(self) -> Path:
+        return self.output_dir / "node_metrics.jsonl"
+
+    @property
+    def prometheus_path(self) -> Path:
+        return self.output_dir / "node_metrics.prom"
+
+    @hook_impl
+    def before_pipeline_run(self, run_params: dict[str, Any]) -> None:
+        self._run_id = run_params.get("run_id") or run_params.get("session_id")
+        self.records = []
+        runtime_params = run_params.get("runtime_params") or {}
+        if "trace_allocations" in runtime_params:
+            self.trace_allocations = _enabled(runtime_params["trace_allocations"])
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    @hook_impl
+    def before_node_run(self, node, inputs: dict[str, Any]) -> None:
+        tracing = self.trace_allocations and tracemalloc.is_tracing()
+        sampler = _RSSSampler(self.rss_interval)
+        sampler.start()
+        state = {
+            "inputs": [data_size(data) for data in inputs.values()],
+            "sampler": sampler,
+            "rss_before": current_rss(),
+            "traced_before": tracemalloc.get_traced_memory()[0] if tracing else None,
+            "cpu_before": time.process_time(),
+            "wall_before": time.perf_counter(),
+        }
+        with self._lock:
+            # The traced peak is process-wide: it is only attributed to nodes that ran alone.
+            state["overlapped"] = bool(self._running)
+            for other in self._running.values():
+                other["overlapped"] = True
+            if tracing and not state["overlapped"]:
+                tracemalloc.reset_peak()
+            self._running[node.name] = state
+
+    @hook_impl
+    def after_node_run(self, node, outputs: dict[str, Any]) -> None:
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        with self._lock:
+            state = self._running.pop(node.name, None)
+        if state is None:
+            return
+
+        peak_rss = state["sampler"].stop()
+        wall_seconds = wall - state["wall_before"]
+        input_rows = sum(rows or 0 for rows, _ in state["inputs"])
+        output_sizes = [data_size(data) for data in outputs.values()]
+        record = {
+            "run_id": self._run_id,
+            "node": node.name,
+            "timestamp": time.time(),
+            "wall_seconds": wall_seconds,
+            "cpu_seconds": cpu - state["cpu_before"],
+            "rss_mb": current_rss() / MB,
+            "rss_delta_mb": (current_rss() - state["rss_before"]) / MB,
+            "peak_rss_mb": peak_rss / MB,
+            "input_rows": input_rows,
+            "input_mb": sum(size for _, size in state["inputs"]) / MB,
+            "output_rows": sum(rows or 0 for rows, _ in output_sizes),
+            "output_mb": sum(size for _, size in output_sizes) / MB,
+            "rows_per_second": input_rows / wall_seconds if wall_seconds > 0 else None,
+        }
+        if state["traced_before"] is not None and not state["overlapped"] and tracemalloc.is_tracing():
+            traced, traced_peak = tracemalloc.get_traced_memory()
+            record["traced_delta_mb"] = (traced - state["traced_before"]) / MB
+            record["traced_peak_mb"] = (traced_peak - state["traced_before"]) / MB
+
+        with self._lock:
+            self.records.append(record)
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.log_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+
+    @hook_impl
+    def on_node_error(self, node) -> None:
+        with self._lock:
+            state = self._running.pop(node.name, None)
+        if state is not None:
+            state["sampler"].stop()
+
+    @hook_impl
+    def after_pipeline_run(self) -> None:
+        self._finish()
+
+    @hook_impl
+    def on_pipeline_error(self) -> None:
+        self._finish()
+
+    def _finish(self) -> None:
+        for state in self._running.values():
+            state["sampler"].stop()
+        self._running = {}
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        if not self.records:
+            return
+        self.write_prometheus()
+        logger.info("Node metrics:\n" + self.summary_table())
+
+    def write_prometheus(self) -> None:
+        """Write the gauges of the run atomically, as the textfile collector requires."""
+        metrics = {
+            "wall_seconds": "Wall-clock time of the node",
+            "cpu_seconds": "CPU time of the node",
+            "peak_rss_mb": "Peak resident set size while the node ran, in MiB",
+            "traced_peak_mb": "Peak Python allocations of the node, in MiB",
+            "input_rows": "Rows in the node inputs",
+            "output_rows": "Rows in the node outputs",
+            "rows_per_second": "Input rows processed per second",
+        }
+        lines = []
+        for name, help_text in metrics.items():
+            lines += [f"# HELP arxiv_node_{name} {help_text}", f"# TYPE arxiv_node_{name} gauge"]
+            for record in self.records:
+                if record.get(name) is not None:
+                    lines.append(f'arxiv_node_{name}{{node="{record["node"]}"}} {record[name]:.6g}')
+
+        tmp_path = self.prometheus_path.with_suffix(".prom.tmp")
+        tmp_path.write_text("\n".join(lines) + "\n")
+        os.replace(tmp_path, self.prometheus_path)
+
+    def summary_table(self) -> str:
+        """Per-node table, slowest nodes first."""
+        columns = [
+            ("node", "{}", 40),
+            ("wall_seconds", "{:.2f}", 10),
+            ("cpu_seconds", "{:.2f}", 10),
+            ("peak_rss_mb", "{:.0f}", 12),
+            ("traced_peak_mb", "{:.1f}", 15),
+            ("input_rows", "{}", 11),
+            ("rows_per_second", "{:.0f}", 16),
+        ]
+        header = " ".join(f"{name:>{width}}" if i else f"{name:<{width}}" for i, (name, _, width) in enumerate(columns))
+        lines = [header]
+        for record in sorted(self.records, key=lambda r: -r["wall_seconds"]):
+            cells = []
+            for i, (name, fmt, width) in enumerate(columns):
+                value = record.get(name)
+                text = "-" if value is None else fmt.format(value)
+                cells.append(f"{text[: width - 1]:<{width}}" if i == 0 else f"{text:>{width}}")
+            lines.append(" ".join(cells))
+        return "\n".join(lines)
@@ -0,0 +1,200 @@
+import cProfile
+import logging
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+from kedro.framework.hooks import hook_impl
+
+logger = logging.getLogger(__name__)
+
+PROFILE_NODES_ENV = "ARXIV_PROFILE_NODES"
+PROFILE_MODE_ENV = "ARXIV_PROFILE_MODE"
+PROFILE_MODES = ("cprofile", "sampling")
+# Deeper call paths are cut when collapsing a cProfile profile into stacks.
+_MAX_STACK_DEPTH = 64
+
+
+def parse_node_names(value: Any) -> set[str]:
+    """Node names from a list, or a string separated by ",", ";" or spaces ("--params" forbids commas)."""
+    if not value:
+        return set()
+    if isinstance(value, str):
+        value = re.split(r"[,;\s]+", value)
+    return {str(name).strip() for name in value if str(name).strip()}
+
+
+def _frame_name(filename: str, lineno: int, name: str) -> str:
+    if filename == "~":  # builtins
+        return name
+    return f"{name} ({Path(filename).name}:{lineno})"
+
+
+def collapse_stats(stats: pstats.Stats) -> str:
+    """
+    Stacks in the collapsed format, reconstructed from a cProfile profile.
+
+    cProfile only records caller -> callee edges, so the time of a function is
+    split between its callers in proportion to the time each call edge took.
+    Weights are in microseconds.
+
+    Args:
+        stats (pstats.Stats): The profile.
+
+    Returns:
+        str: One "stack weight" line per stack, heaviest first.
+    """
+    callees: dict[tuple, dict[tuple, float]] = {}
+    for function, (*_, callers) in stats.stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, {})[function] = edge[3]
+
+    stacks: Counter[str] = Counter()
+
+    def visit(function: tuple, path: list[tuple], share: float) -> None:
+        # `share` is the fraction of the time of `function` spent under `path`.
+        _, _, self_time, total_time, _ = stats.stats[function]
+        path = [*path, function]
+        weight = round(self_time * share * 1e6)
+        if weight:
+            stacks[";".join(_frame_name(*frame) for frame in path)] += weight
+        if len(path) >= _MAX_STACK_DEPTH:
+            return
+        for callee, edge_time in callees.get(function, {}).items():
+            callee_time = stats.stats[callee][3]
+            if callee not in path and callee_time > 0:
+                visit(callee, path, share * edge_time / callee_time)
+
+    for function, (*_, callers) in stats.stats.items():
+        if not callers:
+            visit(function, [], 1.0)
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+class StackSampler(threading.Thread):
+    """
+    Low-overhead sampling profiler of one thread: every `interval` seconds, the
+    current stack of the thread is recorded. The profiled code is not
+    instrumented, it only pays for the GIL hand-offs of the sampling thread.
+
+    Args:
+        thread_id (int): Identifier of the thread to sample.
+        interval (float): Seconds between two samples.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(_frame_name(code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+    def collapsed(self) -> str:
+        """Stacks in the collapsed format read by flamegraph.pl and speedscope."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class NodeProfilerHooks:
+    """
+    Opt-in profiling of selected nodes. Nodes are selected with the
+    `ARXIV_PROFILE_NODES` environment variable or the `profile_nodes` runtime
+    parameter, e.g.
+    ``kedro run --params "profile_nodes=create_embeddings_node;reduce_vectors_dimensionality_node"``
+    ("all" profiles every node). The profiler is chosen with `ARXIV_PROFILE_MODE`
+    or `profile_mode`:
+
+    - ``cprofile`` (default): deterministic profile saved as `<node>.<time>.pstats`,
+      along with the stacks it implies as `<node>.<time>.collapsed`,
+    - ``sampling``: stack sampling saved as `<node>.<time>.collapsed`.
+
+    `.collapsed` files are read by flamegraph.pl and speedscope in both modes.
+
+    When no node is selected, the hooks return immediately and nothing is profiled.
+
+    Args:
+        output_dir (str): Directory of the profiles.
+        interval (float): Sampling interval in seconds of the sampling profiler.
+    """
+
+    def __init__(self, output_dir: str = "data/08_reporting/profiles", interval: float = 0.005):
+        self.output_dir = Path(output_dir)
+        self.interval = interval
+        self.nodes = parse_node_names(os.environ.get(PROFILE_NODES_ENV))
+        self.mode = os.environ.get(PROFILE_MODE_ENV, "cprofile")
+        self._profilers: dict[str, Any] = {}
+
+    @hook_impl
+    def before_pipeline_run(self, run_params: dict[str, Any]) -> None:
+        runtime_params = run_params.get("runtime_params") or {}
+        if "profile_nodes" in runtime_params:
+            self.nodes = parse_node_names(runtime_params["profile_nodes"])
+        self.mode = runtime_params.get("profile_mode", self.mode)
+        if self.nodes and self.mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{self.mode}', expected one of {PROFILE_MODES}")
+        if self.nodes:
+            logger.info(f"Profiling nodes {sorted(self.nodes)} with {self.mode}, writing to {self.output_dir}")
+
+    def _selected(self, node_name: str) -> bool:
+        return bool(self.nodes) and (node_name in self.nodes or "all" in self.nodes)
+
+    @hook_impl
+    def before_node_run(self, node) -> None:
+        if not self._selected(node.name):
+            return
+        if self.mode == "sampling":
+            profiler = StackSampler(threading.get_ident(), self.interval)
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        self._profilers[node.name] = profiler
+
+    @hook_impl
+    def after_node_run(self, node) -> None:
+        if not self._selected(node.name):
+            return
+        profiler = self._profilers.pop(node.name, None)
+        if profiler is None:
+            return
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"{node.name}.{time.strftime('%Y%m%dT%H%M%S')}"
+        if isinstance(profiler, StackSampler):
+            profiler.stop()
+            path = self.output_dir / f"{stem}.collapsed"
+            path.write_text(profiler.collapsed())
+        else:
+            profiler.disable()
+            path = self.output_dir / f"{stem}.pstats"
+            profiler.dump_stats(path)
+            (self.output_dir / f"{stem}.collapsed").write_text(collapse_stats(pstats.Stats(profiler)))
+        logger.info(f"Profile of {node.name} written to {path}")
+
+    @hook_impl
+    def on_node_error(self, node) -> None:
+        profiler = self._profilers.pop(node.name, None)
+        if isinstance(profiler, StackSampler):
+            profiler.stop()
+        elif profiler is not None:
+            profiler.disable()
@@ -0,0 +1,316 @@
+import ast
+import hashlib
+import importlib.util
+import inspect
+import logging
+import os
+import pickle
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from kedro.framework.hooks import hook_impl
+
+from ._node_profiler import parse_node_names
+
+logger = logging.getLogger(__name__)
+
+FORCE_RERUN_ENV = "ARXIV_FORCE_RERUN"
+
+
+def _update_fingerprint(hasher, data: Any) -> None:
+    """Feed the content of `data` to `hasher`, type-tagged so different types never collide."""
+    # Only modules already imported by the nodes are used, the hook imports nothing heavy.
+    pd = sys.modules.get("pandas")
+    np = sys.modules.get("numpy")
+    if pd is not None and isinstance(data, pd.DataFrame):
+        hasher.update(b"DataFrame")
+        hasher.update(repr((list(data.columns), [str(dtype) for dtype in data.dtypes])).encode())
+        hasher.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    elif pd is not None and isinstance(data, pd.Series):
+        hasher.update(b"Series")
+        hasher.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    elif np is not None and isinstance(data, np.ndarray):
+        hasher.update(f"ndarray{data.dtype}{data.shape}".encode())
+        if data.dtype == object:
+            hasher.update(pickle.dumps(data.tolist()))
+        else:
+            hasher.update(np.ascontiguousarray(data).data)
+    elif isinstance(data, dict):
+        hasher.update(f"dict{len(data)}".encode())
+        for key in sorted(data, key=repr):
+            hasher.update(repr(key).encode())
+            _update_fingerprint(hasher, data[key])
+    elif isinstance(data, (list, tuple)):
+        hasher.update(f"{type(data).__name__}{len(data)}".encode())
+        for item in data:
+            _update_fingerprint(hasher, item)
+    elif isinstance(data, (str, bytes, int, float, bool, type(None))):
+        hasher.update(repr(data).encode())
+    else:
+        hasher.update(pickle.dumps(data))
+
+
+def function_source(func) -> str:
+    """Source of a node function, its qualified name when the source is unavailable."""
+    func = getattr(func, "func", func)  # functools.partial
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        return f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', repr(func))}"
+
+
+def _module_file(module_name: str) -> Path | None:
+    """Source file of a module, without importing it (its parent packages may be)."""
+    module = sys.modules.get(module_name)
+    origin = getattr(module, "__file__", None)
+    if origin is None:
+        try:
+            spec = importlib.util.find_spec(module_name)
+        except (ImportError, ValueError):
+            return None
+        origin = spec.origin if spec is not None else None
+    return Path(origin) if origin and origin.endswith(".py") else None
+
+
+@lru_cache(maxsize=1024)
+def _imported_modules(path: Path, module_name: str, mtime_ns: int) -> tuple[str, ...]:
+    """
+    Absolute names of the modules imported by a source file, at module level or
+    inside functions. For `from package import name`, both `package` and
+    `package.name` are listed, `name` may be a submodule.
+    """
+    try:
+        tree = ast.parse(path.read_bytes())
+    except (OSError, SyntaxError, ValueError):
+        return ()
+    package = module_name if path.name == "__init__.py" else module_name.rpartition(".")[0]
+    names = []
+    for statement in ast.walk(tree):
+        if isinstance(statement, ast.Import):
+            names += [alias.name for alias in statement.names]
+        elif isinstance(statement, ast.ImportFrom):
+            try:
+                base = importlib.util.resolve_name("." * statement.level + (statement.module or ""), package)
+            except (ImportError, ValueError):
+                continue
+            names += [base, *(f"{base}.{alias.name}" for alias in statement.names)]
+    return tuple(names)
+
+
+def code_fingerprint(func) -> str:
+    """
+    Hash of the source files a node function depends on: the module defining it
+    and, transitively, every module of the same top-level package they import,
+    so that editing a helper the node calls invalidates its cached outputs.
+    Third-party modules are not hashed.
+
+    Args:
+        func: The node function.
+
+    Returns:
+        str: Hexadecimal fingerprint, empty for functions without a source module.
+    """
+    func = getattr(func, "func", func)  # functools.partial
+    module_name = getattr(func, "__module__", None)
+    if not module_name:
+        return ""
+    root = module_name.partition(".")[0]
+
+    sources: dict[str, Path] = {}
+    pending = [module_name]
+    while pending:
+        name = pending.pop()
+        if name in sources or not (name == root or name.startswith(f"{root}.")):
+            continue
+        path = _module_file(name)
+        if path is None:
+            continue
+        sources[name] = path
+        pending += _imported_modules(path, name, path.stat().st_mtime_ns)
+
+    hasher = hashlib.blake2b(digest_size=20)
+    for name in sorted(sources):
+        hasher.update(name.encode())
+        hasher.update(sources[name].read_bytes())
+    return hasher.hexdigest()
+
+
+def node_fingerprint(node, inputs: dict[str, Any]) -> str:
+    """
+    Hash of a node function source, the source of the package modules it
+    depends on (see `code_fingerprint`), input contents and parameters
+    (`params:` inputs are part of `inputs`).
+
+    Args:
+        node: The Kedro node.
+        inputs (dict[str, Any]): Loaded node inputs, by dataset name.
+
+    Returns:
+        str: Hexadecimal fingerprint.
+    """
+    hasher = hashlib.blake2b(digest_size=20)
+    hasher.update(function_source(node.func).encode())
+    hasher.update(code_fingerprint(node.func).encode())
+    hasher.update(repr(node.outputs).encode())
+    for name in sorted(inputs):
+        hasher.update(name.encode())
+        _update_fingerprint(hasher, inputs[name])
+    return hasher.hexdigest()
+
+
+class _CachedOutputs:
+    """Stands in for a node function and returns its cached result."""
+
+    def __init__(self, node, outputs: dict[str, Any]):
+        self.__name__ = getattr(node.func, "__name__", "cached")
+        declared = node._outputs
+        if declared is None:
+            self.result = None
+        elif isinstance(declared, str):
+            self.result = outputs[declared]
+        elif isinstance(declared, dict):
+            self.result = {key: outputs[name] for key, name in declared.items()}
+        else:
+            self.result = [outputs[name] for name in declared]
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.result
+
+
+class RunCacheHooks:
+    """
+    Skips nodes whose code (function and package modules it depends on), input
+    contents and parameters are unchanged since a previous run, and reuses the outputs stored by that run.
+
+    Cached outputs are pickled to `<cache_dir>/<node>/<fingerprint>.pickle`. On a
+    hit, the node function is replaced, for this run only, by one returning the
+    stored outputs, which Kedro then saves as usual. Only nodes without side
+    effects should be listed: a node querying arXiv has identical inputs on
+    every run but new results.
+
+    Eviction keeps the `max_entries_per_node` most recently used entries of each
+    node, drops entries unused for `max_age_days`, then the least recently used
+    ones until the cache fits in `max_size_mb`.
+
+    `ARXIV_FORCE_RERUN` or the `force_rerun` runtime parameter ("true", or node
+    names) recompute the nodes and refresh their entries.
+
+    Args:
+        nodes (list[str] | None): Names of the cached nodes, every node with inputs if None.
+        cache_dir (str): Cache directory.
+        max_entries_per_node (int): Entries kept per node.
+        max_age_days (float | None): Maximum age of an unused entry.
+        max_size_mb (float | None): Maximum total size of the cache.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        nodes: list[str] | None = None,
+        cache_dir: str = "data/09_cache",
+        max_entries_per_node: int = 3,
+        max_age_days: float | None = 30,
+        max_size_mb: float | None = 10_000,
+    ):
+        self.nodes = set(nodes) if nodes is not None else None
+        self.cache_dir = Path(cache_dir)
+        self.max_entries_per_node = max_entries_per_node
+        self.max_age_days = max_age_days
+        self.max_size_mb = max_size_mb
+        self.force = parse_node_names(os.environ.get(FORCE_RERUN_ENV))
+        self.hits: list[str] = []
+        self._pending: dict[str, tuple[str, Any]] = {}
+
+    @hook_impl
+    def before_pipeline_run(self, run_params: dict[str, Any]) -> None:
+        runtime_params = run_params.get("runtime_params") or {}
+        if "force_rerun" in runtime_params:
+            self.force = parse_node_names(runtime_params["force_rerun"])
+        self.hits = []
+
+    def _cached(self, node) -> bool:
+        if self.nodes is None:
+            return bool(node.inputs)
+        return node.name in self.nodes
+
+    def _forced(self, node_name: str) -> bool:
+        return bool(self.force & {node_name, "true", "True", "1", "all"})
+
+    def _entry_path(self, node_name: str, fingerprint: str) -> Path:
+        return self.cache_dir / node_name / f"{fingerprint}.pickle"
+
+    @hook_impl
+    def before_node_run(self, node, inputs: dict[str, Any]) -> None:
+        if not self._cached(node):
+            return
+        fingerprint = node_fingerprint(node, inputs)
+        path = self._entry_path(node.name, fingerprint)
+        if path.exists() and not self._forced(node.name):
+            try:
+                with open(path, "rb") as f:
+                    outputs = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError) as error:
+                logger.warning(f"Ignoring unreadable cache entry {path}: {error}")
+            else:
+                os.utime(path)
+                self._pending[node.name] = (fingerprint, node._func)
+                node._func = _CachedOutputs(node, outputs)
+                self.hits.append(node.name)
+                logger.info(f"Inputs of {node.name} unchanged, reusing outputs cached in {path}")
+                return
+        self._pending[node.name] = (fingerprint, None)
+
+    @hook_impl
+    def after_node_run(self, node, outputs: dict[str, Any]) -> None:
+        if node.name not in self._pending:
+            return
+        fingerprint, original_func = self._pending.pop(node.name)
+        if original_func is not None:
+            node._func = original_func
+            return
+        self._store(node.name, fingerprint, outputs)
+        self.evict(node.name)
+
+    @hook_impl
+    def on_node_error(self, node) -> None:
+        fingerprint, original_func = self._pending.pop(node.name, (None, None))
+        if original_func is not None:
+            node._func = original_func
+
+    def _store(self, node_name: str, fingerprint: str, outputs: dict[str, Any]) -> None:
+        path = self._entry_path(node_name, fingerprint)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(outputs, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as error:
+            tmp_path.unlink(missing_ok=True)
+            logger.warning(f"Outputs of {node_name} cannot be cached: {error}")
+            return
+        os.replace(tmp_path, path)
+
+    def evict(self, node_name: str | None = None) -> list[Path]:
+        """Apply the eviction policy, returning the removed entries."""
+        entries = sorted(self.cache_dir.glob("*/*.pickle"), key=lambda p: p.stat().st_mtime, reverse=True)
+        removed = []
+        if node_name is not None:
+            own = [path for path in entries if path.parent.name == node_name]
+            removed += own[self.max_entries_per_node :]
+        if self.max_age_days is not None:
+            cutoff = time.time() - self.max_age_days * 86400
+            removed += [path for path in entries if path.stat().st_mtime < cutoff and path not in removed]
+        if self.max_size_mb is not None:
+            total = 0
+            for path in entries:
+                if path in removed:
+                    continue
+                total += path.stat().st_size
+                if total > self.max_size_mb * (1 << 20):
+                    removed.append(path)
+        for path in removed:
+            path.unlink(missing_ok=True)
+            logger.info(f"Evicted cache entry {path}")
+        return removed
@@ -1,8 +1,24 @@
 """Project pipelines."""
 
+import os
+
 from kedro.framework.project import find_pipelines
 from kedro.pipeline import Pipeline
 
+from arxiv_discoverer.pipelines.arxiv_embedding_pipeline import (
+    create_partitioned_pipeline,
+    default_n_partitions,
+)
+from arxiv_discoverer.pipelines.dimensionality_reduction import (
+    create_time_windows_pipeline,
+    create_warmup_pipeline,
+)
+
+# Number of embedding partitions of `arxiv_embedding_partitioned`, harvesting is not partitioned.
+# By default one per CPU, capped by the memory of one model copy per process; set it
+# higher when the partitions go through the embedding service.
+N_PARTITIONS = int(os.environ.get("ARXIV_N_PARTITIONS", "0")) or default_n_partitions()
+
 
 def register_pipelines() -> dict[str, Pipeline]:
     """Register the project's pipelines.
@@ -12,4 +28,13 @@ def register_pipelines() -> dict[str, Pipeline]:
     """
     pipelines = find_pipelines()
     pipelines["__default__"] = sum(pipelines.values())
+    # Same outputs as `arxiv_embedding_pipeline`, run with
+    # `kedro run --pipeline arxiv_embedding_partitioned --runner ParallelRunner`.
+    pipelines["arxiv_embedding_partitioned"] = create_partitioned_pipeline(N_PARTITIONS)
+    # Same outputs as `dimensionality_reduction`, laid out per publication window:
+    # `kedro run --pipeline dimensionality_reduction_windowed` rebuilds the changed windows only.
+    pipelines["dimensionality_reduction_windowed"] = create_time_windows_pipeline()
+    # Fills the numba cache, run once with `kedro run --pipeline umap_warmup`
+    # at image build time so that containers skip the UMAP compilation.
+    pipelines["umap_warmup"] = create_warmup_pipeline()
     return pipelines
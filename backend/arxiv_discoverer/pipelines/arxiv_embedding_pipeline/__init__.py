@@ -1,3 +1,3 @@
 """Complete Data Processing pipeline for the spaceflights tutorial"""
 
-from .pipeline import create_pipeline  # NOQA
+from .pipeline import create_partitioned_pipeline, create_pipeline, default_n_partitions  # NOQA
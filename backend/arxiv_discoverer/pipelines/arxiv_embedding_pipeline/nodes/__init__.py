@@ -1,13 +1,33 @@
+from ._build_ann_index import build_ann_index, get_previous_ann_index
+from ._compress_embeddings import compress_embeddings, train_embedding_codec
 from ._create_embeddings import create_embeddings
 from ._download_papers_by_category import download_papers_by_category
 from ._extract_text_from_pdf import extract_text_from_pdf
 from ._fetch_arxiv_categories import fetch_arxiv_categories
 from ._get_downloaded_papers import get_downloaded_papers_df
+from ._near_duplicates import find_near_duplicates, reuse_duplicate_embeddings
+from ._partitions import consolidate_embeddings, create_embeddings_partition
+from ._previous_embeddings import (
+    get_previous_embeddings,
+    merge_with_previous_embeddings,
+    select_dirty_papers,
+)
 
 __all__ = [
+    "build_ann_index",
+    "compress_embeddings",
+    "consolidate_embeddings",
     "create_embeddings",
+    "create_embeddings_partition",
     "download_papers_by_category",
     "extract_text_from_pdf",
     "fetch_arxiv_categories",
+    "find_near_duplicates",
     "get_downloaded_papers_df",
+    "get_previous_ann_index",
+    "get_previous_embeddings",
+    "merge_with_previous_embeddings",
+    "reuse_duplicate_embeddings",
+    "select_dirty_papers",
+    "train_embedding_codec",
 ]
@@ -0,0 +1,288 @@
+import io
+import logging
+import re
+import time
+from collections.abc import Iterator
+from functools import cache
+from http import HTTPStatus
+from typing import IO, TYPE_CHECKING, NamedTuple
+from urllib.parse import urlencode
+
+import pandas as pd
+
+from ._download_papers_by_category import split_arxiv_version
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+ARXIV_QUERY_URL = "https://export.arxiv.org/api/query?{}"
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_ARXIV = "{http://arxiv.org/schemas/atom}"
+_OPENSEARCH = "{http://a9.com/-/spec/opensearch/1.1/}"
+_ENTRY = f"{_ATOM}entry"
+_HEADER_FIELDS = {
+    f"{_OPENSEARCH}totalResults": "total_results",
+    f"{_OPENSEARCH}startIndex": "start_index",
+    f"{_OPENSEARCH}itemsPerPage": "items_per_page",
+}
+# Elements of an entry kept as their text.
+_TEXT_FIELDS = {
+    f"{_ATOM}id": "entry_id",
+    f"{_ATOM}updated": "updated",
+    f"{_ATOM}published": "published",
+    f"{_ATOM}title": "title",
+    f"{_ATOM}summary": "summary",
+    f"{_ARXIV}comment": "comment",
+    f"{_ARXIV}journal_ref": "journal_ref",
+    f"{_ARXIV}doi": "doi",
+}
+_AUTHOR = f"{_ATOM}author"
+_AUTHOR_NAME = f"{_ATOM}name"
+_LINK = f"{_ATOM}link"
+_CATEGORY = f"{_ATOM}category"
+_PRIMARY_CATEGORY = f"{_ARXIV}primary_category"
+_WHITESPACE = re.compile(r"\s+")
+
+# Fields of `extract_paper_info`, in its order.
+PAPER_FIELDS = [
+    "entry_id", "updated", "published", "title", "authors", "comment", "journal_ref", "doi",
+    "primary_category", "categories", "links", "pdf_url", "summary", "paper_id", "version",
+]
+_LIST_FIELDS = ("authors", "categories", "links")
+_DATE_FIELDS = ("updated", "published")
+
+
+class MalformedFeedError(ValueError):
+    """A page of the arXiv API that is not a well-formed Atom document, e.g. truncated in transfer."""
+
+
+class AtomFeed(NamedTuple):
+    total_results: int
+    start_index: int
+    items_per_page: int
+    papers: "pa.RecordBatch"
+
+
+@cache
+def paper_schema() -> "pa.Schema":
+    """Arrow schema of the papers parsed from a feed, the fields of `extract_paper_info`."""
+    import pyarrow as pa
+
+    types = {field: pa.string() for field in PAPER_FIELDS}
+    types.update({field: pa.list_(pa.string()) for field in _LIST_FIELDS})
+    types.update({field: pa.timestamp("us", tz="UTC") for field in _DATE_FIELDS})
+    types["version"] = pa.int64()
+    return pa.schema([(field, types[field]) for field in PAPER_FIELDS])
+
+
+def parse_atom_feed(source: bytes | IO[bytes]) -> AtomFeed:
+    """
+    Parse a page of the arXiv API into a columnar batch of papers, without
+    building a tree of the whole page nor an object per result: entries are
+    read one at a time with `lxml.etree.iterparse` and released once their
+    fields are appended to the columns. Fields and values are those
+    `extract_paper_info` reads from the `arxiv.Result` of the same entry, and
+    entries missing their id or dates are skipped, as the `arxiv` library does.
+
+    Args:
+        source (bytes | IO[bytes]): The page, or a file-like object streaming it
+            (e.g. the raw body of a response).
+
+    Raises:
+        MalformedFeedError: If the page is not well-formed, as a truncated page.
+
+    Returns:
+        AtomFeed: The opensearch totals of the page and its papers.
+    """
+    import pyarrow as pa
+    from lxml import etree
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    columns = {field: [] for field in PAPER_FIELDS}
+    header = {name: 0 for name in _HEADER_FIELDS.values()}
+    try:
+        events = etree.iterparse(
+            source, events=("end",), tag=(_ENTRY, *_HEADER_FIELDS), resolve_entities=False, no_network=True
+        )
+        for _, element in events:
+            if element.tag == _ENTRY:
+                append_entry(element, columns)
+                element.clear(keep_tail=False)
+                # Entries already parsed are dropped, keeping memory flat on large pages.
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+            else:
+                header[_HEADER_FIELDS[element.tag]] = int((element.text or "0").strip() or 0)
+    except etree.XMLSyntaxError as e:
+        raise MalformedFeedError(f"Malformed Atom feed: {e}") from e
+
+    arrays = {field: columns[field] for field in PAPER_FIELDS}
+    for field in _DATE_FIELDS:
+        try:
+            arrays[field] = pa.array(columns[field], pa.string()).cast(pa.timestamp("us", tz="UTC"))
+        except pa.ArrowInvalid as e:
+            raise MalformedFeedError(f"Invalid {field} date in Atom feed: {e}") from e
+    papers = pa.RecordBatch.from_pydict(arrays, schema=paper_schema())
+    return AtomFeed(header["total_results"], header["start_index"], header["items_per_page"], papers)
+
+
+def append_entry(entry, columns: dict[str, list]) -> None:
+    """Append the fields of an <entry> element to the columns."""
+    values = dict.fromkeys(_TEXT_FIELDS.values())
+    authors, links, categories = [], [], []
+    pdf_url, primary_category = None, ""
+    for child in entry:
+        tag = child.tag
+        if tag in _TEXT_FIELDS:
+            values[_TEXT_FIELDS[tag]] = child.text
+        elif tag == _AUTHOR:
+            authors.append(child.findtext(_AUTHOR_NAME) or "")
+        elif tag == _LINK:
+            href = child.get("href")
+            if href is not None:
+                links.append(href)
+                if pdf_url is None and child.get("title") == "pdf":
+                    pdf_url = href
+        elif tag == _CATEGORY:
+            term = child.get("term")
+            if term is not None:
+                categories.append(term)
+        elif tag == _PRIMARY_CATEGORY:
+            primary_category = child.get("term") or ""
+
+    entry_id = values["entry_id"]
+    if not entry_id or values["updated"] is None or values["published"] is None:
+        logger.warning(f"Skipping entry {entry_id} without an id or dates.")
+        return
+    if not values["summary"]:
+        logger.info(f"Paper {entry_id} has no abstract.")
+    paper_id, version = split_arxiv_version(entry_id.split("arxiv.org/abs/")[-1])
+
+    columns["entry_id"].append(entry_id)
+    columns["updated"].append(values["updated"].strip())
+    columns["published"].append(values["published"].strip())
+    columns["title"].append(_WHITESPACE.sub(" ", values["title"] or ""))
+    columns["authors"].append(authors)
+    columns["comment"].append(values["comment"])
+    columns["journal_ref"].append(values["journal_ref"])
+    columns["doi"].append(values["doi"])
+    columns["primary_category"].append(primary_category)
+    columns["categories"].append(categories)
+    columns["links"].append(links)
+    columns["pdf_url"].append(pdf_url)
+    columns["summary"].append(values["summary"] or "")
+    columns["paper_id"].append(paper_id)
+    columns["version"].append(version)
+
+
+def papers_frame(batches: list["pa.RecordBatch"]) -> pd.DataFrame:
+    """
+    DataFrame of parsed papers, shaped like a DataFrame of `extract_paper_info`
+    dicts: list fields hold Python lists.
+    """
+    import pyarrow as pa
+
+    table = pa.Table.from_batches(batches, schema=paper_schema())
+    df = table.drop_columns(list(_LIST_FIELDS)).to_pandas()
+    for field in _LIST_FIELDS:
+        df[field] = table.column(field).to_pylist()
+    return df[PAPER_FIELDS]
+
+
+class ArxivFeedClient:
+    """
+    Pages through arXiv API queries like `arxiv.Client`, parsing each page with
+    `parse_atom_feed` into a batch of papers. Requests are spaced by
+    `delay_seconds`; a page that fails, is malformed (truncated) or is
+    unexpectedly empty is requested again up to `num_retries` times.
+
+    Args:
+        page_size (int): Results requested per page.
+        delay_seconds (float): Minimum delay between requests.
+        num_retries (int): Retries of a failed page.
+        query_url_format (str): Format of the query URL, "{}" standing for its arguments.
+    """
+
+    def __init__(
+        self,
+        page_size: int = 100,
+        delay_seconds: float = 3.0,
+        num_retries: int = 3,
+        query_url_format: str = ARXIV_QUERY_URL,
+    ):
+        import requests
+
+        self.page_size = page_size
+        self.delay_seconds = delay_seconds
+        self.num_retries = num_retries
+        self.query_url_format = query_url_format
+        self._session = requests.Session()
+        self._last_request: float | None = None
+
+    @classmethod
+    def from_params(cls, client_params: dict | None) -> "ArxivFeedClient":
+        """Client from the `arxiv_client` parameters, missing ones taking their default."""
+        params = {key: value for key, value in (client_params or {}).items() if value is not None}
+        params.pop("parser", None)
+        return cls(**params)
+
+    def batches(self, query: str, max_results: int) -> Iterator["pa.RecordBatch"]:
+        """
+        Papers of a query sorted by submission date, most recent first, one batch per page.
+
+        Args:
+            query (str): Search query, e.g. an arXiv category.
+            max_results (int): Maximum number of papers.
+
+        Returns:
+            Iterator[pa.RecordBatch]: The papers of each page.
+        """
+        start = 0
+        while start < max_results:
+            url = self.query_url_format.format(
+                urlencode(
+                    {
+                        "search_query": query,
+                        "id_list": "",
+                        "sortBy": "submittedDate",
+                        "sortOrder": "descending",
+                        "start": start,
+                        "max_results": min(self.page_size, max_results - start),
+                    }
+                )
+            )
+            feed = self.fetch(url, first_page=start == 0)
+            if feed.papers.num_rows == 0:
+                return
+            yield feed.papers
+            start += feed.papers.num_rows
+            if start >= feed.total_results:
+                return
+
+    def fetch(self, url: str, first_page: bool = True) -> AtomFeed:
+        """One page, retried on errors, malformed pages and unexpectedly empty pages."""
+        import requests
+
+        try_index = 0
+        while True:
+            if self._last_request is not None:
+                time.sleep(max(self.delay_seconds - (time.monotonic() - self._last_request), 0.0))
+            try:
+                response = self._session.get(url, timeout=60)
+                self._last_request = time.monotonic()
+                if response.status_code != HTTPStatus.OK:
+                    raise requests.HTTPError(f"Page request resulted in HTTP {response.status_code} ({url})")
+                feed = parse_atom_feed(response.content)
+                if feed.papers.num_rows == 0 and not first_page:
+                    raise MalformedFeedError(f"Page unexpectedly empty ({url})")
+                return feed
+            except (requests.RequestException, MalformedFeedError) as e:
+                self._last_request = time.monotonic()
+                if try_index >= self.num_retries:
+                    raise
+                logger.debug(f"Got error (try {try_index}): {e}")
+                try_index += 1
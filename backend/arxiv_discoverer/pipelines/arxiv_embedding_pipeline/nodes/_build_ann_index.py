@@ -0,0 +1,91 @@
+import logging
+import pickle
+from pathlib import Path
+
+import numpy as np
+
+from arxiv_discoverer.search import IVFPQIndex
+
+logger = logging.getLogger(__name__)
+
+
+def get_previous_ann_index(ann_index_params: dict) -> IVFPQIndex | None:
+    """
+    Load the ANN index persisted by the previous run, if any.
+
+    Args:
+        ann_index_params (dict): ANN index parameters, with the 'index_path' key.
+
+    Returns:
+        IVFPQIndex | None: The previous index, or None if it does not exist.
+    """
+    index_path = Path(ann_index_params["index_path"])
+    if not index_path.exists():
+        logger.warning(f"No ANN index found at {index_path}")
+        return None
+
+    with index_path.open("rb") as f:
+        index = pickle.load(f)
+    logger.info(f"Loaded ANN index with {len(index)} papers from {index_path}")
+    return index
+
+
+def build_ann_index(
+    embeddings_dict: dict[str, np.ndarray],
+    previous_index: IVFPQIndex | None,
+    ann_index_params: dict,
+) -> IVFPQIndex:
+    """
+    Build or incrementally update the IVF-PQ index over the paper embeddings.
+
+    Only papers missing from the previous index, or whose embedding changed since
+    it was indexed, are encoded and (re-)added. The index is retrained from
+    scratch when there is no previous index, or when the corpus has grown by more
+    than `retrain_growth_factor` since the last training.
+
+    Args:
+        embeddings_dict (dict[str, np.ndarray]): {paper_id: embedding}
+        previous_index (IVFPQIndex | None): Index persisted by the previous run.
+        ann_index_params (dict): ANN index parameters, 'index_params' are passed
+            to `IVFPQIndex`.
+
+    Returns:
+        IVFPQIndex: Index containing every paper of `embeddings_dict`.
+    """
+    growth_factor = ann_index_params.get("retrain_growth_factor", 2.0)
+
+    if previous_index is None or len(embeddings_dict) > growth_factor * max(
+        previous_index.trained_size, 1
+    ):
+        paper_ids = list(embeddings_dict.keys())
+        vectors = np.asarray(list(embeddings_dict.values()), dtype=np.float32)
+
+        index = IVFPQIndex(**ann_index_params.get("index_params", {})).train(vectors)
+        index.add(paper_ids, vectors)
+        logger.info(f"Built ANN index with {len(index)} papers.")
+        return index
+
+    stale_ids = [
+        paper_id
+        for paper_id in previous_index.paper_ids
+        if paper_id in previous_index and paper_id not in embeddings_dict
+    ]
+    previous_index.remove(stale_ids)
+
+    # Papers whose embedding changed (re-encoded abstracts) are removed and added
+    # back, so that they are not searched with their previous vector and PQ code.
+    kept_ids = [paper_id for paper_id in embeddings_dict if paper_id in previous_index]
+    changed_ids = previous_index.changed(
+        kept_ids, np.asarray([embeddings_dict[paper_id] for paper_id in kept_ids])
+    )
+    previous_index.remove(changed_ids)
+
+    new_ids = [paper_id for paper_id in embeddings_dict if paper_id not in previous_index]
+    if new_ids:
+        previous_index.add(new_ids, np.asarray([embeddings_dict[paper_id] for paper_id in new_ids]))
+
+    logger.info(
+        f"Updated ANN index: {len(new_ids) - len(changed_ids)} papers added, "
+        f"{len(changed_ids)} updated, {len(stale_ids)} removed, {len(previous_index)} papers in total."
+    )
+    return previous_index
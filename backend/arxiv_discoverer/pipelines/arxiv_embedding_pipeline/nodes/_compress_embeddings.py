@@ -0,0 +1,63 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from arxiv_discoverer.search import (
+    CompressedEmbeddings,
+    EmbeddingCodec,
+    embeddings_to_matrix,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def train_embedding_codec(embeddings_dict: dict[str, np.ndarray], embedding_storage: dict) -> EmbeddingCodec:
+    """
+    Train the storage codec of the embeddings: int8 scales or PQ codebooks,
+    nothing to train for float32 and float16.
+
+    Args:
+        embeddings_dict (dict[str, np.ndarray]): {paper_id: embedding}
+        embedding_storage (dict): `mode` and the other arguments of `EmbeddingCodec`.
+
+    Returns:
+        EmbeddingCodec: The fitted codec.
+    """
+    codec = EmbeddingCodec(**embedding_storage)
+    if codec.mode in ("int8", "pq") and embeddings_dict:
+        _, vectors = embeddings_to_matrix(embeddings_dict)
+        codec.fit(vectors)
+        logger.info(f"Trained {codec.mode} embedding codec on {min(len(vectors), codec.max_train_samples)} vectors.")
+    return codec
+
+
+def compress_embeddings(
+    embeddings_dict: dict[str, np.ndarray], codec: EmbeddingCodec, downloaded_papers_df: pd.DataFrame | None = None
+) -> CompressedEmbeddings:
+    """
+    Encode the embeddings for storage, along with the `abstract_digest` of the
+    text they were computed from. The next run compares the digests of the papers
+    against these, so that a paper is re-encoded until its embedding is saved.
+
+    Args:
+        embeddings_dict (dict[str, np.ndarray]): {paper_id: embedding}
+        codec (EmbeddingCodec): Codec trained by `train_embedding_codec`.
+        downloaded_papers_df (pd.DataFrame | None): Papers with 'paper_id' and
+            'abstract_digest' columns, no digests are stored without it.
+
+    Returns:
+        CompressedEmbeddings: {paper_id: embedding} mapping over the encoded vectors.
+    """
+    paper_ids, vectors = embeddings_to_matrix(embeddings_dict)
+    digests = None
+    if downloaded_papers_df is not None and "abstract_digest" in downloaded_papers_df.columns:
+        paper_digests = downloaded_papers_df.drop_duplicates("paper_id", keep="last").set_index("paper_id")
+        # Papers without a digest get an empty one, which never matches.
+        digests = pd.Series(paper_ids, dtype=object).map(paper_digests["abstract_digest"]).fillna("").to_numpy(str)
+    compressed = CompressedEmbeddings(np.asarray(paper_ids, dtype=str), codec.encode(vectors), codec, digests)
+    logger.info(
+        f"Compressed {len(compressed)} embeddings with {codec.mode}: "
+        f"{vectors.nbytes / 2**20:.1f} MiB -> {compressed.nbytes / 2**20:.1f} MiB."
+    )
+    return compressed
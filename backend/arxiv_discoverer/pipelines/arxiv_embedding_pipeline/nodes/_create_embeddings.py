@@ -1,17 +1,61 @@
+import asyncio
+import logging
 import os
-from tqdm import tqdm
-from sentence_transformers import SentenceTransformer
-import pandas as pd
 import tempfile
+
 import numpy as np
-import logging
+import pandas as pd
 
+from arxiv_discoverer.embedding_service import encode_with_service
+from arxiv_discoverer.resources import resource_governor
+from arxiv_discoverer.search import get_model
 
 logger = logging.getLogger(__name__)
 
+# Rough peak activation memory of the encoder per input token, used to size
+# encode batches: MiniLM-sized models need ~30 KiB, doubled for safety.
+ENCODE_BYTES_PER_TOKEN = 64 * 1024
+# Tokens of a text are estimated from its length, up to the model's max sequence length.
+CHARS_PER_TOKEN = 4
+MAX_TOKENS = 256
+# Memory held per paper of a chunk: its text and its embedding.
+CHUNK_BYTES_PER_PAPER = 8 * 1024
+
+
+def text_encoder(model_path: str, embedding_service: str | None = None):
+    """
+    Function encoding a list of texts into normalized embeddings, either with
+    the embedding server at `embedding_service` or with the model loaded in-process.
+
+    Args:
+        model_path (str): Path to the SentenceTransformer model.
+        embedding_service (str | None): "host:port" of an embedding server.
+
+    Returns:
+        Callable[[list[str], int], np.ndarray]: The encoding function, taking the texts
+            and the encode batch size (unused by the server, which batches requests itself).
+    """
+    if embedding_service:
+        logger.info(f"Encoding with the embedding server at {embedding_service}")
+        return lambda texts, batch_size: asyncio.run(encode_with_service(embedding_service, texts))
+
+    # Shared, thread-safe model: partitions embedded by a ThreadRunner load it once.
+    model = get_model(model_path)
+    return lambda texts, batch_size: model.encode(texts, batch_size=batch_size, normalize_embeddings=True)
+
+
+def encode_bytes_per_text(texts: list[str]) -> int:
+    """Estimated peak encoder memory per text of a batch, from its longest text."""
+    longest = max((len(text) for text in texts), default=0)
+    return min(longest // CHARS_PER_TOKEN + 2, MAX_TOKENS) * ENCODE_BYTES_PER_TOKEN
+
 
 def create_embeddings(
-    downloaded_papers_df: pd.DataFrame, model_path: str, chunk_size: int = 500
+    downloaded_papers_df: pd.DataFrame,
+    model_path: str,
+    embedding_service: str | None = None,
+    governor_params: dict | None = None,
+    chunk_size: int | None = None,
 ) -> dict[str, list[float]]:
     """
     Creates embeddings for papers in chunks, saving them temporarily to disk,
@@ -21,16 +65,24 @@ def create_embeddings(
         downloaded_papers_df (pd.DataFrame): DataFrame of papers with 'paper_id',
                                              'title', and 'summary' columns.
         model_path (str): Path to the SentenceTransformer model.
-        chunk_size (int): Number of embeddings to process and save per batch.
+        embedding_service (str | None): "host:port" of an embedding server keeping
+            the model loaded, the model is loaded in-process if None.
+        governor_params (dict | None): Parameters of the shared `ResourceGovernor`,
+            sizing the chunks and encode batches to the available memory.
+        chunk_size (int | None): Number of embeddings to process and save per batch,
+            sized by the governor if None.
 
     Returns:
         dict[str, list[float]]: Dictionary mapping paper_id -> embedding vector.
     """
     
+    if downloaded_papers_df.empty:
+        return {}
+    governor = resource_governor(governor_params)
+    if chunk_size is None:
+        chunk_size = governor.batch_size("embedding chunks", CHUNK_BYTES_PER_PAPER, default=500, maximum=10_000)
     logger.info(f"Creating embeddings for {len(downloaded_papers_df)} papers in chunks of {chunk_size}.")
-    
-
-    model = SentenceTransformer(model_path)
+    encode = text_encoder(model_path, embedding_service)
 
     all_paper_ids = downloaded_papers_df["paper_id"].tolist()
     total_papers = len(downloaded_papers_df)
@@ -53,7 +105,13 @@ def create_embeddings(
                 for _, row in chunk_df.iterrows()
             ]
 
-            chunk_embeddings_array = model.encode(texts_to_encode, normalize_embeddings=True)
+            # Batches of long abstracts are smaller, and retried smaller on memory errors.
+            batch_size = governor.batch_size(
+                "encode", encode_bytes_per_text(texts_to_encode), default=32, maximum=512
+            )
+            chunk_embeddings_array = governor.run(
+                "encode", lambda batch_size: encode(texts_to_encode, batch_size), batch_size
+            )
             
             chunk_ids = chunk_df["paper_id"].tolist()
             
@@ -1,15 +1,25 @@
+import hashlib
 import logging
-import arxiv
-from arxiv import Client, Search
-import pandas as pd
+import re
+from typing import TYPE_CHECKING
+
 import numpy as np
+import pandas as pd
 from unidecode import unidecode
 
+if TYPE_CHECKING:
+    import arxiv
+
 logger = logging.getLogger(__name__)
 
+_VERSION_SUFFIX = re.compile(r"v(\d+)$")
+
 
 def download_papers_by_category(
-    downloaded_papers_df: pd.DataFrame, categories: list, max_results: int = 100
+    downloaded_papers_df: pd.DataFrame,
+    categories: list,
+    max_results: int = 100,
+    client_params: dict | None = None,
 ):
     """
     Download papers from specified arXiv categories and upload them to S3.
@@ -17,39 +27,130 @@ def download_papers_by_category(
     Args:
         categories (list): List of arXiv publication categories.
         max_results (int): Maximum number of papers to download per category.
+        client_params (dict | None): Parameters of the `arxiv.Client`, see `arxiv_client`.
 
     Returns:
         pd.DataFrame: Updated DataFrame containing information about all downloaded papers.
     """
 
+    new_entries = harvest_new_papers(downloaded_papers_df, categories, max_results, client_params)
+    return update_downloaded_papers_df(downloaded_papers_df, new_entries)
+
+
+def harvest_new_papers(
+    downloaded_papers_df: pd.DataFrame,
+    categories: list,
+    max_results: int = 100,
+    client_params: dict | None = None,
+) -> list[dict] | pd.DataFrame:
+    """
+    Query arXiv for the given categories and keep the papers not downloaded yet,
+    or whose version is newer than the downloaded one.
+
+    Args:
+        downloaded_papers_df (pd.DataFrame): Existing DataFrame of downloaded papers.
+        categories (list): List of arXiv publication categories.
+        max_results (int): Maximum number of papers to download per category.
+        client_params (dict | None): Parameters of the `arxiv.Client`, see `arxiv_client`.
+
+    Returns:
+        list[dict] | pd.DataFrame: Information of the new papers, as a DataFrame when
+            pages are parsed by the columnar parser (`parser: columnar`).
+    """
+    if (client_params or {}).get("parser") == "columnar":
+        return harvest_new_papers_columnar(downloaded_papers_df, categories, max_results, client_params)
+
     new_entries = []
 
-    papers_ids = get_papers_ids(downloaded_papers_df)
+    paper_versions = get_paper_versions(downloaded_papers_df)
+    client = arxiv_client(client_params)
     for i, category in enumerate(categories):
 
-        for result in arxiv_search_query(category, max_results):
-            if result.entry_id in papers_ids:
+        for result in arxiv_search_query(category, max_results, client):
+            paper_id, version = split_arxiv_version(result.get_short_id())
+            if paper_versions.get(paper_id, 0) >= version:
                 logger.info(f"Paper {result.entry_id} already downloaded. Skipping.")
                 continue
 
-            paper_info, paper_entry_id = extract_paper_info(result)
-            papers_ids.add(paper_entry_id)
-
+            paper_info, _ = extract_paper_info(result)
             new_entries.append(paper_info)
-            logger.info(f"Added : {result.title}")
+            if paper_id in paper_versions:
+                logger.info(f"Added version {version} of : {result.title}")
+            else:
+                logger.info(f"Added : {result.title}")
+            paper_versions[paper_id] = version
 
         logger.info(
             f"Downloaded papers for category {i+1}/{len(categories)}: {category}"
         )
 
-    return update_downloaded_papers_df(downloaded_papers_df, new_entries)
+    return new_entries
+
+
+def harvest_new_papers_columnar(
+    downloaded_papers_df: pd.DataFrame,
+    categories: list,
+    max_results: int = 100,
+    client_params: dict | None = None,
+) -> pd.DataFrame:
+    """
+    `harvest_new_papers` with pages parsed into columnar batches by
+    `parse_atom_feed` instead of `arxiv.Result` objects turned into dicts.
+    Truncated pages are detected and requested again instead of yielding
+    partial entries.
+
+    Args:
+        downloaded_papers_df (pd.DataFrame): Existing DataFrame of downloaded papers.
+        categories (list): List of arXiv publication categories.
+        max_results (int): Maximum number of papers to download per category.
+        client_params (dict | None): Parameters of the `ArxivFeedClient`, see `arxiv_client`.
+
+    Returns:
+        pd.DataFrame: Information of the new papers, with the fields of `extract_paper_info`.
+    """
+    from ._atom_feed import ArxivFeedClient, papers_frame
+
+    batches = []
+    paper_versions = get_paper_versions(downloaded_papers_df)
+    client = ArxivFeedClient.from_params(client_params)
+    for i, category in enumerate(categories):
+        n_new = 0
+        try:
+            for batch in client.batches(category, max_results):
+                rows = []
+                for row, (paper_id, version) in enumerate(
+                    zip(batch.column("paper_id").to_pylist(), batch.column("version").to_pylist())
+                ):
+                    if paper_versions.get(paper_id, 0) < version:
+                        paper_versions[paper_id] = version
+                        rows.append(row)
+                if rows:
+                    batches.append(batch.take(rows))
+                    n_new += len(rows)
+        except Exception as e:
+            logger.warning(f"Error while fetching results: {e}")
+
+        logger.info(
+            f"Downloaded {n_new} new papers or versions for category {i+1}/{len(categories)}: {category}"
+        )
+
+    return papers_frame(batches)
 
 
 def update_downloaded_papers_df(
     downloaded_papers_df: pd.DataFrame, new_entries: list
-) -> tuple[pd.DataFrame, pd.DataFrame]:
+) -> pd.DataFrame:
     """
-    Update the DataFrame of downloaded papers with new entries.
+    Upsert new entries into the DataFrame of downloaded papers, keyed on the
+    unversioned arXiv id: a new version replaces the row of the paper in place,
+    keeping its position, and new papers are appended.
+
+    The `dirty` column flags the rows whose title or abstract changed in this
+    update (new papers included), compared through `abstract_digest`; they are
+    the only rows the reduction stage places again. The embedding stage compares
+    the digests with the ones saved along the embeddings instead, see
+    `select_dirty_papers`. A version bump that leaves the text unchanged only
+    updates the metadata.
 
     Args:
         downloaded_papers_df (pd.DataFrame): Existing DataFrame of downloaded papers.
@@ -58,29 +159,101 @@ def update_downloaded_papers_df(
     Returns:
         pd.DataFrame: Updated DataFrame with new entries.
     """
-    new_df = pd.DataFrame(new_entries)
-    if downloaded_papers_df is None or downloaded_papers_df.empty:
-        downloaded_papers_df = new_df
-    else:
-        downloaded_papers_df = pd.concat(
-            [downloaded_papers_df, new_df], ignore_index=True
-        )
+    previous_df = add_version_columns(
+        pd.DataFrame() if downloaded_papers_df is None else downloaded_papers_df
+    )
+    new_df = add_version_columns(ensure_utf_8_compatibility(pd.DataFrame(new_entries)))
+
+    combined = pd.concat([previous_df, new_df], ignore_index=True)
+    # Rows keep the position of the first occurrence of their paper, with its latest version.
+    position = pd.factorize(combined["paper_id"])[0] if len(combined) else np.zeros(0, dtype=np.int64)
+    downloaded_papers_df = (
+        combined.assign(_position=position)
+        .sort_values(["_position", "version"], kind="stable")
+        .drop_duplicates("_position", keep="last")
+        .drop(columns="_position")
+        .reset_index(drop=True)
+    )
 
-    downloaded_papers_df["year_published"] = pd.to_datetime(
-        downloaded_papers_df["published"]
-    ).dt.year
+    previous_digests = previous_df.drop_duplicates("paper_id", keep="last").set_index("paper_id")["abstract_digest"]
+    digests_before = downloaded_papers_df["paper_id"].map(previous_digests)
+    downloaded_papers_df["dirty"] = digests_before.isna() | (
+        digests_before != downloaded_papers_df["abstract_digest"]
+    )
 
-    length_before_drop_duplicate = len(downloaded_papers_df)
-    downloaded_papers_df = downloaded_papers_df.drop_duplicates(subset="paper_id")
-    length_after_drop_duplicate = len(downloaded_papers_df)
+    if len(downloaded_papers_df):
+        downloaded_papers_df["year_published"] = pd.to_datetime(
+            downloaded_papers_df["published"]
+        ).dt.year
 
+    is_new = digests_before.isna()
     logger.info(
-        f"{length_before_drop_duplicate - length_after_drop_duplicate} lines dropped after removing duplicates."
+        f"Upserted {len(new_df)} entries: {int(is_new.sum())} new papers, "
+        f"{int((downloaded_papers_df['dirty'] & ~is_new).sum())} papers with a changed abstract, "
+        f"{len(combined) - len(downloaded_papers_df)} superseded or duplicated rows dropped."
     )
 
-    return ensure_utf_8_compatibility(downloaded_papers_df), ensure_utf_8_compatibility(
-        downloaded_papers_df
-    )
+    return downloaded_papers_df
+
+
+def split_arxiv_version(short_id: str) -> tuple[str, int]:
+    """
+    Split an arXiv short id into the unversioned id and the version.
+
+    Args:
+        short_id (str): e.g. "2401.00001v2" or "hep-th/9901001v1".
+
+    Returns:
+        tuple[str, int]: ("2401.00001", 2); version 1 when the id has no suffix.
+    """
+    short_id = str(short_id)
+    match = _VERSION_SUFFIX.search(short_id)
+    if match is None:
+        return short_id, 1
+    return short_id[: match.start()], int(match.group(1))
+
+
+def abstract_digest(title, summary) -> str:
+    """Digest of the embedded text (title and abstract), insensitive to whitespace changes."""
+    text = " ".join(str(title).split()) + "\n" + " ".join(str(summary).split())
+    return hashlib.sha256(text.encode()).hexdigest()[:32]
+
+
+def add_version_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ensure the versioning columns: `paper_id` (unversioned arXiv id), `version`,
+    `abstract_digest` and `dirty`. Rows of older files, keyed on the versioned
+    id, are migrated.
+
+    Args:
+        df (pd.DataFrame): Downloaded papers.
+
+    Returns:
+        pd.DataFrame: The papers with versioning columns.
+    """
+    if df.empty and "paper_id" not in df.columns:
+        return pd.DataFrame(
+            {
+                "paper_id": pd.Series(dtype=str),
+                "version": pd.Series(dtype=np.int64),
+                "abstract_digest": pd.Series(dtype=str),
+                "dirty": pd.Series(dtype=bool),
+            }
+        )
+    df = df.copy()
+    if "version" not in df.columns:
+        split = [split_arxiv_version(paper_id) for paper_id in df["paper_id"]]
+        df["paper_id"] = [paper_id for paper_id, _ in split]
+        df["version"] = [version for _, version in split]
+    if "abstract_digest" not in df.columns:
+        df["abstract_digest"] = [
+            abstract_digest(title, summary) for title, summary in zip(df["title"], df["summary"])
+        ]
+    if "dirty" not in df.columns:
+        df["dirty"] = False
+    df["version"] = df["version"].astype(np.int64)
+    df["dirty"] = df["dirty"].astype(bool)
+    return df
 
 
 def encode_to_utf_8(element: list | str):
@@ -94,6 +267,8 @@ def encode_to_utf_8(element: list | str):
         return unidecode(element)
     elif isinstance(element, (list, np.ndarray)):
         return [encode_to_utf_8(subelement) for subelement in element]
+    # Versions and timestamps are kept as they are.
+    return element
 
 
 def ensure_utf_8_compatibility(df: pd.DataFrame) -> pd.DataFrame:
@@ -118,6 +293,7 @@ def extract_paper_info(result) -> tuple[dict, str]:
     if not result.summary:
         logger.info(f"Paper {result.entry_id} has no abstract.")
     entry_id = result.entry_id
+    paper_id, version = split_arxiv_version(result.get_short_id())
     return {
         "entry_id": entry_id,
         "updated": result.updated,
@@ -132,22 +308,50 @@ def extract_paper_info(result) -> tuple[dict, str]:
         "links": [link.href for link in result.links],
         "pdf_url": result.pdf_url,
         "summary": result.summary,
-        "paper_id": result.get_short_id(),
+        "paper_id": paper_id,
+        "version": version,
     }, entry_id
 
 
-def arxiv_search_query(category: str, max_results: int):
+def arxiv_client(client_params: dict | None = None) -> "arxiv.Client":
+    """
+    Client of the arXiv API.
+
+    Args:
+        client_params (dict | None): `page_size`, `delay_seconds` between requests,
+            `num_retries` of a failed page and `query_url_format`, the API endpoint
+            (e.g. "http://127.0.0.1:8080/api/query?{}" for a local stand-in server).
+            Defaults of the `arxiv` library when missing. `parser` is not used by this client.
+
+    Returns:
+        arxiv.Client: The client, shared by the queries of a harvest to respect its delay.
+    """
+    import arxiv
+
+    client_params = dict(client_params or {})
+    query_url_format = client_params.pop("query_url_format", None)
+    client_params.pop("parser", None)
+    client = arxiv.Client(**{key: value for key, value in client_params.items() if value is not None})
+    if query_url_format:
+        client.query_url_format = query_url_format
+    return client
+
+
+def arxiv_search_query(category: str, max_results: int, client: "arxiv.Client | None" = None):
     """
     Perform an arXiv search query for a specific category.
 
     Args:
         category (str): arXiv category to search.
         max_results (int): Maximum number of results to fetch.
+        client (arxiv.Client | None): Client of the API, one with the default parameters if None.
 
     Returns:
         generator: Generator of arXiv search results.
     """
-    client = arxiv.Client()
+    import arxiv
+
+    client = client or arxiv_client()
 
     search = arxiv.Search(
         query=category,
@@ -158,24 +362,25 @@ def arxiv_search_query(category: str, max_results: int):
     return safe_results(client, search)
 
 
-def safe_results(client: Client, search: Search):
+def safe_results(client: "arxiv.Client", search: "arxiv.Search"):
     try:
         for r in client.results(search):
             yield r
     except Exception as e:
-        print("Error while fetching results:", e)
+        logger.warning(f"Error while fetching results: {e}")
 
 
-def get_papers_ids(df: pd.DataFrame) -> set:
+def get_paper_versions(df: pd.DataFrame) -> dict[str, int]:
     """
-    Retrieve a set of paper IDs from the DataFrame.
+    Latest downloaded version of each paper.
 
     Args:
         df (pd.DataFrame): DataFrame containing paper information.
 
     Returns:
-        set: Set of paper IDs.
+        dict[str, int]: {unversioned arXiv id: version}
     """
-    if df.empty:
-        return set()
-    return set(df["entry_id"].tolist())
+    if df is None or df.empty:
+        return {}
+    df = add_version_columns(df)
+    return df.groupby("paper_id", sort=False)["version"].max().to_dict()
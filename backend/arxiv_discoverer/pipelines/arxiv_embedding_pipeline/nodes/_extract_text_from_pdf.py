@@ -1,7 +1,7 @@
 import logging 
-import fitz
 import pandas as pd
-import boto3
+
+from arxiv_discoverer.storage import S3Reader
 
 logger = logging.getLogger(__name__)
 
@@ -15,13 +15,15 @@ def extract_text_from_pdf(downloaded_papers_df: pd.DataFrame, downloaded_papers_
     Returns:
         str: Extracted text from the entire PDF.
     """
-    s3 = boto3.client("s3")
+    import fitz
+
+    reader = S3Reader(cache_dir=downloaded_papers_info.get("s3_cache_dir"))
+    s3 = reader.client
     downloaded_papers_df["len_text"] = 0
     
     for pdf_path in downloaded_papers_df['pdf_path'].tolist():
 
-        s3_object = s3.get_object(Bucket=downloaded_papers_info["aws_bucket_name"], Key=pdf_path)
-        pdf_bytes = s3_object["Body"].read()
+        pdf_bytes = reader.read_bytes(downloaded_papers_info["aws_bucket_name"], pdf_path)
 
         text = ""
         with fitz.open(stream=pdf_bytes, filetype="pdf") as pdf:
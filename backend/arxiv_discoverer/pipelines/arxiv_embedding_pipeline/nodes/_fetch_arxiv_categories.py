@@ -1,6 +1,3 @@
-import requests
-from bs4 import BeautifulSoup
-
 def fetch_arxiv_categories(url: str = "https://arxiv.org/" ) -> list:
     """
     Scrape arxiv categories from the given URL.
@@ -12,6 +9,9 @@ def fetch_arxiv_categories(url: str = "https://arxiv.org/" ) -> list:
         list: List of arxiv publication categories.
     """
 
+    import requests
+    from bs4 import BeautifulSoup
+
     response = requests.get(url)
     soup = BeautifulSoup(response.text, "html.parser")
 
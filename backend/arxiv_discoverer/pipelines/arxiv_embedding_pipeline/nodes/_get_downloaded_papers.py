@@ -1,9 +1,9 @@
 from pathlib import Path
 import logging
 from typing import Literal
-import boto3
 import pandas as pd
-import io
+
+from arxiv_discoverer.storage import S3Reader
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +18,11 @@ def get_downloaded_papers_df(downloaded_paper_info : dict, loading_type: Literal
         pd.DataFrame | None: DataFrame containing downloaded papers or None if file does not exist.
     """
     if loading_type == "aws":
-        return get_downloaded_papers_df_on_aws(bucket_name=downloaded_paper_info["aws_bucket_name"], s3_key=downloaded_paper_info["df_file_name"])
+        return get_downloaded_papers_df_on_aws(
+            bucket_name=downloaded_paper_info["aws_bucket_name"],
+            s3_key=downloaded_paper_info["df_file_name"],
+            cache_dir=downloaded_paper_info.get("s3_cache_dir"),
+        )
     return get_downloaded_papers_df_local(downloaded_paper_info["downloaded_paper_csv_path"])
 
 def get_downloaded_papers_df_local(downloaded_paper_csv_path : str,) -> pd.DataFrame:
@@ -37,24 +41,26 @@ def get_downloaded_papers_df_local(downloaded_paper_csv_path : str,) -> pd.DataF
         return pd.DataFrame([])
 
 
-def get_downloaded_papers_df_on_aws(bucket_name: str, s3_key: str) -> pd.DataFrame:
+def get_downloaded_papers_df_on_aws(bucket_name: str, s3_key: str, cache_dir: str | None = None) -> pd.DataFrame:
     """
-    Get a DataFrame of downloaded papers from an S3 CSV.
+    Get a DataFrame of downloaded papers from an S3 CSV. The object is streamed
+    into the CSV parser in chunks rather than read into memory first.
 
     Args:
         bucket_name (str): Name of the S3 bucket.
         s3_key (str): S3 key of the CSV file.
+        cache_dir (str | None): Local read-through cache of the object, keyed by ETag.
 
     Returns:
         pd.DataFrame: DataFrame containing downloaded papers or empty DataFrame if file does not exist.
     """
-    s3 = boto3.client("s3")
+    reader = S3Reader(cache_dir=cache_dir)
 
     try:
-        obj = s3.get_object(Bucket=bucket_name, Key=s3_key)
-        df = pd.read_csv(io.BytesIO(obj['Body'].read()))
+        with reader.open(bucket_name, s3_key) as f:
+            df = pd.read_csv(f)
         logger.info(f"Loaded {len(df)} downloaded papers from s3://{bucket_name}/{s3_key}")
         return df
-    except s3.exceptions.NoSuchKey:
+    except FileNotFoundError:
         logger.warning(f"No downloaded papers found at s3://{bucket_name}/{s3_key}")
         return pd.DataFrame([])
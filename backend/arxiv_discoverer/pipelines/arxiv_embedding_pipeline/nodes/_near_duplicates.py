@@ -0,0 +1,102 @@
+import logging
+import time
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from arxiv_discoverer.search import (
+    MinHasher,
+    lsh_parameters,
+    near_duplicate_representatives,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def find_near_duplicates(
+    downloaded_papers_df: pd.DataFrame, near_duplicates_params: dict[str, Any]
+) -> tuple[pd.DataFrame, dict[str, str], dict[str, Any]]:
+    """
+    Detect papers whose title and abstract are near-identical to an earlier
+    paper (replacements, re-posts, errata, whitespace changes) with MinHash
+    signatures and LSH banding, so that only one paper of each group is encoded.
+
+    Args:
+        downloaded_papers_df (pd.DataFrame): Papers with 'paper_id', 'title' and 'summary' columns.
+        near_duplicates_params (dict[str, Any]): `enabled`, `threshold` (estimated Jaccard
+            similarity of the character shingles), `n_permutations`, `shingle_size` and `batch_size`.
+
+    Returns:
+        tuple[pd.DataFrame, dict[str, str], dict[str, Any]]: Papers to encode, the
+            {duplicate paper_id: representative paper_id} mapping and a report.
+    """
+    params = {"enabled": True, "threshold": 0.9, "n_permutations": 128, "shingle_size": 5, "batch_size": 512}
+    params.update(near_duplicates_params or {})
+    report = {"enabled": params["enabled"], "n_papers": len(downloaded_papers_df)}
+    if not params["enabled"] or downloaded_papers_df.empty:
+        return downloaded_papers_df, {}, {**report, "encodes_saved": 0}
+
+    start = time.perf_counter()
+    texts = [f"{title} {summary}" for title, summary in zip(downloaded_papers_df["title"], downloaded_papers_df["summary"])]
+    hasher = MinHasher(params["n_permutations"], params["shingle_size"])
+    signatures = hasher.signatures(texts, batch_size=params["batch_size"])
+    hashed = time.perf_counter()
+    n_bands, rows_per_band = lsh_parameters(params["threshold"], params["n_permutations"])
+    representatives = near_duplicate_representatives(signatures, params["threshold"], n_bands, rows_per_band)
+    elapsed = time.perf_counter() - start
+
+    duplicate_rows = np.flatnonzero(representatives != np.arange(len(representatives)))
+    paper_ids = downloaded_papers_df["paper_id"]
+    near_duplicates = {
+        duplicate: representative
+        for duplicate, representative in zip(
+            paper_ids.take(duplicate_rows), paper_ids.take(representatives[duplicate_rows])
+        )
+        if duplicate != representative
+    }
+    keep = np.ones(len(downloaded_papers_df), dtype=bool)
+    keep[duplicate_rows] = False
+
+    report.update(
+        {
+            "threshold": params["threshold"],
+            "n_bands": n_bands,
+            "rows_per_band": rows_per_band,
+            "n_groups": int(len(np.unique(representatives[duplicate_rows]))),
+            "encodes_saved": len(duplicate_rows),
+            "encodes_saved_ratio": len(duplicate_rows) / len(downloaded_papers_df),
+            "signature_seconds": hashed - start,
+            "lsh_seconds": elapsed - (hashed - start),
+            "papers_per_second": len(downloaded_papers_df) / elapsed,
+        }
+    )
+    logger.info(
+        f"Found {len(duplicate_rows)} near-duplicates of {report['n_groups']} papers among "
+        f"{len(downloaded_papers_df)} ({report['encodes_saved_ratio']:.1%} of the encodes saved) "
+        f"in {elapsed:.1f}s ({report['papers_per_second']:.0f} papers/s)."
+    )
+    return downloaded_papers_df[keep], near_duplicates, report
+
+
+def reuse_duplicate_embeddings(
+    downloaded_papers_df: pd.DataFrame, embeddings_dict: dict[str, np.ndarray], near_duplicates: dict[str, str]
+) -> dict[str, np.ndarray]:
+    """
+    Give each near-duplicate the embedding of its representative, in the order of the papers.
+
+    Args:
+        downloaded_papers_df (pd.DataFrame): All downloaded papers.
+        embeddings_dict (dict[str, np.ndarray]): Embeddings of the encoded papers.
+        near_duplicates (dict[str, str]): {duplicate paper_id: representative paper_id}.
+
+    Returns:
+        dict[str, np.ndarray]: Dictionary mapping paper_id -> embedding vector.
+    """
+    embeddings = {}
+    for paper_id in downloaded_papers_df["paper_id"]:
+        source = near_duplicates.get(paper_id, paper_id)
+        if source in embeddings_dict:
+            embeddings[paper_id] = embeddings_dict[source]
+    logger.info(f"Reused {len(embeddings) - len(embeddings_dict)} embeddings of near-duplicate papers.")
+    return embeddings
@@ -0,0 +1,72 @@
+import logging
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from ._create_embeddings import create_embeddings
+
+logger = logging.getLogger(__name__)
+
+
+def paper_partition(paper_ids: pd.Series, n_partitions: int) -> np.ndarray:
+    """Stable partition index of each paper, from the CRC32 of its id."""
+    return np.fromiter(
+        (zlib.crc32(str(paper_id).encode()) % n_partitions for paper_id in paper_ids),
+        dtype=np.int64,
+        count=len(paper_ids),
+    )
+
+
+def create_embeddings_partition(  # noqa: PLR0913
+    downloaded_papers_df: pd.DataFrame,
+    model_path: str,
+    embedding_service: str | None,
+    governor_params: dict | None,
+    *,
+    partition: int,
+    n_partitions: int,
+) -> dict[str, list[float]]:
+    """
+    Embed the papers of one partition, papers being assigned from their id.
+
+    Args:
+        downloaded_papers_df (pd.DataFrame): All downloaded papers.
+        model_path (str): Path to the SentenceTransformer model.
+        embedding_service (str | None): "host:port" of an embedding server, shared
+            by the partitions so their requests are batched together.
+        governor_params (dict | None): Parameters of the `ResourceGovernor` shared
+            by the partitions of the process.
+        partition (int): Index of the partition.
+        n_partitions (int): Number of partitions.
+
+    Returns:
+        dict[str, list[float]]: Dictionary mapping paper_id -> embedding vector.
+    """
+    mask = paper_partition(downloaded_papers_df["paper_id"], n_partitions) == partition
+    partition_df = downloaded_papers_df[mask]
+    logger.info(f"Partition {partition + 1}/{n_partitions}: embedding {len(partition_df)} papers.")
+    if partition_df.empty:
+        return {}
+    return create_embeddings(partition_df, model_path, embedding_service, governor_params)
+
+
+def consolidate_embeddings(
+    downloaded_papers_df: pd.DataFrame, *partitions: dict[str, list[float]]
+) -> dict[str, list[float]]:
+    """
+    Merge the embeddings of every partition, in the order of the papers.
+
+    Args:
+        downloaded_papers_df (pd.DataFrame): All downloaded papers.
+        *partitions (dict[str, list[float]]): Embeddings of each partition.
+
+    Returns:
+        dict[str, list[float]]: Dictionary mapping paper_id -> embedding vector.
+    """
+    merged = {}
+    for partition in partitions:
+        merged.update(partition)
+    embeddings = {paper_id: merged[paper_id] for paper_id in downloaded_papers_df["paper_id"] if paper_id in merged}
+    logger.info(f"Consolidated {len(embeddings)} embeddings from {len(partitions)} partitions.")
+    return embeddings
@@ -0,0 +1,133 @@
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from arxiv_discoverer.search import CompressedEmbeddings, EmbeddingCodec
+
+from ._download_papers_by_category import split_arxiv_version
+
+logger = logging.getLogger(__name__)
+
+
+def get_previous_embeddings(embeddings_path: str, legacy_embeddings_path: str | None = None) -> CompressedEmbeddings:
+    """
+    Load the embeddings persisted by the previous run, if any. Before embeddings
+    were stored compressed, they were pickled as a {paper_id: embedding} dict;
+    that pickle is read when there is no compressed file yet, so that the first
+    run after the upgrade does not re-encode the whole corpus. Embeddings of
+    older runs keyed on versioned arXiv ids are re-keyed on the unversioned id.
+
+    Args:
+        embeddings_path (str): Path of the `CompressedEmbeddingsDataset` file.
+        legacy_embeddings_path (str | None): Path of the pickled embeddings dict
+            of older runs.
+
+    Returns:
+        CompressedEmbeddings: The previous embeddings, empty if they do not exist.
+    """
+    from arxiv_discoverer.datasets import CompressedEmbeddingsDataset
+
+    if Path(embeddings_path).exists():
+        embeddings = CompressedEmbeddingsDataset(filepath=embeddings_path).load()
+        source = embeddings_path
+    elif legacy_embeddings_path and Path(legacy_embeddings_path).exists():
+        from kedro_datasets.pickle import PickleDataset
+
+        legacy_embeddings = PickleDataset(filepath=legacy_embeddings_path).load()
+        embeddings = CompressedEmbeddings.encode(legacy_embeddings, EmbeddingCodec("float32"))
+        source = legacy_embeddings_path
+    else:
+        logger.warning(f"No previous embeddings found at {embeddings_path}")
+        # Kedro does not save None outputs.
+        return CompressedEmbeddings(
+            np.array([], dtype=str), np.zeros((0, 0), dtype=np.float32), EmbeddingCodec("float32")
+        )
+
+    paper_ids = np.asarray(
+        [split_arxiv_version(paper_id)[0] for paper_id in embeddings.paper_ids.tolist()], dtype=str
+    )
+    logger.info(f"Loaded {len(embeddings)} previous {embeddings.codec.mode} embeddings from {source}")
+    return CompressedEmbeddings(paper_ids, embeddings.codes, embeddings.codec, embeddings.digests)
+
+
+def select_dirty_papers(
+    downloaded_papers_df: pd.DataFrame, previous_embeddings: CompressedEmbeddings | None
+) -> pd.DataFrame:
+    """
+    Papers to encode: those without a previous embedding, and those whose title
+    or abstract changed since their embedding was saved, found by comparing their
+    `abstract_digest` with the digests stored along the previous embeddings.
+    A paper whose embedding was never saved, e.g. because the run failed after
+    the harvest, is therefore encoded again. Embeddings saved without digests
+    fall back to the `dirty` flags of the upsert.
+
+    Args:
+        downloaded_papers_df (pd.DataFrame): Papers with 'paper_id' and
+            'abstract_digest' or 'dirty' columns.
+        previous_embeddings (CompressedEmbeddings | None): Embeddings of the previous run.
+
+    Returns:
+        pd.DataFrame: The papers to encode.
+    """
+    if previous_embeddings is None:
+        missing = pd.Series(True, index=downloaded_papers_df.index)
+    else:
+        missing = ~downloaded_papers_df["paper_id"].isin(previous_embeddings.paper_ids)
+
+    if (
+        previous_embeddings is not None
+        and previous_embeddings.digests is not None
+        and "abstract_digest" in downloaded_papers_df.columns
+    ):
+        embedded_digests = pd.Series(previous_embeddings.digests, index=previous_embeddings.paper_ids)
+        embedded_digests = embedded_digests[~embedded_digests.index.duplicated(keep="last")]
+        digests_before = downloaded_papers_df["paper_id"].map(embedded_digests)
+        dirty = ~missing & (digests_before != downloaded_papers_df["abstract_digest"])
+    elif "dirty" in downloaded_papers_df.columns:
+        dirty = downloaded_papers_df["dirty"].fillna(True).astype(bool)
+    else:
+        dirty = pd.Series(True, index=downloaded_papers_df.index)
+    selected = dirty | missing
+    logger.info(
+        f"{int(selected.sum())} of {len(downloaded_papers_df)} papers to encode: {int(dirty.sum())} "
+        f"changed, {int((missing & ~dirty).sum())} without a previous embedding."
+    )
+    return downloaded_papers_df[selected]
+
+
+def merge_with_previous_embeddings(
+    downloaded_papers_df: pd.DataFrame,
+    new_embeddings: dict[str, np.ndarray],
+    previous_embeddings: CompressedEmbeddings | None,
+) -> dict[str, np.ndarray]:
+    """
+    Embeddings of every paper, in the order of the papers: freshly encoded ones,
+    and the previous embeddings of the papers whose text did not change.
+
+    Args:
+        downloaded_papers_df (pd.DataFrame): Papers to return the embeddings of.
+        new_embeddings (dict[str, np.ndarray]): Embeddings of the encoded papers.
+        previous_embeddings (CompressedEmbeddings | None): Embeddings of the previous run.
+
+    Returns:
+        dict[str, np.ndarray]: Dictionary mapping paper_id -> embedding vector.
+    """
+    previous_rows, previous_vectors = {}, None
+    if previous_embeddings is not None and len(previous_embeddings):
+        previous_rows = {
+            paper_id: row for row, paper_id in enumerate(previous_embeddings.paper_ids.tolist())
+        }
+        # Decoded at once, decoding the reused rows one by one is much slower.
+        previous_vectors = previous_embeddings.vectors()
+
+    embeddings, reused = {}, 0
+    for paper_id in downloaded_papers_df["paper_id"]:
+        if paper_id in new_embeddings:
+            embeddings[paper_id] = new_embeddings[paper_id]
+        elif paper_id in previous_rows:
+            embeddings[paper_id] = previous_vectors[previous_rows[paper_id]]
+            reused += 1
+    logger.info(f"Reused {reused} previous embeddings, {len(new_embeddings)} papers encoded.")
+    return embeddings
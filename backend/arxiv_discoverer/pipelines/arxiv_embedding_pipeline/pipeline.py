@@ -1,13 +1,31 @@
+import os
+from functools import partial, update_wrapper
+
 from kedro.pipeline import Node, Pipeline
 
+from arxiv_discoverer.resources import available_memory
+
 from .nodes import (
+    build_ann_index,
+    compress_embeddings,
+    consolidate_embeddings,
     create_embeddings,
+    create_embeddings_partition,
     download_papers_by_category,
-    extract_text_from_pdf,
     fetch_arxiv_categories,
+    find_near_duplicates,
     get_downloaded_papers_df,
+    get_previous_ann_index,
+    get_previous_embeddings,
+    merge_with_previous_embeddings,
+    reuse_duplicate_embeddings,
+    select_dirty_papers,
+    train_embedding_codec,
 )
 
+# Memory of a process embedding in-process: torch runtime, model weights and
+# encode buffers of a MiniLM-sized model, rounded up.
+MODEL_PROCESS_BYTES = 1 << 30
 
 def create_pipeline() -> Pipeline:
     return Pipeline(
@@ -24,24 +42,215 @@ def create_pipeline() -> Pipeline:
                 outputs="downloaded_papers_df_previous_iteration",
                 name="get_downloaded_papers_df_node",
             ),
+            download_papers_node(),
+            near_duplicates_node(),
+            *dirty_papers_nodes(),
             Node(
-                func=download_papers_by_category,
+                func=create_embeddings,
                 inputs=[
-                    "downloaded_papers_df_previous_iteration",
-                    "categories_list",
-                    "params:max_results_per_category",
+                    "dirty_papers_df",
+                    "params:model_path",
+                    "params:embedding_service",
+                    "params:resource_governor",
                 ],
-                outputs=["downloaded_papers_df_local", "downloaded_papers_df_aws_s3"],
-                name="download_papers_by_category_node",
+                outputs="arxiv_embeddings_dirty",
+                name="create_embeddings_node",
+            ),
+            merge_with_previous_embeddings_node(),
+            reuse_duplicate_embeddings_node(),
+            *embedding_storage_nodes(),
+            *ann_index_nodes(),
+        ]
+    )
+
+
+def download_papers_node() -> Node:
+    return Node(
+        func=download_papers_by_category,
+        inputs=[
+            "downloaded_papers_df_previous_iteration",
+            "categories_list",
+            "params:max_results_per_category",
+            "params:arxiv_client",
+        ],
+        outputs="downloaded_papers_df",
+        name="download_papers_by_category_node",
+    )
+
+
+def near_duplicates_node() -> Node:
+    return Node(
+        func=find_near_duplicates,
+        inputs=["downloaded_papers_df", "params:near_duplicates"],
+        outputs=["unique_papers_df", "near_duplicates", "near_duplicates_report"],
+        name="find_near_duplicates_node",
+    )
+
+
+def dirty_papers_nodes() -> list[Node]:
+    return [
+        Node(
+            func=get_previous_embeddings,
+            inputs=["params:previous_embeddings_path", "params:legacy_embeddings_path"],
+            outputs="arxiv_embeddings_previous_iteration",
+            name="get_previous_embeddings_node",
+        ),
+        Node(
+            func=select_dirty_papers,
+            inputs=["unique_papers_df", "arxiv_embeddings_previous_iteration"],
+            outputs="dirty_papers_df",
+            name="select_dirty_papers_node",
+        ),
+    ]
+
+
+def merge_with_previous_embeddings_node() -> Node:
+    return Node(
+        func=merge_with_previous_embeddings,
+        inputs=["unique_papers_df", "arxiv_embeddings_dirty", "arxiv_embeddings_previous_iteration"],
+        outputs="arxiv_embeddings_unique",
+        name="merge_with_previous_embeddings_node",
+    )
+
+
+def reuse_duplicate_embeddings_node() -> Node:
+    return Node(
+        func=reuse_duplicate_embeddings,
+        inputs=["downloaded_papers_df", "arxiv_embeddings_unique", "near_duplicates"],
+        outputs="arxiv_embeddings_float32",
+        name="reuse_duplicate_embeddings_node",
+    )
+
+
+def embedding_storage_nodes() -> list[Node]:
+    return [
+        Node(
+            func=train_embedding_codec,
+            inputs=["arxiv_embeddings_float32", "params:embedding_storage"],
+            outputs="arxiv_embedding_codec",
+            name="train_embedding_codec_node",
+        ),
+        Node(
+            func=compress_embeddings,
+            inputs=["arxiv_embeddings_float32", "arxiv_embedding_codec", "downloaded_papers_df"],
+            outputs="arxiv_embeddings_dict",
+            name="compress_embeddings_node",
+        ),
+    ]
+
+
+def ann_index_nodes() -> list[Node]:
+    return [
+        Node(
+            func=get_previous_ann_index,
+            inputs="params:ann_index_params",
+            outputs="arxiv_ann_index_previous_iteration",
+            name="get_previous_ann_index_node",
+        ),
+        Node(
+            func=build_ann_index,
+            inputs=[
+                "arxiv_embeddings_float32",
+                "arxiv_ann_index_previous_iteration",
+                "params:ann_index_params",
+            ],
+            outputs="arxiv_ann_index",
+            name="build_ann_index_node",
+        ),
+    ]
+
+
+def partition_func(func, partition: int, n_partitions: int):
+    """`func` bound to one partition, picklable for `ParallelRunner`."""
+    return update_wrapper(partial(func, partition=partition, n_partitions=n_partitions), func)
+
+
+def default_n_partitions() -> int:
+    """
+    Number of embedding partitions the machine can run at once: one per CPU,
+    capped so that every `ParallelRunner` process can load its own copy of the
+    model (`MODEL_PROCESS_BYTES` each) in the available memory.
+
+    Returns:
+        int: Number of partitions, at least 1.
+    """
+    n_partitions = os.cpu_count() or 4
+    memory = available_memory()
+    if memory is not None:
+        n_partitions = min(n_partitions, memory // MODEL_PROCESS_BYTES)
+    return max(n_partitions, 1)
+
+
+def create_partitioned_pipeline(n_partitions: int = 4) -> Pipeline:
+    """
+    Same outputs as `create_pipeline`, with embedding split into `n_partitions`
+    independent nodes, so that `ParallelRunner` / `ThreadRunner` process
+    partitions at the same time. Papers are assigned to embedding partitions from
+    their id; each partition is saved to its own dataset, and a consolidation
+    node merges them into `arxiv_embeddings_dirty`. Harvesting stays a single
+    node: arXiv asks for one request every 3 seconds, which concurrent
+    partitions, each with its own client and delay, would not respect.
+    As in `create_pipeline`, only new or changed papers are embedded, the others
+    keeping their previous embedding, and near-duplicates are dropped before
+    partitioning and get the embedding of their representative afterwards.
+
+    Without an `embedding_service`, every `ParallelRunner` process loads its own
+    copy of the model, about `MODEL_PROCESS_BYTES`, so the partitions running at
+    once are bounded by memory (see `default_n_partitions`). Partitions run by a
+    `ThreadRunner` share one model. With an `embedding_service`, the partitions
+    only send requests to the server, which keeps the single copy of the model
+    and batches their requests together, so more partitions cost no memory.
+
+    Args:
+        n_partitions (int): Number of partitions.
+
+    Returns:
+        Pipeline: The partitioned embedding pipeline.
+    """
+    partitions = range(n_partitions)
+    return Pipeline(
+        [
+            Node(
+                func=fetch_arxiv_categories,
+                inputs=None,
+                outputs="categories_list",
+                name="fetch_arxiv_categories_node",
             ),
             Node(
-                func=create_embeddings,
+                func=get_downloaded_papers_df,
+                inputs="params:downloaded_papers_info",
+                outputs="downloaded_papers_df_previous_iteration",
+                name="get_downloaded_papers_df_node",
+            ),
+            download_papers_node(),
+            near_duplicates_node(),
+            *dirty_papers_nodes(),
+            *[
+                Node(
+                    func=partition_func(create_embeddings_partition, partition, n_partitions),
+                    inputs=[
+                        "dirty_papers_df",
+                        "params:model_path",
+                        "params:embedding_service",
+                        "params:resource_governor",
+                    ],
+                    outputs=f"arxiv_embeddings_partition_{partition}",
+                    name=f"create_embeddings_partition_{partition}_node",
+                )
+                for partition in partitions
+            ],
+            Node(
+                func=consolidate_embeddings,
                 inputs=[
-                    "downloaded_papers_df_local",
-                    "params:model_path"
+                    "dirty_papers_df",
+                    *[f"arxiv_embeddings_partition_{partition}" for partition in partitions],
                 ],
-                outputs="arxiv_embeddings_dict",
-                name="create_embeddings_node",
+                outputs="arxiv_embeddings_dirty",
+                name="consolidate_embeddings_node",
             ),
+            merge_with_previous_embeddings_node(),
+            reuse_duplicate_embeddings_node(),
+            *embedding_storage_nodes(),
+            *ann_index_nodes(),
         ]
     )
@@ -3,8 +3,12 @@ This is a boilerplate pipeline 'dimensionality_reduction'
 generated using Kedro 1.0.0
 """
 
-from .pipeline import create_pipeline
+from .pipeline import (
+    create_pipeline,
+    create_time_windows_pipeline,
+    create_warmup_pipeline,
+)
 
-__all__ = ["create_pipeline"]
+__all__ = ["create_pipeline", "create_time_windows_pipeline", "create_warmup_pipeline"]
 
 __version__ = "0.1"
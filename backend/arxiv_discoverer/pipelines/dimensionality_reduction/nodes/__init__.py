@@ -2,10 +2,33 @@ from ._reduce_vectors_dimensionality import reduce_vectors_dimensionality
 from ._merge_embeddings_and_metadata import merge_embeddings_metadata
 from ._create_viz_json import create_visualization_json
 from ._generate_categories_colors import generate_category_colors
+from ._create_search_index import create_search_index
+from ._create_facet_index import create_facet_index
+from ._create_serving_artifacts import create_serving_artifacts
+from ._create_cluster_summaries import create_cluster_summaries
+from ._numba_cache import configure_numba_cache, warm_up_umap
+from ._incremental_layout import place_incrementally
+from ._time_windows import (
+    assemble_all_time_layout,
+    build_time_window_layouts,
+    create_time_window_visualizations,
+    plan_time_windows,
+)
 
 __all__ = [
     "reduce_vectors_dimensionality",
     "merge_embeddings_metadata",
     "create_visualization_json",
-    "generate_category_colors"
+    "generate_category_colors",
+    "create_search_index",
+    "create_facet_index",
+    "create_serving_artifacts",
+    "create_cluster_summaries",
+    "configure_numba_cache",
+    "warm_up_umap",
+    "place_incrementally",
+    "plan_time_windows",
+    "build_time_window_layouts",
+    "create_time_window_visualizations",
+    "assemble_all_time_layout",
 ]
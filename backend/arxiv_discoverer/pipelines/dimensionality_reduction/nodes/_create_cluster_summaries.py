@@ -0,0 +1,229 @@
+import logging
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+
+def create_cluster_summaries(
+    embedding_metadata_merged: pd.DataFrame, cluster_params: dict
+) -> dict[str, Any]:
+    """
+    Multi-resolution clustering of the 3D layout, so that clients can draw one
+    glyph per cluster when zoomed out instead of every paper.
+
+    The finest level is a MiniBatchKMeans of the coordinates; each coarser level
+    clusters the centroids of the next finer level, weighted by their counts, so
+    levels nest and every cluster has a parent. Clusters are summarized by their
+    centroid, count, RMS radius, dominant primary_category and top terms, terms
+    being ranked by class-based TF-IDF over the `term_fields` of their papers,
+    estimated on at most `term_sample_size` papers drawn at random.
+
+    Args:
+        embedding_metadata_merged (pd.DataFrame): Merged DataFrame with 'x', 'y', 'z',
+            'primary_category' and the term fields.
+        cluster_params (dict): `resolutions` (number of clusters of each level),
+            `batch_size`, `random_state`, `n_top_terms`, `term_fields`, `max_features`,
+            `term_sample_size`.
+
+    Returns:
+        dict[str, Any]: {"n_points", "levels": [...]}, levels from coarsest to finest,
+            each with columnar cluster fields and the `parents` in the previous level.
+    """
+    df = embedding_metadata_merged
+    coordinates = df[["x", "y", "z"]].to_numpy(dtype=np.float32)
+    n_points = len(coordinates)
+    random_state = cluster_params.get("random_state", 42)
+    resolutions = cluster_params.get("resolutions", [32, 256, 2048])
+    resolutions = sorted({min(int(n_clusters), n_points) for n_clusters in resolutions} - {0})
+    if not resolutions:
+        return {"n_points": n_points, "levels": []}
+
+    finest_labels = fit_finest_level(coordinates, resolutions[-1], cluster_params)
+    level_labels = nest_levels(coordinates, finest_labels, resolutions[:-1], random_state)
+
+    term_rows = term_sample(n_points, cluster_params.get("term_sample_size"), random_state)
+    term_counts, vocabulary = paper_terms(df.iloc[term_rows], cluster_params)
+    categories, category_codes = category_codes_of(df)
+
+    levels = []
+    for depth, labels in enumerate(level_labels):
+        level = summarize_level(
+            coordinates, labels, category_codes, categories, (term_rows, term_counts), vocabulary,
+            cluster_params.get("n_top_terms", 5),
+        )
+        if depth > 0:
+            level["parents"] = parents_of(labels, level_labels[depth - 1])
+        levels.append(level)
+
+    logger.info(
+        f"Clustered {n_points} papers at {len(levels)} levels: {[level['n_clusters'] for level in levels]} clusters."
+    )
+    return {"n_points": n_points, "levels": levels}
+
+
+def fit_finest_level(coordinates: np.ndarray, n_clusters: int, cluster_params: dict) -> np.ndarray:
+    """Labels of the finest level, empty clusters removed."""
+    from sklearn.cluster import MiniBatchKMeans
+
+    kmeans = MiniBatchKMeans(
+        n_clusters=n_clusters,
+        batch_size=cluster_params.get("batch_size", 4096),
+        random_state=cluster_params.get("random_state", 42),
+        n_init=1,
+    ).fit(coordinates)
+    return np.unique(kmeans.labels_, return_inverse=True)[1]
+
+
+def nest_levels(
+    coordinates: np.ndarray, finest_labels: np.ndarray, resolutions: list[int], random_state: int
+) -> list[np.ndarray]:
+    """
+    Point labels of every level, coarsest first: each coarser level clusters the
+    centroids of the finest level, weighted by their counts.
+    """
+    from sklearn.cluster import KMeans
+
+    counts = np.bincount(finest_labels)
+    centroids = cluster_means(coordinates, finest_labels, counts)
+    levels = [finest_labels]
+    for n_clusters in sorted(resolutions, reverse=True):
+        if n_clusters >= len(centroids):
+            continue
+        kmeans = KMeans(n_clusters=n_clusters, n_init=4, random_state=random_state)
+        parents = kmeans.fit(centroids, sample_weight=counts).labels_
+        levels.insert(0, np.unique(parents, return_inverse=True)[1][finest_labels])
+    return levels
+
+
+def cluster_means(coordinates: np.ndarray, labels: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """(n_clusters, 3) mean coordinates of the clusters."""
+    sums = np.stack(
+        [np.bincount(labels, weights=coordinates[:, axis], minlength=len(counts)) for axis in range(3)], axis=1
+    )
+    return (sums / counts[:, None]).astype(np.float32)
+
+
+def term_sample(n_points: int, sample_size: int | None, random_state: int) -> np.ndarray:
+    """Sorted rows the top terms are estimated on, every row if `sample_size` is None."""
+    if sample_size is None or sample_size >= n_points:
+        return np.arange(n_points)
+    return np.sort(np.random.default_rng(random_state).choice(n_points, sample_size, replace=False))
+
+
+def category_codes_of(df: pd.DataFrame) -> tuple[list[str], np.ndarray]:
+    """Distinct primary categories and the code of each paper, -1 when missing."""
+    if "primary_category" not in df.columns:
+        return [], np.full(len(df), -1, dtype=np.int64)
+    codes, categories = pd.factorize(df["primary_category"])
+    return [str(category) for category in categories], codes
+
+
+def paper_terms(df: pd.DataFrame, cluster_params: dict) -> tuple["sparse.csr_matrix | None", np.ndarray]:
+    """Binary (n_papers, n_terms) occurrence matrix of the term fields, and its vocabulary."""
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    fields = [field for field in cluster_params.get("term_fields", ["title"]) if field in df.columns]
+    if not fields or df.empty:
+        return None, np.array([], dtype=str)
+    texts = df[fields[0]].fillna("").astype(str)
+    for field in fields[1:]:
+        texts = texts + " " + df[field].fillna("").astype(str)
+    vectorizer = CountVectorizer(
+        stop_words="english",
+        binary=True,
+        max_features=cluster_params.get("max_features", 50_000),
+        min_df=min(2, len(df)),
+        dtype=np.float32,
+    )
+    try:
+        term_counts = vectorizer.fit_transform(texts)
+    except ValueError:  # Empty vocabulary, e.g. only stop words.
+        return None, np.array([], dtype=str)
+    return term_counts.tocsr(), vectorizer.get_feature_names_out()
+
+
+def summarize_level(  # noqa: PLR0913, PLR0917
+    coordinates: np.ndarray,
+    labels: np.ndarray,
+    category_codes: np.ndarray,
+    categories: list[str],
+    sampled_terms: tuple[np.ndarray, "sparse.csr_matrix | None"],
+    vocabulary: np.ndarray,
+    n_top_terms: int,
+) -> dict[str, Any]:
+    """Columnar summaries of the clusters of one level, `sampled_terms` being the
+    rows of the term sample and their term matrix."""
+    n_clusters = int(labels.max()) + 1
+    counts = np.bincount(labels, minlength=n_clusters)
+    centroids = cluster_means(coordinates, labels, counts)
+    squared_distances = ((coordinates - centroids[labels]) ** 2).sum(axis=1)
+    radii = np.sqrt(np.bincount(labels, weights=squared_distances, minlength=n_clusters) / counts)
+
+    dominant_categories, category_shares = [None] * n_clusters, [0.0] * n_clusters
+    if categories:
+        known = category_codes >= 0
+        per_cluster = np.bincount(
+            labels[known] * len(categories) + category_codes[known], minlength=n_clusters * len(categories)
+        ).reshape(n_clusters, len(categories))
+        dominant = per_cluster.argmax(axis=1)
+        dominant_categories = [categories[code] if per_cluster[i, code] else None for i, code in enumerate(dominant)]
+        category_shares = [round(float(share), 4) for share in per_cluster.max(axis=1) / counts]
+
+    return {
+        "n_clusters": n_clusters,
+        "centroids": np.round(centroids, 4).ravel().tolist(),
+        "counts": counts.tolist(),
+        "radii": np.round(radii, 4).tolist(),
+        "dominant_categories": dominant_categories,
+        "category_shares": category_shares,
+        "top_terms": top_terms(labels, n_clusters, *sampled_terms, vocabulary, n_top_terms),
+    }
+
+
+def top_terms(  # noqa: PLR0913, PLR0917
+    labels: np.ndarray,
+    n_clusters: int,
+    term_rows: np.ndarray,
+    term_counts: "sparse.csr_matrix | None",
+    vocabulary: np.ndarray,
+    n_top_terms: int,
+) -> list[list[str]]:
+    """
+    Top terms of each cluster by class-based TF-IDF: the frequency of a term in
+    the cluster, weighted by log(1 + mean cluster size / occurrences of the term),
+    over the sampled `term_rows`.
+    """
+    from scipy import sparse
+
+    if term_counts is None or n_top_terms <= 0:
+        return [[] for _ in range(n_clusters)]
+    labels = labels[term_rows]
+    counts = np.bincount(labels, minlength=n_clusters)
+
+    membership = sparse.csr_matrix(
+        (np.ones(len(labels), dtype=np.float32), (labels, np.arange(len(labels)))), shape=(n_clusters, len(labels))
+    )
+    cluster_terms = (membership @ term_counts).tocsr()
+    idf = np.log1p(counts.mean() / np.maximum(np.asarray(term_counts.sum(axis=0)).ravel(), 1.0))
+
+    terms = []
+    for cluster in range(n_clusters):
+        start, end = cluster_terms.indptr[cluster], cluster_terms.indptr[cluster + 1]
+        columns = cluster_terms.indices[start:end]
+        scores = cluster_terms.data[start:end] / max(counts[cluster], 1) * idf[columns]
+        best = np.argsort(-scores, kind="stable")[:n_top_terms]
+        terms.append(vocabulary[columns[best]].tolist())
+    return terms
+
+
+def parents_of(labels: np.ndarray, parent_labels: np.ndarray) -> list[int]:
+    """Cluster of the previous (coarser) level containing each cluster."""
+    parents = np.zeros(int(labels.max()) + 1, dtype=np.int64)
+    parents[labels] = parent_labels
+    return parents.tolist()
@@ -0,0 +1,65 @@
+import ast
+import logging
+from typing import Any
+
+import pandas as pd
+
+from arxiv_discoverer.search import FacetIndex
+
+logger = logging.getLogger(__name__)
+
+
+def create_facet_index(
+    embedding_metadata_merged: pd.DataFrame, facet_fields: list[str]
+) -> tuple[dict[str, Any], dict[str, dict[str, int]]]:
+    """
+    Create one compressed bitmap per facet value over the visualization points.
+
+    Bit i of a bitmap refers to the i-th entry of the visualization `coordinates`,
+    which follows the row order of the merged DataFrame.
+
+    Args:
+        embedding_metadata_merged (pd.DataFrame): Merged DataFrame of papers.
+        facet_fields (list[str]): Columns to facet on, e.g. primary_category,
+            year_published, authors. List columns give one value per element.
+
+    Returns:
+        tuple[dict[str, Any], dict[str, dict[str, int]]]: Serialized index, see
+            `FacetIndex.to_dict`, and the number of points per value of each facet,
+            see `FacetIndex.counts`.
+    """
+    facet_values = {
+        field: [facet_values_of(value) for value in embedding_metadata_merged[field]]
+        for field in facet_fields
+        if field in embedding_metadata_merged.columns
+    }
+
+    index = FacetIndex.build(facet_values, len(embedding_metadata_merged))
+    for field, bitmaps in index.facets.items():
+        logger.info(f"Created {len(bitmaps)} bitmaps for facet '{field}'.")
+    return index.to_dict(), {field: index.counts(field) for field in index.facets}
+
+
+def facet_values_of(value) -> list[str]:
+    """
+    Facet values of a cell: one per element for lists (or their string
+    representation, as read back from the CSV), none for missing values.
+
+    Args:
+        value: Cell of the merged DataFrame.
+
+    Returns:
+        list[str]: Facet values.
+    """
+    if isinstance(value, str) and value.startswith("["):
+        try:
+            value = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            return [value]
+    if isinstance(value, (list, tuple)):
+        return [str(element) for element in value]
+    if pd.isna(value):
+        return []
+    if isinstance(value, float) and value.is_integer():
+        return [str(int(value))]
+    return [str(value)]
@@ -0,0 +1,36 @@
+import logging
+from typing import Any
+
+import pandas as pd
+
+from arxiv_discoverer.search import InvertedIndex
+
+logger = logging.getLogger(__name__)
+
+
+def create_search_index(
+    embedding_metadata_merged: pd.DataFrame, search_fields: list[str]
+) -> dict[str, Any]:
+    """
+    Create the prefix inverted index used by the frontend search bar.
+
+    Posting lists hold positions in the visualization `coordinates` array, which
+    follows the row order of the merged DataFrame.
+
+    Args:
+        embedding_metadata_merged (pd.DataFrame): Merged DataFrame of papers.
+        search_fields (list[str]): Columns to index, e.g. title, authors, primary_category.
+
+    Returns:
+        dict[str, Any]: Serialized index, see `InvertedIndex.to_dict`.
+    """
+    fields = [field for field in search_fields if field in embedding_metadata_merged.columns]
+    documents = embedding_metadata_merged[fields].astype(object).where(
+        embedding_metadata_merged[fields].notna(), None
+    ).to_dict("records")
+
+    index = InvertedIndex.build(documents, fields)
+    logger.info(
+        f"Created search index over {index.n_points} papers with {len(index.terms)} terms."
+    )
+    return index.to_dict()
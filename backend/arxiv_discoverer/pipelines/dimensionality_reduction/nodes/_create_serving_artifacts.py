@@ -0,0 +1,47 @@
+import logging
+from typing import Any
+
+import pandas as pd
+
+from arxiv_discoverer.datasets import JSONObjectStream
+
+from ._create_viz_json import hash_paper_id, iter_details
+
+logger = logging.getLogger(__name__)
+
+
+def create_serving_artifacts(
+    embedding_metadata_merged: pd.DataFrame,
+    detail_fields: list[str],
+    summary_max_length: int = 200,
+) -> dict[str, Any]:
+    """
+    Create the content of the serving artifacts read by the HTTP API.
+
+    Rows follow the visualization `coordinates` array and details are the same
+    as in the visualization JSON, so a client can mix both sources.
+
+    Args:
+        embedding_metadata_merged (pd.DataFrame): Merged DataFrame with columns: x, y, z, paper_id, etc.
+        detail_fields (list[str]): Columns to include in details.
+        summary_max_length (int): Maximum length for abstract text.
+
+    Returns:
+        dict[str, Any]: ids, (N, 3) float32 coordinates, a stream of (id, details)
+            pairs and the bounds, see `ServingArtifactsDataset`.
+    """
+    df = embedding_metadata_merged
+    ids = [hash_paper_id(paper_id) for paper_id in df["paper_id"]]
+    fields = [field for field in detail_fields if field in df.columns]
+    coordinates = df[["x", "y", "z"]].to_numpy(dtype="float32")
+
+    metadata = {"total_papers": len(df)}
+    if len(df):
+        metadata["bounds"] = {axis: [float(df[axis].min()), float(df[axis].max())] for axis in ("x", "y", "z")}
+    logger.info(f"Created serving artifacts of {len(df)} papers with details {fields}.")
+    return {
+        "ids": ids,
+        "coordinates": coordinates,
+        "details": JSONObjectStream(lambda: iter_details(ids, df, fields, summary_max_length)),
+        "metadata": metadata,
+    }
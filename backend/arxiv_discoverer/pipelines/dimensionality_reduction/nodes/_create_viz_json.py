@@ -1,15 +1,18 @@
 import pandas as pd
-import hashlib
 from typing import Any
 
+from arxiv_discoverer.datasets import JSONArrayStream, JSONObjectStream
+from arxiv_discoverer.serving import visualization_id
 
-def create_visualization_json(
+
+def create_visualization_json(  # noqa: PLR0913, PLR0917
     embedding_metadata_merged: pd.DataFrame,
     detail_fields: list[str],
     summary_max_length: int = 200,
     calculate_bounds: bool = True,
-    add_statistics: bool = True
-) -> tuple[dict[str, Any], dict[str, Any]]:
+    add_statistics: bool = True,
+    facet_counts: dict[str, dict[str, int]] | None = None
+) -> dict[str, Any]:
     """
     Create separated JSON structure for visualization
     
@@ -19,48 +22,23 @@ def create_visualization_json(
         summary_max_length: Maximum length for abstract text
         calculate_bounds: Calculate spatial bounds for x, y, z
         add_statistics: Add metadata statistics
+        facet_counts: Number of points per facet value, as output by
+            `create_facet_index`; the category statistics are read from its
+            primary_category bitmaps instead of counted from df
     
     Returns:
-        Dictionary ready to be saved as JSON
+        Dictionary ready to be saved as JSON, with streamed coordinates and details
     """
 
-    df = embedding_metadata_merged.copy()
-    df['id'] = df.apply(lambda row: generate_paper_id(row), axis=1)
-    
-    coordinates = []
-    for _, row in df.iterrows():
-        coordinates.append({
-            'id': row['id'],
-            'x': float(row['x']),
-            'y': float(row['y']),
-            'z': float(row['z'])
-        })
-    
-    details = {}
-    for _, row in df.iterrows():
-        paper_id = row['id']
-        paper_details = {}
-        
-        for field in detail_fields:
-            if field not in df.columns:
-                continue
-            
-            value = row[field]
-            
-            if pd.isna(value):
-                paper_details[field] = None
-                continue
-            
-            if field == 'summary':
-                paper_details[field] = truncate_text(value, summary_max_length)
-                
-            elif field in ['year_published']:
-                paper_details[field] = int(value)
-            else:
-                paper_details[field] = str(value)
-        
-        details[paper_id] = paper_details
-    
+    df = embedding_metadata_merged
+    ids = [hash_paper_id(paper_id) for paper_id in df['paper_id']]
+    fields = [field for field in detail_fields if field in df.columns]
+
+    # Records are generated lazily and streamed by the writer datasets, so the
+    # coordinates and details are never held in memory as Python objects.
+    coordinates = JSONArrayStream(lambda: iter_coordinates(ids, df))
+    details = JSONObjectStream(lambda: iter_details(ids, df, fields, summary_max_length))
+
     metadata = {
         'total_papers': len(df),
         'date_generated': pd.Timestamp.now().isoformat(),
@@ -88,11 +66,14 @@ def create_visualization_json(
                 stats['year_range'] = [int(year_valid.min()), int(year_valid.max())]
         
 
-        category_counts = df['primary_category'].value_counts().to_dict()
+        if facet_counts is not None and 'primary_category' in facet_counts:
+            category_counts = facet_counts['primary_category']
+        else:
+            # By decreasing count then category, as `FacetIndex.counts` orders them.
+            category_counts = df['primary_category'].value_counts().sort_index()
+            category_counts = category_counts.sort_values(ascending=False, kind='stable').to_dict()
         stats['ordered_top_categories'] = {str(k): int(v) for k, v in category_counts.items()}
-
-        category_counts = df['primary_category'].value_counts().head(10).to_dict()
-        stats['ordered_top_ten_categories'] = {str(k): int(v) for k, v in category_counts.items()}
+        stats['ordered_top_ten_categories'] = dict(list(stats['ordered_top_categories'].items())[:10])
 
         
         stats['available_fields'] = detail_fields
@@ -105,21 +86,35 @@ def create_visualization_json(
         'metadata': metadata
     }
     
-    return result, result
+    return result
+
+def iter_coordinates(ids: list[str], df: pd.DataFrame):
+    """Yield the {'id', 'x', 'y', 'z'} record of each paper."""
+    columns = [df[axis].to_numpy(dtype=float) for axis in ('x', 'y', 'z')]
+    for paper_id, x, y, z in zip(ids, *columns):
+        yield {'id': paper_id, 'x': float(x), 'y': float(y), 'z': float(z)}
+
+
+def iter_details(ids: list[str], df: pd.DataFrame, fields: list[str], summary_max_length: int):
+    """Yield the (id, details) pair of each paper."""
+    for paper_id, values in zip(ids, df[fields].itertuples(index=False, name=None)):
+        paper_details = {}
+        for field, value in zip(fields, values):
+            if pd.isna(value):
+                paper_details[field] = None
+            elif field == 'summary':
+                paper_details[field] = truncate_text(value, summary_max_length)
+            elif field in ['year_published']:
+                paper_details[field] = int(value)
+            else:
+                paper_details[field] = str(value)
+        yield paper_id, paper_details
+
+
+def hash_paper_id(paper_id) -> str:
+    """MD5 hex digest of a paper_id, used as the visualization id."""
+    return visualization_id(paper_id)
 
-def generate_paper_id(row: pd.Series) -> str:
-    """
-    Generate unique ID for each paper
-    
-    Args:
-        row: DataFrame row
-        method: 'hash' (path hash), 'sequential', 'doi'
-    
-    Returns:
-        Unique ID string
-    """
-    return hashlib.md5(str(row['paper_id']).encode()).hexdigest()
-    
 
 def truncate_text(text: str, max_length: int = 200) -> str:
     """Truncate text to max_length, adding ellipsis if needed"""
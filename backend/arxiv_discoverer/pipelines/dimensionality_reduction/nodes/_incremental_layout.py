@@ -0,0 +1,91 @@
+import logging
+from collections.abc import Mapping
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from arxiv_discoverer.resources import resource_governor
+from arxiv_discoverer.search import embeddings_to_matrix
+
+logger = logging.getLogger(__name__)
+
+
+def load_previous_layout(layout_path: str | None) -> dict[str, np.ndarray] | None:
+    """
+    Load the 3D coordinates persisted by the previous run, if any.
+
+    Args:
+        layout_path (str | None): Path of the `CompressedEmbeddingsDataset` of `reduced_embeddings_dict`.
+
+    Returns:
+        dict[str, np.ndarray] | None: The previous coordinates, or None if they do not exist.
+    """
+    from arxiv_discoverer.datasets import CompressedEmbeddingsDataset
+
+    if not layout_path or not Path(layout_path).exists():
+        logger.warning(f"No previous layout found at {layout_path}")
+        return None
+    layout = CompressedEmbeddingsDataset(filepath=layout_path).load()
+    return dict(zip(layout.paper_ids.tolist(), layout.vectors()))
+
+
+def dirty_paper_ids(downloaded_papers_df: pd.DataFrame | None) -> set[str]:
+    """Ids of the papers whose title or abstract changed since the previous run."""
+    if downloaded_papers_df is None or "dirty" not in downloaded_papers_df.columns:
+        return set()
+    dirty = downloaded_papers_df["dirty"].fillna(True).astype(bool)
+    return set(downloaded_papers_df.loc[dirty, "paper_id"])
+
+
+def place_incrementally(
+    embeddings_dict: Mapping[str, np.ndarray],
+    previous_layout: dict[str, np.ndarray],
+    dirty_ids: set[str],
+    n_neighbors: int = 10,
+    governor_params: dict | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    Keep the previous coordinates of the unchanged papers, and place the new or
+    changed ones at the similarity-weighted mean of the coordinates of their
+    `n_neighbors` most similar unchanged papers, instead of refitting the layout.
+
+    Args:
+        embeddings_dict (Mapping[str, np.ndarray]): {paper_id: normalized embedding}.
+        previous_layout (dict[str, np.ndarray]): {paper_id: 3d coordinates} of the previous run.
+        dirty_ids (set[str]): Papers whose text changed since the previous run.
+        n_neighbors (int): Number of unchanged neighbours a paper is placed from.
+        governor_params (dict | None): Parameters of the shared `ResourceGovernor`,
+            sizing the batches of papers placed per similarity matrix.
+
+    Returns:
+        dict[str, np.ndarray]: {paper_id: 3d coordinates}, in the order of `embeddings_dict`.
+    """
+    paper_ids, vectors = embeddings_to_matrix(embeddings_dict)
+    is_clean = np.array(
+        [paper_id in previous_layout and paper_id not in dirty_ids for paper_id in paper_ids], dtype=bool
+    )
+    clean_rows, placed_rows = np.flatnonzero(is_clean), np.flatnonzero(~is_clean)
+
+    coordinates = np.empty((len(paper_ids), 3), dtype=np.float32)
+    coordinates[clean_rows] = np.stack([previous_layout[paper_ids[row]] for row in clean_rows])
+
+    clean_vectors, clean_coordinates = vectors[clean_rows], coordinates[clean_rows]
+    k = min(n_neighbors, len(clean_rows))
+
+    def place(start: int, end: int) -> None:
+        rows = placed_rows[start:end]
+        similarities = vectors[rows] @ clean_vectors.T
+        neighbours = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        weights = np.maximum(np.take_along_axis(similarities, neighbours, axis=1), 0.0) + 1e-6
+        weights /= weights.sum(axis=1, keepdims=True)
+        coordinates[rows] = np.einsum("nk,nkd->nd", weights, clean_coordinates[neighbours])
+
+    # A placed paper holds a row of similarities and of argpartition indices.
+    bytes_per_paper = len(clean_rows) * (vectors.itemsize + 8)
+    resource_governor(governor_params).map_batches(
+        "incremental layout", place, len(placed_rows), bytes_per_paper, default=1024
+    )
+
+    logger.info(f"Kept the layout of {len(clean_rows)} papers, placed {len(placed_rows)} new or changed papers.")
+    return dict(zip(paper_ids, coordinates))
@@ -1,62 +1,110 @@
+import logging
+
 import numpy as np
 import pandas as pd
-from pathlib import Path
+
+logger = logging.getLogger(__name__)
 
 
 def merge_embeddings_metadata(
     metadata_df: pd.DataFrame,
-    embeddings_dict: dict[str, np.ndarray]
+    embeddings_dict: dict[str, np.ndarray],
+    detail_fields: list[str] | None = None,
 ) -> pd.DataFrame:
-    """Merge embeddings dataframe with metadata dataframe on 'paper_id' column.
+    """Join the 3D coordinates of the papers to their metadata on 'paper_id'.
+
+    The coordinates are kept as one (N, 3) float32 array and matched to the
+    metadata rows through a paper_id index lookup, instead of building a
+    DataFrame from per-paper dicts and hash-merging it. Papers are kept in the
+    order of `metadata_df`, papers missing on either side are dropped.
 
     Args:
         metadata_df (pd.DataFrame): DataFrame containing metadata with 'paper_id' column.
-        embeddings_df (pd.DataFrame): DataFrame containing embeddings with 'paper_id' column.
+        embeddings_dict (dict[str, np.ndarray]): Dictionary mapping paper_id -> 3D coordinates.
+        detail_fields (list[str] | None): Metadata columns to keep, all of them if None.
 
     Returns:
-        pd.DataFrame: Merged DataFrame containing both metadata and embeddings.
+        pd.DataFrame: 'paper_id', 'x', 'y', 'z' and the projected metadata columns.
     """
-    embeddings_df = create_embeddings_dataframe(embeddings_dict)
-    merged_df = metadata_df.merge(
-        embeddings_df, on="paper_id", how="inner"
-    )
-    try : 
-        assert verify_merge(merged_df, metadata_df, embeddings_df), \
-            "Merge verification failed: Merged DataFrame does not contain all entries from both DataFrames"
-    except AssertionError :
-        print(f"Length mismatch between two DataFrames. \nEmbeddings Dataframe length : {len(embeddings_df)} \nMetadata Dataframe length : {len(metadata_df)}")
-    
+    paper_ids, coordinates = create_embeddings_arrays(embeddings_dict)
+    index = paper_id_index(metadata_df)
+
+    # Position of each embedded paper in the metadata, -1 when it has no metadata.
+    metadata_positions = index.get_indexer(paper_ids)
+    embedded = metadata_positions >= 0
+    embedding_of_row = np.full(len(index), -1, dtype=np.int64)
+    embedding_of_row[metadata_positions[embedded]] = np.flatnonzero(embedded)
+
+    rows = np.flatnonzero(embedding_of_row >= 0)
+    verify_merge(len(metadata_df), len(paper_ids), len(rows))
+
+    if detail_fields is None:
+        fields = [column for column in metadata_df.columns if column != "paper_id"]
+    else:
+        fields = [field for field in dict.fromkeys(detail_fields) if field in metadata_df.columns and field != "paper_id"]
+    if len(index) != len(metadata_df):
+        rows = index_rows(metadata_df)[rows]
+
+    # `take` keeps the column storage (e.g. Arrow strings), no per-value Python objects are created.
+    merged_df = metadata_df[["paper_id", *fields]].take(rows).reset_index(drop=True)
+    merged_coordinates = coordinates[embedding_of_row[embedding_of_row >= 0]]
+    for position, axis in enumerate(("x", "y", "z"), start=1):
+        merged_df.insert(position, axis, merged_coordinates[:, position - 1])
     return merged_df
 
-def verify_merge(merged_df, metadata_csv, embeddings_df) -> bool:
-    """Verify that the merged DataFrame contains all entries from both original DataFrames.
+
+def metadata_paper_ids(metadata_df: pd.DataFrame) -> pd.Series:
+    """paper_ids of the metadata as strings."""
+    paper_ids = metadata_df["paper_id"]
+    return paper_ids if pd.api.types.is_string_dtype(paper_ids) else paper_ids.astype(str)
+
+
+def paper_id_index(metadata_df: pd.DataFrame) -> pd.Index:
+    """Unique paper_ids of the metadata, in order, the coordinates are looked up in."""
+    index = pd.Index(metadata_paper_ids(metadata_df))
+    if not index.is_unique:
+        duplicates = int(index.duplicated().sum())
+        logger.warning(f"{duplicates} duplicated paper_ids in the metadata, keeping their first row.")
+        index = index.drop_duplicates()
+    return index
+
+
+def index_rows(metadata_df: pd.DataFrame) -> np.ndarray:
+    """Row of `metadata_df` of each entry of `paper_id_index`."""
+    return np.flatnonzero(~metadata_paper_ids(metadata_df).duplicated().to_numpy())
+
+
+def verify_merge(n_metadata: int, n_embeddings: int, n_merged: int) -> bool:
+    """Check that every paper has both metadata and coordinates, logging the mismatch otherwise.
 
     Args:
-        merged_df (pd.DataFrame): Merged DataFrame.
-        metadata_csv (pd.DataFrame): Original metadata DataFrame.
-        embeddings_df (pd.DataFrame): Original embeddings DataFrame.
+        n_metadata (int): Number of metadata rows.
+        n_embeddings (int): Number of embedded papers.
+        n_merged (int): Number of papers with both.
 
     Returns:
         bool: True if verification passes, False otherwise.
     """
-    metadata_papers_id = set(metadata_csv['paper_id'])
-    embeddings_papers_id = set(embeddings_df['paper_id'])
-    merged_papers_id = set(merged_df['paper_id'])
+    if n_merged == n_metadata == n_embeddings:
+        return True
+    logger.warning(
+        f"Length mismatch between metadata and embeddings: {n_metadata} metadata rows, "
+        f"{n_embeddings} embeddings, {n_merged} papers with both."
+    )
+    return False
 
-    return metadata_papers_id.issubset(merged_papers_id) and embeddings_papers_id.issubset(merged_papers_id)
 
-def create_embeddings_dataframe(embeddings_dict: dict[str, np.ndarray]) -> pd.DataFrame:
-    """_summary_
+def create_embeddings_arrays(embeddings_dict: dict[str, np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """Aligned paper_id and coordinate arrays of the reduced embeddings.
 
     Args:
-        embeddings_dict (dict[str, np.ndarray]): _description_
+        embeddings_dict (dict[str, np.ndarray]): Dictionary mapping paper_id -> 3D coordinates.
 
     Returns:
-        pd.DataFrame: _description_
+        tuple[np.ndarray, np.ndarray]: (N,) paper_ids and (N, 3) float32 coordinates.
     """
-
-    return pd.DataFrame([
-        {'paper_id': k, 'x': v[0], 'y': v[1], 'z': v[2]} 
-        for k, v in embeddings_dict.items()
-    ])
-
+    paper_ids = np.fromiter((str(paper_id) for paper_id in embeddings_dict), dtype=object, count=len(embeddings_dict))
+    if not embeddings_dict:
+        return paper_ids, np.empty((0, 3), dtype=np.float32)
+    coordinates = np.asarray(list(embeddings_dict.values()), dtype=np.float32).reshape(len(embeddings_dict), -1)
+    return paper_ids, np.ascontiguousarray(coordinates[:, :3])
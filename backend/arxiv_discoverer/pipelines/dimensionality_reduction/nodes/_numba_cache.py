@@ -0,0 +1,145 @@
+import functools
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NUMBA_CACHE_DIR_ENV = "NUMBA_CACHE_DIR"
+
+
+def configure_numba_cache(cache_dir: str | None = None) -> str | None:
+    """
+    Set the directory where numba persists compiled kernels. `NUMBA_CACHE_DIR`,
+    when set (e.g. baked into the container image), takes precedence over
+    `cache_dir`.
+
+    Args:
+        cache_dir (str | None): Cache directory used when `NUMBA_CACHE_DIR` is unset.
+
+    Returns:
+        str | None: The cache directory in use, None if kernels are not persisted.
+    """
+    cache_dir = os.environ.get(NUMBA_CACHE_DIR_ENV) or cache_dir
+    if not cache_dir:
+        return None
+    cache_dir = str(Path(cache_dir).resolve())
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    # Read by numba when it is imported, and inherited by the workers of ParallelRunner.
+    os.environ[NUMBA_CACHE_DIR_ENV] = cache_dir
+    if "numba" in sys.modules:
+        sys.modules["numba"].config.CACHE_DIR = cache_dir
+    return cache_dir
+
+
+@contextmanager
+def cached_numba_kernels():
+    """
+    Make `numba.jit` and `numba.njit` default to ``cache=True`` while the block
+    runs. Most umap and pynndescent kernels are not declared with ``cache=True``
+    and would be compiled again by every new process.
+    """
+    import numba
+
+    decorators = {name: getattr(numba, name) for name in ("jit", "njit")}
+
+    def caching(decorator):
+        @functools.wraps(decorator)
+        def wrapper(*args, **kwargs):
+            kwargs.setdefault("cache", True)
+            return decorator(*args, **kwargs)
+
+        return wrapper
+
+    for name, decorator in decorators.items():
+        setattr(numba, name, caching(decorator))
+    try:
+        yield
+    finally:
+        for name, decorator in decorators.items():
+            setattr(numba, name, decorator)
+
+
+def import_umap():
+    """
+    Import umap, its numba kernels being loaded from and saved to the numba
+    cache directory when one is configured.
+
+    Returns:
+        module: The umap module.
+    """
+    if "umap" in sys.modules or not os.environ.get(NUMBA_CACHE_DIR_ENV):
+        import umap
+
+        return umap
+    with cached_numba_kernels():
+        import umap
+    return umap
+
+
+def count_cached_kernels(cache_dir: str | None) -> int:
+    """Number of compiled kernels stored in `cache_dir`."""
+    if not cache_dir or not Path(cache_dir).exists():
+        return 0
+    return sum(1 for _ in Path(cache_dir).rglob("*.nbc"))
+
+
+def warm_up_umap(method_params: dict, n_samples: int = 300, n_features: int = 16, random_state: int = 42) -> dict:
+    """
+    Compile the UMAP kernels used by `reduce_vectors_dimensionality` on a tiny
+    synthetic matrix, so that they are in the numba cache before the first real
+    run, e.g. when building the container image.
+
+    The nearest-neighbour descent UMAP uses above 4096 points is not warmed up:
+    pynndescent passes the distance to `nn_descent` as a jitted function, and
+    numba cannot cache kernels taking functions as arguments, so it is compiled
+    by every process (about 15 seconds).
+
+    Args:
+        method_params (dict): Parameters of `reduce_vectors_dimensionality`.
+        n_samples (int): Rows of the synthetic matrix.
+        n_features (int): Columns of the synthetic matrix.
+        random_state (int): Seed of the synthetic matrix and of UMAP.
+
+    Returns:
+        dict: Cache directory, kernels cached before and after, import and fit times in seconds.
+    """
+    cache_dir = configure_numba_cache(method_params.get("numba_cache_dir"))
+    kernels_before = count_cached_kernels(cache_dir)
+
+    start = time.perf_counter()
+    umap = import_umap()
+    imported = time.perf_counter()
+
+    umap_params = {
+        key: value
+        for key, value in method_params.get("dimensionality_reduction_params", {}).items()
+        if key in ("n_neighbors", "min_dist", "metric")
+    }
+    vectors = np.random.default_rng(random_state).normal(size=(n_samples, n_features)).astype(np.float32)
+    umap.UMAP(
+        n_components=3,
+        random_state=random_state,
+        n_jobs=-1,
+        **umap_params,
+    ).fit_transform(vectors)
+    fitted = time.perf_counter()
+
+    report = {
+        "cache_dir": cache_dir,
+        "kernels_before": kernels_before,
+        "kernels_after": count_cached_kernels(cache_dir),
+        "import_seconds": imported - start,
+        "fit_seconds": fitted - imported,
+        "total_seconds": fitted - start,
+    }
+    logger.info(
+        f"UMAP warm-up: import {report['import_seconds']:.1f}s, fit {report['fit_seconds']:.1f}s, "
+        f"{report['kernels_after']} kernels cached in {cache_dir}"
+    )
+    return report
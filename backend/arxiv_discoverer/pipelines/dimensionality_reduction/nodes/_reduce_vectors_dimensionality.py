@@ -1,9 +1,19 @@
-import numpy as np
-from sklearn.decomposition import PCA
-import umap
+import logging
 import warnings
+
+import numpy as np
+import pandas as pd
+
+from arxiv_discoverer.search import embeddings_to_matrix
+
+from ._incremental_layout import (
+    dirty_paper_ids,
+    load_previous_layout,
+    place_incrementally,
+)
+from ._numba_cache import configure_numba_cache, import_umap
+
 warnings.filterwarnings('ignore')
-import logging 
 
 logger = logging.getLogger(__name__)
 
@@ -31,8 +41,9 @@ def reduce_umap(
     Returns:
         {path: 3d_coordinates}
     """
-    paths = list(embeddings_dict.keys())
-    vectors = np.array(list(embeddings_dict.values()))
+    umap = import_umap()  # deferred: umap compiles numba kernels on import
+
+    paths, vectors = embeddings_to_matrix(embeddings_dict)
     
     reducer = umap.UMAP(
         n_components=3,
@@ -63,8 +74,9 @@ def reduce_pca(
     Returns:
         ({path: 3d_coordinates}, variance_explained_ratio)
     """
-    paths = list(embeddings_dict.keys())
-    vectors = np.array(list(embeddings_dict.values()))
+    from sklearn.decomposition import PCA
+
+    paths, vectors = embeddings_to_matrix(embeddings_dict)
     
     reducer = PCA(
         n_components=3,
@@ -101,8 +113,11 @@ def reduce_pca_umap(
     Returns:
         {path: 3d_coordinates}
     """
-    paths = list(embeddings_dict.keys())
-    vectors = np.array(list(embeddings_dict.values()))
+    from sklearn.decomposition import PCA
+
+    umap = import_umap()
+
+    paths, vectors = embeddings_to_matrix(embeddings_dict)
     
     pca = PCA(n_components=pca_components, random_state=random_state)
     vectors_pca = pca.fit_transform(vectors)
@@ -129,19 +144,48 @@ reducers = {
         'pca_umap': reduce_pca_umap
 }
 
-def reduce_vectors_dimensionality(embeddings_dict: dict[str, np.ndarray], method_params: dict) -> dict[str, np.ndarray]:
+def reduce_vectors_dimensionality(
+    embeddings_dict: dict[str, np.ndarray],
+    method_params: dict,
+    downloaded_papers_df: pd.DataFrame | None = None,
+    governor_params: dict | None = None,
+) -> dict[str, np.ndarray]:
     """
     Reduce high-dimensional vectors to 3D using specified method.
+
+    With `incremental` parameters, the layout of the previous run is kept when
+    few papers are new or changed: those are placed among their unchanged
+    neighbours instead of refitting the reducer on every paper.
     
     Args:
         embeddings_dict: {path: high_dim_vector}
-        method: Dimensionality reduction method ('umap', 'pca', 'pca_umap')
-        method_params: Parameters for the chosen method
+        method_params: Method ('umap', 'pca', 'pca_umap') under `dimensionality_reduction_method`,
+            its parameters under `dimensionality_reduction_params`, the optional
+            `numba_cache_dir` where compiled UMAP kernels persist across runs, and the
+            optional `incremental` {layout_path, max_dirty_ratio, n_neighbors}
+        downloaded_papers_df: Papers with the `dirty` flags set by the upsert
+        governor_params: Parameters of the shared `ResourceGovernor`, sizing the
+            chunks of the incremental placement
     
     Returns:
         dict[str, np.ndarray]: A dict with paths as keys and 3D vectors as values
     """
 
+    incremental = method_params.get("incremental")
+    if incremental:
+        previous_layout = load_previous_layout(incremental.get("layout_path"))
+        if previous_layout is not None:
+            dirty_ids = dirty_paper_ids(downloaded_papers_df)
+            n_placed = sum(paper_id not in previous_layout or paper_id in dirty_ids for paper_id in embeddings_dict)
+            n_clean = len(embeddings_dict) - n_placed
+            dirty_ratio = n_placed / max(len(embeddings_dict), 1)
+            if n_clean > 0 and dirty_ratio <= incremental.get("max_dirty_ratio", 0.1):
+                return place_incrementally(
+                    embeddings_dict, previous_layout, dirty_ids, incremental.get("n_neighbors", 10), governor_params
+                )
+            logger.info(f"{dirty_ratio:.1%} of the papers are new or changed, refitting the layout.")
+
+    configure_numba_cache(method_params.get("numba_cache_dir"))
     reducer = reducers[method_params["dimensionality_reduction_method"]]
     return reducer(embeddings_dict, **method_params["dimensionality_reduction_params"])
 
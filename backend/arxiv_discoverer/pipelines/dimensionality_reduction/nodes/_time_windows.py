@@ -0,0 +1,269 @@
+import hashlib
+import json
+import logging
+import os
+from collections.abc import Callable, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from arxiv_discoverer.search import embeddings_to_matrix
+
+from ._create_viz_json import create_visualization_json
+from ._merge_embeddings_and_metadata import merge_embeddings_metadata
+from ._reduce_vectors_dimensionality import reduce_vectors_dimensionality
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN_WINDOW = "unknown"
+_WINDOW_FORMATS = {"year": "%Y", "month": "%Y-%m"}
+# x, y, z
+_LAYOUT_DIMENSIONS = 3
+
+
+def time_window_keys(published: pd.Series, granularity: str = "year") -> pd.Series:
+    """
+    Window of each paper from its publication date: "2024" by year, "2024-03" by month.
+
+    Args:
+        published (pd.Series): Publication dates.
+        granularity (str): "year" or "month".
+
+    Returns:
+        pd.Series: The window key of each paper, "unknown" when the date is missing.
+    """
+    if granularity not in _WINDOW_FORMATS:
+        raise ValueError(f"Unknown time window granularity '{granularity}', expected one of {list(_WINDOW_FORMATS)}")
+    dates = pd.to_datetime(published, errors="coerce", utc=True)
+    return dates.dt.strftime(_WINDOW_FORMATS[granularity]).fillna(UNKNOWN_WINDOW).astype(str)
+
+
+def window_digest(papers_df: pd.DataFrame, method_params: dict) -> str:
+    """
+    Fingerprint of the content of a window: its papers, their embedded text and
+    the reduction parameters. Windows whose digest did not change are not rebuilt.
+    """
+    text_digests = (
+        papers_df["abstract_digest"].astype(str)
+        if "abstract_digest" in papers_df.columns
+        else papers_df["title"].astype(str)
+    )
+    digest = hashlib.sha256(json.dumps(method_params, sort_keys=True, default=str).encode())
+    for paper_id, text_digest in sorted(zip(papers_df["paper_id"].astype(str), text_digests)):
+        digest.update(f"{paper_id}\t{text_digest}\n".encode())
+    return digest.hexdigest()[:32]
+
+
+def load_time_windows_manifest(manifest_path: str | None) -> dict[str, Any]:
+    """Manifest written by the previous windowed run, empty if there is none."""
+    if not manifest_path or not Path(manifest_path).exists():
+        logger.warning(f"No time windows manifest found at {manifest_path}")
+        return {"windows": {}}
+    with Path(manifest_path).open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def plan_time_windows(
+    downloaded_papers_df: pd.DataFrame, method_params: dict, time_window_params: dict
+) -> dict[str, Any]:
+    """
+    Split the papers into publication windows and decide which windows to
+    rebuild: those whose papers or abstracts changed since the previous run,
+    typically only the current window after a harvest, and those whose layout
+    is missing.
+
+    Args:
+        downloaded_papers_df (pd.DataFrame): Papers with 'paper_id' and 'published' columns.
+        method_params (dict): Parameters of `reduce_vectors_dimensionality`.
+        time_window_params (dict): `granularity` ("year" or "month"), `manifest_path`
+            of the previous manifest and `layouts_path` of the window layouts.
+
+    Returns:
+        dict[str, Any]: {"granularity", "windows": {key: {"paper_ids", "n_papers", "digest", "rebuild"}}},
+            windows in chronological order.
+    """
+    granularity = time_window_params.get("granularity", "year")
+    previous = load_time_windows_manifest(time_window_params.get("manifest_path"))
+    previous_windows = previous["windows"] if previous.get("granularity", granularity) == granularity else {}
+    layouts_path = Path(time_window_params.get("layouts_path", ""))
+
+    keys = time_window_keys(downloaded_papers_df["published"], granularity)
+    window_params = {key: value for key, value in method_params.items() if key != "incremental"}
+    windows = {}
+    for key, papers_df in downloaded_papers_df.groupby(keys.to_numpy(), sort=True):
+        digest = window_digest(papers_df, window_params)
+        rebuild = (
+            previous_windows.get(key, {}).get("digest") != digest
+            or not (layouts_path / f"{key}.npz").exists()
+        )
+        windows[key] = {
+            "paper_ids": papers_df["paper_id"].astype(str).tolist(),
+            "n_papers": len(papers_df),
+            "digest": digest,
+            "rebuild": rebuild,
+        }
+
+    n_rebuilt = sum(window["rebuild"] for window in windows.values())
+    logger.info(f"{len(windows)} {granularity} windows, {n_rebuilt} to rebuild: "
+                f"{[key for key, window in windows.items() if window['rebuild']]}")
+    return {"granularity": granularity, "windows": windows}
+
+
+def reduce_window(paper_ids: list[str], vectors: np.ndarray, method_params: dict) -> dict[str, np.ndarray]:
+    """
+    Layout of one window. Windows too small for the configured reducer fall back
+    to PCA, and windows of fewer papers than layout dimensions are placed at the origin.
+    """
+    embeddings = dict(zip(paper_ids, vectors))
+    n_neighbors = method_params["dimensionality_reduction_params"].get("n_neighbors", 15)
+    if len(paper_ids) < _LAYOUT_DIMENSIONS:
+        return {paper_id: np.zeros(_LAYOUT_DIMENSIONS, dtype=np.float32) for paper_id in paper_ids}
+    if method_params["dimensionality_reduction_method"] != "pca" and len(paper_ids) <= n_neighbors + 1:
+        method_params = {"dimensionality_reduction_method": "pca", "dimensionality_reduction_params": {}}
+    reduced = reduce_vectors_dimensionality(embeddings, method_params)
+    return {paper_id: np.asarray(coordinates, dtype=np.float32) for paper_id, coordinates in reduced.items()}
+
+
+def build_time_window_layouts(
+    embeddings_dict: Mapping[str, np.ndarray],
+    time_windows_plan: dict[str, Any],
+    method_params: dict,
+    time_window_params: dict,
+) -> dict[str, dict[str, np.ndarray]]:
+    """
+    Reduce the windows to rebuild, in parallel across windows. Unchanged windows
+    keep the layout saved by a previous run.
+
+    Args:
+        embeddings_dict (Mapping[str, np.ndarray]): {paper_id: embedding}.
+        time_windows_plan (dict[str, Any]): Output of `plan_time_windows`.
+        method_params (dict): Parameters of `reduce_vectors_dimensionality`.
+        time_window_params (dict): `max_workers`, the number of windows reduced at once.
+
+    Returns:
+        dict[str, dict[str, np.ndarray]]: {window: {paper_id: 3d coordinates}} of the rebuilt windows.
+    """
+    window_params = {key: value for key, value in method_params.items() if key != "incremental"}
+    paper_ids, vectors = embeddings_to_matrix(embeddings_dict)
+    row_of = {paper_id: row for row, paper_id in enumerate(paper_ids)}
+
+    jobs = {}
+    for key, window in time_windows_plan["windows"].items():
+        if not window["rebuild"]:
+            continue
+        window_ids = [paper_id for paper_id in window["paper_ids"] if paper_id in row_of]
+        jobs[key] = (window_ids, vectors[[row_of[paper_id] for paper_id in window_ids]])
+
+    max_workers = min(time_window_params.get("max_workers") or os.cpu_count() or 1, max(len(jobs), 1))
+    if max_workers == 1:
+        return {key: reduce_window(*job, window_params) for key, job in jobs.items()}
+
+    logger.info(f"Reducing {len(jobs)} windows with {max_workers} processes")
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {key: executor.submit(reduce_window, *job, window_params) for key, job in jobs.items()}
+        return {key: future.result() for key, future in futures.items()}
+
+
+def create_time_window_visualizations(
+    time_window_layouts: Mapping[str, Any],
+    downloaded_papers_df: pd.DataFrame,
+    time_windows_plan: dict[str, Any],
+    detail_fields: list[str],
+) -> dict[str, Callable[[], dict[str, Any]]]:
+    """
+    Visualization JSON of each rebuilt window, saved lazily one window at a time.
+
+    Args:
+        time_window_layouts (Mapping[str, Any]): Layouts of every window, as loaded
+            from the partitioned dataset.
+        downloaded_papers_df (pd.DataFrame): Metadata of the papers.
+        time_windows_plan (dict[str, Any]): Output of `plan_time_windows`.
+        detail_fields (list[str]): Columns included in the details of each paper.
+
+    Returns:
+        dict[str, Callable[[], dict[str, Any]]]: Visualization of each rebuilt window.
+    """
+    def visualization(key: str) -> Callable[[], dict[str, Any]]:
+        def build() -> dict[str, Any]:
+            layout = load_partition(time_window_layouts[key])
+            window_df = downloaded_papers_df[downloaded_papers_df["paper_id"].isin(layout)]
+            merged = merge_embeddings_metadata(window_df, layout, detail_fields)
+            return create_visualization_json(merged, detail_fields)
+
+        return build
+
+    return {
+        key: visualization(key)
+        for key, window in time_windows_plan["windows"].items()
+        if window["rebuild"] and key in time_window_layouts
+    }
+
+
+def assemble_all_time_layout(
+    time_window_layouts: Mapping[str, Any],
+    time_windows_plan: dict[str, Any],
+    time_window_params: dict,
+) -> tuple[dict[str, np.ndarray], dict[str, Any]]:
+    """
+    Assemble the "all time" layout from the window layouts instead of reducing
+    the whole corpus: each window is centered, scaled to a unit radius and
+    shifted along x by its rank, so that windows are laid out chronologically.
+    The manifest records each window with its transform, letting clients map
+    window coordinates to the combined view.
+
+    Args:
+        time_window_layouts (Mapping[str, Any]): Layouts of every window, as loaded
+            from the partitioned dataset.
+        time_windows_plan (dict[str, Any]): Output of `plan_time_windows`.
+        time_window_params (dict): `spacing` between consecutive windows along x,
+            `manifest_path` of the previous manifest.
+
+    Returns:
+        tuple[dict[str, np.ndarray], dict[str, Any]]: The combined {paper_id: 3d coordinates},
+            and the manifest of the windows.
+    """
+    spacing = float(time_window_params.get("spacing", 3.0))
+    previous = load_time_windows_manifest(time_window_params.get("manifest_path"))["windows"]
+    now = pd.Timestamp.now(tz="UTC").isoformat()
+
+    combined, windows = {}, {}
+    for rank, (key, window) in enumerate(time_windows_plan["windows"].items()):
+        layout = load_partition(time_window_layouts[key])
+        window_ids = [paper_id for paper_id in window["paper_ids"] if paper_id in layout]
+        coordinates = np.asarray([layout[paper_id] for paper_id in window_ids], dtype=np.float32).reshape(-1, 3)
+
+        center = coordinates.mean(axis=0) if len(coordinates) else np.zeros(3, dtype=np.float32)
+        radius = float(np.abs(coordinates - center).max()) if len(coordinates) else 0.0
+        scale = 1.0 / radius if radius > 0 else 1.0
+        offset = np.array([rank * spacing, 0.0, 0.0], dtype=np.float32)
+        combined.update(zip(window_ids, (coordinates - center) * scale + offset))
+
+        windows[key] = {
+            "n_papers": len(window_ids),
+            "digest": window["digest"],
+            "built_at": now if window["rebuild"] else previous.get(key, {}).get("built_at", now),
+            "center": center.tolist(),
+            "scale": scale,
+            "offset": offset.tolist(),
+        }
+
+    manifest = {
+        "granularity": time_windows_plan["granularity"],
+        "date_generated": now,
+        "total_papers": len(combined),
+        "rebuilt_windows": [key for key, window in time_windows_plan["windows"].items() if window["rebuild"]],
+        "windows": windows,
+    }
+    logger.info(f"Assembled the layout of {len(combined)} papers from {len(windows)} windows.")
+    return combined, manifest
+
+
+def load_partition(partition: Any) -> dict[str, np.ndarray]:
+    """A partition of a `PartitionedDataset`, loading it if it is a load function."""
+    partition = partition() if callable(partition) else partition
+    if isinstance(partition, dict):
+        return partition
+    return dict(zip(partition.paper_ids.tolist(), partition.vectors()))
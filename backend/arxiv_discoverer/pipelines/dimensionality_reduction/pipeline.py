@@ -3,33 +3,133 @@ from .nodes import (
     reduce_vectors_dimensionality,
     merge_embeddings_metadata,
     create_visualization_json,
-    generate_category_colors
+    generate_category_colors,
+    create_search_index,
+    create_facet_index,
+    create_serving_artifacts,
+    create_cluster_summaries,
+    warm_up_umap,
+    plan_time_windows,
+    build_time_window_layouts,
+    create_time_window_visualizations,
+    assemble_all_time_layout,
 )
 
 def create_pipeline() -> Pipeline:
     return pipeline([
         node(
             func=reduce_vectors_dimensionality,
-            inputs=["arxiv_embeddings_dict", "params:dimensionality_reduction_params_umap"],
+            inputs=[
+                "arxiv_embeddings_dict",
+                "params:dimensionality_reduction_params_umap",
+                "downloaded_papers_df",
+                "params:resource_governor",
+            ],
             outputs="reduced_embeddings_dict",
             name="reduce_vectors_dimensionality_node"
         ),
         node(
             func=merge_embeddings_metadata,
-            inputs=["downloaded_papers_df_local", "reduced_embeddings_dict"],
+            inputs=["downloaded_papers_df", "reduced_embeddings_dict", "params:detail_fields"],
             outputs="merged_embeddings_metadata_dict",
             name="merge_embeddings_metadata_node"
         ),
+        node(
+            func=create_facet_index,
+            inputs=["merged_embeddings_metadata_dict", "params:facet_fields"],
+            outputs=["facet_index", "facet_counts"],
+            name="create_facet_index_node"
+        ),
         node(
             func=create_visualization_json,
-            inputs=["merged_embeddings_metadata_dict", "params:detail_fields"],
-            outputs=["visualization_json_local","visualization_json_aws_s3"],
+            inputs={
+                "embedding_metadata_merged": "merged_embeddings_metadata_dict",
+                "detail_fields": "params:detail_fields",
+                "facet_counts": "facet_counts",
+            },
+            outputs="visualization_json",
             name="create_visualization_json_node"
         ),
         node(
             func=generate_category_colors,
-            inputs="visualization_json_local",
+            inputs="visualization_json",
             outputs="category_colors_map",
             name="generate_category_colors_node"
+        ),
+        node(
+            func=create_search_index,
+            inputs=["merged_embeddings_metadata_dict", "params:search_fields"],
+            outputs="search_index",
+            name="create_search_index_node"
+        ),
+        node(
+            func=create_serving_artifacts,
+            inputs=["merged_embeddings_metadata_dict", "params:detail_fields"],
+            outputs="serving_artifacts",
+            name="create_serving_artifacts_node"
+        ),
+        node(
+            func=create_cluster_summaries,
+            inputs=["merged_embeddings_metadata_dict", "params:cluster_summaries"],
+            outputs="cluster_summaries",
+            name="create_cluster_summaries_node"
+        )
+    ])
+
+
+def create_time_windows_pipeline() -> Pipeline:
+    """
+    Same outputs as `create_pipeline`, with the layout built per publication
+    window (year or month). Windows are reduced in parallel, only the windows
+    whose papers changed are rebuilt, and `reduced_embeddings_dict` is assembled
+    from the window layouts. Each window also gets its own visualization.
+    """
+    windows = pipeline([
+        node(
+            func=plan_time_windows,
+            inputs=[
+                "downloaded_papers_df",
+                "params:dimensionality_reduction_params_umap",
+                "params:time_windows",
+            ],
+            outputs="time_windows_plan",
+            name="plan_time_windows_node"
+        ),
+        node(
+            func=build_time_window_layouts,
+            inputs=[
+                "arxiv_embeddings_dict",
+                "time_windows_plan",
+                "params:dimensionality_reduction_params_umap",
+                "params:time_windows",
+            ],
+            outputs="time_window_layouts",
+            name="build_time_window_layouts_node"
+        ),
+        node(
+            func=create_time_window_visualizations,
+            inputs=["time_window_layouts", "downloaded_papers_df", "time_windows_plan", "params:detail_fields"],
+            outputs="time_window_visualizations",
+            name="create_time_window_visualizations_node"
+        ),
+        node(
+            func=assemble_all_time_layout,
+            inputs=["time_window_layouts", "time_windows_plan", "params:time_windows"],
+            outputs=["reduced_embeddings_dict", "time_windows_manifest"],
+            name="assemble_all_time_layout_node"
+        ),
+    ])
+    all_time = create_pipeline()
+    return windows + (all_time - all_time.only_nodes("reduce_vectors_dimensionality_node"))
+
+
+def create_warmup_pipeline() -> Pipeline:
+    """Compiles the UMAP kernels into the numba cache, e.g. while building the image."""
+    return pipeline([
+        node(
+            func=warm_up_umap,
+            inputs="params:dimensionality_reduction_params_umap",
+            outputs="umap_warmup_report",
+            name="warm_up_umap_node"
         )
     ])
@@ -0,0 +1,22 @@
+"""
+Memory-aware sizing of the batches of the heavy nodes: encode batches of the
+embedding model, chunks of embeddings and of the incremental layout.
+"""
+
+from ._governor import ResourceGovernor, is_memory_error, resource_governor
+from ._memory import (
+    available_memory,
+    cgroup_memory_limit,
+    current_rss,
+    meminfo_available,
+)
+
+__all__ = [
+    "ResourceGovernor",
+    "available_memory",
+    "cgroup_memory_limit",
+    "current_rss",
+    "is_memory_error",
+    "meminfo_available",
+    "resource_governor",
+]
@@ -0,0 +1,183 @@
+import gc
+import json
+import logging
+import threading
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from ._memory import available_memory, current_rss
+
+logger = logging.getLogger(__name__)
+
+MB = 1 << 20
+T = TypeVar("T")
+
+_governors: dict[str, "ResourceGovernor"] = {}
+_governors_lock = threading.Lock()
+
+
+def is_memory_error(exc: BaseException) -> bool:
+    """True for memory pressure failures: MemoryError and "out of memory" errors of torch."""
+    return isinstance(exc, MemoryError) or "out of memory" in str(exc).lower()
+
+
+class ResourceGovernor:
+    """
+    Sizes batches from the memory the process can use, and backs off when a
+    batch fails on memory pressure.
+
+    The headroom is the smaller of `memory_fraction` of the available memory
+    (host MemAvailable or cgroup limit) and, with `rss_budget_mb`, the room left
+    under that RSS budget. A batch size is the headroom divided by the estimated
+    bytes per item, clipped to [min_batch_size, max_batch_size]. After a memory
+    error the batch is retried `backoff_factor` times smaller, and later batches
+    of the same name keep the reduced scale.
+
+    One governor is shared by the nodes of a process, see `resource_governor`.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        rss_budget_mb: float | None = None,
+        memory_fraction: float = 0.7,
+        min_batch_size: int = 1,
+        max_batch_size: int = 4096,
+        max_retries: int = 4,
+        backoff_factor: float = 0.5,
+    ):
+        """
+        Args:
+            rss_budget_mb (float | None): RSS the process should stay under, in MiB.
+            memory_fraction (float): Share of the available memory batches may use.
+            min_batch_size (int): Smallest batch, a memory error at this size is raised.
+            max_batch_size (int): Largest batch, unless overridden per call.
+            max_retries (int): Retries of a batch after memory errors.
+            backoff_factor (float): Batch size multiplier after a memory error.
+        """
+        self.rss_budget = None if rss_budget_mb is None else int(rss_budget_mb * MB)
+        self.memory_fraction = memory_fraction
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self._scales: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def headroom(self) -> int | None:
+        """Bytes the next batch may use, None if memory cannot be measured."""
+        limits = []
+        available = available_memory()
+        if available is not None:
+            limits.append(int(available * self.memory_fraction))
+        if self.rss_budget is not None:
+            limits.append(max(self.rss_budget - current_rss(), 0))
+        return min(limits) if limits else None
+
+    def batch_size(
+        self,
+        name: str,
+        bytes_per_item: float,
+        default: int | None = None,
+        maximum: int | None = None,
+    ) -> int:
+        """
+        Number of items of `bytes_per_item` each that fit in the headroom.
+
+        Args:
+            name (str): Name of the batched operation, for logging and backoff.
+            bytes_per_item (float): Estimated peak memory of one item.
+            default (int | None): Size used when memory cannot be measured.
+            maximum (int | None): Largest batch of this operation, at most `max_batch_size`.
+
+        Returns:
+            int: The batch size.
+        """
+        maximum = min(maximum, self.max_batch_size) if maximum else self.max_batch_size
+        headroom = self.headroom()
+        if headroom is None:
+            size = default or maximum
+        else:
+            size = int(headroom // max(bytes_per_item, 1))
+        with self._lock:
+            scale = self._scales.get(name, 1.0)
+        size = max(self.min_batch_size, int(min(size, maximum) * scale))
+        logger.info(
+            f"{name}: batch size {size} ({'unknown' if headroom is None else f'{headroom / MB:.0f} MiB'} "
+            f"headroom, {bytes_per_item / MB:.2f} MiB per item, backoff scale {scale:g})"
+        )
+        return size
+
+    def run(self, name: str, func: Callable[[int], T], batch_size: int) -> T:
+        """
+        Call `func(batch_size)`, retrying with smaller batches on memory errors.
+
+        Args:
+            name (str): Name of the batched operation, its backoff applies to later batches.
+            func (Callable[[int], T]): Processes its input in batches of the given size.
+            batch_size (int): Initial batch size, e.g. from `batch_size`.
+
+        Returns:
+            T: The result of `func`.
+        """
+        return self._run(name, func, batch_size)[0]
+
+    def map_batches(
+        self, name: str, func: Callable[[int, int], T], n_items: int, bytes_per_item: float, **size_args: Any
+    ) -> list[T]:
+        """
+        `func(start, end)` over consecutive batches of `n_items`, each batch sized
+        from the current headroom and retried smaller on memory errors.
+
+        Args:
+            name (str): Name of the batched operation.
+            func (Callable[[int, int], T]): Processes the items [start, end).
+            n_items (int): Number of items.
+            bytes_per_item (float): Estimated peak memory of one item.
+            **size_args: `default` and `maximum` of `batch_size`.
+
+        Returns:
+            list[T]: The result of each batch, in order.
+        """
+        results, start = [], 0
+        while start < n_items:
+            size = self.batch_size(name, bytes_per_item, **size_args)
+            result, size = self._run(name, lambda batch_size: func(start, min(start + batch_size, n_items)), size)
+            results.append(result)
+            start += size
+        return results
+
+    def _run(self, name: str, func: Callable[[int], T], batch_size: int) -> tuple[T, int]:
+        """`run`, also returning the batch size that succeeded."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return func(batch_size), batch_size
+            except Exception as exc:  # noqa: BLE001 - torch raises RuntimeError on CUDA OOM
+                if not is_memory_error(exc) or attempt == self.max_retries or batch_size <= self.min_batch_size:
+                    raise
+                gc.collect()
+                smaller = max(self.min_batch_size, int(batch_size * self.backoff_factor))
+                with self._lock:
+                    self._scales[name] = self._scales.get(name, 1.0) * smaller / batch_size
+                logger.warning(f"{name}: memory error with batches of {batch_size}, retrying with {smaller}")
+                batch_size = smaller
+        raise AssertionError("unreachable")
+
+
+def resource_governor(governor_params: dict | None = None) -> ResourceGovernor:
+    """
+    Governor shared by the nodes of the process with the same parameters, so
+    that a backoff after a memory error in one node applies to the next ones.
+
+    Args:
+        governor_params (dict | None): Arguments of `ResourceGovernor`.
+
+    Returns:
+        ResourceGovernor: The shared governor.
+    """
+    governor_params = governor_params or {}
+    key = json.dumps(governor_params, sort_keys=True)
+    with _governors_lock:
+        if key not in _governors:
+            _governors[key] = ResourceGovernor(**governor_params)
+        return _governors[key]
@@ -0,0 +1,81 @@
+import logging
+import os
+import resource
+import sys
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# cgroup v2 exposes memory.max / memory.current, cgroup v1 memory.limit_in_bytes / memory.usage_in_bytes.
+_CGROUP_FILES = (
+    ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory.current"),
+    ("/sys/fs/cgroup/memory/memory.limit_in_bytes", "/sys/fs/cgroup/memory/memory.usage_in_bytes"),
+)
+# cgroup v1 reports "no limit" as a huge page-aligned number instead of "max".
+_UNLIMITED = 1 << 60
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss() -> int:
+    """Resident set size of the process in bytes, its peak where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def meminfo_available(meminfo_path: str = "/proc/meminfo") -> int | None:
+    """MemAvailable of the host in bytes, None where /proc/meminfo is unavailable."""
+    try:
+        with open(meminfo_path) as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def cgroup_memory_limit(cgroup_files=_CGROUP_FILES) -> tuple[int, int] | None:
+    """
+    (limit, usage) in bytes of the memory cgroup of the process, e.g. the memory
+    limit of a container, None when the process is not memory-limited.
+
+    Args:
+        cgroup_files: (limit, usage) file paths tried in order, cgroup v2 first.
+
+    Returns:
+        tuple[int, int] | None: The limit and the current usage of the cgroup.
+    """
+    for limit_path, usage_path in cgroup_files:
+        try:
+            limit = Path(limit_path).read_text().strip()
+            usage = int(Path(usage_path).read_text().strip())
+        except (OSError, ValueError):
+            continue
+        if limit == "max" or int(limit) >= _UNLIMITED:
+            return None
+        return int(limit), usage
+    return None
+
+
+def available_memory() -> int | None:
+    """
+    Memory the process can still allocate in bytes: the smaller of the host
+    MemAvailable and the room left under the cgroup limit.
+
+    Returns:
+        int | None: Available bytes, None if neither can be read.
+    """
+    candidates = []
+    host = meminfo_available()
+    if host is not None:
+        candidates.append(host)
+    cgroup = cgroup_memory_limit()
+    if cgroup is not None:
+        limit, usage = cgroup
+        candidates.append(max(limit - usage, 0))
+    return min(candidates) if candidates else None
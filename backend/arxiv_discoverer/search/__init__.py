@@ -0,0 +1,47 @@
+"""Query-time search structures built by the pipelines."""
+
+from ._ann_index import IVFPQIndex, ProductQuantizer, brute_force_search
+from ._bitmap import Bitmap, FacetIndex
+from ._embedding_codec import (
+    STORAGE_MODES,
+    CompressedEmbeddings,
+    EmbeddingCodec,
+    embeddings_to_matrix,
+)
+from ._inverted_index import InvertedIndex, delta_decode, delta_encode, tokenize
+from ._minhash import (
+    MinHasher,
+    lsh_parameters,
+    near_duplicate_representatives,
+    normalize_text,
+)
+from ._query import (
+    get_model,
+    load_ann_index,
+    search_similar_papers,
+    search_similar_papers_async,
+)
+
+__all__ = [
+    "Bitmap",
+    "CompressedEmbeddings",
+    "EmbeddingCodec",
+    "FacetIndex",
+    "IVFPQIndex",
+    "InvertedIndex",
+    "MinHasher",
+    "ProductQuantizer",
+    "STORAGE_MODES",
+    "brute_force_search",
+    "delta_decode",
+    "delta_encode",
+    "embeddings_to_matrix",
+    "get_model",
+    "load_ann_index",
+    "lsh_parameters",
+    "near_duplicate_representatives",
+    "normalize_text",
+    "search_similar_papers",
+    "search_similar_papers_async",
+    "tokenize",
+]
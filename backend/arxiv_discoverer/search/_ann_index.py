@@ -0,0 +1,387 @@
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Codes are stored as uint8.
+_MAX_CENTROIDS = 256
+
+
+class ProductQuantizer:
+    """
+    Product quantizer splitting vectors into `n_subvectors` sub-spaces, each
+    encoded with the index of its nearest centroid in a per sub-space codebook.
+
+    Args:
+        n_subvectors (int): Number of sub-spaces. Must divide the vector dimension.
+        n_centroids (int): Number of centroids per sub-space (at most 256).
+        random_state (int): For reproducibility.
+    """
+
+    def __init__(self, n_subvectors: int = 48, n_centroids: int = 256, random_state: int = 42):
+        if n_centroids > _MAX_CENTROIDS:
+            raise ValueError(f"n_centroids must be <= {_MAX_CENTROIDS} to fit codes in uint8.")
+        self.n_subvectors = n_subvectors
+        self.n_centroids = n_centroids
+        self.random_state = random_state
+        self.codebooks: np.ndarray | None = None  # (n_subvectors, n_centroids, sub_dim)
+
+    @property
+    def is_trained(self) -> bool:
+        return self.codebooks is not None
+
+    def _split(self, vectors: np.ndarray) -> np.ndarray:
+        n, dim = vectors.shape
+        if dim % self.n_subvectors:
+            raise ValueError(
+                f"Vector dimension {dim} is not divisible by n_subvectors={self.n_subvectors}."
+            )
+        return vectors.reshape(n, self.n_subvectors, dim // self.n_subvectors)
+
+    def fit(self, vectors: np.ndarray) -> "ProductQuantizer":
+        """
+        Train one codebook per sub-space.
+
+        Args:
+            vectors (np.ndarray): (N, dim) training vectors.
+
+        Returns:
+            ProductQuantizer: The fitted quantizer.
+        """
+        from sklearn.cluster import MiniBatchKMeans
+
+        sub_vectors = self._split(np.asarray(vectors, dtype=np.float32))
+        n_centroids = min(self.n_centroids, len(vectors))
+        codebooks = []
+        for j in range(self.n_subvectors):
+            kmeans = MiniBatchKMeans(
+                n_clusters=n_centroids,
+                random_state=self.random_state,
+                batch_size=4096,
+                n_init=1,
+            ).fit(sub_vectors[:, j, :])
+            codebooks.append(kmeans.cluster_centers_.astype(np.float32))
+        self.codebooks = np.stack(codebooks)
+        return self
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Encode vectors into PQ codes.
+
+        Args:
+            vectors (np.ndarray): (N, dim) vectors.
+
+        Returns:
+            np.ndarray: (N, n_subvectors) uint8 codes.
+        """
+        sub_vectors = self._split(np.asarray(vectors, dtype=np.float32))
+        codes = np.empty((len(vectors), self.n_subvectors), dtype=np.uint8)
+        for j in range(self.n_subvectors):
+            codebook = self.codebooks[j]
+            # argmin ||x - c||^2 == argmin (||c||^2 - 2 x.c)
+            distances = (codebook**2).sum(axis=1) - 2.0 * sub_vectors[:, j, :] @ codebook.T
+            codes[:, j] = distances.argmin(axis=1)
+        return codes
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Reconstruct approximate vectors from PQ codes.
+
+        Args:
+            codes (np.ndarray): (N, n_subvectors) uint8 codes.
+
+        Returns:
+            np.ndarray: (N, dim) float32 reconstructed vectors.
+        """
+        sub_vectors = self.codebooks[np.arange(self.n_subvectors), codes]
+        return sub_vectors.reshape(len(codes), -1)
+
+    def inner_product_table(self, query: np.ndarray) -> np.ndarray:
+        """
+        Lookup table of inner products between each query sub-vector and the
+        centroids of its sub-space, used for asymmetric distance computation.
+
+        Args:
+            query (np.ndarray): (dim,) query vector.
+
+        Returns:
+            np.ndarray: (n_subvectors, n_centroids) table.
+        """
+        sub_query = query.reshape(self.n_subvectors, -1)
+        return np.einsum("mkd,md->mk", self.codebooks, sub_query)
+
+
+class IVFPQIndex:
+    """
+    Inverted-file index with product-quantized residuals (IVF-PQ) over
+    normalized paper embeddings, scored by inner product (cosine similarity).
+
+    Vectors are assigned to their closest coarse centroid and the residual is PQ
+    encoded. A query only scans the `n_probe` closest inverted lists, and the best
+    candidates are re-ranked with the exact vectors when `keep_vectors` is set.
+
+    Args:
+        n_lists (int | None): Number of inverted lists. Defaults to ~4 * sqrt(N).
+        n_subvectors (int): Number of PQ sub-spaces.
+        n_probe (int): Number of inverted lists scanned per query.
+        rerank_factor (int): Candidates re-ranked exactly = k * rerank_factor.
+        keep_vectors (bool): Store float16 copies of the vectors for re-ranking.
+        train_size (int): Maximum number of vectors used for training.
+        random_state (int): For reproducibility.
+        compact_threshold (float): Share of removed rows above which the codes,
+            vectors and ids of removed papers are dropped from memory.
+    """
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        n_lists: int | None = None,
+        n_subvectors: int = 48,
+        n_probe: int = 16,
+        rerank_factor: int = 10,
+        keep_vectors: bool = True,
+        train_size: int = 50_000,
+        random_state: int = 42,
+        compact_threshold: float = 0.2,
+    ):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.rerank_factor = rerank_factor
+        self.keep_vectors = keep_vectors
+        self.train_size = train_size
+        self.random_state = random_state
+        self.compact_threshold = compact_threshold
+        self.pq = ProductQuantizer(n_subvectors=n_subvectors, random_state=random_state)
+
+        self.centroids: np.ndarray | None = None
+        self.trained_size = 0
+        self.paper_ids: list[str] = []
+        self._id_to_row: dict[str, int] = {}
+        self._deleted = np.zeros(0, dtype=bool)
+        self._vectors = np.zeros((0, 0), dtype=np.float16)
+        self._list_rows: list[np.ndarray] = []
+        self._list_codes: list[np.ndarray] = []
+
+    def __setstate__(self, state: dict) -> None:
+        # Indexes pickled before compaction existed.
+        state.setdefault("compact_threshold", 0.2)
+        self.__dict__.update(state)
+
+    def __len__(self) -> int:
+        return len(self._id_to_row)
+
+    def __contains__(self, paper_id: str) -> bool:
+        return paper_id in self._id_to_row
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def train(self, vectors: np.ndarray) -> "IVFPQIndex":
+        """
+        Train the coarse quantizer and the residual product quantizer.
+
+        Args:
+            vectors (np.ndarray): (N, dim) normalized training vectors.
+
+        Returns:
+            IVFPQIndex: The trained index.
+        """
+        from sklearn.cluster import MiniBatchKMeans
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+        rng = np.random.default_rng(self.random_state)
+        if len(vectors) > self.train_size:
+            vectors = vectors[rng.choice(len(vectors), self.train_size, replace=False)]
+
+        n_lists = self.n_lists or max(1, int(4 * np.sqrt(len(vectors))))
+        n_lists = min(n_lists, len(vectors))
+        logger.info(f"Training IVF-PQ index on {len(vectors)} vectors with {n_lists} lists.")
+
+        coarse = MiniBatchKMeans(
+            n_clusters=n_lists, random_state=self.random_state, batch_size=4096, n_init=1
+        ).fit(vectors)
+        self.centroids = coarse.cluster_centers_.astype(np.float32)
+        self.n_lists = n_lists
+
+        residuals = vectors - self.centroids[self._assign(vectors)]
+        self.pq.fit(residuals)
+
+        self.trained_size = len(vectors)
+        self._list_rows = [np.zeros(0, dtype=np.int64) for _ in range(n_lists)]
+        self._list_codes = [
+            np.zeros((0, self.pq.n_subvectors), dtype=np.uint8) for _ in range(n_lists)
+        ]
+        return self
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        return (vectors @ self.centroids.T).argmax(axis=1)
+
+    def add(self, paper_ids: list[str], vectors: np.ndarray) -> int:
+        """
+        Add vectors to the index. Paper ids already indexed are replaced by the new
+        vector, so the index can be updated incrementally between runs.
+
+        Args:
+            paper_ids (list[str]): Ids of the papers, aligned with `vectors`.
+            vectors (np.ndarray): (N, dim) normalized vectors.
+
+        Returns:
+            int: Number of vectors added.
+        """
+        if not self.is_trained:
+            raise RuntimeError("The index must be trained before adding vectors.")
+        if len(paper_ids) == 0:
+            return 0
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.remove([paper_id for paper_id in paper_ids if paper_id in self._id_to_row])
+
+        first_row = len(self.paper_ids)
+        rows = np.arange(first_row, first_row + len(paper_ids), dtype=np.int64)
+        self.paper_ids.extend(paper_ids)
+        self._id_to_row.update(zip(paper_ids, rows.tolist()))
+        self._deleted = np.concatenate([self._deleted, np.zeros(len(rows), dtype=bool)])
+        if self.keep_vectors:
+            stored = vectors.astype(np.float16)
+            self._vectors = stored if first_row == 0 else np.concatenate([self._vectors, stored])
+
+        assignments = self._assign(vectors)
+        codes = self.pq.encode(vectors - self.centroids[assignments])
+        for list_id in np.unique(assignments):
+            mask = assignments == list_id
+            self._list_rows[list_id] = np.concatenate([self._list_rows[list_id], rows[mask]])
+            self._list_codes[list_id] = np.concatenate([self._list_codes[list_id], codes[mask]])
+        return len(rows)
+
+    def remove(self, paper_ids: list[str]) -> int:
+        """
+        Remove papers from the index. Rows are tombstoned and skipped at query
+        time, and the index is compacted once the share of removed rows exceeds
+        `compact_threshold`.
+
+        Args:
+            paper_ids (list[str]): Ids of the papers to remove.
+
+        Returns:
+            int: Number of papers removed.
+        """
+        rows = [self._id_to_row.pop(paper_id) for paper_id in paper_ids if paper_id in self._id_to_row]
+        self._deleted[rows] = True
+        if rows and self._deleted.mean() > self.compact_threshold:
+            self.compact()
+        return len(rows)
+
+    def compact(self) -> None:
+        """Drop the rows of removed papers from the inverted lists, vectors and ids, renumbering the others."""
+        alive = ~self._deleted
+        new_rows = np.cumsum(alive) - 1
+        for list_id, rows in enumerate(self._list_rows):
+            kept = alive[rows]
+            self._list_rows[list_id] = new_rows[rows[kept]]
+            self._list_codes[list_id] = self._list_codes[list_id][kept]
+        if self.keep_vectors:
+            self._vectors = self._vectors[alive]
+        self.paper_ids = [paper_id for paper_id, kept in zip(self.paper_ids, alive) if kept]
+        self._id_to_row = {paper_id: row for row, paper_id in enumerate(self.paper_ids)}
+        logger.info(f"Compacted ANN index: dropped {int(self._deleted.sum())} removed rows.")
+        self._deleted = np.zeros(len(self.paper_ids), dtype=bool)
+
+    def changed(self, paper_ids: list[str], vectors: np.ndarray) -> list[str]:
+        """
+        Indexed papers whose entry no longer matches their vector: the stored
+        float16 copy differs when `keep_vectors` is set, otherwise the inverted
+        list or the PQ code the vector would get differs.
+
+        Args:
+            paper_ids (list[str]): Ids of indexed papers, aligned with `vectors`.
+            vectors (np.ndarray): (N, dim) normalized vectors.
+
+        Returns:
+            list[str]: Ids of the changed papers.
+        """
+        if len(paper_ids) == 0:
+            return []
+        vectors = np.asarray(vectors, dtype=np.float32)
+        rows = np.asarray([self._id_to_row[paper_id] for paper_id in paper_ids], dtype=np.int64)
+
+        if self.keep_vectors:
+            differs = (self._vectors[rows] != vectors.astype(np.float16)).any(axis=1)
+        else:
+            list_rows = np.concatenate(self._list_rows)
+            list_ids = np.repeat(np.arange(self.n_lists), [len(list_) for list_ in self._list_rows])
+            list_codes = np.concatenate(self._list_codes)
+            positions = np.empty(len(self.paper_ids), dtype=np.int64)
+            positions[list_rows] = np.arange(len(list_rows))
+            positions = positions[rows]
+
+            assignments = self._assign(vectors)
+            codes = self.pq.encode(vectors - self.centroids[assignments])
+            differs = (list_ids[positions] != assignments) | (list_codes[positions] != codes).any(axis=1)
+        return [paper_id for paper_id, changed in zip(paper_ids, differs) if changed]
+
+    def search(self, query: np.ndarray, k: int = 10, n_probe: int | None = None) -> list[tuple[str, float]]:
+        """
+        Return the `k` papers with the highest cosine similarity to the query.
+
+        Args:
+            query (np.ndarray): (dim,) normalized query vector.
+            k (int): Number of results.
+            n_probe (int | None): Override of the number of inverted lists scanned.
+
+        Returns:
+            list[tuple[str, float]]: (paper_id, score) pairs, best first.
+        """
+        query = np.asarray(query, dtype=np.float32).ravel()
+        n_probe = min(n_probe or self.n_probe, self.n_lists)
+
+        coarse_scores = self.centroids @ query
+        probed = np.argpartition(-coarse_scores, n_probe - 1)[:n_probe]
+        table = self.pq.inner_product_table(query)
+        sub_spaces = np.arange(self.pq.n_subvectors)
+
+        rows, scores = [], []
+        for list_id in probed:
+            if not len(self._list_rows[list_id]):
+                continue
+            codes = self._list_codes[list_id]
+            rows.append(self._list_rows[list_id])
+            scores.append(coarse_scores[list_id] + table[sub_spaces, codes].sum(axis=1))
+        if not rows:
+            return []
+
+        rows = np.concatenate(rows)
+        scores = np.concatenate(scores)
+        alive = ~self._deleted[rows]
+        rows, scores = rows[alive], scores[alive]
+
+        n_candidates = min(len(rows), k * self.rerank_factor if self.keep_vectors else k)
+        best = np.argpartition(-scores, n_candidates - 1)[:n_candidates]
+        rows, scores = rows[best], scores[best]
+        if self.keep_vectors:
+            scores = self._vectors[rows].astype(np.float32) @ query
+
+        order = np.argsort(-scores)[:k]
+        return [(self.paper_ids[row], float(scores[i])) for i, row in zip(order, rows[order])]
+
+
+def brute_force_search(
+    paper_ids: list[str], vectors: np.ndarray, query: np.ndarray, k: int = 10
+) -> list[tuple[str, float]]:
+    """
+    Exact top-k search by inner product, used as ground truth for the ANN index.
+
+    Args:
+        paper_ids (list[str]): Ids aligned with `vectors`.
+        vectors (np.ndarray): (N, dim) normalized vectors.
+        query (np.ndarray): (dim,) normalized query vector.
+        k (int): Number of results.
+
+    Returns:
+        list[tuple[str, float]]: (paper_id, score) pairs, best first.
+    """
+    scores = vectors @ np.asarray(query, dtype=vectors.dtype).ravel()
+    k = min(k, len(scores))
+    best = np.argpartition(-scores, k - 1)[:k]
+    best = best[np.argsort(-scores[best])]
+    return [(paper_ids[i], float(scores[i])) for i in best]
@@ -0,0 +1,293 @@
+from typing import Any
+
+import numpy as np
+
+from ._inverted_index import delta_decode, delta_encode
+
+_EMPTY_RUNS = np.zeros((0, 2), dtype=np.int64)
+# Runs only pay off from 3 positions on, most facet values (authors) have fewer.
+_MIN_RUN_POSITIONS = 3
+
+
+def _positions_to_runs(positions: np.ndarray) -> np.ndarray:
+    """Maximal runs of sorted unique positions, as (n_runs, 2) [start, stop)."""
+    if not len(positions):
+        return _EMPTY_RUNS
+    breaks = np.flatnonzero(np.diff(positions) != 1) + 1
+    starts = positions[np.concatenate([[0], breaks])]
+    stops = positions[np.concatenate([breaks - 1, [len(positions) - 1]])] + 1
+    return np.stack([starts, stops], axis=1)
+
+
+def _runs_to_positions(runs: np.ndarray) -> np.ndarray:
+    """Positions covered by [start, stop) runs."""
+    lengths = runs[:, 1] - runs[:, 0]
+    # Expand each run into its positions: start + 0..length-1
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.repeat(runs[:, 0], lengths) + offsets
+
+
+def _covered(runs: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """Mask of the positions falling inside one of the [start, stop) runs."""
+    if not len(runs):
+        return np.zeros(len(positions), dtype=bool)
+    run = np.searchsorted(runs[:, 0], positions, side="right") - 1
+    return (run >= 0) & (positions < runs[np.maximum(run, 0), 1])
+
+
+def _combine_runs(a: np.ndarray, b: np.ndarray, op) -> np.ndarray:
+    """
+    Runs of `op` (a boolean ufunc) applied to two sets of runs: the boundaries of
+    both cut the line into segments that are either fully in or out of each set.
+    """
+    boundaries = np.unique(np.concatenate([a.ravel(), b.ravel()]))
+    if not len(boundaries):
+        return _EMPTY_RUNS
+    starts, stops = boundaries[:-1], boundaries[1:]
+    keep = op(_covered(a, starts), _covered(b, starts))
+    starts, stops = starts[keep], stops[keep]
+    if not len(starts):
+        return _EMPTY_RUNS
+    # Merge the kept segments that touch.
+    new_run = np.concatenate([[True], starts[1:] != stops[:-1]])
+    last = np.concatenate([np.flatnonzero(new_run)[1:] - 1, [len(stops) - 1]])
+    return np.stack([starts[new_run], stops[last]], axis=1)
+
+
+def _and_not(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return a & ~b
+
+
+class Bitmap:
+    """
+    Fixed-size bitset over point indices, stored sparse like the containers of
+    roaring bitmaps: either as the sorted positions of the set bits ("array") or
+    as runs of consecutive set bits ("runs"), whichever is smaller. Memory and
+    AND / OR / NOT cost are proportional to the set bits or runs, not to the
+    number of points, so that a facet with many rare values (e.g. authors) stays
+    small.
+
+    Bitmaps are serialized the same way, delta-encoded.
+
+    Args:
+        positions (np.ndarray | None): Sorted unique int64 positions of the set bits.
+        runs (np.ndarray | None): Maximal runs of set bits, as (n_runs, 2) int64
+            [start, stop), when `positions` is None.
+        size (int): Number of points covered by the bitmap.
+    """
+
+    __slots__ = ("positions", "_runs", "size")
+    __hash__ = None
+
+    def __init__(self, positions: np.ndarray | None, size: int, runs: np.ndarray | None = None):
+        if (positions is None) == (runs is None):
+            raise ValueError("A bitmap is built from either its positions or its runs")
+        self.positions = positions
+        self._runs = runs
+        self.size = size
+
+    @classmethod
+    def _sparsest(cls, positions: np.ndarray | None, size: int, runs: np.ndarray | None = None) -> "Bitmap":
+        """Bitmap in the smaller of the two containers."""
+        if runs is None:
+            if len(positions) < _MIN_RUN_POSITIONS:
+                return cls(positions, size)
+            runs = _positions_to_runs(positions)
+            return cls(None, size, runs) if 2 * len(runs) < len(positions) else cls(positions, size)
+        cardinality = int((runs[:, 1] - runs[:, 0]).sum())
+        return cls(None, size, runs) if 2 * len(runs) < cardinality else cls(_runs_to_positions(runs), size)
+
+    @classmethod
+    def zeros(cls, size: int) -> "Bitmap":
+        return cls(np.zeros(0, dtype=np.int64), size)
+
+    @classmethod
+    def from_indices(cls, indices, size: int) -> "Bitmap":
+        """
+        Build a bitmap with the given point indices set.
+
+        Args:
+            indices: Iterable of point indices in [0, size).
+            size (int): Number of points.
+
+        Returns:
+            Bitmap: The bitmap.
+        """
+        positions = np.unique(np.asarray(indices, dtype=np.int64))
+        if len(positions) and (positions[0] < 0 or positions[-1] >= size):
+            raise ValueError(f"Bitmap indices must be in [0, {size})")
+        return cls._sparsest(positions, size)
+
+    def to_indices(self) -> np.ndarray:
+        """Sorted indices of the set bits."""
+        return self.positions if self.positions is not None else _runs_to_positions(self._runs)
+
+    def cardinality(self) -> int:
+        """Number of set bits."""
+        if self.positions is not None:
+            return len(self.positions)
+        return int((self._runs[:, 1] - self._runs[:, 0]).sum())
+
+    def __len__(self) -> int:
+        return self.cardinality()
+
+    def _check(self, other: "Bitmap"):
+        if self.size != other.size:
+            raise ValueError(f"Bitmap sizes differ: {self.size} != {other.size}")
+
+    def _as_runs(self) -> np.ndarray:
+        return self._runs if self._runs is not None else _positions_to_runs(self.positions)
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        self._check(other)
+        if self.positions is not None and other.positions is not None:
+            return Bitmap._sparsest(np.intersect1d(self.positions, other.positions, assume_unique=True), self.size)
+        if self.positions is not None or other.positions is not None:
+            array, runs = (self, other) if self.positions is not None else (other, self)
+            return Bitmap._sparsest(array.positions[_covered(runs._runs, array.positions)], self.size)
+        return Bitmap._sparsest(None, self.size, _combine_runs(self._runs, other._runs, np.logical_and))
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        self._check(other)
+        if self.positions is not None and other.positions is not None:
+            return Bitmap._sparsest(np.union1d(self.positions, other.positions), self.size)
+        return Bitmap._sparsest(None, self.size, _combine_runs(self._as_runs(), other._as_runs(), np.logical_or))
+
+    def __sub__(self, other: "Bitmap") -> "Bitmap":
+        self._check(other)
+        if self.positions is not None:
+            if other.positions is not None:
+                return Bitmap._sparsest(np.setdiff1d(self.positions, other.positions, assume_unique=True), self.size)
+            return Bitmap._sparsest(self.positions[~_covered(other._runs, self.positions)], self.size)
+        return Bitmap._sparsest(None, self.size, _combine_runs(self._runs, other._as_runs(), _and_not))
+
+    def __invert__(self) -> "Bitmap":
+        runs = self._as_runs()
+        # The gaps between the runs, within [0, size).
+        starts = np.concatenate([[0], runs[:, 1]])
+        stops = np.concatenate([runs[:, 0], [self.size]])
+        keep = starts < stops
+        return Bitmap._sparsest(None, self.size, np.stack([starts[keep], stops[keep]], axis=1))
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, Bitmap) and self.size == other.size and np.array_equal(self._as_runs(), other._as_runs())
+        )
+
+    def __repr__(self) -> str:
+        return f"Bitmap(size={self.size}, cardinality={self.cardinality()})"
+
+    def runs(self) -> np.ndarray:
+        """
+        Runs of consecutive set bits.
+
+        Returns:
+            np.ndarray: (n_runs, 2) array of [start, length].
+        """
+        runs = self._as_runs()
+        return np.stack([runs[:, 0], runs[:, 1] - runs[:, 0]], axis=1)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Compressed, JSON-serializable representation.
+
+        "runs" stores [gap, length] pairs where gap is the distance from the end of
+        the previous run, "array" stores the delta-encoded set positions.
+        """
+        if self.positions is not None:
+            return {"encoding": "array", "data": delta_encode(self.positions)}
+        gaps = self._runs[:, 0] - np.concatenate([[0], self._runs[:-1, 1]])
+        lengths = self._runs[:, 1] - self._runs[:, 0]
+        return {"encoding": "runs", "data": np.stack([gaps, lengths], axis=1).ravel().tolist()}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], size: int) -> "Bitmap":
+        if data["encoding"] == "array":
+            return cls._sparsest(delta_decode(data["data"]), size)
+
+        pairs = np.asarray(data["data"], dtype=np.int64).reshape(-1, 2)
+        lengths = pairs[:, 1]
+        starts = np.cumsum(pairs[:, 0] + np.concatenate([[0], lengths[:-1]]))
+        return cls._sparsest(None, size, np.stack([starts, starts + lengths], axis=1))
+
+
+class FacetIndex:
+    """
+    One bitmap per value of each facet (e.g. primary_category, year, author),
+    over the points of the visualization.
+
+    Args:
+        facets (dict[str, dict[str, Bitmap]]): {facet: {value: bitmap}}
+        size (int): Number of points.
+    """
+
+    def __init__(self, facets: dict[str, dict[str, Bitmap]], size: int):
+        self.facets = facets
+        self.size = size
+
+    @classmethod
+    def build(cls, facet_values: dict[str, list[list[str]]], size: int) -> "FacetIndex":
+        """
+        Build the facet bitmaps.
+
+        Args:
+            facet_values (dict[str, list[list[str]]]): For each facet, the values
+                of every point in point order (a point may have several values).
+            size (int): Number of points.
+
+        Returns:
+            FacetIndex: The facet index.
+        """
+        facets = {}
+        for facet, values_per_point in facet_values.items():
+            positions: dict[str, list[int]] = {}
+            for point, values in enumerate(values_per_point):
+                for value in values:
+                    points = positions.setdefault(value, [])
+                    # Points are visited in order, so each list is sorted; skip repeated values of a point.
+                    if not points or points[-1] != point:
+                        points.append(point)
+            facets[facet] = {
+                value: Bitmap._sparsest(np.asarray(points, dtype=np.int64), size) for value, points in positions.items()
+            }
+        return cls(facets, size)
+
+    def get(self, facet: str, value: str) -> Bitmap:
+        """Bitmap of the points having `value` for `facet`, empty if unknown."""
+        bitmap = self.facets[facet].get(str(value))
+        return bitmap if bitmap is not None else Bitmap.zeros(self.size)
+
+    def any_of(self, facet: str, values: list[str]) -> Bitmap:
+        """Bitmap of the points having at least one of `values` for `facet`."""
+        result = Bitmap.zeros(self.size)
+        for value in values:
+            result = result | self.get(facet, value)
+        return result
+
+    def counts(self, facet: str) -> dict[str, int]:
+        """
+        Number of points per value of `facet`.
+
+        Returns:
+            dict[str, int]: {value: count}, by decreasing count then value.
+        """
+        counts = {value: bitmap.cardinality() for value, bitmap in self.facets[facet].items()}
+        return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "size": self.size,
+            "facets": {
+                facet: {value: bitmap.to_dict() for value, bitmap in bitmaps.items()}
+                for facet, bitmaps in self.facets.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "FacetIndex":
+        size = data["size"]
+        facets = {
+            facet: {value: Bitmap.from_dict(bitmap, size) for value, bitmap in bitmaps.items()}
+            for facet, bitmaps in data["facets"].items()
+        }
+        return cls(facets, size)
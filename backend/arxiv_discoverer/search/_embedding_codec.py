@@ -0,0 +1,238 @@
+import logging
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+import numpy as np
+
+from ._ann_index import ProductQuantizer
+
+logger = logging.getLogger(__name__)
+
+STORAGE_MODES = ("float32", "float16", "int8", "pq")
+
+
+class EmbeddingCodec:
+    """
+    Storage encoding of the paper embeddings:
+
+    - ``float32``: unchanged, 4 bytes per dimension,
+    - ``float16``: half precision, 2 bytes per dimension,
+    - ``int8``: symmetric per-dimension scaling to [-127, 127], 1 byte per dimension,
+    - ``pq``: product quantization, 1 byte per sub-space (48 bytes for 384 dimensions
+      with the default 48 sub-spaces).
+
+    ``int8`` scales and ``pq`` codebooks are trained on the embeddings by `fit`.
+
+    Args:
+        mode (str): One of "float32", "float16", "int8", "pq".
+        n_subvectors (int): Number of PQ sub-spaces. Must divide the vector dimension.
+        n_centroids (int): Number of centroids per PQ sub-space (at most 256).
+        max_train_samples (int): Maximum number of vectors used for training.
+        random_state (int): For reproducibility.
+    """
+
+    def __init__(
+        self,
+        mode: str = "float16",
+        n_subvectors: int = 48,
+        n_centroids: int = 256,
+        max_train_samples: int = 100_000,
+        random_state: int = 42,
+    ):
+        if mode not in STORAGE_MODES:
+            raise ValueError(f"Unknown embedding storage mode '{mode}', expected one of {STORAGE_MODES}")
+        self.mode = mode
+        self.max_train_samples = max_train_samples
+        self.random_state = random_state
+        self.scale: np.ndarray | None = None  # (dim,) int8 scales
+        self.pq = ProductQuantizer(n_subvectors, n_centroids, random_state) if mode == "pq" else None
+
+    @property
+    def is_trained(self) -> bool:
+        if self.mode == "int8":
+            return self.scale is not None
+        if self.mode == "pq":
+            return self.pq.is_trained
+        return True
+
+    def fit(self, vectors: np.ndarray) -> "EmbeddingCodec":
+        """
+        Train the int8 scales or the PQ codebooks, a no-op for float modes.
+
+        Args:
+            vectors (np.ndarray): (N, dim) training vectors.
+
+        Returns:
+            EmbeddingCodec: The fitted codec.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(vectors) > self.max_train_samples:
+            rng = np.random.default_rng(self.random_state)
+            vectors = vectors[rng.choice(len(vectors), self.max_train_samples, replace=False)]
+        if self.mode == "int8":
+            scale = np.abs(vectors).max(axis=0) / 127.0
+            self.scale = np.where(scale > 0, scale, 1.0).astype(np.float32)
+        elif self.mode == "pq":
+            self.pq.fit(vectors)
+        return self
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Encode vectors for storage.
+
+        Args:
+            vectors (np.ndarray): (N, dim) vectors.
+
+        Returns:
+            np.ndarray: (N, dim) float32/float16/int8 or (N, n_subvectors) uint8 codes.
+        """
+        if not self.is_trained:
+            raise RuntimeError(f"The {self.mode} codec must be fitted before encoding.")
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.mode == "float16":
+            return vectors.astype(np.float16)
+        if self.mode == "int8":
+            return np.clip(np.rint(vectors / self.scale), -127, 127).astype(np.int8)
+        if self.mode == "pq":
+            return self.pq.encode(vectors)
+        return vectors
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Decode stored codes back to float32 vectors, in a single vectorized pass.
+
+        Args:
+            codes (np.ndarray): Codes returned by `encode`.
+
+        Returns:
+            np.ndarray: (N, dim) float32 vectors.
+        """
+        if self.mode == "int8":
+            return codes.astype(np.float32) * self.scale
+        if self.mode == "pq":
+            return self.pq.decode(codes)
+        return codes.astype(np.float32, copy=False)
+
+    def get_state(self) -> dict[str, Any]:
+        """Arrays and parameters of the codec, stored next to the codes."""
+        state = {"mode": self.mode, "max_train_samples": self.max_train_samples, "random_state": self.random_state}
+        if self.scale is not None:
+            state["scale"] = self.scale
+        if self.pq is not None:
+            state.update(n_subvectors=self.pq.n_subvectors, n_centroids=self.pq.n_centroids)
+            if self.pq.is_trained:
+                state["codebooks"] = self.pq.codebooks
+        return state
+
+    @classmethod
+    def from_state(cls, state: dict[str, Any]) -> "EmbeddingCodec":
+        """Rebuild a codec from `get_state`."""
+        codec = cls(
+            mode=str(state["mode"]),
+            n_subvectors=int(state.get("n_subvectors", 48)),
+            n_centroids=int(state.get("n_centroids", 256)),
+            max_train_samples=int(state["max_train_samples"]),
+            random_state=int(state["random_state"]),
+        )
+        if "scale" in state:
+            codec.scale = np.asarray(state["scale"], dtype=np.float32)
+        if "codebooks" in state:
+            codec.pq.codebooks = np.asarray(state["codebooks"], dtype=np.float32)
+        return codec
+
+
+class CompressedEmbeddings(Mapping):
+    """
+    Read-only {paper_id: embedding} mapping over encoded vectors. Single
+    embeddings are decoded on access; `vectors` decodes the whole matrix at once
+    and `values`/`items` iterate over its rows.
+
+    Args:
+        paper_ids (np.ndarray): (N,) paper ids.
+        codes (np.ndarray): Codes of the embeddings, aligned with `paper_ids`.
+        codec (EmbeddingCodec): Codec the codes were encoded with.
+        digests (np.ndarray | None): (N,) digests of the text each embedding was
+            computed from, aligned with `paper_ids`, if known.
+    """
+
+    def __init__(
+        self, paper_ids: np.ndarray, codes: np.ndarray, codec: EmbeddingCodec, digests: np.ndarray | None = None
+    ):
+        if len(paper_ids) != len(codes):
+            raise ValueError(f"{len(paper_ids)} paper ids for {len(codes)} codes.")
+        if digests is not None and len(digests) != len(paper_ids):
+            raise ValueError(f"{len(digests)} digests for {len(paper_ids)} paper ids.")
+        self.paper_ids = np.asarray(paper_ids)
+        self.codes = codes
+        self.codec = codec
+        self.digests = None if digests is None else np.asarray(digests, dtype=str)
+        self._rows: dict[str, int] | None = None
+
+    @classmethod
+    def encode(cls, embeddings_dict: Mapping[str, np.ndarray], codec: EmbeddingCodec) -> "CompressedEmbeddings":
+        """
+        Encode a {paper_id: embedding} mapping with a fitted codec.
+
+        Args:
+            embeddings_dict (Mapping[str, np.ndarray]): Embeddings to encode.
+            codec (EmbeddingCodec): Fitted codec.
+
+        Returns:
+            CompressedEmbeddings: The encoded embeddings.
+        """
+        paper_ids, vectors = embeddings_to_matrix(embeddings_dict)
+        return cls(np.asarray(paper_ids, dtype=str), codec.encode(vectors), codec)
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes
+
+    def _row(self, paper_id: str) -> int:
+        if self._rows is None:
+            self._rows = {paper_id: row for row, paper_id in enumerate(self.paper_ids.tolist())}
+        return self._rows[paper_id]
+
+    def __getitem__(self, paper_id: str) -> np.ndarray:
+        return self.codec.decode(self.codes[self._row(paper_id)][None])[0]
+
+    def __contains__(self, paper_id: object) -> bool:
+        try:
+            self._row(paper_id)
+        except (KeyError, TypeError):
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.paper_ids.tolist())
+
+    def __len__(self) -> int:
+        return len(self.paper_ids)
+
+    def vectors(self) -> np.ndarray:
+        """(N, dim) float32 matrix of the decoded embeddings."""
+        return self.codec.decode(self.codes)
+
+    def values(self) -> list[np.ndarray]:
+        return list(self.vectors())
+
+    def items(self) -> list[tuple[str, np.ndarray]]:
+        return list(zip(self.paper_ids.tolist(), self.vectors()))
+
+
+def embeddings_to_matrix(embeddings_dict: Mapping[str, np.ndarray]) -> tuple[list[str], np.ndarray]:
+    """
+    Paper ids and (N, dim) float32 matrix of an embeddings mapping, decoded in
+    one pass for `CompressedEmbeddings`.
+
+    Args:
+        embeddings_dict (Mapping[str, np.ndarray]): {paper_id: embedding}.
+
+    Returns:
+        tuple[list[str], np.ndarray]: Paper ids and their aligned vectors.
+    """
+    if isinstance(embeddings_dict, CompressedEmbeddings):
+        return embeddings_dict.paper_ids.tolist(), embeddings_dict.vectors()
+    paper_ids = list(embeddings_dict.keys())
+    if not paper_ids:
+        return paper_ids, np.zeros((0, 0), dtype=np.float32)
+    return paper_ids, np.asarray(list(embeddings_dict.values()), dtype=np.float32)
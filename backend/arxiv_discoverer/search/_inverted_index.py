@@ -0,0 +1,148 @@
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[.\-][a-z0-9]+)*")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split a text into lowercase tokens. Dots and dashes inside a token are kept,
+    so arXiv categories such as "cs.LG" or "astro-ph.GA" stay a single token.
+
+    Args:
+        text (str): Text to tokenize.
+
+    Returns:
+        list[str]: Tokens in order of appearance.
+    """
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+
+def delta_encode(values: np.ndarray) -> list[int]:
+    """Encode a sorted integer array as its first value followed by the gaps."""
+    return np.diff(values, prepend=0).tolist()
+
+
+def delta_decode(deltas: list[int]) -> np.ndarray:
+    """Inverse of `delta_encode`."""
+    return np.cumsum(np.asarray(deltas, dtype=np.int64))
+
+
+class InvertedIndex:
+    """
+    Prefix-searchable inverted index mapping tokens to the sorted indices of the
+    points (rows of the visualization `coordinates`) containing them.
+
+    Query semantics:
+        - The query is tokenized like the documents (case-insensitive).
+        - A query token matches every indexed token it is a prefix of.
+        - A point matches when every query token matches one of its fields.
+        - An empty query matches nothing.
+
+    Args:
+        terms (list[str]): Sorted vocabulary.
+        postings (list[list[int]]): Delta-encoded posting list of each term.
+        n_points (int): Number of indexed points.
+        fields (list[str]): Indexed fields.
+    """
+
+    def __init__(self, terms: list[str], postings: list[list[int]], n_points: int, fields: list[str]):
+        self.terms = terms
+        self.postings = postings
+        self.n_points = n_points
+        self.fields = fields
+
+    @classmethod
+    def build(cls, documents: list[dict[str, Any]], fields: list[str]) -> "InvertedIndex":
+        """
+        Build the index from one record per point.
+
+        Args:
+            documents (list[dict[str, Any]]): Records, in point order.
+            fields (list[str]): Fields of the records to index.
+
+        Returns:
+            InvertedIndex: The built index.
+        """
+        point_sets: dict[str, set[int]] = defaultdict(set)
+        for point, document in enumerate(documents):
+            for field in fields:
+                value = document.get(field)
+                if value is None:
+                    continue
+                for token in tokenize(value):
+                    point_sets[token].add(point)
+
+        terms = sorted(point_sets)
+        postings = [delta_encode(np.fromiter(sorted(point_sets[term]), dtype=np.int64)) for term in terms]
+        return cls(terms, postings, len(documents), fields)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "n_points": self.n_points,
+            "fields": self.fields,
+            "terms": self.terms,
+            "postings": self.postings,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "InvertedIndex":
+        return cls(data["terms"], data["postings"], data["n_points"], data["fields"])
+
+    def prefix_range(self, prefix: str) -> tuple[int, int]:
+        """
+        Range of the vocabulary starting with `prefix`.
+
+        Args:
+            prefix (str): Token prefix.
+
+        Returns:
+            tuple[int, int]: [start, end) positions in `terms`.
+        """
+        start = bisect_left(self.terms, prefix)
+        end = bisect_left(self.terms, prefix + "\uffff", lo=start)
+        return start, end
+
+    def match_prefix(self, prefix: str) -> np.ndarray:
+        """
+        Points containing a token starting with `prefix`.
+
+        Args:
+            prefix (str): Token prefix.
+
+        Returns:
+            np.ndarray: Sorted point indices.
+        """
+        start, end = self.prefix_range(prefix)
+        if start == end:
+            return np.zeros(0, dtype=np.int64)
+        if end - start == 1:
+            return delta_decode(self.postings[start])
+        return np.unique(np.concatenate([delta_decode(self.postings[i]) for i in range(start, end)]))
+
+    def search(self, query: str) -> np.ndarray:
+        """
+        Points matching every token of the query.
+
+        Args:
+            query (str): Free-text query.
+
+        Returns:
+            np.ndarray: Sorted point indices.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return np.zeros(0, dtype=np.int64)
+
+        # The longest tokens are usually the most selective, start with them.
+        result = None
+        for token in sorted(set(tokens), key=len, reverse=True):
+            matches = self.match_prefix(token)
+            result = matches if result is None else np.intersect1d(result, matches, assume_unique=True)
+            if not len(result):
+                break
+        return result
@@ -0,0 +1,213 @@
+import logging
+import re
+from collections.abc import Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_EMPTY = np.iinfo(np.uint32).max
+_SHINGLE_BASE = np.uint64(1_099_511_628_211)  # FNV-1a 64-bit prime
+_NON_WORD = re.compile(r"[\W_]+")
+# np.trapz was renamed np.trapezoid in NumPy 2.0.
+_trapezoid = getattr(np, "trapezoid", None) or np.trapz
+
+
+def normalize_text(text: str) -> bytes:
+    """Lower-cased text with punctuation and whitespace runs collapsed to one space."""
+    return _NON_WORD.sub(" ", str(text).lower()).strip().encode()
+
+
+class MinHasher:
+    """
+    MinHash signatures of the character shingles of texts, computed in
+    vectorized batches with one-permutation hashing: every shingle is hashed
+    once, the hash range is split into `n_permutations` bins and each
+    signature entry is the minimum hash of its bin. Bins left empty by short
+    texts are filled from the next non-empty bin (rotation densification).
+    This costs one hash per shingle instead of one per shingle and permutation,
+    with the same similarity estimate: the fraction of equal signature entries
+    of two texts estimates the Jaccard similarity of their shingle sets.
+
+    Args:
+        n_permutations (int): Signature length.
+        shingle_size (int): Number of characters per shingle, after `normalize_text`.
+        random_state (int): For reproducibility.
+    """
+
+    def __init__(self, n_permutations: int = 128, shingle_size: int = 5, random_state: int = 42):
+        rng = np.random.default_rng(random_state)
+        self.n_permutations = n_permutations
+        self.shingle_size = shingle_size
+        self._multiplier = rng.integers(1, 2**63, dtype=np.uint64) | np.uint64(1)
+        self._increment = rng.integers(0, 2**63, dtype=np.uint64)
+        # Offset separating a densified entry from the bin it was copied from.
+        self._rotation = np.uint32(rng.integers(1, 2**32 - 1))
+
+    def shingle_hashes(self, texts: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Hashes of the shingles of every text, concatenated.
+
+        Args:
+            texts (Sequence[str]): Texts.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: (uint64 shingle hashes, number of shingles of each text).
+        """
+        normalized = [normalize_text(text) for text in texts]
+        lengths = np.fromiter(map(len, normalized), dtype=np.int64, count=len(normalized))
+        counts = np.maximum(lengths - self.shingle_size + 1, 0)
+        data = np.frombuffer(b"".join(normalized), dtype=np.uint8)
+        n_windows = len(data) - self.shingle_size + 1
+        if n_windows <= 0 or not counts.any():
+            return np.zeros(0, dtype=np.uint64), counts
+
+        hashes = np.zeros(n_windows, dtype=np.uint64)
+        for offset in range(self.shingle_size):
+            hashes = hashes * _SHINGLE_BASE + data[offset : offset + n_windows]
+
+        # Keep the windows lying within a single text.
+        text_starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        first_shingle = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        positions = np.arange(counts.sum()) - np.repeat(first_shingle, counts) + np.repeat(text_starts, counts)
+        return hashes[positions], counts
+
+    def signatures(self, texts: Sequence[str], batch_size: int = 4096) -> np.ndarray:
+        """
+        MinHash signatures of texts. Texts shorter than a shingle get a signature
+        of `_EMPTY` values, and are never considered duplicates.
+
+        Args:
+            texts (Sequence[str]): Texts.
+            batch_size (int): Number of texts hashed at once.
+
+        Returns:
+            np.ndarray: (len(texts), n_permutations) uint32 signatures.
+        """
+        n_bins = self.n_permutations
+        signatures = np.full((len(texts), n_bins), _EMPTY, dtype=np.uint32)
+        for start in range(0, len(texts), batch_size):
+            hashes, counts = self.shingle_hashes(texts[start : start + batch_size])
+            if not len(hashes):
+                continue
+            hashes = (hashes * self._multiplier + self._increment) >> np.uint64(32)
+            bins = (hashes * np.uint64(n_bins)) >> np.uint64(32)
+            keys = np.repeat(np.arange(len(counts)) * n_bins, counts) + bins.astype(np.int64)
+            batch = np.full(len(counts) * n_bins, _EMPTY, dtype=np.uint32)
+            np.minimum.at(batch, keys, hashes.astype(np.uint32))
+            signatures[start : start + len(counts)] = self._densify(batch.reshape(len(counts), n_bins))
+        return signatures
+
+    def _densify(self, signatures: np.ndarray) -> np.ndarray:
+        """Fill each empty bin with the next non-empty bin, circularly, plus `_rotation` per bin skipped."""
+        empty = signatures == _EMPTY
+        partial = np.flatnonzero(empty.any(axis=1) & ~empty.all(axis=1))
+        if not len(partial):
+            return signatures
+        n_bins = self.n_permutations
+        positions = np.arange(2 * n_bins)
+        candidates = np.where(np.tile(~empty[partial], 2), positions, 2 * n_bins)
+        following = np.minimum.accumulate(candidates[:, ::-1], axis=1)[:, ::-1][:, :n_bins]
+        distance = (following - positions[:n_bins]).astype(np.uint32)
+        values = np.take_along_axis(signatures[partial], following % n_bins, axis=1)
+        signatures[partial] = values + distance * self._rotation
+        return signatures
+
+
+def lsh_parameters(threshold: float, n_permutations: int, false_negative_weight: float = 0.8) -> tuple[int, int]:
+    """
+    Number of bands and rows per band whose LSH S-curve best separates
+    similarities above and below `threshold`, by minimizing the weighted areas
+    of false positives and false negatives. Candidates are verified on their
+    signatures afterwards, so false negatives weigh more by default.
+
+    Args:
+        threshold (float): Jaccard similarity threshold.
+        n_permutations (int): Signature length.
+        false_negative_weight (float): Weight of false negatives, in [0, 1].
+
+    Returns:
+        tuple[int, int]: (n_bands, rows_per_band), with n_bands * rows_per_band <= n_permutations.
+    """
+    below = np.linspace(0, threshold, 200)
+    above = np.linspace(threshold, 1, 200)
+    best, best_error = (1, n_permutations), np.inf
+    for rows in range(1, n_permutations + 1):
+        bands = n_permutations // rows
+        false_positives = _trapezoid(1 - (1 - below**rows) ** bands, below)
+        false_negatives = _trapezoid((1 - above**rows) ** bands, above)
+        error = (1 - false_negative_weight) * false_positives + false_negative_weight * false_negatives
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+def near_duplicate_representatives(
+    signatures: np.ndarray, threshold: float = 0.9, n_bands: int | None = None, rows_per_band: int | None = None
+) -> np.ndarray:
+    """
+    Group near-duplicate texts with LSH banding over their MinHash signatures.
+
+    Texts sharing a band bucket are candidates; a candidate is linked to the
+    first text of its bucket when their estimated similarity reaches
+    `threshold`, links are merged into groups, and the first text of each
+    group is its representative. Members less similar than `threshold` to
+    their representative, through chains of links, are kept on their own.
+
+    Args:
+        signatures (np.ndarray): (N, n_permutations) signatures from `MinHasher.signatures`.
+        threshold (float): Estimated Jaccard similarity above which texts are duplicates.
+        n_bands (int | None): Number of LSH bands, from `lsh_parameters` if None.
+        rows_per_band (int | None): Signature entries per band, from `lsh_parameters` if None.
+
+    Returns:
+        np.ndarray: (N,) row of the representative of each text, itself if it has no duplicate.
+    """
+    n_texts, n_permutations = signatures.shape
+    if n_bands is None or rows_per_band is None:
+        n_bands, rows_per_band = lsh_parameters(threshold, n_permutations)
+    representatives = np.arange(n_texts)
+    rows = np.flatnonzero((signatures != _EMPTY).any(axis=1))
+    if len(rows) <= 1:
+        # No pair to compare.
+        return representatives
+
+    rng = np.random.default_rng(0)
+    mixers = rng.integers(1, 2**63, size=rows_per_band, dtype=np.uint64) | np.uint64(1)
+    left, right = [], []
+    for band in range(n_bands):
+        columns = slice(band * rows_per_band, (band + 1) * rows_per_band)
+        keys = (signatures[rows, columns].astype(np.uint64) * mixers).sum(axis=1)
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        group_start = np.flatnonzero(np.concatenate([[True], sorted_keys[1:] != sorted_keys[:-1]]))
+        heads = np.repeat(order[group_start], np.diff(np.append(group_start, len(order))))
+        linked = heads != order
+        left.append(rows[order[linked]])
+        right.append(rows[heads[linked]])
+
+    if not any(len(pairs) for pairs in left):
+        return representatives
+    pairs = np.unique(np.stack([np.concatenate(left), np.concatenate(right)], axis=1), axis=0)
+    pairs = pairs[_similarity(signatures, pairs[:, 0], pairs[:, 1]) >= threshold]
+
+    # Connected components labelled by their smallest row, by min-label propagation.
+    labels = representatives.copy()
+    while len(pairs):
+        updated = labels.copy()
+        np.minimum.at(updated, pairs[:, 0], labels[pairs[:, 1]])
+        np.minimum.at(updated, pairs[:, 1], labels[pairs[:, 0]])
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            break
+        labels = updated
+
+    members = np.flatnonzero(labels != representatives)
+    close = _similarity(signatures, members, labels[members]) >= threshold
+    representatives[members[close]] = labels[members[close]]
+    return representatives
+
+
+def _similarity(signatures: np.ndarray, rows: np.ndarray, other_rows: np.ndarray) -> np.ndarray:
+    """Estimated Jaccard similarity of the pairs (rows[i], other_rows[i])."""
+    return (signatures[rows] == signatures[other_rows]).mean(axis=1)
@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import pickle
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+from arxiv_discoverer.embedding_service import EmbeddingClient, encode_with_service
+
+from ._ann_index import IVFPQIndex
+
+logger = logging.getLogger(__name__)
+
+_model_lock = threading.Lock()
+
+
+def get_model(model_path: str):
+    """
+    Load a SentenceTransformer once per process, so repeated queries do not pay
+    the model loading cost. Concurrent callers wait for a single load.
+
+    Args:
+        model_path (str): Path or name of the SentenceTransformer model.
+
+    Returns:
+        SentenceTransformer: The loaded model.
+    """
+    with _model_lock:
+        return _load_model(model_path)
+
+
+@lru_cache(maxsize=4)
+def _load_model(model_path: str):
+    from sentence_transformers import SentenceTransformer
+
+    logger.info(f"Loading embedding model {model_path}")
+    return SentenceTransformer(model_path)
+
+
+def load_ann_index(index_path: str) -> IVFPQIndex:
+    """
+    Load a persisted ANN index.
+
+    Args:
+        index_path (str): Path of the pickled index written by the pipeline.
+
+    Returns:
+        IVFPQIndex: The loaded index.
+    """
+    with Path(index_path).open("rb") as f:
+        return pickle.load(f)
+
+
+def search_similar_papers(  # noqa: PLR0913, PLR0917
+    text: str,
+    index: IVFPQIndex,
+    model_path: str,
+    k: int = 10,
+    n_probe: int | None = None,
+    embedding_service: str | None = None,
+) -> list[tuple[str, float]]:
+    """
+    Find the papers semantically closest to a free text.
+
+    The text is encoded with the same model and normalization as
+    `create_embeddings`, so scores are cosine similarities.
+
+    Args:
+        text (str): Query text, e.g. a title or an abstract.
+        index (IVFPQIndex): ANN index built by the embedding pipeline.
+        model_path (str): Path to the SentenceTransformer model used for the index.
+        k (int): Number of results.
+        n_probe (int | None): Override of the number of inverted lists scanned.
+        embedding_service (str | None): "host:port" of an embedding server serving
+            `model_path`, the model is loaded in-process if None.
+
+    Returns:
+        list[tuple[str, float]]: (paper_id, score) pairs, best first.
+    """
+    if embedding_service:
+        query = asyncio.run(encode_with_service(embedding_service, [text]))[0]
+    else:
+        query = get_model(model_path).encode([text], normalize_embeddings=True)[0]
+    return index.search(query, k=k, n_probe=n_probe)
+
+
+async def search_similar_papers_async(
+    text: str,
+    index: IVFPQIndex,
+    client: EmbeddingClient,
+    k: int = 10,
+    n_probe: int | None = None,
+) -> list[tuple[str, float]]:
+    """
+    `search_similar_papers` for asyncio applications: the text is encoded by the
+    embedding server behind `client`, batched with the other concurrent queries.
+
+    Args:
+        text (str): Query text, e.g. a title or an abstract.
+        index (IVFPQIndex): ANN index built by the embedding pipeline.
+        client (EmbeddingClient): Connected client of the embedding server.
+        k (int): Number of results.
+        n_probe (int | None): Override of the number of inverted lists scanned.
+
+    Returns:
+        list[tuple[str, float]]: (paper_id, score) pairs, best first.
+    """
+    query = (await client.encode([text]))[0]
+    return index.search(query, k=k, n_probe=n_probe)
@@ -0,0 +1,20 @@
+"""
+Read-optimized HTTP API over the serving artifacts of the dimensionality
+reduction pipeline, so the frontend can look up a paper, a shard of details
+or a range of coordinates without downloading the whole visualization JSON.
+
+Start it with ``python -m arxiv_discoverer.serving data/07_model_output/serving``.
+"""
+
+from ._artifacts import ServingArtifacts, visualization_id, write_serving_artifacts
+from ._http import negotiate_encoding, parse_range
+from ._server import ArtifactServer
+
+__all__ = [
+    "ArtifactServer",
+    "ServingArtifacts",
+    "negotiate_encoding",
+    "parse_range",
+    "visualization_id",
+    "write_serving_artifacts",
+]
@@ -0,0 +1,35 @@
+"""Serve the artifacts: ``python -m arxiv_discoverer.serving data/07_model_output/serving``."""
+
+import argparse
+import logging
+
+from ._artifacts import ServingArtifacts
+from ._server import ArtifactServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP API over memory-mapped serving artifacts.")
+    parser.add_argument("artifacts", nargs="?", default="data/07_model_output/serving", help="Artifacts directory.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--compression-cache-mb", type=int, default=64)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    server = ArtifactServer(
+        ServingArtifacts(args.artifacts),
+        host=args.host,
+        port=args.port,
+        compression_cache_bytes=args.compression_cache_mb << 20,
+    )
+    logging.getLogger(__name__).info(f"Serving {len(server.artifacts)} papers on {server.address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
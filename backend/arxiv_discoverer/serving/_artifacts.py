@@ -0,0 +1,229 @@
+import hashlib
+import json
+import logging
+import mmap
+import os
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+ID_BYTES = 32
+
+# name: (dtype, row width). All files are raw little-endian arrays, so they can be
+# memory-mapped as is and served, or byte-ranged, without any decoding.
+_ARRAY_FILES = {
+    "coordinates.f32": ("<f4", 3),  # (N, 3) points, in visualization order
+    "ids.bin": (f"S{ID_BYTES}", 1),  # (N,) visualization ids, in visualization order
+    "id_index_keys.bin": (f"S{ID_BYTES}", 1),  # (N,) sorted ids
+    "id_index_rows.u32": ("<u4", 1),  # (N,) row of each sorted id
+    "details_offsets.u64": ("<u8", 1),  # (N + 1,) byte offsets of the rows of details.ndjson
+}
+DETAILS_FILE = "details.ndjson"
+
+
+def visualization_id(paper_id: str) -> str:
+    """Visualization id of a paper: the MD5 hex digest of its arXiv id, see `create_visualization_json`."""
+    return hashlib.md5(str(paper_id).encode()).hexdigest()
+
+
+def write_serving_artifacts(  # noqa: PLR0913
+    directory: str | Path,
+    ids: Iterable[str],
+    coordinates: np.ndarray,
+    details: Iterable[tuple[str, dict[str, Any]]],
+    *,
+    shard_size: int = 1000,
+    metadata: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Write the read-optimized files served by `ArtifactServer`.
+
+    Details are written as one JSON line per paper, with a byte offsets array,
+    so that a paper or a shard of consecutive papers is a slice of the file.
+    Every file is written next to its destination then renamed, the manifest
+    last, so a server never maps a partially written build.
+
+    Args:
+        directory (str | Path): Output directory.
+        ids (Iterable[str]): Visualization ids (32 hex characters), in row order.
+        coordinates (np.ndarray): (N, 3) coordinates, in row order.
+        details (Iterable[tuple[str, dict[str, Any]]]): (id, details) pairs, in row order.
+        shard_size (int): Number of papers per detail shard.
+        metadata (dict[str, Any] | None): Visualization metadata copied to the manifest.
+
+    Returns:
+        dict[str, Any]: The manifest.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    ids = list(ids)
+    if any(len(paper_id) != ID_BYTES for paper_id in ids):
+        raise ValueError(f"Serving ids must be {ID_BYTES}-character visualization ids")
+    coordinates = np.ascontiguousarray(coordinates, dtype="<f4").reshape(len(ids), 3)
+    id_array = np.array(ids, dtype=f"S{ID_BYTES}")
+    order = np.argsort(id_array, kind="stable")
+
+    files = {}
+    offsets = np.zeros(len(ids) + 1, dtype="<u8")
+    with _AtomicFile(directory / DETAILS_FILE) as f:
+        row = -1
+        for row, (paper_id, paper_details) in enumerate(details):
+            if row >= len(ids) or paper_id != ids[row]:
+                raise ValueError(f"Details row {row} ({paper_id}) does not match the ids")
+            f.write(json.dumps({"id": paper_id, **paper_details}, separators=(",", ":")).encode() + b"\n")
+            offsets[row + 1] = f.size
+        if row + 1 != len(ids):
+            raise ValueError(f"Got details for {row + 1} papers, expected {len(ids)}")
+    files[DETAILS_FILE] = f.describe()
+
+    arrays = {
+        "coordinates.f32": coordinates,
+        "ids.bin": id_array,
+        "id_index_keys.bin": id_array[order],
+        "id_index_rows.u32": order.astype("<u4"),
+        "details_offsets.u64": offsets,
+    }
+    for name, array in arrays.items():
+        with _AtomicFile(directory / name) as f:
+            f.write(array.tobytes())
+        files[name] = f.describe()
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "total_papers": len(ids),
+        "shard_size": shard_size,
+        "build_id": hashlib.sha256("".join(files[name]["sha256"] for name in sorted(files)).encode()).hexdigest(),
+        "files": files,
+        "metadata": metadata or {},
+    }
+    with _AtomicFile(directory / MANIFEST_FILE) as f:
+        f.write(json.dumps(manifest, indent=2).encode())
+    logger.info(
+        f"Wrote serving artifacts of {len(ids)} papers to {directory} "
+        f"({sum(file['bytes'] for file in files.values()) / 2**20:.1f} MiB)"
+    )
+    return manifest
+
+
+class _AtomicFile:
+    """Binary file written to `<path>.tmp`, hashed on the fly and renamed to `path` on success."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.size = 0
+        self._sha256 = hashlib.sha256()
+
+    def __enter__(self) -> "_AtomicFile":
+        self._file = open(self.path.with_name(self.path.name + ".tmp"), "wb")
+        return self
+
+    def write(self, data: bytes) -> None:
+        self._file.write(data)
+        self._sha256.update(data)
+        self.size += len(data)
+
+    def describe(self) -> dict[str, Any]:
+        return {"bytes": self.size, "sha256": self._sha256.hexdigest()}
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        self._file.close()
+        if exc_type is None:
+            os.replace(self._file.name, self.path)
+        else:
+            os.remove(self._file.name)
+
+
+class ServingArtifacts:
+    """
+    Memory-mapped serving artifacts written by `write_serving_artifacts`.
+    Nothing is read upfront: pages are loaded by the OS on access and shared
+    by all the server threads (and processes).
+
+    Args:
+        directory (str | Path): Directory of the artifacts.
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.manifest = json.loads((self.directory / MANIFEST_FILE).read_bytes())
+        if self.manifest["format_version"] != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported serving artifacts version {self.manifest['format_version']}, expected {FORMAT_VERSION}"
+            )
+        self._buffers = {name: self._map(name) for name in [DETAILS_FILE, *_ARRAY_FILES]}
+        arrays = {}
+        for name, (dtype, width) in _ARRAY_FILES.items():
+            array = np.frombuffer(self._buffers[name], dtype=dtype)
+            arrays[name] = array.reshape(-1, width) if width > 1 else array
+        self.coordinates = arrays["coordinates.f32"]
+        self.ids = arrays["ids.bin"]
+        self._index_keys = arrays["id_index_keys.bin"]
+        self._index_rows = arrays["id_index_rows.u32"]
+        self._offsets = arrays["details_offsets.u64"]
+
+    def _map(self, name: str) -> mmap.mmap | bytes:
+        with open(self.directory / name, "rb") as f:
+            # Empty files cannot be mapped.
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b""
+
+    def __len__(self) -> int:
+        return self.manifest["total_papers"]
+
+    @property
+    def shard_size(self) -> int:
+        return self.manifest["shard_size"]
+
+    @property
+    def n_shards(self) -> int:
+        return -(-len(self) // self.shard_size)
+
+    def file_digest(self, name: str) -> str:
+        return self.manifest["files"][name]["sha256"]
+
+    def file_bytes(self, name: str) -> memoryview:
+        """Whole content of an artifact file, without copy."""
+        return memoryview(self._buffers[name])
+
+    def row_of(self, paper_id: str) -> int | None:
+        """
+        Row of a paper, found by binary search in the sorted id index.
+
+        Args:
+            paper_id (str): Visualization id, or arXiv id (hashed to its visualization id).
+
+        Returns:
+            int | None: The row, or None if the paper is unknown.
+        """
+        if len(paper_id) != ID_BYTES:
+            paper_id = visualization_id(paper_id)
+        key = paper_id.encode("ascii", errors="replace")
+        position = int(np.searchsorted(self._index_keys, key))
+        if position < len(self._index_keys) and self._index_keys[position] == key:
+            return int(self._index_rows[position])
+        return None
+
+    def detail_bytes(self, row: int) -> memoryview:
+        """JSON details of the paper at `row`, without copy."""
+        return self.file_bytes(DETAILS_FILE)[int(self._offsets[row]) : int(self._offsets[row + 1]) - 1]
+
+    def shard_bytes(self, shard: int) -> memoryview:
+        """NDJSON details of the papers of a shard, without copy."""
+        start = shard * self.shard_size
+        end = min(start + self.shard_size, len(self))
+        return self.file_bytes(DETAILS_FILE)[int(self._offsets[start]) : int(self._offsets[end])]
+
+    def close(self) -> None:
+        self.coordinates = self.ids = self._index_keys = self._index_rows = self._offsets = None
+        for buffer in self._buffers.values():
+            if isinstance(buffer, mmap.mmap):
+                try:
+                    buffer.close()
+                except BufferError:
+                    # A response still holds a view, the mapping is released with it.
+                    pass
@@ -0,0 +1,106 @@
+import gzip
+from importlib.util import find_spec
+
+# Preferred first when the client accepts several encodings with the same weight.
+ENCODINGS = ("br", "gzip")
+
+
+class RangeNotSatisfiable(ValueError):
+    """The Range header selects no byte of the resource."""
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """
+    Byte range selected by a Range header.
+
+    Only single ranges are honoured; multiple ranges, like malformed headers,
+    return None so the whole resource is served, as RFC 9110 allows.
+
+    Args:
+        header (str | None): Value of the Range header.
+        size (int): Size of the resource in bytes.
+
+    Returns:
+        tuple[int, int] | None: [start, end) byte offsets, or None to serve the whole resource.
+
+    Raises:
+        RangeNotSatisfiable: The range starts past the end of the resource.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[len("bytes=") :].strip().partition("-")
+    try:
+        if not first:
+            suffix = int(last)
+            if suffix <= 0:
+                raise RangeNotSatisfiable(header)
+            return max(size - suffix, 0), size
+        start = int(first)
+        end = int(last) + 1 if last else size
+    except ValueError:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+    if end <= start:
+        return None
+    return start, min(end, size)
+
+
+def available_encodings() -> tuple[str, ...]:
+    """`ENCODINGS` usable in this environment, "br" requiring the optional 'brotli' package."""
+    return tuple(encoding for encoding in ENCODINGS if encoding != "br" or find_spec("brotli") is not None)
+
+
+def negotiate_encoding(accept_encoding: str | None, available: tuple[str, ...] = ENCODINGS) -> str | None:
+    """
+    Content coding to respond with given an Accept-Encoding header.
+
+    Args:
+        accept_encoding (str | None): Value of the Accept-Encoding header.
+        available (tuple[str, ...]): Codings the server can produce, by preference.
+
+    Returns:
+        str | None: "br", "gzip", or None for the identity coding.
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        weight = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding.lower()] = weight
+    wildcard = weights.get("*", 0.0)
+    best, best_weight = None, 0.0
+    for coding in available:
+        weight = weights.get(coding, wildcard)
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def etag_matches(if_none_match: str | None, etags: tuple[str, ...]) -> bool:
+    """Whether an If-None-Match header matches one of `etags`, with the weak comparison of RFC 9110."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return any(etag.removeprefix("W/") in candidates for etag in etags)
+
+
+def compress(body: bytes | memoryview, encoding: str) -> bytes:
+    """Compress a response body with "gzip" or "br"."""
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6, mtime=0)
+    try:
+        import brotli
+    except ImportError as exc:
+        raise ImportError("Brotli compression requires the 'brotli' package.") from exc
+    return brotli.compress(bytes(body), quality=5)
@@ -0,0 +1,244 @@
+import json
+import logging
+import re
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import NamedTuple
+from urllib.parse import unquote, urlsplit
+
+from ._artifacts import DETAILS_FILE, ServingArtifacts
+from ._http import (
+    RangeNotSatisfiable,
+    available_encodings,
+    compress,
+    etag_matches,
+    negotiate_encoding,
+    parse_range,
+)
+
+logger = logging.getLogger(__name__)
+
+# Smaller bodies fit in a packet anyway, compressing them only costs CPU.
+MIN_COMPRESS_BYTES = 1024
+
+# Binary files served as they are, by path.
+_FILES = {"coordinates": "coordinates.f32", "ids": "ids.bin"}
+_SHARD_PATH = re.compile(r"details/shards/(\d+)")
+_PAPER_PATH = re.compile(r"papers/([^/]+)")
+
+
+class Resource(NamedTuple):
+    body: bytes | memoryview
+    content_type: str
+    etag: str
+
+
+class ArtifactServer(ThreadingHTTPServer):
+    """
+    HTTP API over memory-mapped `ServingArtifacts`:
+
+    - ``GET /metadata``: manifest, bounds and statistics of the visualization,
+    - ``GET /coordinates``: (N, 3) little-endian float32 points, ``GET /ids``: their
+      32-byte ids; byte ranges select rows (12 and 32 bytes per row),
+    - ``GET /details/shards/<k>``: NDJSON details of rows [k * shard_size, (k + 1) * shard_size),
+    - ``GET /papers/<id>``: details of one paper, by visualization or arXiv id.
+
+    Responses carry strong ETags derived from the artifact digests and honour
+    ``If-None-Match``, single ``Range`` requests (with ``If-Range``) and
+    gzip/brotli ``Accept-Encoding``. Compressed bodies are cached, up to
+    `compression_cache_bytes`.
+
+    Args:
+        artifacts (ServingArtifacts): Artifacts to serve.
+        host (str): Interface to listen on.
+        port (int): Port to listen on, 0 picks a free port.
+        compression_cache_bytes (int): Size of the compressed bodies cache.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        artifacts: ServingArtifacts,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        compression_cache_bytes: int = 64 << 20,
+    ):
+        self.artifacts = artifacts
+        self.encodings = available_encodings()
+        self.compression_cache_bytes = compression_cache_bytes
+        self._compressed: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+        self._compressed_bytes = 0
+        self._compressed_lock = threading.Lock()
+        self._metadata = self._metadata_resource()
+        super().__init__((host, port), ArtifactRequestHandler)
+
+    @property
+    def address(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_in_background(self) -> threading.Thread:
+        """Serve from a daemon thread, until `shutdown` is called."""
+        thread = threading.Thread(target=self.serve_forever, name="artifact-server", daemon=True)
+        thread.start()
+        logger.info(f"Serving {len(self.artifacts)} papers on {self.address}")
+        return thread
+
+    def _metadata_resource(self) -> Resource:
+        manifest = self.artifacts.manifest
+        body = {
+            "total_papers": manifest["total_papers"],
+            "shard_size": manifest["shard_size"],
+            "n_shards": self.artifacts.n_shards,
+            "build_id": manifest["build_id"],
+            "files": {name: file["bytes"] for name, file in manifest["files"].items()},
+            "metadata": manifest["metadata"],
+        }
+        return Resource(json.dumps(body).encode(), "application/json", _etag(manifest["build_id"]))
+
+    def resource(self, path: str) -> Resource | None:
+        """Resource at `path`, None if there is none."""
+        path = path.strip("/")
+        if path == "metadata":
+            return self._metadata
+        if path in _FILES:
+            name = _FILES[path]
+            return Resource(
+                self.artifacts.file_bytes(name), "application/octet-stream", _etag(self.artifacts.file_digest(name))
+            )
+        if shard := _SHARD_PATH.fullmatch(path):
+            return self._shard(int(shard.group(1)))
+        if paper := _PAPER_PATH.fullmatch(path):
+            return self._paper(unquote(paper.group(1)))
+        return None
+
+    def _shard(self, shard: int) -> Resource | None:
+        artifacts = self.artifacts
+        if shard >= artifacts.n_shards:
+            return None
+        etag = _etag(artifacts.file_digest(DETAILS_FILE), f"s{artifacts.shard_size}.{shard}")
+        return Resource(artifacts.shard_bytes(shard), "application/x-ndjson", etag)
+
+    def _paper(self, paper_id: str) -> Resource | None:
+        artifacts = self.artifacts
+        row = artifacts.row_of(paper_id)
+        if row is None:
+            return None
+        return Resource(artifacts.detail_bytes(row), "application/json", _etag(artifacts.file_digest(DETAILS_FILE), f"r{row}"))
+
+    def compressed(self, resource: Resource, encoding: str) -> bytes:
+        """Body of `resource` compressed with `encoding`, cached by ETag."""
+        key = (resource.etag, encoding)
+        with self._compressed_lock:
+            body = self._compressed.get(key)
+            if body is not None:
+                self._compressed.move_to_end(key)
+                return body
+        body = compress(resource.body, encoding)
+        with self._compressed_lock:
+            if key not in self._compressed and len(body) <= self.compression_cache_bytes:
+                self._compressed[key] = body
+                self._compressed_bytes += len(body)
+                while self._compressed_bytes > self.compression_cache_bytes:
+                    _, evicted = self._compressed.popitem(last=False)
+                    self._compressed_bytes -= len(evicted)
+        return body
+
+
+def _etag(digest: str, suffix: str = "") -> str:
+    return f'"{digest[:20]}{"-" + suffix if suffix else ""}"'
+
+
+def _variant_etag(etag: str, encoding: str | None) -> str:
+    return etag if encoding is None else f'{etag[:-1]}-{encoding}"'
+
+
+class ArtifactRequestHandler(BaseHTTPRequestHandler):
+    """Request handler of `ArtifactServer`, with keep-alive connections."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes: with Nagle's algorithm, the body
+    # waits for the client's delayed ACK of the headers (~40 ms per response).
+    disable_nagle_algorithm = True
+    server: ArtifactServer
+
+    def do_GET(self) -> None:
+        self._respond(send_body=True)
+
+    def do_HEAD(self) -> None:
+        self._respond(send_body=False)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _respond(self, send_body: bool) -> None:
+        resource = self.server.resource(urlsplit(self.path).path)
+        if resource is None:
+            self._send_error(HTTPStatus.NOT_FOUND, f"No resource at {self.path}")
+            return
+
+        size = len(resource.body)
+        byte_range = None
+        if_range = self.headers.get("If-Range")
+        if if_range is None or if_range.strip() == resource.etag:
+            try:
+                byte_range = parse_range(self.headers.get("Range"), size)
+            except RangeNotSatisfiable:
+                self._send_error(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE, "Range not satisfiable", {
+                    "Content-Range": f"bytes */{size}"
+                })
+                return
+
+        # Ranges address the identity representation, only whole bodies are compressed.
+        encoding = None
+        if byte_range is None and size >= MIN_COMPRESS_BYTES:
+            encoding = negotiate_encoding(self.headers.get("Accept-Encoding"), self.server.encodings)
+        etag = _variant_etag(resource.etag, encoding)
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+            "Accept-Ranges": "bytes",
+            "Access-Control-Allow-Origin": "*",
+            "Access-Control-Expose-Headers": "ETag, Content-Range",
+        }
+
+        variants = tuple(_variant_etag(resource.etag, coding) for coding in (None, *self.server.encodings))
+        if etag_matches(self.headers.get("If-None-Match"), variants):
+            self._send(HTTPStatus.NOT_MODIFIED, headers)
+            return
+
+        headers["Content-Type"] = resource.content_type
+        if byte_range is not None:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+            self._send(HTTPStatus.PARTIAL_CONTENT, headers, resource.body[start:end], send_body)
+        elif encoding is not None:
+            headers["Content-Encoding"] = encoding
+            self._send(HTTPStatus.OK, headers, self.server.compressed(resource, encoding), send_body)
+        else:
+            self._send(HTTPStatus.OK, headers, resource.body, send_body)
+
+    def _send(
+        self,
+        status: HTTPStatus,
+        headers: dict[str, str],
+        body: bytes | memoryview = b"",
+        send_body: bool = True,
+    ) -> None:
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body and body:
+            self.wfile.write(body)
+
+    def _send_error(self, status: HTTPStatus, message: str, headers: dict[str, str] | None = None) -> None:
+        body = json.dumps({"error": message}).encode()
+        self._send(status, {**(headers or {}), "Content-Type": "application/json"}, body)
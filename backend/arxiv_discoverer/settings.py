@@ -3,11 +3,36 @@ from the Kedro defaults. For further information, including these default values
 https://docs.kedro.org/en/stable/kedro_project_setup/settings.html."""
 
 # Instantiated project hooks.
-# For example, after creating a hooks.py and defining a ProjectHooks class there, do
-# from arxiv_discoverer.hooks import ProjectHooks
+from arxiv_discoverer.hooks import (  # noqa: E402
+    NodeMetricsHooks,
+    NodeProfilerHooks,
+    RunCacheHooks,
+)
 
 # Hooks are executed in a Last-In-First-Out (LIFO) order.
-# HOOKS = (ProjectHooks(),)
+# NodeMetricsHooks traces Python allocations only with ARXIV_TRACE_ALLOCATIONS=1
+# or --params "trace_allocations=true".
+# NodeProfilerHooks only profiles the nodes named in ARXIV_PROFILE_NODES or
+# --params "profile_nodes=...", it does nothing otherwise.
+# RunCacheHooks skips the listed nodes when their inputs and parameters are
+# unchanged; ARXIV_FORCE_RERUN or --params "force_rerun=true" recomputes them.
+HOOKS = (
+    NodeMetricsHooks(output_dir="data/08_reporting"),
+    NodeProfilerHooks(output_dir="data/08_reporting/profiles"),
+    RunCacheHooks(
+        nodes=[
+            "reduce_vectors_dimensionality_node",
+            "merge_embeddings_metadata_node",
+            "create_facet_index_node",
+            "create_search_index_node",
+            "create_cluster_summaries_node",
+        ],
+        cache_dir="data/09_cache",
+        max_entries_per_node=3,
+        max_age_days=30,
+        max_size_mb=10_000,
+    ),
+)
 
 # Installed plugins for which to disable hook auto-registration.
 # DISABLE_HOOKS_FOR_PLUGINS = ("kedro-viz",)
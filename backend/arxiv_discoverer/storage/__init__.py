@@ -0,0 +1,27 @@
+"""Low-level local and S3 storage helpers shared by datasets and nodes."""
+
+from ._s3 import (
+    S3Reader,
+    S3StreamReader,
+    get_s3_client,
+    s3_client_kwargs,
+    split_s3_path,
+)
+from ._sinks import (
+    LocalSink,
+    S3Sink,
+    make_sink,
+    write_to_sinks,
+)
+
+__all__ = [
+    "LocalSink",
+    "S3Reader",
+    "S3Sink",
+    "S3StreamReader",
+    "get_s3_client",
+    "make_sink",
+    "s3_client_kwargs",
+    "split_s3_path",
+    "write_to_sinks",
+]
@@ -0,0 +1,222 @@
+import io
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO
+
+logger = logging.getLogger(__name__)
+
+MB = 1 << 20
+# MD5 hex digest, followed by the number of parts for multipart uploads.
+_ETAG = re.compile(r"[0-9a-f]{32}(-\d+)?")
+
+
+def s3_client_kwargs(credentials: dict[str, Any] | None) -> dict[str, Any]:
+    """
+    Translate fsspec/s3fs style credentials, as used in the Kedro catalog, into
+    `boto3.client` arguments.
+
+    Args:
+        credentials (dict[str, Any] | None): {"key", "secret", "token", "client_kwargs"}
+
+    Returns:
+        dict[str, Any]: Keyword arguments for `boto3.client("s3", ...)`.
+    """
+    credentials = credentials or {}
+    kwargs = dict(credentials.get("client_kwargs", {}))
+    for fsspec_name, boto_name in (
+        ("key", "aws_access_key_id"),
+        ("secret", "aws_secret_access_key"),
+        ("token", "aws_session_token"),
+    ):
+        if credentials.get(fsspec_name):
+            kwargs[boto_name] = credentials[fsspec_name]
+    return kwargs
+
+
+def split_s3_path(path: str) -> tuple[str, str]:
+    """Split "s3://bucket/key" into (bucket, key)."""
+    bucket, _, key = path.removeprefix("s3://").partition("/")
+    return bucket, key
+
+
+_clients: dict[str, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def get_s3_client(credentials: dict[str, Any] | None = None, max_pool_connections: int = 32):
+    """
+    Shared S3 client for the given credentials. boto3 clients are thread-safe but
+    creating them is slow and not thread-safe, so a single client, with a
+    connection pool large enough for parallel transfers, is created per
+    credentials and reused by every caller.
+
+    Args:
+        credentials (dict[str, Any] | None): fsspec style S3 credentials.
+        max_pool_connections (int): Size of the HTTP connection pool.
+
+    Returns:
+        The boto3 S3 client.
+    """
+    import boto3  # deferred: boto3 is slow to import and only needed for S3 I/O
+    from botocore.config import Config
+
+    kwargs = s3_client_kwargs(credentials)
+    cache_key = json.dumps([kwargs, max_pool_connections], sort_keys=True, default=str)
+    with _clients_lock:
+        if cache_key not in _clients:
+            config = Config(max_pool_connections=max_pool_connections, retries={"mode": "adaptive"})
+            _clients[cache_key] = boto3.session.Session().client("s3", config=config, **kwargs)
+        return _clients[cache_key]
+
+
+def _is_missing(error: Exception) -> bool:
+    return error.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound")
+
+
+class S3StreamReader(io.RawIOBase):
+    """Raw stream over an S3 object body, so it can be wrapped in a `BufferedReader`."""
+
+    def __init__(self, body):
+        self._body = body
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._body.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        self._body.close()
+        super().close()
+
+
+class S3Reader:
+    """
+    Reads S3 objects through a shared client.
+
+    - `open` streams an object in chunks of `chunk_size`, to be passed straight to
+      parsers such as `pd.read_csv`,
+    - `read_bytes` fetches objects larger than `part_size` with parallel ranged GETs,
+    - with `cache_dir`, objects are downloaded once into a local read-through
+      cache keyed by their ETag, and served from disk while the ETag is unchanged.
+
+    Missing objects raise `FileNotFoundError`.
+
+    Args:
+        client: boto3 S3 client, the shared client by default.
+        cache_dir (str | None): Local cache directory, no caching if None.
+        chunk_size (int): Read size of the streaming reads.
+        part_size (int): Size of the ranged GETs.
+        max_workers (int): Number of ranged GETs in flight.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        cache_dir: str | None = None,
+        chunk_size: int = MB,
+        part_size: int = 8 * MB,
+        max_workers: int = 8,
+    ):
+        self.client = client or get_s3_client()
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.chunk_size = chunk_size
+        self.part_size = part_size
+        self.max_workers = max_workers
+
+    def head(self, bucket: str, key: str) -> dict[str, Any]:
+        from botocore.exceptions import ClientError
+
+        try:
+            return self.client.head_object(Bucket=bucket, Key=key)
+        except ClientError as error:
+            if _is_missing(error):
+                raise FileNotFoundError(f"s3://{bucket}/{key}") from error
+            raise
+
+    def open(self, bucket: str, key: str) -> BinaryIO:
+        """Binary file object over the object, read in chunks."""
+        from botocore.exceptions import ClientError
+
+        if self.cache_dir is not None:
+            return open(self.cached_path(bucket, key), "rb")
+        try:
+            body = self.client.get_object(Bucket=bucket, Key=key)["Body"]
+        except ClientError as error:
+            if _is_missing(error):
+                raise FileNotFoundError(f"s3://{bucket}/{key}") from error
+            raise
+        return io.BufferedReader(S3StreamReader(body), buffer_size=self.chunk_size)
+
+    def read_bytes(self, bucket: str, key: str) -> bytes:
+        """Whole object content, fetched with parallel ranged GETs when large."""
+        if self.cache_dir is not None:
+            return self.cached_path(bucket, key).read_bytes()
+        size = self.head(bucket, key)["ContentLength"]
+        buffer = bytearray(size)
+
+        def write_at(start: int, data: bytes) -> None:
+            buffer[start : start + len(data)] = data
+
+        self._read_ranges(bucket, key, size, write_at)
+        return bytes(buffer)
+
+    def download(self, bucket: str, key: str, path: str | Path) -> None:
+        """Write the object to `path`, atomically, with parallel ranged GETs."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        size = self.head(bucket, key)["ContentLength"]
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        lock = threading.Lock()
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.truncate(size)
+
+                def write_at(start: int, data: bytes) -> None:
+                    with lock:
+                        f.seek(start)
+                        f.write(data)
+
+                self._read_ranges(bucket, key, size, write_at)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def cached_path(self, bucket: str, key: str) -> Path:
+        """Local copy of the object, downloaded if the cache has no copy for its current ETag."""
+        etag = self.head(bucket, key)["ETag"].strip('"')
+        path = self.cache_dir / bucket / f"{key}.{etag}"
+        if path.exists():
+            logger.info(f"Cache hit for s3://{bucket}/{key} ({etag})")
+            return path
+        self.download(bucket, key, path)
+        # Only `<name>.<etag>` copies of this key: the glob also matches other keys,
+        # e.g. `<name>.gz.<etag>`.
+        name = Path(key).name
+        for stale in path.parent.glob(f"{name}.*"):
+            if stale != path and _ETAG.fullmatch(stale.name[len(name) + 1 :]):
+                stale.unlink(missing_ok=True)
+        return path
+
+    def _read_ranges(self, bucket: str, key: str, size: int, write_at) -> None:
+        def fetch(start: int) -> None:
+            end = min(start + self.part_size, size) - 1
+            body = self.client.get_object(Bucket=bucket, Key=key, Range=f"bytes={start}-{end}")["Body"]
+            write_at(start, body.read())
+
+        starts = range(0, size, self.part_size)
+        if len(starts) <= 1:
+            for start in starts:
+                fetch(start)
+            return
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(fetch, starts))
@@ -0,0 +1,216 @@
+import logging
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from ._s3 import S3Reader, get_s3_client, split_s3_path
+
+logger = logging.getLogger(__name__)
+
+MB = 1 << 20
+
+
+class LocalSink:
+    """
+    Local file destination. Content is written to a temporary file in the same
+    directory and renamed over the destination, so readers never see a partial file.
+
+    Args:
+        path (str): Destination file path.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def __repr__(self) -> str:
+        return f"LocalSink({self.path})"
+
+    def _replace_with(self, write) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def write_bytes(self, content: bytes) -> None:
+        self._replace_with(lambda f: f.write(content))
+
+    def write_file(self, source_path: str) -> None:
+        if Path(source_path).resolve() == self.path.resolve():
+            return
+        def copy(f) -> None:
+            with open(source_path, "rb") as source:
+                shutil.copyfileobj(source, f, 4 * MB)
+
+        self._replace_with(copy)
+
+    def open(self):
+        return open(self.path, "rb")
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def delete(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+class S3Sink:
+    """
+    S3 object destination. Objects above `multipart_threshold` are sent as a
+    multipart upload with parts uploaded in parallel. An S3 object only becomes
+    visible once its PUT or multipart upload completes, which makes writes atomic.
+
+    Sinks can be pickled, e.g. by `ParallelRunner`: the client is not pickled
+    but recreated from `credentials` in the receiving process.
+
+    Args:
+        path (str): Destination "s3://bucket/key".
+        client: boto3 S3 client.
+        multipart_threshold (int): Size in bytes above which multipart upload is used.
+        part_size (int): Size in bytes of each part (S3 requires at least 5 MB).
+        max_workers (int): Number of parts uploaded concurrently.
+        credentials (dict[str, Any] | None): Credentials of the client.
+    """
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        path: str,
+        client,
+        multipart_threshold: int = 16 * MB,
+        part_size: int = 8 * MB,
+        max_workers: int = 8,
+        credentials: dict[str, Any] | None = None,
+    ):
+        self.bucket, self.key = split_s3_path(path)
+        self.client = client
+        self.multipart_threshold = multipart_threshold
+        self.part_size = max(part_size, 5 * MB)
+        self.max_workers = max_workers
+        self.credentials = credentials
+
+    def __repr__(self) -> str:
+        return f"S3Sink(s3://{self.bucket}/{self.key})"
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {**self.__dict__, "client": None}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.client = get_s3_client(self.credentials)
+
+    def write_bytes(self, content: bytes) -> None:
+        if len(content) <= self.multipart_threshold:
+            self.client.put_object(Bucket=self.bucket, Key=self.key, Body=content)
+            return
+        view = memoryview(content)
+        self._multipart_upload(len(content), lambda start, end: view[start:end])
+
+    def write_file(self, source_path: str) -> None:
+        size = os.path.getsize(source_path)
+        if size <= self.multipart_threshold:
+            with open(source_path, "rb") as f:
+                self.client.put_object(Bucket=self.bucket, Key=self.key, Body=f.read())
+            return
+
+        def read_range(start: int, end: int) -> bytes:
+            with open(source_path, "rb") as f:
+                f.seek(start)
+                return f.read(end - start)
+
+        self._multipart_upload(size, read_range)
+
+    def _multipart_upload(self, size: int, read_range) -> None:
+        upload_id = self.client.create_multipart_upload(Bucket=self.bucket, Key=self.key)["UploadId"]
+        ranges = [(start, min(start + self.part_size, size)) for start in range(0, size, self.part_size)]
+
+        def upload_part(part_number: int, start: int, end: int) -> dict[str, Any]:
+            response = self.client.upload_part(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=bytes(read_range(start, end)),
+            )
+            return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                parts = list(executor.map(lambda args: upload_part(*args), [(i + 1, *r) for i, r in enumerate(ranges)]))
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+            )
+        except BaseException:
+            self.client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=upload_id)
+            raise
+        logger.info(f"Uploaded {size} bytes to s3://{self.bucket}/{self.key} in {len(ranges)} parts")
+
+    def open(self):
+        return S3Reader(self.client).open(self.bucket, self.key)
+
+    def exists(self) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.key)
+        except self.client.exceptions.ClientError:
+            return False
+        return True
+
+    def delete(self) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self.key)
+
+
+def make_sink(path: str, credentials: dict[str, Any] | None = None, client=None, **s3_args):
+    """
+    Create the sink for a local path or an "s3://" URL.
+
+    Args:
+        path (str): Destination.
+        credentials (dict[str, Any] | None): fsspec style S3 credentials.
+        client: boto3 S3 client to reuse, created from `credentials` if not given.
+        **s3_args: Extra `S3Sink` arguments (multipart_threshold, part_size, max_workers).
+
+    Returns:
+        LocalSink | S3Sink: The sink.
+    """
+    if path.startswith("s3://"):
+        client = client or get_s3_client(credentials)
+        return S3Sink(path, client, credentials=credentials, **s3_args)
+    if "://" in path and not path.startswith("file://"):
+        raise ValueError(f"Unsupported sink protocol: {path}")
+    return LocalSink(path.removeprefix("file://"))
+
+
+def write_to_sinks(
+    sinks: list,
+    content: bytes | None = None,
+    source_path: str | None = None,
+    max_workers: int = 4,
+) -> None:
+    """
+    Write the same content to every sink concurrently, either from bytes already
+    serialized in memory or from a local file.
+
+    Args:
+        sinks (list): Destinations.
+        content (bytes | None): Serialized content.
+        source_path (str | None): Local file holding the serialized content.
+        max_workers (int): Number of sinks written concurrently.
+    """
+    if (content is None) == (source_path is None):
+        raise ValueError("Exactly one of content and source_path must be given.")
+
+    def write(sink) -> None:
+        if content is not None:
+            sink.write_bytes(content)
+        else:
+            sink.write_file(source_path)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(sinks)))) as executor:
+        # list() re-raises the first failure
+        list(executor.map(write, sinks))
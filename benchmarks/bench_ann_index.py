@@ -0,0 +1,77 @@
+"""Recall@k and QPS of the IVF-PQ index against brute-force search.
+
+Usage:
+    python benchmarks/bench_ann_index.py --n-papers 100000 --k 10
+    python benchmarks/bench_ann_index.py --embeddings data/01_raw/embeddings_dict.pickle
+"""
+
+import argparse
+import pickle
+import time
+
+import numpy as np
+
+from arxiv_discoverer.search import IVFPQIndex, brute_force_search
+
+
+def synthetic_embeddings(n_papers: int, dim: int = 384, n_topics: int = 200, seed: int = 0) -> np.ndarray:
+    """Normalized vectors drawn around random topic centers, closer to real embeddings than uniform noise."""
+    rng = np.random.default_rng(seed)
+    topics = rng.normal(size=(n_topics, dim)).astype(np.float32)
+    vectors = topics[rng.integers(n_topics, size=n_papers)] + 0.6 * rng.normal(size=(n_papers, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def recall_at_k(approximate: list[tuple[str, float]], exact: list[tuple[str, float]]) -> float:
+    exact_ids = {paper_id for paper_id, _ in exact}
+    return len(exact_ids.intersection(paper_id for paper_id, _ in approximate)) / len(exact_ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--embeddings", help="Pickled {paper_id: vector} dict. Synthetic data if omitted.")
+    parser.add_argument("--n-papers", type=int, default=100_000)
+    parser.add_argument("--n-queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--n-probes", type=int, nargs="+", default=[4, 8, 16, 32])
+    args = parser.parse_args()
+
+    if args.embeddings:
+        with open(args.embeddings, "rb") as f:
+            embeddings_dict = pickle.load(f)
+        paper_ids = list(embeddings_dict.keys())
+        vectors = np.asarray(list(embeddings_dict.values()), dtype=np.float32)
+    else:
+        vectors = synthetic_embeddings(args.n_papers)
+        paper_ids = [str(i) for i in range(len(vectors))]
+
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.choice(len(vectors), args.n_queries, replace=False)]
+    queries = queries + 0.05 * rng.normal(size=queries.shape).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    start = time.perf_counter()
+    index = IVFPQIndex().train(vectors)
+    index.add(paper_ids, vectors)
+    print(f"Built index over {len(index)} papers in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    exact = [brute_force_search(paper_ids, vectors, query, args.k) for query in queries]
+    brute_qps = len(queries) / (time.perf_counter() - start)
+    print(f"{'method':<16}{'recall@' + str(args.k):>12}{'QPS':>12}{'p50 ms':>10}")
+    print(f"{'brute force':<16}{1.0:>12.3f}{brute_qps:>12.0f}{1000 / brute_qps:>10.2f}")
+
+    for n_probe in args.n_probes:
+        latencies, recalls = [], []
+        for query, truth in zip(queries, exact):
+            start = time.perf_counter()
+            results = index.search(query, k=args.k, n_probe=n_probe)
+            latencies.append(time.perf_counter() - start)
+            recalls.append(recall_at_k(results, truth))
+        qps = len(queries) / sum(latencies)
+        name = f"ivfpq n_probe={n_probe}"
+        print(f"{name:<16}{np.mean(recalls):>12.3f}{qps:>12.0f}{1000 * np.median(latencies):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
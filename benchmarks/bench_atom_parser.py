@@ -0,0 +1,110 @@
+"""Parsing of arXiv API pages into a DataFrame of papers: the `arxiv` library
+path of `harvest_new_papers` against the columnar `parse_atom_feed`.
+
+    arxiv      the library parses the page into one `arxiv.Result` per entry
+               (with Author and Link objects and datetimes), `extract_paper_info`
+               turns each into a dict, and the DataFrame is built from the dicts
+    columnar   `parse_atom_feed` streams the entries with lxml iterparse into
+               an Arrow batch, turned into a DataFrame by `papers_frame`
+
+Pages are rendered by `fake_arxiv.py` from the synthetic catalog. As in a
+harvest, each path parses all the pages and builds one DataFrame of their
+papers, timed as the best of --repeat; the peak Python memory it allocates is
+traced. The DataFrames of both paths are checked to be equal.
+
+Usage:
+    python benchmarks/bench_atom_parser.py --page-sizes 100 1000 2000 --pages 20
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import pandas as pd
+from fake_arxiv import FakeArxivServer, FakeCatalog, Faults
+
+from arxiv_discoverer.pipelines.arxiv_embedding_pipeline.nodes._atom_feed import (
+    papers_frame,
+    parse_atom_feed,
+)
+from arxiv_discoverer.pipelines.arxiv_embedding_pipeline.nodes._download_papers_by_category import (
+    extract_paper_info,
+)
+
+
+def parse_with_arxiv(pages: list[bytes]) -> pd.DataFrame:
+    # The parser `arxiv.Client` runs on every response.
+    from arxiv import _feed
+
+    return pd.DataFrame([extract_paper_info(result)[0] for page in pages for result in _feed.parse(page).results])
+
+
+def parse_columnar(pages: list[bytes]) -> pd.DataFrame:
+    return papers_frame([parse_atom_feed(page).papers for page in pages])
+
+
+PARSERS = {"arxiv": parse_with_arxiv, "columnar": parse_columnar}
+
+
+def render_pages(catalog: FakeCatalog, category: str, page_size: int, n_pages: int) -> list[bytes]:
+    server = FakeArxivServer(catalog, Faults())
+    try:
+        return [
+            server.feed(
+                {"search_query": [category], "start": [str(page * page_size)], "max_results": [str(page_size)]}, 0
+            )
+            for page in range(n_pages)
+        ]
+    finally:
+        server.server_close()
+
+
+def comparable(df: pd.DataFrame) -> pd.DataFrame:
+    """Missing values as None, whether a column holds None (objects) or NaN (strings)."""
+    return df.astype(object).where(df.notna(), None)
+
+
+def measure(parse, pages: list[bytes], repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(pages)
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    parse(pages)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": min(timings), "peak_mb": peak / 2**20}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-papers", type=int, default=100_000, help="Papers of the synthetic catalog.")
+    parser.add_argument("--category", default="cs.LG")
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[100, 1000, 2000])
+    parser.add_argument("--pages", type=int, default=10, help="Pages parsed per measurement.")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    catalog = FakeCatalog.synthetic(args.n_papers)
+    print(f"{'page size':>10}{'parser':>10}{'ms/page':>10}{'entries/s':>12}{'peak MB':>10}{'speedup':>9}")
+    for page_size in args.page_sizes:
+        pages = render_pages(catalog, args.category, page_size, args.pages)
+        n_entries = sum(page.count(b"<entry>") for page in pages)
+        if n_entries == 0:
+            print(f"{page_size:>10}  no entries, use a larger --n-papers")
+            continue
+        pd.testing.assert_frame_equal(comparable(parse_with_arxiv(pages)), comparable(parse_columnar(pages)))
+
+        results = {name: measure(parse, pages, args.repeat) for name, parse in PARSERS.items()}
+        for name, stats in results.items():
+            print(
+                f"{page_size:>10}{name:>10}{stats['seconds'] / len(pages) * 1000:>10.1f}"
+                f"{n_entries / stats['seconds']:>12.0f}{stats['peak_mb']:>10.1f}"
+                f"{results['arxiv']['seconds'] / stats['seconds']:>9.2f}",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Time of the multi-resolution cluster summaries against corpus size.
+
+Papers are drawn around topic centers in 3D, each topic with its own category
+and title vocabulary, and `create_cluster_summaries` is timed per stage:
+finest MiniBatchKMeans, nesting of the coarser levels, term matrix and the
+level summaries. The size of the JSON artifact is compared with the
+coordinates of every point.
+
+Usage:
+    python benchmarks/bench_cluster_summaries.py --n-papers 10000 100000 1000000
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from arxiv_discoverer.pipelines.dimensionality_reduction.nodes import (
+    _create_cluster_summaries as clusters,
+)
+
+
+def synthetic_layout(n_papers: int, n_topics: int = 200, seed: int = 0) -> pd.DataFrame:
+    """Papers around `n_topics` centers, titles drawn from the words of their topic."""
+    rng = np.random.default_rng(seed)
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    vocabulary = np.array(["".join(rng.choice(letters, rng.integers(4, 10))) for _ in range(20 * n_topics)])
+    centers = rng.uniform(-20, 20, size=(n_topics, 3))
+    topic = rng.zipf(1.5, n_papers) % n_topics
+    coordinates = centers[topic] + rng.normal(size=(n_papers, 3))
+    words = vocabulary[topic[:, None] * 20 + rng.integers(0, 20, size=(n_papers, 6))]
+    return pd.DataFrame(
+        {
+            "x": coordinates[:, 0], "y": coordinates[:, 1], "z": coordinates[:, 2],
+            "title": [" ".join(row) for row in words],
+            "primary_category": [f"cat.{t % 40}" for t in topic],
+        }
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-papers", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--resolutions", type=int, nargs="+", default=[32, 256, 2048])
+    parser.add_argument("--term-sample-size", type=int, default=200_000)
+    args = parser.parse_args()
+    params = {
+        "resolutions": args.resolutions,
+        "n_top_terms": 5,
+        "term_fields": ["title"],
+        "term_sample_size": args.term_sample_size,
+    }
+
+    print(f"resolutions {args.resolutions}, top terms on {args.term_sample_size} papers")
+    print(f"{'papers':>9}{'kmeans s':>10}{'nest s':>8}{'terms s':>9}{'summary s':>11}{'total s':>9}{'JSON KiB':>10}"
+          f"{'points KiB':>12}")
+    for n_papers in args.n_papers:
+        df = synthetic_layout(n_papers)
+        coordinates = df[["x", "y", "z"]].to_numpy(dtype=np.float32)
+        start = time.perf_counter()
+        finest = clusters.fit_finest_level(coordinates, min(max(args.resolutions), n_papers), params)
+        fitted = time.perf_counter()
+        levels = clusters.nest_levels(coordinates, finest, sorted(args.resolutions)[:-1], 42)
+        nested = time.perf_counter()
+        term_rows = clusters.term_sample(n_papers, args.term_sample_size, 42)
+        term_counts, vocabulary = clusters.paper_terms(df.iloc[term_rows], params)
+        termed = time.perf_counter()
+        categories, codes = clusters.category_codes_of(df)
+        for labels in levels:
+            clusters.summarize_level(coordinates, labels, codes, categories, (term_rows, term_counts), vocabulary, 5)
+        done = time.perf_counter()
+
+        artifact = clusters.create_cluster_summaries(df, params)
+        json_kib = len(json.dumps(artifact, separators=(",", ":"))) / 1024
+        points_kib = len(json.dumps(np.round(coordinates, 4).tolist(), separators=(",", ":"))) / 1024
+        print(
+            f"{n_papers:>9}{fitted - start:>10.2f}{nested - fitted:>8.2f}{termed - nested:>9.2f}"
+            f"{done - termed:>11.2f}{done - start:>9.2f}{json_kib:>10.0f}{points_kib:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Latency and batch fill of the embedding server under concurrent clients.
+
+Each client sends `--requests` single-text requests back to back, as a query
+API would. By default the model is simulated by an encoder costing a fixed
+per-call overhead plus a per-text cost, which is where dynamic batching pays:
+the overhead is paid once per batch instead of once per request.
+
+Usage:
+    python benchmarks/bench_embedding_service.py --clients 32 --requests 50
+    python benchmarks/bench_embedding_service.py --model all-MiniLM-L6-v2
+"""
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from arxiv_discoverer.embedding_service import (
+    EmbeddingClient,
+    EmbeddingServer,
+    model_encoder,
+)
+
+
+def simulated_encoder(overhead_ms: float, per_text_ms: float, dim: int = 384):
+    def encode(texts: list[str]) -> np.ndarray:
+        time.sleep((overhead_ms + per_text_ms * len(texts)) / 1000)
+        return np.ones((len(texts), dim), dtype=np.float32)
+
+    return encode
+
+
+async def run(encoder, n_clients: int, n_requests: int, max_batch_size: int, max_wait_ms: float) -> dict:
+    async with EmbeddingServer(encoder, port=0, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms) as server:
+
+        async def client_session(i: int) -> None:
+            async with EmbeddingClient(server.address) as client:
+                for j in range(n_requests):
+                    await client.encode([f"Title : paper {i}-{j}\n Abstract : benchmark text"])
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client_session(i) for i in range(n_clients)))
+        elapsed = time.perf_counter() - start
+        return {**server.batcher.stats.summary(), "throughput": n_clients * n_requests / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", help="SentenceTransformer model. A simulated encoder is used if omitted.")
+    parser.add_argument("--overhead-ms", type=float, default=8.0, help="Simulated cost of one encoder call.")
+    parser.add_argument("--per-text-ms", type=float, default=0.3, help="Simulated cost of one text.")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, nargs="+", default=[0.0, 2.0, 5.0, 20.0])
+    args = parser.parse_args()
+
+    encoder = model_encoder(args.model) if args.model else simulated_encoder(args.overhead_ms, args.per_text_ms)
+    print(f"{args.clients} clients x {args.requests} requests, max batch size {args.max_batch_size}")
+    print(f"{'mode':<16}{'req/s':>9}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'batches':>9}{'mean size':>11}{'fill':>7}")
+
+    unbatched = asyncio.run(run(encoder, args.clients, args.requests, 1, 0.0))
+    rows = [("unbatched", unbatched)]
+    rows += [
+        (f"max_wait={wait:g}ms", asyncio.run(run(encoder, args.clients, args.requests, args.max_batch_size, wait)))
+        for wait in args.max_wait_ms
+    ]
+    for name, stats in rows:
+        print(
+            f"{name:<16}{stats['throughput']:>9.0f}{stats['latency_p50_ms']:>9.1f}{stats['latency_p90_ms']:>9.1f}"
+            f"{stats['latency_p99_ms']:>9.1f}{stats['batches']:>9}{stats['mean_batch_size']:>11.1f}"
+            f"{stats['mean_batch_fill']:>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
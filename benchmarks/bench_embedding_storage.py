@@ -0,0 +1,112 @@
+"""Size, encode/decode time and quality of the embedding storage modes.
+
+Quality is measured against the float32 embeddings:
+- neighbourhood recall@k: overlap of the exact cosine top-k of sample papers
+  searched among the decoded vectors with their top-k among the original vectors,
+- UMAP kNN preservation: share of the k nearest neighbours (in the original
+  space) of each paper that are also among its k nearest neighbours in the 3D
+  UMAP layout, on a subset of the papers (the float32 row is the baseline).
+
+Usage:
+    python benchmarks/bench_embedding_storage.py --n-papers 100000
+    python benchmarks/bench_embedding_storage.py --embeddings data/01_raw/embeddings.npz --umap-papers 0
+"""
+
+import argparse
+import pickle
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from bench_ann_index import synthetic_embeddings
+
+from arxiv_discoverer.datasets import CompressedEmbeddingsDataset
+from arxiv_discoverer.search import (
+    STORAGE_MODES,
+    CompressedEmbeddings,
+    EmbeddingCodec,
+    embeddings_to_matrix,
+)
+
+
+def load_embeddings(path: str) -> np.ndarray:
+    if path.endswith(".npz"):
+        return CompressedEmbeddingsDataset(filepath=path).load().vectors()
+    with open(path, "rb") as f:
+        return embeddings_to_matrix(pickle.load(f))[1]
+
+
+def top_k(vectors: np.ndarray, queries: np.ndarray, query_rows: np.ndarray, k: int) -> np.ndarray:
+    """Rows of the k vectors closest to each query, the query paper itself excluded."""
+    scores = queries @ vectors.T
+    scores[np.arange(len(query_rows)), query_rows] = -np.inf
+    return np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+
+def neighbourhood_recall(reference: np.ndarray, approximate: np.ndarray) -> float:
+    return float(np.mean([len(np.intersect1d(r, a)) / len(r) for r, a in zip(reference, approximate)]))
+
+
+def umap_knn_preservation(original: np.ndarray, decoded: np.ndarray, k: int) -> float:
+    from sklearn.neighbors import NearestNeighbors
+
+    from arxiv_discoverer.pipelines.dimensionality_reduction.nodes._reduce_vectors_dimensionality import (
+        reduce_umap,
+    )
+
+    layout = reduce_umap(dict(enumerate(decoded)), metric="cosine")
+    layout = np.stack([layout[i] for i in range(len(decoded))])
+    high = NearestNeighbors(n_neighbors=k + 1, metric="cosine").fit(original).kneighbors(original, return_distance=False)
+    low = NearestNeighbors(n_neighbors=k + 1).fit(layout).kneighbors(layout, return_distance=False)
+    return neighbourhood_recall(high[:, 1:], low[:, 1:])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--embeddings", help="embeddings.npz or pickled {paper_id: vector} dict. Synthetic if omitted.")
+    parser.add_argument("--n-papers", type=int, default=100_000)
+    parser.add_argument("--n-queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--umap-papers", type=int, default=3000, help="0 skips the UMAP comparison.")
+    parser.add_argument("--modes", nargs="+", default=list(STORAGE_MODES))
+    args = parser.parse_args()
+
+    vectors = load_embeddings(args.embeddings) if args.embeddings else synthetic_embeddings(args.n_papers)
+    paper_ids = np.array([f"paper-{i}" for i in range(len(vectors))])
+    rng = np.random.default_rng(0)
+    query_rows = rng.choice(len(vectors), args.n_queries, replace=False)
+    queries = vectors[query_rows]
+    reference = top_k(vectors, queries, query_rows, args.k)
+    umap_rows = rng.choice(len(vectors), min(args.umap_papers, len(vectors)), replace=False)
+    print(f"{len(vectors)} papers, {vectors.shape[1]} dimensions")
+
+    print(
+        f"{'mode':<9}{'file MB':>9}{'ratio':>7}{'train s':>9}{'encode s':>10}{'decode s':>10}"
+        f"{f'recall@{args.k}':>11}{'UMAP kNN':>10}"
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for mode in args.modes:
+            start = time.perf_counter()
+            codec = EmbeddingCodec(mode).fit(vectors)
+            trained = time.perf_counter()
+            compressed = CompressedEmbeddings(paper_ids, codec.encode(vectors), codec)
+            encoded = time.perf_counter()
+            decoded = compressed.vectors()
+            decode_seconds = time.perf_counter() - encoded
+
+            path = Path(tmp_dir) / f"{mode}.npz"
+            CompressedEmbeddingsDataset(filepath=str(path)).save(compressed)
+            size = path.stat().st_size
+
+            recall = neighbourhood_recall(reference, top_k(decoded, queries, query_rows, args.k))
+            umap_quality = umap_knn_preservation(vectors[umap_rows], decoded[umap_rows], args.k) if len(umap_rows) else None
+            ratio = vectors.nbytes / compressed.nbytes
+            print(
+                f"{mode:<9}{size / 1e6:>9.1f}{ratio:>6.1f}x{trained - start:>9.2f}{encoded - trained:>10.2f}"
+                f"{decode_seconds:>10.2f}{recall:>11.3f}{'-' if umap_quality is None else f'{umap_quality:.3f}':>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
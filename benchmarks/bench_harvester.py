@@ -0,0 +1,215 @@
+"""End-to-end load test of the harvesting nodes against the fake arXiv API of
+`fake_arxiv.py`: papers/sec, requests issued, duplicate fetches and recovery
+from faults of `download_papers_by_category`.
+
+Each scenario starts a fake server in a separate process (so that it does not
+share the GIL with the harvester) with its faults, then runs the node on the
+categories through an `arxiv.Client` pointed at it, without the 3s delay
+between requests the real API asks for unless --delay-seconds is given. The
+harvest is compared with the synthetic catalog:
+
+    complete    share of the expected new papers harvested; a category whose
+                retries are exhausted ends early
+    corrupted   harvested papers whose title or abstract differs from the
+                catalog, e.g. entries cut mid-abstract by a truncated page
+    aborted     categories that ended on an error
+    refetched   entries served again for the same query (retried pages)
+    cross       entries served again for another category (cross-listed papers)
+
+--known-fraction seeds the previous harvest with a share of the catalog, to
+measure the incremental case where most fetched entries are skipped.
+
+Usage:
+    python benchmarks/bench_harvester.py --n-papers 20000 --max-results 2000
+    python benchmarks/bench_harvester.py --scenarios clean errors --known-fraction 0.9
+    python benchmarks/bench_harvester.py --scenarios clean cut_pages --parser arxiv
+"""
+
+import argparse
+import json
+import logging
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from fake_arxiv import FakeCatalog
+from synthetic_corpus import synthetic_papers
+
+from arxiv_discoverer.pipelines.arxiv_embedding_pipeline.nodes import (
+    download_papers_by_category,
+)
+from arxiv_discoverer.pipelines.arxiv_embedding_pipeline.nodes._download_papers_by_category import (
+    update_downloaded_papers_df,
+)
+
+# Faults of each scenario, as flags of fake_arxiv.py.
+SCENARIOS = {
+    "clean": {},
+    "latency": {"latency": 0.05, "latency_jitter": 0.1},
+    "errors": {"error_rate": 0.1},
+    "outage": {"error_rate": 0.6},
+    "short_pages": {"truncate_rate": 0.1, "truncate_mode": "short"},
+    "cut_pages": {"truncate_rate": 0.1, "truncate_mode": "cut"},
+    "mixed": {"latency": 0.02, "latency_jitter": 0.05, "error_rate": 0.05, "truncate_rate": 0.05},
+}
+CATEGORIES = ["cs.LG", "cs.CV", "cs.CL", "cs.AI", "stat.ML", "math.CO"]
+
+
+class ErrorCounter(logging.Handler):
+    """Counts the fetch errors logged by `safe_results`, one per aborted category."""
+
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.errors = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.errors += record.getMessage().startswith("Error while fetching results")
+
+
+def start_server(n_papers: int, seed: int, faults: dict) -> tuple[subprocess.Popen, str]:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    command = [sys.executable, str(Path(__file__).with_name("fake_arxiv.py")), "--n-papers", str(n_papers),
+               "--seed", str(seed), "--port", str(port)]
+    for name, value in faults.items():
+        command += [f"--{name.replace('_', '-')}", str(value)]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(1200):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return process, f"http://127.0.0.1:{port}"
+        except OSError:
+            if process.poll() is not None:
+                break
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("Fake arXiv server did not start")
+
+
+def server_stats(url: str) -> dict:
+    with urllib.request.urlopen(f"{url}/stats", timeout=10) as response:
+        return json.load(response)
+
+
+def previous_harvest(expected: pd.DataFrame, known_fraction: float, seed: int) -> pd.DataFrame | None:
+    """Downloaded papers of a previous run: `known_fraction` of the expected papers."""
+    if known_fraction <= 0:
+        return None
+    known = expected.sample(frac=known_fraction, random_state=seed).copy()
+    # As read back from the CSV of a previous run, where dates were saved from tz-aware datetimes.
+    for column in ("published", "updated"):
+        known[column] = pd.to_datetime(known[column], utc=True).astype(str)
+    return update_downloaded_papers_df(None, known.to_dict("records"))
+
+
+def check_harvest(harvested: pd.DataFrame, expected: pd.DataFrame) -> tuple[int, int]:
+    """Expected papers harvested, and harvested papers whose text differs from the catalog."""
+    reference = expected.set_index("paper_id")
+    harvested = harvested[harvested["paper_id"].isin(reference.index)]
+    reference = reference.loc[harvested["paper_id"]]
+    normalize = lambda texts: [" ".join(str(text).split()) for text in texts]  # noqa: E731
+    corrupted = (np.array(normalize(harvested["title"])) != np.array(normalize(reference["title"]))) | (
+        np.array(normalize(harvested["summary"])) != np.array(normalize(reference["summary"]))
+    )
+    return len(harvested), int(corrupted.sum())
+
+
+def run_scenario(name: str, faults: dict, args, catalog: FakeCatalog) -> dict:
+    expected = catalog.expected(args.categories, args.max_results)
+    previous_df = previous_harvest(expected, args.known_fraction, args.seed)
+    n_known = 0 if previous_df is None else len(previous_df)
+    process, url = start_server(args.n_papers, args.seed, faults)
+    client_params = {
+        "parser": args.parser,
+        "page_size": args.page_size,
+        "delay_seconds": args.delay_seconds,
+        "num_retries": args.num_retries,
+        "query_url_format": f"{url}/api/query?{{}}",
+    }
+    counter = ErrorCounter()
+    node_logger = logging.getLogger(
+        "arxiv_discoverer.pipelines.arxiv_embedding_pipeline.nodes._download_papers_by_category"
+    )
+    node_logger.addHandler(counter)
+    node_logger.setLevel(logging.WARNING)
+    node_logger.propagate = False
+    try:
+        start = time.perf_counter()
+        papers_df = download_papers_by_category(previous_df, args.categories, args.max_results, client_params)
+        seconds = time.perf_counter() - start
+        stats = server_stats(url)
+    finally:
+        node_logger.removeHandler(counter)
+        node_logger.setLevel(logging.NOTSET)
+        node_logger.propagate = True
+        process.terminate()
+        process.wait()
+
+    new_df = papers_df.iloc[n_known:]
+    n_expected_new = len(expected) - n_known
+    n_harvested, n_corrupted = check_harvest(new_df, expected)
+    return {
+        "scenario": name,
+        "faults": faults,
+        "seconds": round(seconds, 3),
+        "papers": len(new_df),
+        "papers_per_second": round(len(new_df) / seconds, 1),
+        "entries_per_second": round(stats["entries_served"] / seconds, 1),
+        "requests": stats["requests"],
+        "errors_503": stats["statuses"].get("503", 0),
+        "truncated": stats["truncated"],
+        "entries_served": stats["entries_served"],
+        "refetched_entries": stats["refetched_entries"],
+        "cross_listed_entries": stats["cross_listed_entries"],
+        "complete": round(n_harvested / n_expected_new, 4) if n_expected_new else 1.0,
+        "corrupted": n_corrupted,
+        "aborted_categories": counter.errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--n-papers", type=int, default=20_000, help="Papers of the synthetic catalog.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--categories", nargs="+", default=CATEGORIES)
+    parser.add_argument("--max-results", type=int, default=2000, help="Papers harvested per category.")
+    parser.add_argument("--parser", choices=["arxiv", "columnar"], default="columnar")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--delay-seconds", type=float, default=0.0)
+    parser.add_argument("--num-retries", type=int, default=3)
+    parser.add_argument("--known-fraction", type=float, default=0.0)
+    parser.add_argument("--output", type=Path, help="Write the results to this JSON file.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    catalog = FakeCatalog(synthetic_papers(args.n_papers, args.seed))
+    print(
+        f"{'scenario':<13}{'seconds':>9}{'papers':>8}{'papers/s':>10}{'requests':>10}{'503':>6}{'cut':>6}"
+        f"{'refetched':>11}{'cross':>8}{'complete':>10}{'corrupted':>11}{'aborted':>9}"
+    )
+    results = []
+    for name in args.scenarios:
+        stats = run_scenario(name, SCENARIOS[name], args, catalog)
+        results.append(stats)
+        print(
+            f"{name:<13}{stats['seconds']:>9.2f}{stats['papers']:>8}{stats['papers_per_second']:>10.0f}"
+            f"{stats['requests']:>10}{stats['errors_503']:>6}{stats['truncated']:>6}{stats['refetched_entries']:>11}"
+            f"{stats['cross_listed_entries']:>8}{stats['complete']:>10.1%}{stats['corrupted']:>11}"
+            f"{stats['aborted_categories']:>9}",
+            flush=True,
+        )
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps({"args": {**vars(args), "output": str(args.output)}, "results": results},
+                                          indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
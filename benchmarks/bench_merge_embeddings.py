@@ -0,0 +1,156 @@
+"""Time and peak memory of merge_embeddings_metadata: list-of-dicts DataFrame +
+hash merge + id sets (previous path) against the (N, 3) float32 array joined
+through a categorical paper_id index, projecting the detail fields.
+
+Each mode runs in a fresh subprocess so peak RSS measurements are independent.
+Peak RSS is the process high-water mark during the merge (reset after building
+the inputs where /proc/self/clear_refs is available), peak alloc the Python
+allocations made by the merge.
+
+Usage:
+    python benchmarks/bench_merge_embeddings.py --n-papers 1000000
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+DETAIL_FIELDS = ["entry_id", "title", "authors", "primary_category", "summary", "year_published"]
+
+
+def synthetic_inputs(n_papers: int, seed: int = 0) -> tuple[pd.DataFrame, dict[str, np.ndarray]]:
+    """Metadata with more columns than the detail fields, and reduced embeddings in another order."""
+    rng = np.random.default_rng(seed)
+    paper_ids = np.array([f"{2400 + i // 100000}.{i % 100000:05d}v1" for i in range(n_papers)], dtype=object)
+    words = np.array(["graph", "neural", "quantum", "learning", "model", "theory", "data", "optimal"])
+    titles = [" ".join(rng.choice(words, 6)) for _ in range(1000)]
+    summaries = [" ".join(rng.choice(words, 40)) for _ in range(1000)]
+    picks = rng.integers(0, 1000, n_papers)
+    metadata_df = pd.DataFrame(
+        {
+            "paper_id": paper_ids,
+            "entry_id": "http://arxiv.org/abs/" + pd.Series(paper_ids),
+            "title": np.array(titles, dtype=object)[picks],
+            "authors": np.array([f"['Author {j}']" for j in range(1000)], dtype=object)[picks],
+            "primary_category": rng.choice(["cs.LG", "cs.CV", "math.CO", "astro-ph.GA"], n_papers).astype(object),
+            "categories": rng.choice(["cs.LG cs.AI", "cs.CV", "math.CO"], n_papers).astype(object),
+            "comment": np.array(titles, dtype=object)[picks[::-1]],
+            "journal_ref": None,
+            "doi": None,
+            "pdf_url": "http://arxiv.org/pdf/" + pd.Series(paper_ids),
+            "summary": np.array(summaries, dtype=object)[picks],
+            "year_published": rng.integers(1995, 2026, n_papers),
+        }
+    )
+    reduced = rng.normal(size=(n_papers, 3)).astype(np.float32)
+    order = rng.permutation(n_papers)
+    embeddings_dict = {paper_ids[i]: reduced[i] for i in order}
+    return metadata_df, embeddings_dict
+
+
+def reset_peak_rss() -> None:
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def current_rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+
+
+def legacy_merge_embeddings_metadata(metadata_df: pd.DataFrame, embeddings_dict: dict) -> pd.DataFrame:
+    """The previous implementation."""
+    embeddings_df = pd.DataFrame([{"paper_id": k, "x": v[0], "y": v[1], "z": v[2]} for k, v in embeddings_dict.items()])
+    merged_df = metadata_df.merge(embeddings_df, on="paper_id", how="inner")
+    merged_ids = set(merged_df["paper_id"])
+    set(metadata_df["paper_id"]).issubset(merged_ids) and set(embeddings_df["paper_id"]).issubset(merged_ids)
+    return merged_df
+
+
+def merge(mode: str, metadata_df: pd.DataFrame, embeddings_dict: dict) -> pd.DataFrame:
+    from arxiv_discoverer.pipelines.dimensionality_reduction.nodes import (
+        merge_embeddings_metadata,
+    )
+
+    if mode == "legacy":
+        return legacy_merge_embeddings_metadata(metadata_df, embeddings_dict)
+    return merge_embeddings_metadata(metadata_df, embeddings_dict, DETAIL_FIELDS)
+
+
+def run_mode(mode: str, n_papers: int) -> dict:
+    metadata_df, embeddings_dict = synthetic_inputs(n_papers)
+    merge(mode, metadata_df.head(10), dict(list(embeddings_dict.items())[:10]))  # imports
+    rss_before = current_rss_mb()
+    reset_peak_rss()
+
+    start = time.perf_counter()
+    merged_df = merge(mode, metadata_df, embeddings_dict)
+    elapsed = time.perf_counter() - start
+    peak_rss = peak_rss_mb()
+    output_mb = merged_df.memory_usage(index=True, deep=True).sum() / 2**20
+    del merged_df
+
+    # Second pass under tracemalloc: peak Python allocations of the merge itself.
+    tracemalloc.start()
+    merge(mode, metadata_df, embeddings_dict)
+    _, peak_allocated = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "mode": mode,
+        "seconds": elapsed,
+        "inputs_rss_mb": rss_before,
+        "peak_rss_mb": peak_rss,
+        "peak_allocated_mb": peak_allocated / 2**20,
+        "output_mb": output_mb,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-papers", type=int, default=1_000_000)
+    parser.add_argument("--mode", choices=["legacy", "indexed"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.n_papers)))
+        return
+
+    print(f"{'mode':<10}{'seconds':>10}{'inputs RSS MB':>15}{'peak RSS MB':>14}{'peak alloc MB':>15}{'output MB':>11}")
+    for mode in ("legacy", "indexed"):
+        output = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--n-papers", str(args.n_papers)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        stats = json.loads(output.strip().splitlines()[-1])
+        print(
+            f"{mode:<10}{stats['seconds']:>10.2f}{stats['inputs_rss_mb']:>15.0f}{stats['peak_rss_mb']:>14.0f}"
+            f"{stats['peak_allocated_mb']:>15.0f}{stats['output_mb']:>11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
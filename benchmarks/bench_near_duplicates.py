@@ -0,0 +1,93 @@
+"""Throughput and accuracy of the MinHash-LSH near-duplicate detection.
+
+A synthetic corpus of abstracts is generated and a share of its papers is
+re-posted with the kind of edits seen on arXiv: whitespace and case changes,
+an appended erratum sentence, a few replaced words. Detected groups are
+compared with the injected ones and the saved encodes are converted to time
+with the encoder throughput (--encode-rate, papers per second).
+
+Usage:
+    python benchmarks/bench_near_duplicates.py --n-papers 10000 100000 --duplicate-rate 0.05
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from arxiv_discoverer.search import (
+    MinHasher,
+    lsh_parameters,
+    near_duplicate_representatives,
+)
+
+EDITS = ("whitespace", "case", "erratum", "replace")
+
+
+def synthetic_corpus(n_papers: int, duplicate_rate: float, seed: int = 0) -> tuple[list[str], np.ndarray]:
+    """Texts and the row each text duplicates (itself for originals)."""
+    rng = np.random.default_rng(seed)
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    vocabulary = np.array(["".join(rng.choice(letters, rng.integers(2, 12))) for _ in range(20_000)])
+    n_duplicates = int(n_papers * duplicate_rate)
+    n_originals = n_papers - n_duplicates
+    lengths = rng.integers(80, 200, n_originals)
+    texts = [" ".join(vocabulary[rng.zipf(1.3, length) % len(vocabulary)]) for length in lengths]
+    truth = list(range(n_originals))
+    for _ in range(n_duplicates):
+        source = int(rng.integers(n_originals))
+        words = texts[source].split()
+        edit = EDITS[rng.integers(len(EDITS))]
+        if edit == "whitespace":
+            text = "  ".join(words)
+        elif edit == "case":
+            text = texts[source].title()
+        elif edit == "erratum":
+            text = texts[source] + " Erratum: corrected a typo in the second equation."
+        else:
+            for position in rng.choice(len(words), 2, replace=False):
+                words[position] = "replaced"
+            text = " ".join(words)
+        texts.append(text)
+        truth.append(source)
+    return texts, np.asarray(truth)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-papers", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--duplicate-rate", type=float, default=0.05)
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument("--n-permutations", type=int, default=128)
+    parser.add_argument("--encode-rate", type=float, default=150.0, help="Papers encoded per second by the model.")
+    args = parser.parse_args()
+
+    n_bands, rows_per_band = lsh_parameters(args.threshold, args.n_permutations)
+    print(f"threshold {args.threshold}, {args.n_permutations} permutations, {n_bands} bands x {rows_per_band} rows")
+    print(
+        f"{'papers':>9}{'sign s':>8}{'LSH s':>7}{'papers/s':>10}{'found':>8}{'precision':>11}{'recall':>8}"
+        f"{'saved':>8}{'encode s saved':>16}"
+    )
+    hasher = MinHasher(args.n_permutations)
+    for n_papers in args.n_papers:
+        texts, truth = synthetic_corpus(n_papers, args.duplicate_rate)
+        start = time.perf_counter()
+        signatures = hasher.signatures(texts)
+        signed = time.perf_counter()
+        representatives = near_duplicate_representatives(signatures, args.threshold, n_bands, rows_per_band)
+        done = time.perf_counter()
+
+        found = representatives != np.arange(n_papers)
+        injected = truth != np.arange(n_papers)
+        true_positives = found & (representatives == truth)
+        precision = true_positives.sum() / max(found.sum(), 1)
+        recall = true_positives.sum() / max(injected.sum(), 1)
+        saved = int(found.sum())
+        print(
+            f"{n_papers:>9}{signed - start:>8.2f}{done - signed:>7.2f}{n_papers / (done - start):>10.0f}{saved:>8}"
+            f"{precision:>11.3f}{recall:>8.3f}{saved / n_papers:>8.1%}{saved / args.encode_rate:>16.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Startup cost of UMAP in a fresh process: without numba cache, with an empty
+cache (cold, first container run) and with the cache filled by the warm-up
+(warm, image built with `kedro run --pipeline umap_warmup`).
+
+Each run is a fresh subprocess, as a new container would be. "process" is the
+wall time of the whole subprocess, interpreter and numpy included.
+
+Usage:
+    python benchmarks/bench_numba_cache.py
+    python benchmarks/bench_numba_cache.py --metric cosine --n-samples 5000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def run_warm_up(cache_dir: str | None, metric: str, n_samples: int) -> dict:
+    from arxiv_discoverer.pipelines.dimensionality_reduction.nodes import warm_up_umap
+
+    return warm_up_umap(
+        {"numba_cache_dir": cache_dir, "dimensionality_reduction_params": {"metric": metric}},
+        n_samples=n_samples,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--metric", default="euclidean")
+    parser.add_argument("--n-samples", type=int, default=300)
+    parser.add_argument("--cache-dir", help=argparse.SUPPRESS)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_warm_up(args.cache_dir, args.metric, args.n_samples)))
+        return
+
+    env = {key: value for key, value in os.environ.items() if key != "NUMBA_CACHE_DIR"}
+    print(f"{'run':<10}{'import s':>10}{'fit s':>10}{'process s':>11}{'kernels':>9}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for run, run_cache_dir in (("no cache", None), ("cold", cache_dir), ("warm", cache_dir)):
+            command = [sys.executable, __file__, "--child", "--metric", args.metric, "--n-samples", str(args.n_samples)]
+            if run_cache_dir:
+                command += ["--cache-dir", run_cache_dir]
+            start = time.perf_counter()
+            output = subprocess.run(command, check=True, capture_output=True, text=True, env=env).stdout
+            process_seconds = time.perf_counter() - start
+            stats = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{run:<10}{stats['import_seconds']:>10.1f}{stats['fit_seconds']:>10.1f}"
+                f"{process_seconds:>11.1f}{stats['kernels_after']:>9}"
+            )
+
+
+if __name__ == "__main__":
+    main()
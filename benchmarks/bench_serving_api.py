@@ -0,0 +1,164 @@
+"""Load test of the serving HTTP API: requests/sec and latency percentiles per endpoint.
+
+Keep-alive clients run in threads of this process and send a mix of
+requests: paper lookups (by arXiv id), conditional lookups answered with
+304, gzip detail shards and coordinate byte ranges. Unless --url is given,
+synthetic artifacts are written and served by a separate server process,
+so client and server do not share the GIL.
+
+Usage:
+    python benchmarks/bench_serving_api.py --n-papers 100000 --clients 16 --duration 10
+    python benchmarks/bench_serving_api.py --url http://127.0.0.1:8000 --n-papers 0
+"""
+
+import argparse
+import http.client
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from http import HTTPStatus
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from arxiv_discoverer.serving import visualization_id, write_serving_artifacts
+
+# endpoint: share of the requests
+WORKLOAD = {"paper": 0.6, "paper_304": 0.15, "shard_gzip": 0.1, "coordinates_range": 0.15}
+
+
+def synthetic_artifacts(directory: str, n_papers: int) -> None:
+    rng = np.random.default_rng(0)
+    paper_ids = [f"{2000 + i % 2500:04d}.{i:06d}v1" for i in range(n_papers)]
+    ids = [visualization_id(paper_id) for paper_id in paper_ids]
+    details = (
+        (paper_id, {
+            "title": f"Synthetic paper {i}",
+            "authors": "A. Author, B. Author",
+            "summary": "word " * 40 + "...",
+            "primary_category": ["cs.LG", "cs.CV", "math.ST", "hep-th"][i % 4],
+            "year_published": 2000 + i % 25,
+        })
+        for i, paper_id in enumerate(ids)
+    )
+    write_serving_artifacts(directory, ids, rng.normal(size=(n_papers, 3)), details)
+
+
+def start_server(directory: str) -> tuple[subprocess.Popen, str]:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    process = subprocess.Popen(
+        [sys.executable, "-m", "arxiv_discoverer.serving", directory, "--port", str(port)],
+        stderr=subprocess.DEVNULL,
+    )
+    for _ in range(200):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return process, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("Server did not start")
+
+
+def client(  # noqa: PLR0913, PLR0917
+    url: str, paper_ids: list[str], n_papers: int, deadline: float, seed: int, results: dict
+) -> None:
+    rng = random.Random(seed)
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=10)
+    etags = {}
+    names, weights = list(WORKLOAD), list(WORKLOAD.values())
+    latencies, transferred = defaultdict(list), defaultdict(int)
+    while time.perf_counter() < deadline:
+        endpoint = rng.choices(names, weights)[0]
+        headers = {}
+        if endpoint == "paper_304" and etags:
+            # Revalidation of a paper the client already holds.
+            paper_id = rng.choice(list(etags)[-100:])
+            path = f"/papers/{paper_id}"
+            headers["If-None-Match"] = etags[paper_id]
+        elif endpoint in ("paper", "paper_304"):
+            endpoint = "paper"
+            paper_id = rng.choice(paper_ids)
+            path = f"/papers/{paper_id}"
+        elif endpoint == "shard_gzip":
+            path = f"/details/shards/{rng.randrange(max(n_papers // 1000, 1))}"
+            headers["Accept-Encoding"] = "gzip"
+        else:
+            start = rng.randrange(max(n_papers - 1000, 1))
+            path = "/coordinates"
+            headers["Range"] = f"bytes={start * 12}-{(start + 1000) * 12 - 1}"
+        started = time.perf_counter()
+        connection.request("GET", path, headers=headers)
+        response = connection.getresponse()
+        body = response.read()
+        latencies[endpoint].append(time.perf_counter() - started)
+        transferred[endpoint] += len(body)
+        if response.status >= HTTPStatus.BAD_REQUEST:
+            raise RuntimeError(f"GET {path} returned {response.status}")
+        if endpoint == "paper":
+            etags[paper_id] = response.getheader("ETag")
+    connection.close()
+    results[seed] = (latencies, transferred)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Running server. Synthetic artifacts are served if omitted.")
+    parser.add_argument("--n-papers", type=int, default=100_000, help="Synthetic papers, also the id range of --url.")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    paper_ids = [f"{2000 + i % 2500:04d}.{i:06d}v1" for i in range(args.n_papers)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        process = None
+        url = args.url
+        if url is None:
+            start = time.perf_counter()
+            synthetic_artifacts(tmp_dir, args.n_papers)
+            print(f"Wrote artifacts of {args.n_papers} papers in {time.perf_counter() - start:.1f}s")
+            process, url = start_server(tmp_dir)
+        try:
+            results = {}
+            deadline = time.perf_counter() + args.duration
+            threads = [
+                threading.Thread(target=client, args=(url, paper_ids, args.n_papers, deadline, seed, results))
+                for seed in range(args.clients)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+    print(f"{args.clients} keep-alive clients for {args.duration:g}s against {url}")
+    print(f"{'endpoint':<20}{'requests':>10}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'KiB/req':>9}")
+    all_latencies = []
+    for endpoint in WORKLOAD:
+        latencies = np.concatenate([np.asarray(latency[endpoint]) for latency, _ in results.values()]) * 1000
+        size = sum(transferred[endpoint] for _, transferred in results.values())
+        all_latencies.append(latencies)
+        print(
+            f"{endpoint:<20}{len(latencies):>10}{len(latencies) / args.duration:>9.0f}"
+            f"{np.percentile(latencies, 50):>9.2f}{np.percentile(latencies, 99):>9.2f}{size / len(latencies) / 1024:>9.1f}"
+        )
+    latencies = np.concatenate(all_latencies)
+    print(
+        f"{'total':<20}{len(latencies):>10}{len(latencies) / args.duration:>9.0f}"
+        f"{np.percentile(latencies, 50):>9.2f}{np.percentile(latencies, 99):>9.2f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""Time and peak memory of the pipeline nodes on synthetic corpora of growing size,
+stored as baselines and compared against them to catch regressions.
+
+Every (node, scale) measurement runs in a fresh subprocess on the deterministic
+corpus of `synthetic_corpus.py`, so timings and peak RSS are independent of the
+other measurements. Inputs are built and the node warmed up on a small slice
+(imports, numba compilation) before the peak RSS is reset and the node timed
+`--repeat` times; the fastest run is kept.
+
+Nodes:
+    update_downloaded_papers_df   upsert of a harvest (5% new papers, 2% new versions)
+    create_embeddings             with a tiny hashing encoder, or --model when
+                                  sentence-transformers is installed
+    reduce_pca, reduce_umap, reduce_pca_umap
+    merge_embeddings_metadata
+    create_visualization_json     streamed to a DeltaPublishedJSONDataset
+
+Usage:
+    python benchmarks/bench_suite.py --scales 1000 10000 --save-baseline benchmarks/baselines/ci.json
+    python benchmarks/bench_suite.py --scales 1000 10000 --compare benchmarks/baselines/ci.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+from synthetic_corpus import synthetic_embeddings, synthetic_harvest, synthetic_papers
+
+DETAIL_FIELDS = ["entry_id", "published", "title", "authors", "primary_category", "summary", "year_published"]
+# Larger scales of the slow nodes are only run when asked for with --max-scale.
+DEFAULT_MAX_SCALE = {
+    "create_embeddings": 100_000,
+    "reduce_umap": 100_000,
+    "reduce_pca_umap": 100_000,
+}
+WARMUP_PAPERS = 200
+
+
+class TinyEncoder:
+    """
+    Deterministic stand-in for a SentenceTransformer: hashed bag of words
+    projected to `dim` dimensions. It keeps the benchmark of `create_embeddings`
+    about the node (chunking, temporary files, consolidation), not the model.
+    """
+
+    def __init__(self, dim: int = 384, n_buckets: int = 4096, seed: int = 0):
+        self.projection = np.random.default_rng(seed).standard_normal((n_buckets, dim), dtype=np.float32)
+        self.n_buckets = n_buckets
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=True):
+        vectors = np.zeros((len(texts), self.projection.shape[1]), dtype=np.float32)
+        for row, text in enumerate(texts):
+            buckets = [zlib.crc32(token.encode()) % self.n_buckets for token in text.lower().split()]
+            vectors[row] = self.projection[buckets].sum(axis=0)
+        if normalize_embeddings:
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return vectors
+
+
+def reset_peak_rss() -> None:
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def current_rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+
+
+def prepare(node: str, n_papers: int, model: str | None):
+    """The function timing one run of `node` on `n_papers` papers; inputs are built beforehand."""
+    from arxiv_discoverer.datasets import DeltaPublishedJSONDataset
+    from arxiv_discoverer.pipelines.arxiv_embedding_pipeline.nodes import (
+        _create_embeddings,
+        create_embeddings,
+    )
+    from arxiv_discoverer.pipelines.arxiv_embedding_pipeline.nodes._download_papers_by_category import (
+        update_downloaded_papers_df,
+    )
+    from arxiv_discoverer.pipelines.dimensionality_reduction.nodes import (
+        create_visualization_json,
+        merge_embeddings_metadata,
+    )
+    from arxiv_discoverer.pipelines.dimensionality_reduction.nodes._reduce_vectors_dimensionality import (
+        reducers,
+    )
+
+    papers_df = synthetic_papers(n_papers)
+    if node == "update_downloaded_papers_df":
+        previous_df = update_downloaded_papers_df(None, papers_df.to_dict("records"))
+        harvest = synthetic_harvest(papers_df, n_new=max(n_papers // 20, 1))
+        return lambda: update_downloaded_papers_df(previous_df, harvest)
+
+    if node == "create_embeddings":
+        if model is None:
+            encoder = TinyEncoder()
+            _create_embeddings.get_model = lambda model_path: encoder
+        return lambda: create_embeddings(papers_df, model or "tiny")
+
+    embeddings = synthetic_embeddings(papers_df["paper_id"])
+    if node.startswith("reduce_"):
+        reducer = reducers[node.removeprefix("reduce_")]
+        return lambda: reducer(embeddings)
+
+    papers_df["year_published"] = papers_df["published"].str[:4].astype(int)
+    rng = np.random.default_rng(0)
+    reduced = dict(zip(papers_df["paper_id"], rng.normal(size=(n_papers, 3)).astype(np.float32)))
+    if node == "merge_embeddings_metadata":
+        return lambda: merge_embeddings_metadata(papers_df, reduced, DETAIL_FIELDS)
+
+    if node == "create_visualization_json":
+        merged = merge_embeddings_metadata(papers_df, reduced, DETAIL_FIELDS)
+        directory = tempfile.mkdtemp(prefix="bench_viz_")
+
+        def write():
+            DeltaPublishedJSONDataset(path=directory).save(create_visualization_json(merged, DETAIL_FIELDS))
+
+        return write
+
+    raise ValueError(f"Unknown node '{node}'")
+
+
+def measure(node: str, n_papers: int, repeat: int, model: str | None) -> dict:
+    """Time and memory of `node` at `n_papers` papers, in the current process."""
+    prepare(node, min(n_papers, WARMUP_PAPERS), model)()  # imports, numba compilation
+    run = prepare(node, n_papers, model)
+    rss_before = current_rss_mb()
+    reset_peak_rss()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    peak_rss = peak_rss_mb()
+    return {
+        "seconds": min(timings),
+        "inputs_rss_mb": round(rss_before, 1),
+        "peak_rss_mb": round(peak_rss, 1),
+        "node_peak_mb": round(max(peak_rss - rss_before, 0.0), 1),
+    }
+
+
+def run_suite(nodes: list[str], scales: list[int], repeat: int, max_scale: dict, model: str | None) -> dict:
+    """Measure every node at every scale, each in a subprocess."""
+    results = {}
+    for node in nodes:
+        for n_papers in scales:
+            if n_papers > max_scale.get(node, n_papers):
+                continue
+            command = [sys.executable, __file__, "--measure", node, "--scales", str(n_papers), "--repeat", str(repeat)]
+            if model:
+                command += ["--model", model]
+            output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+            stats = json.loads(output.strip().splitlines()[-1])
+            results[f"{node}@{n_papers}"] = stats
+            print(
+                f"{node:<30}{n_papers:>9}{stats['seconds']:>10.3f}{stats['peak_rss_mb']:>13.0f}"
+                f"{stats['node_peak_mb']:>13.0f}",
+                flush=True,
+            )
+    return results
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(  # noqa: PLR0913
+    results: dict,
+    baseline: dict,
+    *,
+    time_tolerance: float = 0.25,
+    memory_tolerance: float = 0.25,
+    min_seconds: float = 0.05,
+    min_memory_mb: float = 16.0,
+) -> list[str]:
+    """
+    Measurements slower or heavier than the baseline by more than the tolerance.
+    Differences under `min_seconds` / `min_memory_mb` are noise and never flagged.
+
+    Returns:
+        list[str]: One line per regression.
+    """
+    regressions = []
+    print(f"{'measurement':<40}{'seconds':>10}{'baseline':>10}{'ratio':>8}{'peak MB':>10}{'baseline':>10}{'ratio':>8}")
+    for key, stats in results.items():
+        reference = baseline["results"].get(key)
+        if reference is None:
+            print(f"{key:<40}{stats['seconds']:>10.3f}{'new':>10}")
+            continue
+        time_ratio = stats["seconds"] / max(reference["seconds"], 1e-9)
+        memory_ratio = stats["node_peak_mb"] / max(reference["node_peak_mb"], 1e-9)
+        flags = []
+        if time_ratio > 1 + time_tolerance and stats["seconds"] - reference["seconds"] > min_seconds:
+            flags.append(f"time x{time_ratio:.2f}")
+        if memory_ratio > 1 + memory_tolerance and stats["node_peak_mb"] - reference["node_peak_mb"] > min_memory_mb:
+            flags.append(f"memory x{memory_ratio:.2f}")
+        print(
+            f"{key:<40}{stats['seconds']:>10.3f}{reference['seconds']:>10.3f}{time_ratio:>8.2f}"
+            f"{stats['node_peak_mb']:>10.0f}{reference['node_peak_mb']:>10.0f}{memory_ratio:>8.2f}"
+            f"  {' '.join(flags) or 'ok'}"
+        )
+        regressions.extend(f"{key}: {flag}" for flag in flags)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", nargs="+", default=[
+        "update_downloaded_papers_df", "create_embeddings", "reduce_pca", "reduce_umap", "reduce_pca_umap",
+        "merge_embeddings_metadata", "create_visualization_json",
+    ])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-scale", type=int, help="Run the slow nodes up to this scale too.")
+    parser.add_argument("--model", help="SentenceTransformer used by create_embeddings instead of the tiny encoder.")
+    parser.add_argument("--output", type=Path, help="Write the results to this JSON file.")
+    parser.add_argument("--save-baseline", type=Path, help="Store the results as a baseline.")
+    parser.add_argument("--compare", type=Path, help="Compare with a baseline, exit 1 on regressions.")
+    parser.add_argument("--time-tolerance", type=float, default=0.25)
+    parser.add_argument("--memory-tolerance", type=float, default=0.25)
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.scales[0], args.repeat, args.model)))
+        return
+
+    max_scale = {node: max(scale, args.max_scale or 0) for node, scale in DEFAULT_MAX_SCALE.items()}
+    print(f"{'node':<30}{'papers':>9}{'seconds':>10}{'peak RSS MB':>13}{'node peak MB':>13}")
+    report = {
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": environment(),
+        "results": run_suite(args.nodes, args.scales, args.repeat, max_scale, args.model),
+    }
+    for path in (args.output, args.save_baseline):
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if baseline["environment"] != report["environment"]:
+            print(f"warning: baseline recorded on {baseline['environment']}, running on {report['environment']}")
+        regressions = compare(
+            report["results"], baseline, time_tolerance=args.time_tolerance, memory_tolerance=args.memory_tolerance
+        )
+        if regressions:
+            print("Regressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Peak RSS and write time of the visualization JSON: in-memory dict + JSONDataset
+(previous path) against streamed records + StreamingJSONDataset. Peak RSS is the
+process high-water mark, peak alloc the Python allocations made by the write.
+
+Each mode runs in a fresh subprocess so peak RSS measurements are independent.
+
+Usage:
+    python benchmarks/bench_viz_json_writer.py --n-papers 200000
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DETAIL_FIELDS = ["entry_id", "title", "authors", "primary_category", "summary", "year_published"]
+
+
+def synthetic_merged_df(n_papers: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    words = np.array(["graph", "neural", "quantum", "learning", "model", "theory", "data", "optimal"])
+    return pd.DataFrame(
+        {
+            "paper_id": [f"{2400 + i // 100000}.{i % 100000:05d}v1" for i in range(n_papers)],
+            "entry_id": [f"http://arxiv.org/abs/{2400 + i // 100000}.{i % 100000:05d}v1" for i in range(n_papers)],
+            "title": [" ".join(rng.choice(words, 8)) for _ in range(n_papers)],
+            "authors": [str([f"Author {j}" for j in rng.integers(0, 10000, 4)]) for _ in range(n_papers)],
+            "primary_category": rng.choice(["cs.LG", "cs.CV", "math.CO", "astro-ph.GA"], n_papers),
+            "summary": [" ".join(rng.choice(words, 150)) for _ in range(n_papers)],
+            "year_published": rng.integers(2000, 2026, n_papers).astype(float),
+            "x": rng.normal(size=n_papers),
+            "y": rng.normal(size=n_papers),
+            "z": rng.normal(size=n_papers),
+        }
+    )
+
+
+def legacy_create_visualization_json(df: pd.DataFrame, detail_fields: list[str]) -> dict:
+    """The previous implementation: row-wise construction of the whole document."""
+    from arxiv_discoverer.pipelines.dimensionality_reduction.nodes._create_viz_json import (
+        hash_paper_id,
+        truncate_text,
+    )
+
+    df = df.copy()
+    df["id"] = df.apply(lambda row: hash_paper_id(row["paper_id"]), axis=1)
+    coordinates = [
+        {"id": row["id"], "x": float(row["x"]), "y": float(row["y"]), "z": float(row["z"])}
+        for _, row in df.iterrows()
+    ]
+    details = {}
+    for _, row in df.iterrows():
+        paper_details = {}
+        for field in detail_fields:
+            value = row[field]
+            if pd.isna(value):
+                paper_details[field] = None
+            elif field == "summary":
+                paper_details[field] = truncate_text(value, 200)
+            elif field == "year_published":
+                paper_details[field] = int(value)
+            else:
+                paper_details[field] = str(value)
+        details[row["id"]] = paper_details
+    return {"coordinates": coordinates, "details": details, "metadata": {"total_papers": len(df)}}
+
+
+def write_outputs(mode: str, df: pd.DataFrame, output_dir: Path) -> None:
+    from arxiv_discoverer.datasets import StreamingJSONDataset
+    from arxiv_discoverer.pipelines.dimensionality_reduction.nodes import (
+        create_visualization_json,
+    )
+
+    if mode == "legacy":
+        result = legacy_create_visualization_json(df, DETAIL_FIELDS)
+        for sink in ("local", "s3"):
+            with open(output_dir / f"{sink}.json", "w") as f:
+                json.dump(result, f, indent=2)
+    else:
+        result = create_visualization_json(df, DETAIL_FIELDS, add_statistics=False)
+        StreamingJSONDataset(filepath=str(output_dir / "viz.json"), compression=["gzip"]).save(result)
+
+
+def run_mode(mode: str, n_papers: int, output_dir: Path) -> dict:
+    # Import the pipeline modules up front so their footprint is not measured.
+    import arxiv_discoverer.pipelines.dimensionality_reduction.nodes  # noqa: F401
+
+    df = synthetic_merged_df(n_papers)
+
+    start = time.perf_counter()
+    write_outputs(mode, df, output_dir)
+    elapsed = time.perf_counter() - start
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    # Second pass under tracemalloc: peak Python allocations of the write itself.
+    tracemalloc.start()
+    write_outputs(mode, df, output_dir)
+    _, peak_allocated = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "mode": mode,
+        "seconds": elapsed,
+        "peak_rss_mb": peak_rss,
+        "peak_allocated_mb": peak_allocated / 2**20,
+        "files": {path.name: path.stat().st_size for path in output_dir.iterdir()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-papers", type=int, default=100_000)
+    parser.add_argument("--mode", choices=["legacy", "streaming"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        with tempfile.TemporaryDirectory() as output_dir:
+            print(json.dumps(run_mode(args.mode, args.n_papers, Path(output_dir))))
+        return
+
+    print(f"{'mode':<12}{'seconds':>10}{'peak RSS MB':>14}{'peak alloc MB':>15}  files")
+    for mode in ("legacy", "streaming"):
+        output = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--n-papers", str(args.n_papers)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        stats = json.loads(output.strip().splitlines()[-1])
+        files = ", ".join(f"{name}={size / 1e6:.1f}MB" for name, size in stats["files"].items())
+        print(f"{mode:<12}{stats['seconds']:>10.1f}{stats['peak_rss_mb']:>14.0f}{stats['peak_allocated_mb']:>15.0f}  {files}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""Local stand-in for the arXiv API: paginated Atom feeds of the synthetic catalog
+of `synthetic_corpus.py`, with injectable latency, 503 responses and truncated pages.
+
+``GET /api/query?search_query=<category>&start=<i>&max_results=<n>`` answers like
+export.arxiv.org: the papers listing the category (primary or cross-list), most
+recently submitted first, as an Atom page with the opensearch totals. Pages
+past the end are empty. Faults are drawn per request from a seeded generator:
+
+    --latency / --latency-jitter   delay before answering, in seconds
+    --error-rate                   share of 503 Service Unavailable responses
+    --truncate-rate                share of truncated pages, either cut in the
+                                   middle of an entry (--truncate-mode cut, the
+                                   body is not well-formed) or ending early
+                                   with fewer entries than asked (short)
+
+``GET /stats`` returns the requests served, by status, and the entries served,
+so a driver can count retries and duplicate fetches; ``GET /reset`` clears them.
+
+Usage:
+    python benchmarks/fake_arxiv.py --n-papers 100000 --port 8080 --error-rate 0.05
+    # then harvest with arxiv_client.query_url_format: "http://127.0.0.1:8080/api/query?{}"
+"""
+
+import argparse
+import ast
+import json
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+import pandas as pd
+from synthetic_corpus import synthetic_papers
+
+# The real API refuses larger pages.
+MAX_PAGE_SIZE = 2000
+
+FEED_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/" '
+    'xmlns:arxiv="http://arxiv.org/schemas/atom">\n'
+    '  <id>{feed_id}</id>\n'
+    '  <title>arXiv Query: {query}</title>\n'
+    '  <updated>{updated}</updated>\n'
+    '  <link href="http://arxiv.org/api/query" rel="self" type="application/atom+xml"/>\n'
+    '  <opensearch:itemsPerPage>{items_per_page}</opensearch:itemsPerPage>\n'
+    '  <opensearch:totalResults>{total_results}</opensearch:totalResults>\n'
+    '  <opensearch:startIndex>{start_index}</opensearch:startIndex>\n'
+)
+FEED_FOOTER = "</feed>\n"
+
+
+@dataclass
+class Faults:
+    """Faults injected by the server, drawn independently for every request."""
+
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    error_rate: float = 0.0
+    truncate_rate: float = 0.0
+    truncate_mode: str = "cut"
+    seed: int = 0
+
+
+class FakeCatalog:
+    """
+    Synthetic papers served by the fake API, indexed by category.
+
+    Args:
+        papers_df (pd.DataFrame): Papers shaped like `synthetic_papers`.
+    """
+
+    def __init__(self, papers_df: pd.DataFrame):
+        # Most recently submitted first, as the harvester's sortBy=submittedDate, sortOrder=descending.
+        self.papers_df = papers_df.sort_values("published", ascending=False, kind="stable").reset_index(drop=True)
+        self.categories = [ast.literal_eval(categories) for categories in self.papers_df["categories"]]
+        self.rows: dict[str, np.ndarray] = {}
+        for row, categories in enumerate(self.categories):
+            for category in categories:
+                self.rows.setdefault(category, []).append(row)
+        self.rows = {category: np.asarray(rows) for category, rows in self.rows.items()}
+        self._entries: dict[int, bytes] = {}
+
+    @classmethod
+    def synthetic(cls, n_papers: int, seed: int = 0) -> "FakeCatalog":
+        return cls(synthetic_papers(n_papers, seed))
+
+    def query(self, search_query: str) -> np.ndarray:
+        """Rows matching a query, "cs.LG" or "cat:cs.LG"; other queries match nothing."""
+        category = search_query.strip().removeprefix("cat:")
+        return self.rows.get(category, np.zeros(0, dtype=np.int64))
+
+    def expected(self, categories: list[str], max_results: int) -> pd.DataFrame:
+        """Papers a complete harvest of the first `max_results` results of each category returns."""
+        rows = np.unique(np.concatenate([self.query(category)[:max_results] for category in categories] or [[]]))
+        return self.papers_df.iloc[rows.astype(np.int64)]
+
+    def entry(self, row: int) -> bytes:
+        """Atom <entry> of a paper, rendered once."""
+        cached = self._entries.get(row)
+        if cached is not None:
+            return cached
+        paper = self.papers_df.iloc[row]
+        abs_url = paper["entry_id"].replace("http://", "https://")
+        authors = "".join(
+            f"    <author>\n      <name>{escape(name)}</name>\n    </author>\n"
+            for name in ast.literal_eval(paper["authors"])
+        )
+        categories = "".join(
+            f'    <category term={quoteattr(category)} scheme="http://arxiv.org/schemas/atom"/>\n'
+            for category in self.categories[row]
+        )
+        updated = pd.Timestamp(paper["updated"]).strftime("%Y-%m-%dT%H:%M:%SZ")
+        published = pd.Timestamp(paper["published"]).strftime("%Y-%m-%dT%H:%M:%SZ")
+        entry = (
+            "  <entry>\n"
+            f"    <id>{abs_url}</id>\n"
+            f"    <updated>{updated}</updated>\n"
+            f"    <published>{published}</published>\n"
+            f"    <title>{escape(paper['title'])}</title>\n"
+            f"    <summary>  {escape(paper['summary'])}\n</summary>\n"
+            f"{authors}"
+            f'    <link href="{abs_url}" rel="alternate" type="text/html"/>\n'
+            f'    <link title="pdf" href="{abs_url.replace("/abs/", "/pdf/")}" rel="related" type="application/pdf"/>\n'
+            f'    <arxiv:primary_category term={quoteattr(paper["primary_category"])} '
+            'scheme="http://arxiv.org/schemas/atom"/>\n'
+            f"{categories}"
+            "  </entry>\n"
+        ).encode()
+        self._entries[row] = entry
+        return entry
+
+    def page(self, search_query: str, start: int, max_results: int) -> tuple[list[bytes], list[str], int]:
+        """Entries of one page, the ids of their papers and the total number of results."""
+        rows = self.query(search_query)
+        page_rows = rows[start : start + min(max_results, MAX_PAGE_SIZE)]
+        return [self.entry(int(row)) for row in page_rows], self.papers_df["paper_id"].iloc[page_rows].tolist(), len(rows)
+
+
+class FakeArxivServer(ThreadingHTTPServer):
+    """
+    HTTP server of the fake arXiv API, see the module docstring.
+
+    Args:
+        catalog (FakeCatalog): Papers to serve.
+        faults (Faults): Faults to inject.
+        host (str): Interface to listen on.
+        port (int): Port to listen on, 0 picks a free port.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, catalog: FakeCatalog, faults: Faults, host: str = "127.0.0.1", port: int = 0):
+        self.catalog = catalog
+        self.faults = faults
+        self._random = random.Random(faults.seed)
+        self._lock = threading.Lock()
+        self.reset_stats()
+        super().__init__((host, port), FakeArxivRequestHandler)
+
+    @property
+    def address(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_in_background(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.statuses: Counter[int] = Counter()
+            self.truncated = 0
+            self.entries_served = 0
+            # Times each paper was served for each query, and for any query.
+            self.served: Counter[tuple[str, str]] = Counter()
+            self.papers_served: Counter[str] = Counter()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+                "truncated": self.truncated,
+                "entries_served": self.entries_served,
+                "distinct_papers_served": len(self.papers_served),
+                # Same paper served again for the same query: retried or overlapping pages.
+                "refetched_entries": sum(count - 1 for count in self.served.values()),
+                # Same paper served again for another query: cross-listed papers.
+                "cross_listed_entries": sum(self.papers_served.values()) - len(self.papers_served)
+                - sum(count - 1 for count in self.served.values()),
+                "faults": asdict(self.faults),
+            }
+
+    def draw_faults(self) -> tuple[float, bool, bool]:
+        """Delay, whether to answer 503 and whether to truncate, for one request."""
+        faults = self.faults
+        with self._lock:
+            self.requests += 1
+            delay = faults.latency + faults.latency_jitter * self._random.random()
+            error = self._random.random() < faults.error_rate
+            truncate = not error and self._random.random() < faults.truncate_rate
+            cut = self._random.random()
+        return delay, error, truncate and cut
+
+    def record_status(self, status: HTTPStatus) -> None:
+        with self._lock:
+            self.statuses[status.value] += 1
+
+    def feed(self, query: dict[str, list[str]], truncate: float) -> bytes:
+        """Atom page answering `query`; `truncate` in (0, 1) is where to cut it, 0 for a whole page."""
+        search_query = query.get("search_query", [""])[0]
+        start = int(query.get("start", ["0"])[0])
+        max_results = int(query.get("max_results", ["10"])[0])
+        entries, paper_ids, total = self.catalog.page(search_query, start, max_results)
+
+        if truncate and self.faults.truncate_mode == "short" and entries:
+            n_kept = int(len(entries) * truncate)
+            entries, paper_ids = entries[:n_kept], paper_ids[:n_kept]
+        header = FEED_HEADER.format(
+            feed_id=f"https://arxiv.org/api/{abs(hash((search_query, start))):x}",
+            query=escape(f"search_query={search_query}&start={start}&max_results={max_results}"),
+            updated=time.strftime("%Y-%m-%dT00:00:00-05:00"),
+            items_per_page=len(entries),
+            total_results=total,
+            start_index=start,
+        ).encode()
+        body = header + b"".join(entries) + FEED_FOOTER.encode()
+        if truncate and self.faults.truncate_mode == "cut" and entries:
+            # Cut inside the entries, as a response dropped mid-transfer; only whole entries count as served.
+            ends = np.cumsum([len(entry) for entry in entries])
+            cut = int(ends[-1] * truncate)
+            body = body[: len(header) + cut]
+            paper_ids = paper_ids[: int(np.searchsorted(ends, cut, side="right"))]
+
+        with self._lock:
+            self.truncated += bool(truncate) and bool(entries)
+            self.entries_served += len(paper_ids)
+            for paper_id in paper_ids:
+                self.served[search_query, paper_id] += 1
+                self.papers_served[paper_id] += 1
+        return body
+
+
+class FakeArxivRequestHandler(BaseHTTPRequestHandler):
+    server: FakeArxivServer
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path == "/stats":
+            return self._send(HTTPStatus.OK, json.dumps(self.server.stats()).encode(), "application/json")
+        if url.path == "/reset":
+            self.server.reset_stats()
+            return self._send(HTTPStatus.OK, b"{}", "application/json")
+        if url.path != "/api/query":
+            return self._send(HTTPStatus.NOT_FOUND, b"Not found", "text/plain")
+
+        delay, error, truncate = self.server.draw_faults()
+        if delay:
+            time.sleep(delay)
+        if error:
+            self.server.record_status(HTTPStatus.SERVICE_UNAVAILABLE)
+            return self._send(HTTPStatus.SERVICE_UNAVAILABLE, b"Service Unavailable", "text/plain", {"Retry-After": "3"})
+        try:
+            body = self.server.feed(parse_qs(url.query), truncate)
+        except ValueError:
+            self.server.record_status(HTTPStatus.BAD_REQUEST)
+            return self._send(HTTPStatus.BAD_REQUEST, b"Bad query", "text/plain")
+        self.server.record_status(HTTPStatus.OK)
+        self._send(HTTPStatus.OK, body, "application/atom+xml; charset=utf-8")
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def _send(self, status: HTTPStatus, body: bytes, content_type: str, headers: dict[str, str] | None = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-papers", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--truncate-rate", type=float, default=0.0)
+    parser.add_argument("--truncate-mode", choices=["cut", "short"], default="cut")
+    args = parser.parse_args()
+
+    catalog = FakeCatalog.synthetic(args.n_papers, args.seed)
+    faults = Faults(
+        args.latency, args.latency_jitter, args.error_rate, args.truncate_rate, args.truncate_mode, args.seed
+    )
+    server = FakeArxivServer(catalog, faults, args.host, args.port)
+    print(f"Serving {args.n_papers} papers on {server.address}/api/query", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
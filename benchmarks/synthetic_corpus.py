@@ -0,0 +1,143 @@
+"""Deterministic synthetic arXiv corpus: metadata rows shaped like the output of
+`extract_paper_info` and random normalized embeddings, from 1k to 1M papers.
+
+The same (n_papers, seed) always gives the same corpus, so benchmark runs and
+baselines measure the same inputs. Text is drawn from a Zipf-distributed
+vocabulary, categories and years from skewed distributions close to arXiv's.
+
+Usage:
+    python benchmarks/synthetic_corpus.py --n-papers 100000 --output data/bench/100k
+"""
+
+import argparse
+import hashlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from arxiv_discoverer.datasets import CompressedEmbeddingsDataset
+
+CATEGORIES = np.array(
+    ["cs.LG", "cs.CV", "cs.CL", "cs.AI", "stat.ML", "math.CO", "math.PR", "quant-ph", "hep-th", "astro-ph.GA",
+     "cond-mat.str-el", "q-bio.NC", "physics.optics", "econ.EM", "eess.SP", "gr-qc"]
+)
+
+
+def vocabulary(size: int = 20_000, seed: int = 0) -> np.ndarray:
+    """Random lowercase words, the same for a given seed."""
+    rng = np.random.default_rng(seed)
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    return np.array(["".join(rng.choice(letters, rng.integers(3, 11))) for _ in range(size)])
+
+
+def random_texts(
+    rng: np.random.Generator, words: np.ndarray, n_texts: int, min_words: int, max_words: int
+) -> list[str]:
+    """Texts of Zipf-distributed words, built from a pool of 4096 distinct texts to stay fast at 1M papers."""
+    n_pool = min(n_texts, 4096)
+    lengths = rng.integers(min_words, max_words + 1, n_pool)
+    pool = np.array([" ".join(words[rng.zipf(1.3, length) % len(words)]) for length in lengths], dtype=object)
+    # Suffixes keep every text distinct, as digests and near-duplicate detection expect.
+    picks = rng.integers(0, n_pool, n_texts)
+    return [f"{text} {i}" for i, text in enumerate(pool[picks])]
+
+
+def synthetic_papers(n_papers: int, seed: int = 0, id_offset: int = 0) -> pd.DataFrame:
+    """
+    Metadata of `n_papers` synthetic papers, with the columns of `extract_paper_info`.
+
+    Args:
+        n_papers (int): Number of papers.
+        seed (int): Seed of the generator.
+        id_offset (int): First paper number, to generate papers absent from another corpus.
+
+    Returns:
+        pd.DataFrame: One row per paper, unversioned arXiv-style paper_ids.
+    """
+    rng = np.random.default_rng(seed)
+    words = vocabulary(seed=seed)
+    numbers = np.arange(id_offset, id_offset + n_papers)
+    years = np.clip(2025 - rng.geometric(0.18, n_papers) + 1, 1995, 2025)
+    months = rng.integers(1, 13, n_papers)
+    # A 5-digit counter, and a sixth digit past 100k papers, keeps ids unique.
+    paper_ids = [
+        f"{year % 100:02d}{month:02d}.{number % 100_000:05d}{number // 100_000 or ''}"
+        for year, month, number in zip(years, months, numbers)
+    ]
+    published = pd.to_datetime({"year": years, "month": months, "day": rng.integers(1, 29, n_papers)})
+    versions = rng.geometric(0.7, n_papers)
+    primary = CATEGORIES[np.minimum(rng.zipf(1.6, n_papers) - 1, len(CATEGORIES) - 1)]
+    cross = CATEGORIES[rng.integers(0, len(CATEGORIES), n_papers)]
+    authors = random_texts(rng, words, n_papers, 1, 4)
+
+    return pd.DataFrame(
+        {
+            "entry_id": [f"http://arxiv.org/abs/{paper_id}v{version}" for paper_id, version in zip(paper_ids, versions)],
+            "paper_id": paper_ids,
+            "version": versions,
+            "updated": (published + pd.to_timedelta(rng.integers(0, 400, n_papers), unit="D")).astype(str),
+            "published": published.astype(str),
+            "title": random_texts(rng, words, n_papers, 5, 14),
+            "authors": [str([name.title()]) for name in authors],
+            "summary": random_texts(rng, words, n_papers, 80, 250),
+            "comment": None,
+            "journal_ref": None,
+            "doi": None,
+            "primary_category": primary,
+            "categories": [str(sorted({str(a), str(b)})) for a, b in zip(primary, cross)],
+            "links": None,
+            "pdf_url": [f"http://arxiv.org/pdf/{paper_id}" for paper_id in paper_ids],
+        }
+    )
+
+
+def synthetic_harvest(
+    papers_df: pd.DataFrame, n_new: int, revised_rate: float = 0.02, changed_rate: float = 0.5, seed: int = 1
+) -> list[dict]:
+    """
+    Entries of a harvest following `papers_df`: `n_new` new papers, and new
+    versions of `revised_rate` of the existing ones, `changed_rate` of them with
+    a changed abstract.
+    """
+    rng = np.random.default_rng(seed)
+    new = synthetic_papers(n_new, seed=seed, id_offset=len(papers_df) + 10_000_000)
+    revised = papers_df.sample(frac=revised_rate, random_state=seed).copy()
+    revised["version"] = revised["version"] + 1
+    changed = rng.random(len(revised)) < changed_rate
+    revised.loc[changed, "summary"] = revised.loc[changed, "summary"] + " Revised."
+    return pd.concat([new, revised], ignore_index=True).to_dict("records")
+
+
+def synthetic_embeddings(paper_ids, dim: int = 384, seed: int = 0) -> dict[str, np.ndarray]:
+    """Random unit-norm float32 embeddings of the papers, in their order."""
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((len(paper_ids), dim), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return dict(zip(paper_ids, vectors))
+
+
+def corpus_digest(papers_df: pd.DataFrame) -> str:
+    """Digest of a corpus, to check that two runs generated the same one."""
+    hashes = pd.util.hash_pandas_object(papers_df.astype(str), index=False).to_numpy()
+    return hashlib.sha256(hashes.tobytes()).hexdigest()[:16]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-papers", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--output", type=Path, required=True)
+    args = parser.parse_args()
+
+    papers_df = synthetic_papers(args.n_papers, args.seed)
+    embeddings = synthetic_embeddings(papers_df["paper_id"], args.dim, args.seed)
+    args.output.mkdir(parents=True, exist_ok=True)
+    papers_df.to_csv(args.output / "downloaded_papers.csv", index=False)
+    CompressedEmbeddingsDataset(filepath=str(args.output / "embeddings.npz")).save(embeddings)
+    print(f"{args.n_papers} papers, digest {corpus_digest(papers_df)}, written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
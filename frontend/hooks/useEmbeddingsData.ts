@@ -1,5 +1,6 @@
 import { useState, useEffect } from "react";
 import { EmbeddingsData } from "../types";
+import { fetchDeltaPublished } from "../utils/vizPatches";
 
 export function useEmbeddingsData() {
   const [data, setData] = useState<EmbeddingsData | null>(null);
@@ -7,11 +8,7 @@ export function useEmbeddingsData() {
   const [error, setError] = useState<string | null>(null);
 
   useEffect(() => {
-    fetch("/data/viz_data.json")
-      .then((res) => {
-        if (!res.ok) throw new Error("Failed to fetch data");
-        return res.json();
-      })
+    fetchDeltaPublished("/data/viz")
       .then(setData)
       .catch((err) => setError(err.message))
       .finally(() => setLoading(false));
@@ -0,0 +1,64 @@
+// Reconstruction of the delta-published visualization data
+// (see arxiv_discoverer.datasets.DeltaPublishedJSONDataset).
+import { EmbeddingsData } from "../types";
+
+type PointRow = [string, number, number, number];
+
+interface ManifestEntry {
+  version: number;
+  file: string;
+  sha256: string;
+}
+
+export interface VizManifest {
+  format_version: number;
+  version: number;
+  base: ManifestEntry;
+  patches: ManifestEntry[];
+}
+
+interface VizPatch {
+  coordinates: { remove: string[]; move: PointRow[]; add: PointRow[] };
+  details: EmbeddingsData["details"];
+  metadata: EmbeddingsData["metadata"];
+}
+
+export const applyPatch = (state: EmbeddingsData, patch: VizPatch): EmbeddingsData => {
+  const removed = new Set(patch.coordinates.remove);
+  const moved = new Map(patch.coordinates.move.map(([id, x, y, z]) => [id, { id, x, y, z }]));
+
+  const coordinates = state.coordinates
+    .filter((point) => !removed.has(point.id))
+    .map((point) => moved.get(point.id) ?? point);
+  for (const [id, x, y, z] of patch.coordinates.add) {
+    coordinates.push({ id, x, y, z });
+  }
+
+  const details = { ...state.details };
+  removed.forEach((id) => delete details[id]);
+  Object.assign(details, patch.details);
+
+  return { ...state, coordinates, details, metadata: patch.metadata };
+};
+
+const fetchJson = async <T,>(url: string, init?: RequestInit): Promise<T> => {
+  const res = await fetch(url, init);
+  if (!res.ok) throw new Error(`Failed to fetch ${url}`);
+  return res.json();
+};
+
+// Base and patch files are named by version, and a version can be published
+// again with other content (e.g. after a failed save), so they are requested
+// with the sha256 the manifest records: the browser cache only serves a file
+// whose content did not change. The manifest itself is always revalidated.
+const entryUrl = (baseUrl: string, entry: ManifestEntry): string =>
+  `${baseUrl}/${entry.file}?sha256=${entry.sha256}`;
+
+export const fetchDeltaPublished = async (baseUrl: string): Promise<EmbeddingsData> => {
+  const manifest = await fetchJson<VizManifest>(`${baseUrl}/manifest.json`, { cache: "no-cache" });
+  const [base, ...patches] = await Promise.all([
+    fetchJson<EmbeddingsData>(entryUrl(baseUrl, manifest.base)),
+    ...manifest.patches.map((patch) => fetchJson<VizPatch>(entryUrl(baseUrl, patch))),
+  ]);
+  return (patches as VizPatch[]).reduce(applyPatch, base as EmbeddingsData);
+};
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from arxiv_discoverer.datasets import CompressedEmbeddingsDataset
+from arxiv_discoverer.search import CompressedEmbeddings, EmbeddingCodec
+
+
+@pytest.fixture
+def embeddings_dict():
+    rng = np.random.default_rng(0)
+    return {f"2401.{i:05d}v1": rng.normal(size=16).astype(np.float32) for i in range(300)}
+
+
+@pytest.mark.parametrize("mode", ["float16", "int8", "pq"])
+def test_save_and_load_compressed_embeddings(tmp_path, embeddings_dict, mode):
+    codec = EmbeddingCodec(mode, n_subvectors=4, n_centroids=32).fit(np.stack(list(embeddings_dict.values())))
+    compressed = CompressedEmbeddings.encode(embeddings_dict, codec)
+    dataset = CompressedEmbeddingsDataset(filepath=str(tmp_path / "embeddings.npz"))
+
+    assert not dataset.exists()
+    dataset.save(compressed)
+    loaded = dataset.load()
+
+    assert dataset.exists()
+    assert loaded.codec.mode == mode
+    assert list(loaded) == list(embeddings_dict)
+    np.testing.assert_array_equal(loaded.vectors(), compressed.vectors())
+
+
+def test_plain_dict_is_stored_as_float32(tmp_path, embeddings_dict):
+    dataset = CompressedEmbeddingsDataset(filepath=str(tmp_path / "nested" / "embeddings.npz"))
+    dataset.save(embeddings_dict)
+    loaded = dataset.load()
+
+    assert loaded.codec.mode == "float32"
+    np.testing.assert_array_equal(loaded["2401.00007v1"], embeddings_dict["2401.00007v1"])
+
+
+def test_digests_are_stored_along_the_embeddings(tmp_path, embeddings_dict):
+    compressed = CompressedEmbeddings.encode(embeddings_dict, EmbeddingCodec("float16"))
+    digests = [f"digest-{i}" for i in range(len(compressed))]
+    dataset = CompressedEmbeddingsDataset(filepath=str(tmp_path / "embeddings.npz"))
+
+    dataset.save(CompressedEmbeddings(compressed.paper_ids, compressed.codes, compressed.codec, digests))
+    assert dataset.load().digests.tolist() == digests
+
+    dataset.save(compressed)
+    assert dataset.load().digests is None
@@ -0,0 +1,117 @@
+import json
+
+import pytest
+from kedro.io.core import DatasetError
+
+from arxiv_discoverer.datasets import (
+    DeltaPublishedJSONDataset,
+    apply_patch,
+    diff_visualization,
+)
+
+
+def make_viz(points: dict[str, tuple[float, float, float]], titles: dict[str, str] | None = None):
+    titles = titles or {}
+    return {
+        "coordinates": [{"id": i, "x": x, "y": y, "z": z} for i, (x, y, z) in points.items()],
+        "details": {i: {"title": titles.get(i, f"title {i}")} for i in points},
+        "metadata": {"total_papers": len(points)},
+    }
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    return DeltaPublishedJSONDataset(path=str(tmp_path / "viz"), max_patches=3, compact_ratio=10)
+
+
+def test_diff_and_apply_roundtrip():
+    previous = make_viz({"a": (0, 0, 0), "b": (1, 1, 1), "c": (2, 2, 2)})
+    current = make_viz({"a": (0, 0, 0), "c": (2, 2, 5), "d": (3, 3, 3)}, titles={"a": "renamed"})
+
+    patch = diff_visualization(previous, current)
+
+    assert patch["coordinates"] == {"remove": ["b"], "move": [["c", 2, 2, 5]], "add": [["d", 3, 3, 3]]}
+    assert set(patch["details"]) == {"a", "d"}
+    assert apply_patch(previous, patch) == current
+
+
+def test_save_writes_patches_and_load_reconstructs(dataset, tmp_path):
+    first = make_viz({"a": (0, 0, 0), "b": (1, 1, 1)})
+    second = make_viz({"a": (0, 0, 0), "b": (1, 1, 1), "c": (2, 2, 2)})
+    dataset.save(first)
+    dataset.save(second)
+
+    manifest = json.loads((tmp_path / "viz" / "manifest.json").read_text())
+    assert manifest["version"] == 2
+    assert manifest["base"]["file"] == "base_000001.json"
+    assert [patch["file"] for patch in manifest["patches"]] == ["patch_000002.json"]
+    patch = json.loads((tmp_path / "viz" / "patch_000002.json").read_text())
+    assert patch["coordinates"]["add"] == [["c", 2, 2, 2]]
+    assert dataset.load() == second
+
+
+def test_patch_chain_is_compacted(dataset, tmp_path):
+    for n_points in range(1, 6):
+        dataset.save(make_viz({str(i): (i, i, i) for i in range(n_points)}))
+
+    manifest = dataset.load_manifest()
+    assert manifest["version"] == 5
+    assert manifest["base"]["version"] == 5
+    assert manifest["patches"] == []
+    assert dataset.load() == make_viz({str(i): (i, i, i) for i in range(5)})
+
+    # Files of older generations are removed once no manifest references them.
+    dataset.save(make_viz({str(i): (i, i, i) for i in range(6)}))
+    assert sorted(path.name for path in (tmp_path / "viz").iterdir()) == [
+        "base_000005.json",
+        "manifest.json",
+        "patch_000006.json",
+    ]
+
+
+def test_reordered_points_publish_a_new_base(dataset):
+    dataset.save(make_viz({"a": (0, 0, 0), "b": (1, 1, 1)}))
+    dataset.save(make_viz({"b": (1, 1, 1), "a": (0, 0, 0)}))
+
+    manifest = dataset.load_manifest()
+    assert manifest["base"]["version"] == 2
+    assert [point["id"] for point in dataset.load()["coordinates"]] == ["b", "a"]
+
+
+def test_mirrors_receive_the_published_files(tmp_path):
+    dataset = DeltaPublishedJSONDataset(
+        path=str(tmp_path / "viz"), mirrors=[str(tmp_path / "mirror")], max_patches=1, compact_ratio=10
+    )
+    for n_points in (2, 3, 4):
+        dataset.save(make_viz({str(i): (i, i, i) for i in range(n_points)}))
+
+    primary = {path.name: path.read_bytes() for path in (tmp_path / "viz").iterdir()}
+    mirror = {path.name: path.read_bytes() for path in (tmp_path / "mirror").iterdir()}
+    assert mirror == primary
+    assert DeltaPublishedJSONDataset(path=str(tmp_path / "mirror")).load() == dataset.load()
+
+
+def test_mirror_missing_a_save_is_repaired_by_the_next_one(tmp_path, monkeypatch):
+    from arxiv_discoverer.storage import LocalSink
+
+    dataset = DeltaPublishedJSONDataset(
+        path=str(tmp_path / "viz"), mirrors=[str(tmp_path / "mirror")], max_patches=5, compact_ratio=10
+    )
+    dataset.save(make_viz({"a": (0, 0, 0)}))
+
+    write_file = LocalSink.write_file
+
+    def failing_write_file(sink, source_path):
+        if sink.path.name == "patch_000002.json":
+            raise OSError("upload failed")
+        write_file(sink, source_path)
+
+    monkeypatch.setattr(LocalSink, "write_file", failing_write_file)
+    with pytest.raises(DatasetError):
+        dataset.save(make_viz({"a": (0, 0, 0), "b": (1, 1, 1)}))
+    monkeypatch.setattr(LocalSink, "write_file", write_file)
+
+    dataset.save(make_viz({"a": (0, 0, 0), "b": (1, 1, 1), "c": (2, 2, 2)}))
+    mirror = DeltaPublishedJSONDataset(path=str(tmp_path / "mirror"))
+    assert [patch["file"] for patch in mirror.load_manifest()["patches"]] == ["patch_000002.json", "patch_000003.json"]
+    assert mirror.load() == dataset.load()
@@ -0,0 +1,69 @@
+import boto3
+import pandas as pd
+import pytest
+from moto import mock_aws
+
+from arxiv_discoverer.datasets import MultiSinkDataset
+
+BUCKET = "arxiv-file-storage"
+
+
+@pytest.fixture
+def s3_bucket(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        boto3.client("s3").create_bucket(Bucket=BUCKET)
+        yield BUCKET
+
+
+@pytest.fixture
+def papers_df():
+    return pd.DataFrame({"paper_id": ["2401.00001v1", "2401.00002v2"], "title": ["A", "B"], "year_published": [2024, 2023]})
+
+
+def test_save_serializes_once_to_every_sink(tmp_path, s3_bucket, papers_df, mocker):
+    dataset = MultiSinkDataset(
+        sinks=[str(tmp_path / "papers.csv"), f"s3://{s3_bucket}/metadata/papers.csv"],
+        credentials={"key": "testing", "secret": "testing"},
+    )
+    to_csv = mocker.spy(pd.DataFrame, "to_csv")
+    dataset.save(papers_df)
+
+    assert to_csv.call_count == 1
+    s3_content = boto3.client("s3").get_object(Bucket=s3_bucket, Key="metadata/papers.csv")["Body"].read()
+    assert s3_content == (tmp_path / "papers.csv").read_bytes()
+    pd.testing.assert_frame_equal(dataset.load(), papers_df)
+
+
+def test_load_streams_from_s3_when_first(s3_bucket, papers_df):
+    dataset = MultiSinkDataset(sinks=[f"s3://{s3_bucket}/papers.pickle"], format="pickle")
+    assert not dataset.exists()
+    dataset.save(papers_df)
+
+    assert dataset.exists()
+    pd.testing.assert_frame_equal(dataset.load(), papers_df)
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported format"):
+        MultiSinkDataset(sinks=[str(tmp_path / "a.parquet")], format="parquet")
+
+
+def test_dataset_can_be_pickled_for_parallel_runner(tmp_path, s3_bucket, papers_df):
+    import pickle
+
+    dataset = MultiSinkDataset(sinks=[str(tmp_path / "papers.csv"), f"s3://{s3_bucket}/papers.csv"])
+    restored = pickle.loads(pickle.dumps(dataset))
+    restored.save(papers_df)
+
+    pd.testing.assert_frame_equal(dataset.load(), papers_df)
+
+
+def test_sinks_are_created_on_first_save(tmp_path, papers_df, mocker):
+    get_s3_client = mocker.patch("arxiv_discoverer.storage._sinks.get_s3_client")
+    dataset = MultiSinkDataset(sinks=[str(tmp_path / "papers.csv"), "s3://bucket/papers.csv"])
+    get_s3_client.assert_not_called()
+
+    mocker.patch("arxiv_discoverer.datasets._multi_sink_dataset.write_to_sinks")
+    dataset.save(papers_df)
+    get_s3_client.assert_called_once()
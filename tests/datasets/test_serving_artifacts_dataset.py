@@ -0,0 +1,47 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from kedro.io.core import DatasetError
+
+from arxiv_discoverer.datasets import ServingArtifactsDataset
+from arxiv_discoverer.pipelines.dimensionality_reduction.nodes import (
+    create_serving_artifacts,
+)
+
+
+@pytest.fixture
+def merged_df():
+    return pd.DataFrame(
+        {
+            "paper_id": ["2401.00001v1", "2401.00002v2", "2401.00003v1"],
+            "x": [0.0, 1.0, 2.0],
+            "y": [0.5, 1.5, 2.5],
+            "z": [-1.0, 0.0, 1.0],
+            "title": ["A", "B", None],
+            "year_published": [2024.0, 2023.0, None],
+        }
+    )
+
+
+def test_save_and_load_serving_artifacts(tmp_path, merged_df):
+    dataset = ServingArtifactsDataset(path=str(tmp_path / "serving"), shard_size=2)
+
+    assert not dataset.exists()
+    dataset.save(create_serving_artifacts(merged_df, ["title", "year_published", "missing"]))
+    artifacts = dataset.load()
+
+    assert dataset.exists()
+    assert len(artifacts) == 3
+    assert artifacts.n_shards == 2
+    assert artifacts.manifest["metadata"]["bounds"]["z"] == [-1.0, 1.0]
+    np.testing.assert_array_equal(artifacts.coordinates, merged_df[["x", "y", "z"]].to_numpy(dtype="float32"))
+    details = json.loads(bytes(artifacts.detail_bytes(artifacts.row_of("2401.00003v1"))))
+    assert details == {"id": artifacts.ids[2].decode(), "title": None, "year_published": None}
+    artifacts.close()
+
+
+def test_remote_paths_are_rejected():
+    with pytest.raises(DatasetError, match="must be local"):
+        ServingArtifactsDataset(path="s3://bucket/serving")
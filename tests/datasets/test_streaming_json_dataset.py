@@ -0,0 +1,81 @@
+import gzip
+import json
+
+import pytest
+from kedro.io import DatasetError
+
+from arxiv_discoverer.datasets import (
+    JSONArrayStream,
+    JSONObjectStream,
+    StreamingJSONDataset,
+    materialize,
+)
+
+
+@pytest.fixture
+def streamed_data():
+    return {
+        "coordinates": JSONArrayStream(lambda: ({"id": str(i), "x": i / 3} for i in range(1000))),
+        "details": JSONObjectStream(lambda: ((str(i), {"title": f"paper {i}", "year": None}) for i in range(1000))),
+        "metadata": {"total_papers": 1000, "bounds": [0.0, 1.5]},
+    }
+
+
+def test_save_streams_compact_json(tmp_path, streamed_data):
+    filepath = tmp_path / "viz.json"
+    StreamingJSONDataset(filepath=str(filepath)).save(streamed_data)
+
+    content = filepath.read_text()
+    assert json.loads(content) == materialize(streamed_data)
+    assert ", " not in content and ": " not in content
+
+
+def test_compressed_variants_are_written_in_the_same_pass(tmp_path, streamed_data):
+    pytest.importorskip("brotli")
+    import brotli
+
+    filepath = tmp_path / "viz.json"
+    StreamingJSONDataset(filepath=str(filepath), compression=["gzip", "br"]).save(streamed_data)
+
+    raw = filepath.read_bytes()
+    assert gzip.decompress((tmp_path / "viz.json.gz").read_bytes()) == raw
+    assert brotli.decompress((tmp_path / "viz.json.br").read_bytes()) == raw
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_content_hash_names_and_pointer(tmp_path, streamed_data):
+    dataset = StreamingJSONDataset(filepath=str(tmp_path / "viz.json"), compression=["gzip"], content_hash=True)
+    dataset.save(streamed_data)
+
+    pointer = json.loads((tmp_path / "viz.json").read_text())
+    assert pointer["file"] == f"viz.{pointer['sha256'][:16]}.json"
+    assert pointer["encodings"] == {"gzip": pointer["file"] + ".gz"}
+    assert dataset.load() == materialize(streamed_data)
+
+
+def test_unknown_compression_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported compression"):
+        StreamingJSONDataset(filepath=str(tmp_path / "a.json"), compression=["zstd"])
+
+
+def test_superseded_content_hash_files_are_pruned(tmp_path, streamed_data):
+    dataset = StreamingJSONDataset(filepath=str(tmp_path / "viz.json"), compression=["gzip"], content_hash=True)
+    dataset.save(streamed_data)
+    dataset.save({"metadata": {"total_papers": 0}})
+
+    pointer = json.loads((tmp_path / "viz.json").read_text())
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        ["viz.json", pointer["file"], pointer["encodings"]["gzip"]]
+    )
+
+
+def test_failed_save_leaves_no_temporary_files(tmp_path):
+    def records():
+        yield {"id": "1"}
+        raise RuntimeError("boom")
+
+    dataset = StreamingJSONDataset(filepath=str(tmp_path / "viz.json"), compression=["gzip"])
+    with pytest.raises(DatasetError, match="Failed while saving"):
+        dataset.save({"coordinates": JSONArrayStream(records)})
+
+    assert not list(tmp_path.iterdir())
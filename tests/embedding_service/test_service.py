@@ -0,0 +1,175 @@
+import asyncio
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from arxiv_discoverer.embedding_service import (
+    EmbeddingClient,
+    EmbeddingServer,
+    EmbeddingServiceError,
+    encode_with_service,
+)
+from arxiv_discoverer.embedding_service._protocol import encode_frame, read_frame
+from arxiv_discoverer.pipelines.arxiv_embedding_pipeline.nodes import create_embeddings
+
+
+class FakeEncoder:
+    """Deterministic encoder recording the size of every batch it encodes."""
+
+    def __init__(self, fail_on: str | None = None):
+        self.batch_sizes = []
+        self.fail_on = fail_on
+
+    def __call__(self, texts):
+        if self.fail_on in texts:
+            raise ValueError(f"cannot encode {self.fail_on}")
+        self.batch_sizes.append(len(texts))
+        return np.array([[len(text), sum(map(ord, text)) % 97, 1.0] for text in texts], dtype=np.float32)
+
+
+def expected(texts):
+    return FakeEncoder()(texts)
+
+
+def run_with_server(encoder, scenario, **server_kwargs):
+    async def main():
+        async with EmbeddingServer(encoder, port=0, **server_kwargs) as server:
+            return await scenario(server.address)
+
+    return asyncio.run(main())
+
+
+def test_concurrent_requests_are_batched():
+    encoder = FakeEncoder()
+    texts = [f"paper {i}" for i in range(40)]
+
+    async def scenario(address):
+        async with EmbeddingClient(address) as client:
+            results = await asyncio.gather(*(client.encode([text]) for text in texts))
+            return results, await client.stats()
+
+    results, stats = run_with_server(encoder, scenario, max_batch_size=16, max_wait_ms=50)
+
+    for text, result in zip(texts, results):
+        np.testing.assert_array_equal(result, expected([text]))
+    assert max(encoder.batch_sizes) <= 16
+    assert len(encoder.batch_sizes) < len(texts)
+    assert stats["requests"] == 40
+    assert stats["texts"] == 40
+    assert stats["batches"] == len(encoder.batch_sizes)
+    assert 0 < stats["mean_batch_fill"] <= 1
+    assert stats["latency_p50_ms"] <= stats["latency_p99_ms"]
+
+
+def test_large_inputs_are_split_and_reassembled_in_order():
+    encoder = FakeEncoder()
+    texts = [f"abstract {i}" * (i % 5 + 1) for i in range(100)]
+
+    async def scenario(address):
+        return await encode_with_service(address, texts, request_size=8)
+
+    vectors = run_with_server(encoder, scenario, max_batch_size=32, max_wait_ms=20)
+
+    np.testing.assert_array_equal(vectors, expected(texts))
+    assert max(encoder.batch_sizes) <= 32
+
+
+def test_clients_share_batches():
+    encoder = FakeEncoder()
+
+    async def scenario(address):
+        clients = [await EmbeddingClient(address).connect() for _ in range(4)]
+        try:
+            return await asyncio.gather(*(client.encode([f"client {i}"]) for i, client in enumerate(clients)))
+        finally:
+            for client in clients:
+                await client.close()
+
+    results = run_with_server(encoder, scenario, max_batch_size=64, max_wait_ms=200)
+
+    assert encoder.batch_sizes == [4]
+    for i, result in enumerate(results):
+        np.testing.assert_array_equal(result, expected([f"client {i}"]))
+
+
+def test_encoder_errors_are_reported_to_the_client():
+    encoder = FakeEncoder(fail_on="broken")
+
+    async def scenario(address):
+        async with EmbeddingClient(address) as client:
+            with pytest.raises(EmbeddingServiceError, match="cannot encode broken"):
+                await client.encode(["broken"])
+            # The server keeps serving after a failed batch.
+            return await client.encode(["fine"]), await client.stats()
+
+    vectors, stats = run_with_server(encoder, scenario, max_wait_ms=1)
+
+    np.testing.assert_array_equal(vectors, expected(["fine"]))
+    assert stats["errors"] == 1
+
+
+def test_requests_fail_fast_once_the_reader_died():
+    async def misbehaving_server(reader, writer):
+        await read_frame(reader)
+        # A response without its request id stops the client reader.
+        writer.write(encode_frame({"type": "encode"}))
+        await writer.drain()
+        await reader.read()
+
+    async def main():
+        server = await asyncio.start_server(misbehaving_server, "127.0.0.1", 0)
+        host, port = server.sockets[0].getsockname()[:2]
+        async with server, EmbeddingClient(f"{host}:{port}") as client:
+            with pytest.raises(ConnectionError, match="failed: KeyError"):
+                await asyncio.wait_for(client.encode(["first"]), 5)
+            with pytest.raises(ConnectionError, match="failed: KeyError"):
+                await asyncio.wait_for(client.encode(["second"]), 5)
+
+    asyncio.run(main())
+
+
+@pytest.fixture
+def background_server():
+    """Server running in its own event loop thread, like a separate service process."""
+    encoder = FakeEncoder()
+    started = threading.Event()
+    state = {}
+
+    async def serve():
+        state["stop"] = asyncio.Event()
+        async with EmbeddingServer(encoder, port=0, max_wait_ms=1) as server:
+            state["address"] = server.address
+            started.set()
+            await state["stop"].wait()
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_until_complete, args=(serve(),))
+    thread.start()
+    assert started.wait(5)
+    yield state["address"], encoder
+    loop.call_soon_threadsafe(state["stop"].set)
+    thread.join(5)
+    loop.close()
+
+
+def test_synchronous_callers_use_a_running_server(background_server):
+    address, _ = background_server
+
+    vectors = asyncio.run(encode_with_service(address, ["a", "bb"]))
+
+    np.testing.assert_array_equal(vectors, expected(["a", "bb"]))
+
+
+def test_create_embeddings_encodes_with_the_service(background_server):
+    address, encoder = background_server
+    papers = pd.DataFrame(
+        {"paper_id": [f"p{i}" for i in range(7)], "title": [f"T{i}" for i in range(7)], "summary": ["S"] * 7}
+    )
+
+    embeddings = create_embeddings(papers, "unused-model", embedding_service=address, chunk_size=3)
+
+    assert sorted(embeddings) == sorted(papers["paper_id"])
+    np.testing.assert_array_equal(embeddings["p4"], expected(["Title : T4\n Abstract : S"])[0])
+    assert sum(encoder.batch_sizes) == 7
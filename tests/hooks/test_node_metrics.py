@@ -0,0 +1,95 @@
+import json
+
+import numpy as np
+import pandas as pd
+from kedro.framework.hooks.manager import _create_hook_manager
+from kedro.io import DataCatalog, MemoryDataset
+from kedro.pipeline import node, pipeline
+from kedro.runner import SequentialRunner
+
+from arxiv_discoverer.hooks import NodeMetricsHooks, data_size
+
+
+def double(df: pd.DataFrame) -> pd.DataFrame:
+    return df * 2
+
+
+def to_array(df: pd.DataFrame) -> np.ndarray:
+    return df.to_numpy()
+
+
+def run_with_hooks(hooks: NodeMetricsHooks) -> None:
+    hook_manager = _create_hook_manager()
+    hook_manager.register(hooks)
+    catalog = DataCatalog({"papers": MemoryDataset(pd.DataFrame({"x": range(1000)}))})
+    test_pipeline = pipeline(
+        [
+            node(double, "papers", "doubled", name="double_node"),
+            node(to_array, "doubled", "array", name="to_array_node"),
+        ]
+    )
+    hooks.before_pipeline_run(run_params={"run_id": "test-run"})
+    SequentialRunner().run(test_pipeline, catalog, hook_manager=hook_manager)
+    hooks.after_pipeline_run()
+
+
+def test_node_metrics_are_logged(tmp_path):
+    hooks = NodeMetricsHooks(output_dir=str(tmp_path), trace_allocations=True)
+    run_with_hooks(hooks)
+
+    records = [json.loads(line) for line in (tmp_path / "node_metrics.jsonl").read_text().splitlines()]
+    assert [record["node"] for record in records] == ["double_node", "to_array_node"]
+    for record in records:
+        assert record["run_id"] == "test-run"
+        assert record["input_rows"] == 1000
+        assert record["wall_seconds"] >= 0 and record["cpu_seconds"] >= 0
+        assert record["peak_rss_mb"] > 0
+        assert "traced_peak_mb" in record
+    assert records[1]["output_mb"] == 1000 * 8 / 2**20
+
+
+def test_prometheus_file_and_summary(tmp_path):
+    hooks = NodeMetricsHooks(output_dir=str(tmp_path), trace_allocations=False)
+    run_with_hooks(hooks)
+
+    prometheus = (tmp_path / "node_metrics.prom").read_text()
+    assert "# TYPE arxiv_node_wall_seconds gauge" in prometheus
+    assert 'arxiv_node_input_rows{node="double_node"} 1000' in prometheus
+    assert "traced_peak_mb{" not in prometheus
+    assert hooks.summary_table().splitlines()[0].startswith("node")
+
+
+def test_allocation_tracing_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.delenv("ARXIV_TRACE_ALLOCATIONS", raising=False)
+    assert not NodeMetricsHooks(output_dir=str(tmp_path)).trace_allocations
+
+    monkeypatch.setenv("ARXIV_TRACE_ALLOCATIONS", "true")
+    assert NodeMetricsHooks(output_dir=str(tmp_path)).trace_allocations
+
+    monkeypatch.delenv("ARXIV_TRACE_ALLOCATIONS")
+    hooks = NodeMetricsHooks(output_dir=str(tmp_path))
+    hooks.before_pipeline_run(run_params={"runtime_params": {"trace_allocations": True}})
+    hooks.after_pipeline_run()
+    assert hooks.trace_allocations
+
+
+def test_traced_peak_is_not_recorded_for_concurrent_nodes(tmp_path):
+    hooks = NodeMetricsHooks(output_dir=str(tmp_path), trace_allocations=True)
+    first, second = node(double, "a", "b", name="first_node"), node(double, "b", "c", name="second_node")
+    hooks.before_pipeline_run(run_params={"run_id": "test-run"})
+    hooks.before_node_run(first, {})
+    hooks.before_node_run(second, {})
+    hooks.after_node_run(first, {})
+    hooks.after_node_run(second, {})
+    hooks.after_pipeline_run()
+
+    assert all("traced_peak_mb" not in record for record in hooks.records)
+
+
+def test_data_size():
+    assert data_size(pd.DataFrame({"a": np.zeros(10)})) == (10, 80 + 132)
+    assert data_size(np.zeros((5, 2), dtype=np.float32)) == (5, 40)
+    assert data_size({"ids": np.arange(3), "vectors": np.zeros((3, 4))})[0] == 3
+    assert data_size(b"abc") == (None, 3)
+    # Objects of object columns are counted.
+    assert data_size(pd.DataFrame({"authors": [["Ada", "Bob"]] * 10}, dtype=object))[1] > 10 * 8 + 132
@@ -0,0 +1,80 @@
+import pstats
+import time
+
+import pytest
+from kedro.framework.hooks.manager import _create_hook_manager
+from kedro.io import DataCatalog, MemoryDataset
+from kedro.pipeline import node, pipeline
+from kedro.runner import SequentialRunner
+
+from arxiv_discoverer.hooks import NodeProfilerHooks, parse_node_names
+
+
+def busy_loop(n: int) -> int:
+    deadline = time.perf_counter() + 0.2
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(n))
+    return total
+
+
+def identity(value: int) -> int:
+    return value
+
+
+def run_with_hooks(hooks: NodeProfilerHooks, runtime_params: dict | None = None) -> None:
+    hook_manager = _create_hook_manager()
+    hook_manager.register(hooks)
+    catalog = DataCatalog({"n": MemoryDataset(1000)})
+    test_pipeline = pipeline(
+        [
+            node(busy_loop, "n", "total", name="busy_node"),
+            node(identity, "total", "same", name="identity_node"),
+        ]
+    )
+    hooks.before_pipeline_run(run_params={"runtime_params": runtime_params or {}})
+    SequentialRunner().run(test_pipeline, catalog, hook_manager=hook_manager)
+
+
+def test_nothing_is_profiled_by_default(tmp_path, monkeypatch):
+    monkeypatch.delenv("ARXIV_PROFILE_NODES", raising=False)
+    run_with_hooks(NodeProfilerHooks(output_dir=str(tmp_path)))
+    assert not list(tmp_path.iterdir())
+
+
+def test_cprofile_from_env_var(tmp_path, monkeypatch):
+    monkeypatch.setenv("ARXIV_PROFILE_NODES", "busy_node")
+    run_with_hooks(NodeProfilerHooks(output_dir=str(tmp_path)))
+
+    (profile,) = tmp_path.glob("busy_node.*.pstats")
+    functions = {name for _, _, name in pstats.Stats(str(profile)).stats}
+    assert "busy_loop" in functions
+    assert not list(tmp_path.glob("identity_node.*"))
+
+    collapsed = next(tmp_path.glob("busy_node.*.collapsed")).read_text().splitlines()
+    assert any("busy_loop (test_node_profiler.py" in line for line in collapsed)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed)
+
+
+def test_sampling_from_runtime_params(tmp_path, monkeypatch):
+    monkeypatch.delenv("ARXIV_PROFILE_NODES", raising=False)
+    run_with_hooks(
+        NodeProfilerHooks(output_dir=str(tmp_path), interval=0.001),
+        {"profile_nodes": "busy_node;identity_node", "profile_mode": "sampling"},
+    )
+
+    collapsed = next(tmp_path.glob("busy_node.*.collapsed")).read_text().splitlines()
+    assert any("busy_loop (test_node_profiler.py" in line for line in collapsed)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed)
+
+
+def test_unknown_mode_is_rejected(monkeypatch):
+    hooks = NodeProfilerHooks()
+    with pytest.raises(ValueError, match="Unknown profile mode"):
+        hooks.before_pipeline_run(run_params={"runtime_params": {"profile_nodes": "all", "profile_mode": "perf"}})
+
+
+def test_parse_node_names():
+    assert parse_node_names("a, b;c d") == {"a", "b", "c", "d"}
+    assert parse_node_names(["a", " b "]) == {"a", "b"}
+    assert parse_node_names(None) == set()
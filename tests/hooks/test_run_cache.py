@@ -0,0 +1,130 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from kedro.framework.hooks.manager import _create_hook_manager
+from kedro.io import DataCatalog, MemoryDataset
+from kedro.pipeline import node, pipeline
+from kedro.runner import SequentialRunner
+
+from arxiv_discoverer.hooks import RunCacheHooks, node_fingerprint
+
+calls = []
+
+
+def reduce(embeddings: dict, n_components: int) -> tuple[pd.DataFrame, int]:
+    calls.append("reduce")
+    return pd.DataFrame(embeddings["vectors"][:, :n_components]), n_components
+
+
+def summarize(reduced: pd.DataFrame) -> dict:
+    calls.append("summarize")
+    return {"rows": len(reduced)}
+
+
+@pytest.fixture(autouse=True)
+def reset_calls(monkeypatch):
+    monkeypatch.delenv("ARXIV_FORCE_RERUN", raising=False)
+    calls.clear()
+
+
+def run(hooks: RunCacheHooks, vectors: np.ndarray, n_components: int = 2, runtime_params: dict | None = None):
+    hook_manager = _create_hook_manager()
+    hook_manager.register(hooks)
+    catalog = DataCatalog(
+        {
+            "embeddings": MemoryDataset({"paper_ids": ["a", "b", "c"], "vectors": vectors}),
+            "params:n_components": MemoryDataset(n_components),
+            "summary": MemoryDataset(),
+        }
+    )
+    test_pipeline = pipeline(
+        [
+            node(reduce, ["embeddings", "params:n_components"], ["reduced", "dims"], name="reduce_node"),
+            node(summarize, "reduced", "summary", name="summarize_node"),
+        ]
+    )
+    hooks.before_pipeline_run(run_params={"runtime_params": runtime_params or {}})
+    SequentialRunner().run(test_pipeline, catalog, hook_manager=hook_manager)
+    return catalog.load("summary")
+
+
+def test_unchanged_inputs_reuse_cached_outputs(tmp_path):
+    vectors = np.arange(12, dtype=np.float32).reshape(3, 4)
+    hooks = RunCacheHooks(nodes=["reduce_node"], cache_dir=str(tmp_path))
+
+    assert run(hooks, vectors) == {"rows": 3}
+    assert run(hooks, vectors) == {"rows": 3}
+    assert calls == ["reduce", "summarize", "summarize"]
+    assert hooks.hits == ["reduce_node"]
+
+
+def test_changed_inputs_or_params_recompute(tmp_path):
+    vectors = np.arange(12, dtype=np.float32).reshape(3, 4)
+    hooks = RunCacheHooks(nodes=["reduce_node"], cache_dir=str(tmp_path))
+
+    run(hooks, vectors)
+    run(hooks, vectors, n_components=3)
+    changed = vectors.copy()
+    changed[0, 0] = 100
+    run(hooks, changed)
+
+    assert calls.count("reduce") == 3
+    assert len(list((tmp_path / "reduce_node").glob("*.pickle"))) == 3
+
+
+def test_force_rerun(tmp_path, monkeypatch):
+    vectors = np.ones((3, 4))
+    hooks = RunCacheHooks(nodes=["reduce_node"], cache_dir=str(tmp_path))
+    run(hooks, vectors)
+    run(hooks, vectors, runtime_params={"force_rerun": "reduce_node"})
+    monkeypatch.setenv("ARXIV_FORCE_RERUN", "true")
+    run(RunCacheHooks(nodes=["reduce_node"], cache_dir=str(tmp_path)), vectors)
+
+    assert calls.count("reduce") == 3
+
+
+def test_eviction_keeps_recent_entries(tmp_path):
+    hooks = RunCacheHooks(nodes=["reduce_node"], cache_dir=str(tmp_path), max_entries_per_node=2)
+    for value in range(4):
+        run(hooks, np.full((3, 4), value, dtype=np.float32))
+        time.sleep(0.01)
+    assert len(list((tmp_path / "reduce_node").glob("*.pickle"))) == 2
+
+    old = next((tmp_path / "reduce_node").glob("*.pickle"))
+    os.utime(old, (0, 0))
+    hooks.max_age_days = 1
+    assert hooks.evict() == [old]
+
+
+def test_fingerprint_depends_on_function_source():
+    first = node(reduce, ["embeddings", "params:n_components"], ["reduced", "dims"])
+    second = node(lambda embeddings, n_components: (None, n_components), ["embeddings", "params:n_components"], ["reduced", "dims"])
+    inputs = {"embeddings": {"vectors": np.ones(3)}, "params:n_components": 2}
+    assert node_fingerprint(first, inputs) == node_fingerprint(first, dict(inputs))
+    assert node_fingerprint(first, inputs) != node_fingerprint(second, inputs)
+
+
+def test_fingerprint_depends_on_called_package_modules(tmp_path, monkeypatch):
+    package = tmp_path / "cached_package"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "helpers.py").write_text("def scale(x):\n    return 2 * x\n")
+    (package / "unrelated.py").write_text("VALUE = 1\n")
+    (package / "nodes.py").write_text(
+        "from .helpers import scale\n\n\ndef scaled(x):\n    return scale(x)\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    from cached_package.nodes import scaled
+
+    cached_node = node(scaled, "x", "y")
+    inputs = {"x": 1}
+    fingerprint = node_fingerprint(cached_node, inputs)
+
+    (package / "unrelated.py").write_text("VALUE = 2\n")
+    assert node_fingerprint(cached_node, inputs) == fingerprint
+
+    (package / "helpers.py").write_text("def scale(x):\n    return 3 * x\n")
+    assert node_fingerprint(cached_node, inputs) != fingerprint
@@ -0,0 +1,351 @@
+import numpy as np
+import pandas as pd
+import pytest
+from kedro.io import DataCatalog, MemoryDataset
+from kedro.runner import ThreadRunner
+from kedro_datasets.pickle import PickleDataset
+
+from arxiv_discoverer.pipelines.arxiv_embedding_pipeline import (
+    create_partitioned_pipeline,
+    create_pipeline,
+    default_n_partitions,
+)
+from arxiv_discoverer.pipelines.arxiv_embedding_pipeline import (
+    pipeline as embedding_pipeline,
+)
+from arxiv_discoverer.pipelines.arxiv_embedding_pipeline.nodes import (
+    _download_papers_by_category,
+    _partitions,
+    build_ann_index,
+    compress_embeddings,
+    find_near_duplicates,
+    get_previous_embeddings,
+    merge_with_previous_embeddings,
+    reuse_duplicate_embeddings,
+    select_dirty_papers,
+)
+from arxiv_discoverer.pipelines.arxiv_embedding_pipeline.nodes._atom_feed import (
+    ArxivFeedClient,
+    MalformedFeedError,
+    papers_frame,
+    parse_atom_feed,
+)
+from arxiv_discoverer.pipelines.arxiv_embedding_pipeline.nodes._download_papers_by_category import (
+    arxiv_client,
+    extract_paper_info,
+    harvest_new_papers,
+    split_arxiv_version,
+    update_downloaded_papers_df,
+)
+from arxiv_discoverer.pipelines.arxiv_embedding_pipeline.nodes._partitions import (
+    paper_partition,
+)
+from arxiv_discoverer.pipelines.arxiv_embedding_pipeline.pipeline import (
+    MODEL_PROCESS_BYTES,
+)
+from arxiv_discoverer.search import CompressedEmbeddings, EmbeddingCodec
+
+CATEGORIES = ["cs.LG", "cs.CV", "math.CO", "astro-ph.GA", "q-bio.NC"]
+
+
+def fake_harvest(downloaded_papers_df, categories, max_results, client_params=None):
+    return [
+        {
+            "entry_id": f"http://arxiv.org/abs/{category}-{i}",
+            "paper_id": f"{category}-{i}",
+            "published": "2024-01-01",
+            "title": f"{category} paper {i}",
+            "summary": "abstract",
+        }
+        for category in categories
+        for i in range(max_results)
+    ]
+
+
+def fake_create_embeddings(df, model_path, embedding_service=None, governor_params=None):
+    return {paper_id: np.full(4, len(paper_id), dtype=np.float32) for paper_id in df["paper_id"]}
+
+
+def test_arxiv_client_can_target_another_endpoint():
+    client = arxiv_client(
+        {"page_size": 50, "delay_seconds": 0.0, "num_retries": None, "query_url_format": "http://127.0.0.1:8080/api/query?{}"}
+    )
+    assert (client.page_size, client.delay_seconds, client.num_retries) == (50, 0.0, 3)
+    assert client.query_url_format == "http://127.0.0.1:8080/api/query?{}"
+    assert arxiv_client().query_url_format.startswith("https://export.arxiv.org/")
+
+
+ATOM_PAGE = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/"
+      xmlns:arxiv="http://arxiv.org/schemas/atom">
+  <title>arXiv Query</title>
+  <opensearch:itemsPerPage>2</opensearch:itemsPerPage>
+  <opensearch:totalResults>5</opensearch:totalResults>
+  <opensearch:startIndex>0</opensearch:startIndex>
+  <entry>
+    <id>http://arxiv.org/abs/2401.00001v2</id>
+    <updated>2024-01-03T10:00:00Z</updated>
+    <published>2024-01-01T09:30:00Z</published>
+    <title>Graph networks
+      for molecules</title>
+    <summary>  We study molecules &amp; graphs.
+</summary>
+    <author><name>Ada Lovelace</name><arxiv:affiliation>Analytical Engine</arxiv:affiliation></author>
+    <author><name>Alan Turing</name></author>
+    <arxiv:doi>10.1000/xyz</arxiv:doi>
+    <link href="http://arxiv.org/abs/2401.00001v2" rel="alternate" type="text/html"/>
+    <link title="pdf" href="http://arxiv.org/pdf/2401.00001v2" rel="related" type="application/pdf"/>
+    <arxiv:comment>12 pages</arxiv:comment>
+    <arxiv:primary_category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="q-bio.BM" scheme="http://arxiv.org/schemas/atom"/>
+  </entry>
+  <entry>
+    <id>http://arxiv.org/abs/hep-th/9901001v1</id>
+    <updated>1999-01-04T00:00:00Z</updated>
+    <published>1999-01-04T00:00:00Z</published>
+    <title>Strings</title>
+    <summary></summary>
+    <link href="http://arxiv.org/abs/hep-th/9901001v1" rel="alternate" type="text/html"/>
+    <arxiv:primary_category term="hep-th" scheme="http://arxiv.org/schemas/atom"/>
+  </entry>
+</feed>
+"""
+
+
+def comparable(df):
+    return df.astype(object).where(df.notna(), None)
+
+
+def test_columnar_parser_matches_extract_paper_info():
+    from arxiv import _feed
+
+    feed = parse_atom_feed(ATOM_PAGE)
+    expected = pd.DataFrame([extract_paper_info(result)[0] for result in _feed.parse(ATOM_PAGE).results])
+
+    assert (feed.total_results, feed.start_index, feed.items_per_page) == (5, 0, 2)
+    pd.testing.assert_frame_equal(comparable(papers_frame([feed.papers])), comparable(expected))
+    assert feed.papers.column("paper_id").to_pylist() == ["2401.00001", "hep-th/9901001"]
+
+
+def test_truncated_pages_are_retried(mocker):
+    client = ArxivFeedClient(delay_seconds=0.0, num_retries=2)
+    responses = [
+        mocker.Mock(status_code=503, content=b""),
+        mocker.Mock(status_code=200, content=ATOM_PAGE[: ATOM_PAGE.index(b"<published>1999")]),
+        mocker.Mock(status_code=200, content=ATOM_PAGE),
+    ]
+    get = mocker.patch.object(client._session, "get", side_effect=responses)
+
+    with pytest.raises(MalformedFeedError):
+        parse_atom_feed(responses[1].content)
+    assert [batch.num_rows for batch in client.batches("cs.LG", 2)] == [2]
+    assert get.call_count == 3
+
+
+def test_columnar_harvest_skips_known_versions(mocker):
+    batch = parse_atom_feed(ATOM_PAGE).papers
+    mocker.patch.object(ArxivFeedClient, "batches", side_effect=lambda query, max_results: iter([batch]))
+    previous = pd.DataFrame([paper("2401.00001", published="2024-01-01 09:30:00+00:00") | {"version": 2}])
+
+    papers = harvest_new_papers(previous, ["cs.LG", "hep-th"], 2, {"parser": "columnar"})
+
+    assert papers["paper_id"].tolist() == ["hep-th/9901001"]
+    assert papers["authors"].tolist() == [[]]
+    assert update_downloaded_papers_df(previous, papers)["paper_id"].tolist() == ["2401.00001", "hep-th/9901001"]
+
+
+def test_paper_partition_is_stable():
+    ids = pd.Series([f"2401.{i:05d}v1" for i in range(1000)])
+    assignment = paper_partition(ids, 4)
+    assert np.array_equal(assignment, paper_partition(ids, 4))
+    assert set(np.bincount(assignment)) and np.bincount(assignment).min() > 200
+
+
+def test_partitioned_pipeline_has_same_outputs():
+    partitioned = create_partitioned_pipeline(3)
+    names = {node.name for node in partitioned.nodes}
+
+    assert {f"create_embeddings_partition_{i}_node" for i in range(3)} <= names
+    # A single harvesting node, so that arXiv sees one client respecting its rate limit.
+    assert "download_papers_by_category_node" in names
+    assert not any(name.startswith("download_papers_partition") for name in names)
+    assert partitioned.all_outputs() >= create_pipeline().outputs()
+
+
+def test_default_partitions_fit_one_model_per_process_in_memory(mocker):
+    mocker.patch("os.cpu_count", return_value=16)
+    available_memory = mocker.patch.object(embedding_pipeline, "available_memory", return_value=3 * MODEL_PROCESS_BYTES)
+    assert default_n_partitions() == 3
+
+    available_memory.return_value = MODEL_PROCESS_BYTES // 2
+    assert default_n_partitions() == 1
+
+    available_memory.return_value = None
+    assert default_n_partitions() == 16
+
+
+def test_partitioned_pipeline_runs_with_thread_runner(tmp_path, mocker):
+    mocker.patch.object(_download_papers_by_category, "harvest_new_papers", side_effect=fake_harvest)
+    mocker.patch.object(_partitions, "create_embeddings", side_effect=fake_create_embeddings)
+    previous = pd.DataFrame(
+        # Same text as the harvested cs.LG-0, which reuses its embedding.
+        [{"entry_id": "old", "paper_id": "old-0", "published": "2023-01-01", "title": "cs.LG paper 0", "summary": "abstract"}]
+    )
+    catalog = DataCatalog(
+        {
+            "categories_list": MemoryDataset(CATEGORIES),
+            "downloaded_papers_df_previous_iteration": MemoryDataset(previous),
+            "params:max_results_per_category": MemoryDataset(2),
+            "params:arxiv_client": MemoryDataset({}),
+            "params:model_path": MemoryDataset("model"),
+            "params:embedding_service": MemoryDataset(None),
+            "params:resource_governor": MemoryDataset({}),
+            "params:previous_embeddings_path": MemoryDataset(str(tmp_path / "missing.npz")),
+            "params:legacy_embeddings_path": MemoryDataset(str(tmp_path / "missing.pickle")),
+            "params:near_duplicates": MemoryDataset({"threshold": 0.9}),
+            "downloaded_papers_df": PickleDataset(filepath=str(tmp_path / "papers.pickle")),
+            "arxiv_embeddings_float32": PickleDataset(filepath=str(tmp_path / "embeddings.pickle")),
+        }
+    )
+    pipeline = create_partitioned_pipeline(3).from_inputs(
+        "downloaded_papers_df_previous_iteration", "params:previous_embeddings_path"
+    ).to_outputs("arxiv_embeddings_float32")
+
+    ThreadRunner(max_workers=3).run(pipeline, catalog)
+
+    papers = catalog.load("downloaded_papers_df")
+    embeddings = catalog.load("arxiv_embeddings_float32")
+    assert len(papers) == 1 + 2 * len(CATEGORIES)
+    assert list(embeddings) == papers["paper_id"].tolist()
+    np.testing.assert_array_equal(embeddings["cs.LG-0"], embeddings["old-0"])
+    assert embeddings["cs.LG-1"][0] == len("cs.LG-1")
+
+
+def test_near_duplicates_reuse_the_embedding_of_the_first_paper():
+    abstract = "We propose a graph neural network for molecule property prediction on large benchmarks."
+    papers = pd.DataFrame(
+        {
+            "paper_id": ["a", "b", "c", "d"],
+            "title": ["Molecular GNNs", "Quantum gravity", "Molecular  GNNs", "Molecular GNNs"],
+            "summary": [abstract, "Loop quantum gravity in four dimensions.", abstract.upper(), abstract + " Errata."],
+        }
+    )
+
+    unique, near_duplicates, report = find_near_duplicates(papers, {"threshold": 0.8})
+    embeddings = reuse_duplicate_embeddings(papers, fake_create_embeddings(unique, "model"), near_duplicates)
+
+    assert unique["paper_id"].tolist() == ["a", "b"]
+    assert near_duplicates == {"c": "a", "d": "a"}
+    assert report["encodes_saved"] == 2
+    assert list(embeddings) == ["a", "b", "c", "d"]
+    assert embeddings["d"] is embeddings["a"]
+
+
+def test_near_duplicate_detection_can_be_disabled():
+    papers = pd.DataFrame({"paper_id": ["a", "b"], "title": ["T", "T"], "summary": ["same", "same"]})
+
+    unique, near_duplicates, report = find_near_duplicates(papers, {"enabled": False})
+
+    assert unique is papers
+    assert near_duplicates == {}
+    assert report["encodes_saved"] == 0
+
+
+def paper(paper_id, title="Title", summary="Abstract", published="2024-01-01"):
+    return {"entry_id": f"http://arxiv.org/abs/{paper_id}", "paper_id": paper_id, "published": published,
+            "title": title, "summary": summary}
+
+
+def test_split_arxiv_version():
+    assert split_arxiv_version("2401.00001v12") == ("2401.00001", 12)
+    assert split_arxiv_version("hep-th/9901001v1") == ("hep-th/9901001", 1)
+    assert split_arxiv_version("2401.00001") == ("2401.00001", 1)
+
+
+def test_upsert_migrates_versioned_rows_and_replaces_new_versions_in_place():
+    # Rows of older files are keyed on the versioned id, with duplicated versions.
+    previous = pd.DataFrame([paper("av1", title="A"), paper("bv1", title="B"), paper("bv2", title="B")])
+
+    papers = update_downloaded_papers_df(previous, [])
+    assert papers["paper_id"].tolist() == ["a", "b"]
+    assert papers["version"].tolist() == [1, 2]
+    assert not papers["dirty"].any()
+
+    new_entries = [paper("b", title="B", summary="Corrected abstract") | {"version": 3}, paper("c") | {"version": 1}]
+    papers = update_downloaded_papers_df(papers, new_entries)
+    assert papers["paper_id"].tolist() == ["a", "b", "c"]
+    assert papers["version"].tolist() == [1, 3, 1]
+    assert papers["summary"].tolist()[1] == "Corrected abstract"
+    assert papers["dirty"].tolist() == [False, True, True]
+
+
+def test_version_bump_without_text_change_is_not_dirty():
+    papers = update_downloaded_papers_df(None, [paper("a", summary="Same  abstract") | {"version": 1}])
+    assert papers["dirty"].tolist() == [True]
+
+    bumped = paper("a", summary="Same abstract", published="2024-02-01") | {"version": 2}
+    papers = update_downloaded_papers_df(papers, [bumped])
+    assert papers["version"].tolist() == [2]
+    assert papers["dirty"].tolist() == [False]
+    # Older versions are ignored.
+    assert update_downloaded_papers_df(papers, [paper("a", summary="Old") | {"version": 1}])["version"].tolist() == [2]
+
+
+def test_only_dirty_papers_are_encoded():
+    papers = pd.DataFrame({"paper_id": ["a", "b", "c"], "title": ["A", "B", "C"], "summary": ["x", "y", "z"],
+                           "dirty": [False, True, False]})
+    previous = CompressedEmbeddings.encode(
+        {"a": np.ones(4, dtype=np.float32), "b": np.zeros(4, dtype=np.float32)}, EmbeddingCodec("float32")
+    )
+
+    dirty = select_dirty_papers(papers, previous)
+    assert dirty["paper_id"].tolist() == ["b", "c"]
+
+    embeddings = merge_with_previous_embeddings(papers, fake_create_embeddings(dirty, "model"), previous)
+    assert list(embeddings) == ["a", "b", "c"]
+    np.testing.assert_array_equal(embeddings["a"], np.ones(4))
+    assert embeddings["b"][0] == 1 and embeddings["c"][0] == 1
+
+
+def test_previous_embeddings_fall_back_to_the_legacy_pickle(tmp_path):
+    legacy_path = str(tmp_path / "embeddings_dict.pickle")
+    PickleDataset(filepath=legacy_path).save({"2401.00001v2": np.ones(4), "2401.00002v1": np.zeros(4)})
+
+    previous = get_previous_embeddings(str(tmp_path / "embeddings.npz"), legacy_path)
+    assert list(previous) == ["2401.00001", "2401.00002"]
+    np.testing.assert_array_equal(previous["2401.00001"], np.ones(4))
+    assert len(get_previous_embeddings(str(tmp_path / "embeddings.npz"))) == 0
+
+
+def test_changed_papers_are_encoded_until_their_embedding_is_saved():
+    papers = update_downloaded_papers_df(None, [paper("a", summary="x"), paper("b", summary="y")])
+    saved = compress_embeddings(
+        {"a": np.ones(4, dtype=np.float32), "b": np.ones(4, dtype=np.float32)}, EmbeddingCodec("float32"), papers
+    )
+    assert select_dirty_papers(papers, saved).empty
+
+    # The abstract of b changes, but the run fails before the embeddings are saved:
+    # the next run sees no change in the downloaded papers, only in the embeddings.
+    papers = update_downloaded_papers_df(papers, [paper("b", summary="Corrected") | {"version": 2}])
+    papers = update_downloaded_papers_df(papers, [])
+    assert not papers["dirty"].any()
+    assert select_dirty_papers(papers, saved)["paper_id"].tolist() == ["b"]
+
+
+@pytest.mark.parametrize("keep_vectors", [True, False])
+def test_ann_index_update_reindexes_changed_embeddings(keep_vectors):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(500, 16)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    embeddings = {f"paper-{i}": vector for i, vector in enumerate(vectors)}
+    params = {"index_params": {"n_lists": 8, "n_subvectors": 4, "n_probe": 8, "keep_vectors": keep_vectors}}
+    index = build_ann_index(embeddings, None, params)
+
+    # The abstract of paper-0 changed, its new embedding is the one of paper-1.
+    embeddings["paper-0"] = vectors[1]
+    index = build_ann_index(embeddings, index, params)
+
+    assert len(index) == len(vectors)
+    assert {paper_id for paper_id, _ in index.search(vectors[1], k=2)} == {"paper-0", "paper-1"}
+    assert "paper-0" not in {paper_id for paper_id, _ in index.search(vectors[0], k=5)}
@@ -7,3 +7,272 @@ Kedro recommends using `pytest` framework, more info about it can be found
 in the official documentation:
 https://docs.pytest.org/en/latest/getting-started.html
 """
+import importlib
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from arxiv_discoverer.datasets import DeltaPublishedJSONDataset, materialize
+from arxiv_discoverer.pipelines.dimensionality_reduction.nodes import (
+    create_facet_index,
+    create_visualization_json,
+    merge_embeddings_metadata,
+    reduce_vectors_dimensionality,
+)
+from arxiv_discoverer.pipelines.dimensionality_reduction.nodes._create_viz_json import (
+    hash_paper_id,
+)
+from arxiv_discoverer.pipelines.dimensionality_reduction.nodes._numba_cache import (
+    NUMBA_CACHE_DIR_ENV,
+    cached_numba_kernels,
+    configure_numba_cache,
+    count_cached_kernels,
+)
+
+
+@pytest.fixture
+def merged_df():
+    return pd.DataFrame(
+        {
+            "paper_id": ["2401.00001v1", "2401.00002v2", "2401.00003v1"],
+            "x": [0.0, 1.0, 2.0],
+            "y": [0.5, 1.5, 2.5],
+            "z": [-1.0, 0.0, 1.0],
+            "title": ["A", "B", None],
+            "summary": ["word " * 100, "short", "x"],
+            "primary_category": ["cs.LG", "cs.CV", "cs.LG"],
+            "year_published": [2024.0, 2023.0, None],
+        }
+    )
+
+
+def test_create_visualization_json(merged_df):
+    result = create_visualization_json(merged_df, ["title", "summary", "year_published", "missing"])
+    data = materialize(result)
+
+    first_id = hash_paper_id(merged_df["paper_id"].iloc[0])
+    assert [point["id"] for point in data["coordinates"]][0] == first_id
+    assert data["coordinates"][1] == {"id": hash_paper_id(merged_df["paper_id"].iloc[1]), "x": 1.0, "y": 1.5, "z": 0.0}
+    assert data["details"][first_id]["summary"].endswith("...")
+    assert data["details"][first_id]["year_published"] == 2024
+    assert data["details"][hash_paper_id(merged_df["paper_id"].iloc[2])] == {"title": None, "summary": "x", "year_published": None}
+    assert data["metadata"]["statistics"]["ordered_top_categories"] == {"cs.LG": 2, "cs.CV": 1}
+    assert data["metadata"]["bounds"]["x"] == [0.0, 2.0]
+
+
+def test_visualization_category_statistics_come_from_the_facet_bitmaps(merged_df):
+    facet_index, facet_counts = create_facet_index(merged_df, ["primary_category", "year_published"])
+    assert facet_index["size"] == len(merged_df)
+    assert facet_counts["year_published"] == {"2023": 1, "2024": 1}
+
+    # A DataFrame without primary_category: the counts can only come from the bitmaps.
+    result = create_visualization_json(merged_df.drop(columns="primary_category"), ["title"], facet_counts=facet_counts)
+    assert materialize(result)["metadata"]["statistics"]["ordered_top_categories"] == {"cs.LG": 2, "cs.CV": 1}
+
+
+def test_visualization_json_streams_to_delta_dataset(tmp_path, merged_df):
+    result = create_visualization_json(merged_df, ["title"])
+    dataset = DeltaPublishedJSONDataset(path=str(tmp_path / "viz"))
+    dataset.save(result)
+
+    assert dataset.load() == materialize(result)
+
+
+def test_merge_embeddings_metadata_joins_on_paper_id(caplog):
+    metadata_df = pd.DataFrame(
+        {
+            "paper_id": ["a", "b", "c", "b"],
+            "title": ["A", "B", "C", "B again"],
+            "summary": ["sa", "sb", "sc", "sb2"],
+            "doi": [None, "10.1/b", None, None],
+        }
+    )
+    embeddings = {"c": np.array([3.0, 3.5, 4.0]), "a": np.array([1.0, 1.5, 2.0]), "z": np.zeros(3)}
+
+    merged = merge_embeddings_metadata(metadata_df, embeddings, ["title", "missing", "title"])
+
+    assert list(merged.columns) == ["paper_id", "x", "y", "z", "title"]
+    assert merged["paper_id"].tolist() == ["a", "c"]
+    assert merged["title"].tolist() == ["A", "C"]
+    assert merged[["x", "y", "z"]].dtypes.eq(np.float32).all()
+    np.testing.assert_array_equal(merged[["x", "y", "z"]].to_numpy(), [[1.0, 1.5, 2.0], [3.0, 3.5, 4.0]])
+    assert "duplicated paper_ids" in caplog.text
+    assert "Length mismatch" in caplog.text
+
+
+def test_merge_embeddings_metadata_keeps_first_duplicate_and_all_columns():
+    metadata_df = pd.DataFrame({"paper_id": ["a", "b", "a"], "title": ["A", "B", "A again"]})
+    embeddings = {"b": [0.0, 1.0, 2.0], "a": [3.0, 4.0, 5.0]}
+
+    merged = merge_embeddings_metadata(metadata_df, embeddings)
+
+    assert merged["paper_id"].tolist() == ["a", "b"]
+    assert merged["title"].tolist() == ["A", "B"]
+    assert merged["x"].tolist() == [3.0, 0.0]
+
+
+@pytest.fixture
+def numba_config(monkeypatch):
+    numba = pytest.importorskip("numba")
+    monkeypatch.delenv(NUMBA_CACHE_DIR_ENV, raising=False)
+    monkeypatch.setattr(numba.config, "CACHE_DIR", numba.config.CACHE_DIR)
+    return numba.config
+
+
+def test_configure_numba_cache_prefers_environment(tmp_path, monkeypatch, numba_config):
+    assert configure_numba_cache(None) is None
+
+    cache_dir = configure_numba_cache(str(tmp_path / "param"))
+    assert cache_dir == str((tmp_path / "param").resolve())
+    assert numba_config.CACHE_DIR == cache_dir
+
+    monkeypatch.setenv(NUMBA_CACHE_DIR_ENV, str(tmp_path / "image"))
+    assert configure_numba_cache(str(tmp_path / "param")) == str(tmp_path / "image")
+    assert (tmp_path / "image").is_dir()
+
+
+def test_cached_numba_kernels_persist_undeclared_kernels(tmp_path, monkeypatch, numba_config):
+    module_dir = tmp_path / "src"
+    module_dir.mkdir()
+    (module_dir / "kernels_module.py").write_text(
+        "import numba\n\n\n@numba.njit\ndef total(values):\n    return values.sum()\n"
+    )
+    monkeypatch.syspath_prepend(str(module_dir))
+    cache_dir = configure_numba_cache(str(tmp_path / "numba"))
+
+    with cached_numba_kernels():
+        module = importlib.import_module("kernels_module")
+    sys.modules.pop("kernels_module")
+
+    assert module.total(np.arange(4.0)) == 6.0
+    assert count_cached_kernels(cache_dir) == 1
+
+
+
+def test_reduction_keeps_the_previous_layout_of_unchanged_papers(tmp_path):
+    from arxiv_discoverer.datasets import CompressedEmbeddingsDataset
+
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(50, 8)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    embeddings = {f"p{i}": vector for i, vector in enumerate(vectors)}
+    layout = {f"p{i}": rng.normal(size=3).astype(np.float32) for i in range(49)}
+    CompressedEmbeddingsDataset(filepath=str(tmp_path / "layout.npz")).save(layout)
+    papers = pd.DataFrame({"paper_id": list(embeddings), "dirty": [i in (3, 49) for i in range(50)]})
+    params = {
+        "dimensionality_reduction_method": "pca",
+        "dimensionality_reduction_params": {},
+        "incremental": {"layout_path": str(tmp_path / "layout.npz"), "max_dirty_ratio": 0.1, "n_neighbors": 5},
+    }
+
+    reduced = reduce_vectors_dimensionality(embeddings, params, papers)
+
+    assert list(reduced) == list(embeddings)
+    np.testing.assert_array_equal(reduced["p0"], layout["p0"])
+    assert not np.array_equal(reduced["p3"], layout["p3"])
+    clean = np.stack([layout[f"p{i}"] for i in range(49) if i != 3])
+    assert np.all(reduced["p49"] >= clean.min(axis=0)) and np.all(reduced["p49"] <= clean.max(axis=0))
+
+    papers["dirty"] = [i < 10 for i in range(50)]
+    refit = reduce_vectors_dimensionality(embeddings, params, papers)
+    assert not np.array_equal(refit["p0"], layout["p0"])
+
+
+def test_time_windows_rebuild_only_changed_windows(tmp_path):
+    from kedro_datasets.json import JSONDataset
+    from kedro_datasets.partitions import PartitionedDataset
+
+    from arxiv_discoverer.pipelines.dimensionality_reduction.nodes import (
+        assemble_all_time_layout,
+        build_time_window_layouts,
+        create_time_window_visualizations,
+        plan_time_windows,
+    )
+
+    rng = np.random.default_rng(0)
+    papers = pd.DataFrame(
+        {
+            "paper_id": [f"p{i}" for i in range(30)],
+            "published": [f"{2022 + i % 3}-03-01" for i in range(30)],
+            "title": [f"T{i}" for i in range(30)],
+            "abstract_digest": [f"d{i}" for i in range(30)],
+            "primary_category": ["cs.LG"] * 30,
+        }
+    )
+    embeddings = {paper_id: rng.normal(size=8).astype(np.float32) for paper_id in papers["paper_id"]}
+    method_params = {"dimensionality_reduction_method": "pca", "dimensionality_reduction_params": {}}
+    window_params = {
+        "granularity": "year",
+        "max_workers": 1,
+        "manifest_path": str(tmp_path / "manifest.json"),
+        "layouts_path": str(tmp_path / "layouts"),
+    }
+    layouts_dataset = PartitionedDataset(
+        path=str(tmp_path / "layouts"),
+        dataset="arxiv_discoverer.datasets.CompressedEmbeddingsDataset",
+        filename_suffix=".npz",
+    )
+
+    def run():
+        plan = plan_time_windows(papers, method_params, window_params)
+        layouts_dataset.save(build_time_window_layouts(embeddings, plan, method_params, window_params))
+        layouts = layouts_dataset.load()
+        visualizations = create_time_window_visualizations(layouts, papers, plan, ["title", "primary_category"])
+        combined, manifest = assemble_all_time_layout(layouts, plan, window_params)
+        JSONDataset(filepath=window_params["manifest_path"]).save(manifest)
+        return plan, visualizations, combined, manifest
+
+    plan, visualizations, combined, manifest = run()
+    assert list(plan["windows"]) == ["2022", "2023", "2024"]
+    assert sorted(visualizations) == manifest["rebuilt_windows"] == ["2022", "2023", "2024"]
+    assert len(materialize(visualizations["2023"]())["coordinates"]) == 10
+    assert len(combined) == 30
+    assert [manifest["windows"][key]["offset"][0] for key in plan["windows"]] == [0.0, 3.0, 6.0]
+    assert np.abs(np.stack([combined[f"p{i}"] for i in range(0, 30, 3)]) - [0.0, 0.0, 0.0]).max() <= 1 + 1e-5
+
+    papers.loc[papers["paper_id"] == "p2", "abstract_digest"] = "changed"
+    plan, visualizations, combined, manifest = run()
+    assert manifest["rebuilt_windows"] == list(visualizations) == ["2024"]
+    assert len(combined) == 30
+
+
+def test_cluster_summaries_are_nested_and_labelled():
+    from arxiv_discoverer.pipelines.dimensionality_reduction.nodes import (
+        create_cluster_summaries,
+    )
+
+    rng = np.random.default_rng(0)
+    centers = np.array([[0, 0, 0], [10, 0, 0], [0, 10, 0], [0, 0, 10]], dtype=float)
+    topics = ["graph neural network", "galaxy redshift survey", "protein folding", "prime number sieve"]
+    categories = ["cs.LG", "astro-ph.GA", "q-bio.BM", "math.NT"]
+    blob = np.repeat(np.arange(4), 50)
+    coordinates = centers[blob] + rng.normal(scale=0.5, size=(200, 3))
+    df = pd.DataFrame(
+        {
+            "paper_id": [f"p{i}" for i in range(200)],
+            "x": coordinates[:, 0], "y": coordinates[:, 1], "z": coordinates[:, 2],
+            "title": [f"A {topics[b]} study {i}" for i, b in enumerate(blob)],
+            "primary_category": [categories[b] if i % 10 else "cs.CV" for i, b in enumerate(blob)],
+        }
+    )
+
+    summaries = create_cluster_summaries(df, {"resolutions": [4, 20], "n_top_terms": 2})
+
+    coarse, fine = summaries["levels"]
+    assert summaries["n_points"] == 200
+    assert coarse["n_clusters"] == 4 and fine["n_clusters"] == 20
+    assert sum(coarse["counts"]) == sum(fine["counts"]) == 200
+    assert sorted(coarse["counts"]) == [50, 50, 50, 50]
+    assert len(coarse["centroids"]) == 12 and len(fine["parents"]) == 20
+    for cluster in range(4):
+        category = coarse["dominant_categories"][cluster]
+        topic = topics[categories.index(category)]
+        assert set(coarse["top_terms"][cluster]) <= set(topic.split())
+        assert coarse["category_shares"][cluster] == 0.9
+    for cluster, parent in enumerate(fine["parents"]):
+        assert fine["dominant_categories"][cluster] in (coarse["dominant_categories"][parent], "cs.CV")
+        fine_centroid = np.reshape(fine["centroids"], (-1, 3))[cluster]
+        coarse_centroids = np.reshape(coarse["centroids"], (-1, 3))
+        assert np.linalg.norm(coarse_centroids - fine_centroid, axis=1).argmin() == parent
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from arxiv_discoverer.pipelines.arxiv_embedding_pipeline.nodes import (
+    _create_embeddings,
+    create_embeddings,
+)
+from arxiv_discoverer.resources import (
+    ResourceGovernor,
+    _governor,
+    cgroup_memory_limit,
+    meminfo_available,
+)
+
+MB = 1 << 20
+
+
+@pytest.fixture
+def memory(monkeypatch):
+    state = {"available": 1000 * MB, "rss": 100 * MB}
+    monkeypatch.setattr(_governor, "available_memory", lambda: state["available"])
+    monkeypatch.setattr(_governor, "current_rss", lambda: state["rss"])
+    return state
+
+
+def test_memory_probes(tmp_path):
+    meminfo = tmp_path / "meminfo"
+    meminfo.write_text("MemTotal:  8000 kB\nMemAvailable:  2048 kB\n")
+    assert meminfo_available(str(meminfo)) == 2048 * 1024
+    assert meminfo_available(str(tmp_path / "missing")) is None
+
+    limit, usage = tmp_path / "memory.max", tmp_path / "memory.current"
+    usage.write_text("100\n")
+    limit.write_text("max\n")
+    assert cgroup_memory_limit([(str(limit), str(usage))]) is None
+    limit.write_text("4096\n")
+    missing = (str(tmp_path / "v1.limit"), str(tmp_path / "v1.usage"))
+    assert cgroup_memory_limit([missing, (str(limit), str(usage))]) == (4096, 100)
+
+
+def test_batch_size_follows_available_memory_and_rss_budget(memory):
+    governor = ResourceGovernor(memory_fraction=0.5, max_batch_size=10_000)
+    assert governor.batch_size("encode", MB) == 500
+
+    memory["available"] = 10 * MB
+    assert governor.batch_size("encode", MB) == 5
+
+    memory["available"] = 1000 * MB
+    budgeted = ResourceGovernor(rss_budget_mb=300, max_batch_size=10_000)
+    assert budgeted.batch_size("encode", MB) == 200
+    memory["rss"] = 400 * MB
+    assert budgeted.batch_size("encode", MB) == budgeted.min_batch_size
+    assert budgeted.batch_size("encode", MB, maximum=50) == 1
+
+
+def test_backs_off_on_memory_errors(memory):
+    governor = ResourceGovernor(max_batch_size=64)
+    sizes = []
+
+    def process(start, end):
+        sizes.append(end - start)
+        if end - start > 16:
+            raise MemoryError
+        return end - start
+
+    assert sum(governor.map_batches("encode", process, 100, MB)) == 100
+    assert sizes[:3] == [64, 32, 16]
+    # Later batches start from the reduced size.
+    assert set(sizes[3:]) == {16, 4}
+    assert governor.batch_size("encode", MB) == 16
+
+    def fails(batch_size):
+        raise ValueError("not a memory error")
+
+    with pytest.raises(ValueError):
+        governor.run("other", fails, 64)
+    def cuda_oom(batch_size):
+        raise RuntimeError("CUDA out of memory")
+
+    with pytest.raises(RuntimeError, match="out of memory"):
+        ResourceGovernor(max_retries=1).run("cuda", cuda_oom, 8)
+
+
+def test_create_embeddings_retries_smaller_encode_batches(memory, monkeypatch):
+    batch_sizes = []
+
+    class FakeModel:
+        def encode(self, texts, batch_size, normalize_embeddings):
+            batch_sizes.append(batch_size)
+            if batch_size > 4:
+                raise MemoryError
+            return np.ones((len(texts), 3), dtype=np.float32)
+
+    monkeypatch.setattr(_create_embeddings, "get_model", lambda model_path: FakeModel())
+    papers = pd.DataFrame({"paper_id": [f"p{i}" for i in range(10)], "title": ["T"] * 10, "summary": ["A"] * 10})
+
+    embeddings = create_embeddings(papers, "model", governor_params={"max_batch_size": 16, "max_retries": 3})
+
+    assert list(embeddings) == papers["paper_id"].tolist()
+    assert batch_sizes[:3] == [16, 8, 4]
+    assert set(batch_sizes[3:]) <= {4}
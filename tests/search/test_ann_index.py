@@ -0,0 +1,82 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from arxiv_discoverer.search import IVFPQIndex, brute_force_search
+
+
+@pytest.fixture
+def embeddings():
+    rng = np.random.default_rng(0)
+    topics = rng.normal(size=(20, 32))
+    vectors = topics[rng.integers(20, size=2000)] + 0.5 * rng.normal(size=(2000, 32))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return [f"paper-{i}" for i in range(len(vectors))], vectors.astype(np.float32)
+
+
+@pytest.fixture
+def index(embeddings):
+    paper_ids, vectors = embeddings
+    index = IVFPQIndex(n_lists=32, n_subvectors=8, n_probe=8).train(vectors)
+    index.add(paper_ids, vectors)
+    return index
+
+
+def test_search_recall_against_brute_force(index, embeddings):
+    paper_ids, vectors = embeddings
+    recalls = []
+    for query in vectors[:50]:
+        exact = {paper_id for paper_id, _ in brute_force_search(paper_ids, vectors, query, k=10)}
+        approximate = {paper_id for paper_id, _ in index.search(query, k=10)}
+        recalls.append(len(exact & approximate) / 10)
+
+    assert np.mean(recalls) > 0.9
+
+
+def test_search_returns_query_paper_first(index, embeddings):
+    _, vectors = embeddings
+    paper_id, score = index.search(vectors[42], k=5)[0]
+
+    assert paper_id == "paper-42"
+    assert score == pytest.approx(1.0, abs=1e-2)
+
+
+def test_incremental_add_and_remove(index):
+    rng = np.random.default_rng(1)
+    new_vector = rng.normal(size=(1, 32)).astype(np.float32)
+    new_vector /= np.linalg.norm(new_vector)
+
+    assert index.add(["new-paper"], new_vector) == 1
+    assert index.search(new_vector[0], k=1, n_probe=32)[0][0] == "new-paper"
+
+    index.remove(["new-paper"])
+    assert "new-paper" not in index
+    assert all(paper_id != "new-paper" for paper_id, _ in index.search(new_vector[0], k=10))
+
+
+def test_removed_rows_are_compacted(index, embeddings):
+    paper_ids, vectors = embeddings
+    index.remove(paper_ids[:300])
+    assert len(index.paper_ids) == len(paper_ids)  # 15% removed, below the threshold
+
+    index.remove(paper_ids[300:500])
+    assert len(index.paper_ids) == len(index) == len(paper_ids) - 500
+    assert sum(len(rows) for rows in index._list_rows) == len(index)
+    assert index.search(vectors[600], k=1)[0][0] == "paper-600"
+    assert all(int(paper_id.split("-")[1]) >= 500 for paper_id, _ in index.search(vectors[0], k=20))
+
+
+def test_add_replaces_existing_paper(index, embeddings):
+    _, vectors = embeddings
+    index.add(["paper-0"], vectors[1:2])
+
+    assert len(index) == len(vectors)
+    assert {paper_id for paper_id, _ in index.search(vectors[1], k=2)} == {"paper-0", "paper-1"}
+
+
+def test_index_pickle_roundtrip(index, embeddings):
+    _, vectors = embeddings
+    restored = pickle.loads(pickle.dumps(index))
+
+    assert restored.search(vectors[7], k=5) == index.search(vectors[7], k=5)
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from arxiv_discoverer.search import Bitmap, FacetIndex
+
+
+def test_boolean_operations():
+    a = Bitmap.from_indices([0, 3, 64, 99], 100)
+    b = Bitmap.from_indices([3, 50, 99], 100)
+
+    assert (a & b).to_indices().tolist() == [3, 99]
+    assert (a | b).to_indices().tolist() == [0, 3, 50, 64, 99]
+    assert (a - b).to_indices().tolist() == [0, 64]
+    assert len(~a) == 96
+    assert (~a).to_indices().max() == 98
+
+
+def test_sizes_must_match():
+    with pytest.raises(ValueError):
+        Bitmap.zeros(10) & Bitmap.zeros(11)
+
+
+@pytest.mark.parametrize(
+    "indices, encoding",
+    [
+        ([], "array"),
+        ([5, 70, 300], "array"),
+        (list(range(10, 500)) + list(range(600, 1000)), "runs"),
+    ],
+)
+def test_serialization_roundtrip(indices, encoding):
+    bitmap = Bitmap.from_indices(indices, 1000)
+    data = bitmap.to_dict()
+
+    assert data["encoding"] == encoding
+    assert Bitmap.from_dict(data, 1000) == bitmap
+
+
+def test_facet_index_filters_and_counts():
+    index = FacetIndex.build(
+        {
+            "primary_category": [["cs.LG"], ["cs.CV"], ["cs.LG"], ["math.CO"], ["cs.LG"]],
+            "year_published": [["2024"], ["2024"], ["2023"], ["2024"], []],
+            "authors": [["Ada", "Bob"], ["Bob"], ["Ada"], ["Cy"], ["Ada"]],
+        },
+        size=5,
+    )
+    restored = FacetIndex.from_dict(index.to_dict())
+
+    selection = restored.get("primary_category", "cs.LG") & restored.get("year_published", 2024) & restored.get("authors", "Ada")
+    assert selection.to_indices().tolist() == [0]
+    assert restored.any_of("authors", ["Bob", "Cy"]).to_indices().tolist() == [0, 1, 3]
+    assert len(restored.get("authors", "Nobody")) == 0
+    assert restored.counts("primary_category") == {"cs.LG": 3, "cs.CV": 1, "math.CO": 1}
+
+
+def test_large_bitmap_roundtrip():
+    rng = np.random.default_rng(0)
+    indices = np.unique(rng.integers(0, 1_000_000, size=50_000))
+    bitmap = Bitmap.from_indices(indices, 1_000_000)
+
+    np.testing.assert_array_equal(Bitmap.from_dict(bitmap.to_dict(), 1_000_000).to_indices(), indices)
+
+
+def test_operations_across_containers_match_dense_sets():
+    rng = np.random.default_rng(0)
+    size = 5_000
+    masks = [
+        rng.random(size) < 0.001,  # array container
+        rng.random(size) < 0.5,  # array container, dense
+        np.repeat(rng.random(size // 100) < 0.5, 100),  # runs container
+        ~np.repeat(rng.random(size // 50) < 0.1, 50),  # runs container, almost full
+    ]
+    bitmaps = [Bitmap.from_indices(np.flatnonzero(mask), size) for mask in masks]
+
+    for a, mask_a in zip(bitmaps, masks):
+        np.testing.assert_array_equal((~a).to_indices(), np.flatnonzero(~mask_a))
+        for b, mask_b in zip(bitmaps, masks):
+            np.testing.assert_array_equal((a & b).to_indices(), np.flatnonzero(mask_a & mask_b))
+            np.testing.assert_array_equal((a | b).to_indices(), np.flatnonzero(mask_a | mask_b))
+            np.testing.assert_array_equal((a - b).to_indices(), np.flatnonzero(mask_a & ~mask_b))
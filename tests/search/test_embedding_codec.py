@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from arxiv_discoverer.search import (
+    CompressedEmbeddings,
+    EmbeddingCodec,
+    embeddings_to_matrix,
+)
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(600, 32))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+@pytest.mark.parametrize(
+    "mode, dtype, tolerance",
+    [("float32", np.float32, 0.0), ("float16", np.float16, 1e-3), ("int8", np.int8, 5e-3)],
+)
+def test_scalar_modes_round_trip(vectors, mode, dtype, tolerance):
+    codec = EmbeddingCodec(mode).fit(vectors)
+    codes = codec.encode(vectors)
+
+    assert codes.dtype == dtype
+    assert codes.shape == vectors.shape
+    np.testing.assert_allclose(codec.decode(codes), vectors, atol=tolerance)
+
+
+def test_pq_mode_stores_one_byte_per_sub_space(vectors):
+    codec = EmbeddingCodec("pq", n_subvectors=8, n_centroids=64).fit(vectors)
+    codes = codec.encode(vectors)
+    decoded = codec.decode(codes)
+
+    assert codes.shape == (600, 8) and codes.dtype == np.uint8
+    assert decoded.shape == vectors.shape
+    assert np.mean(np.sum(decoded * vectors, axis=1)) > 0.5
+
+
+def test_untrained_codec_refuses_to_encode(vectors):
+    with pytest.raises(RuntimeError, match="fitted"):
+        EmbeddingCodec("int8").encode(vectors)
+    with pytest.raises(ValueError, match="storage mode"):
+        EmbeddingCodec("bfloat16")
+
+
+@pytest.mark.parametrize("mode", ["float16", "int8", "pq"])
+def test_codec_state_round_trip(vectors, mode):
+    codec = EmbeddingCodec(mode, n_subvectors=8, n_centroids=16).fit(vectors)
+    restored = EmbeddingCodec.from_state(codec.get_state())
+
+    np.testing.assert_array_equal(restored.decode(codec.encode(vectors)), codec.decode(codec.encode(vectors)))
+
+
+def test_compressed_embeddings_behave_like_a_dict(vectors):
+    embeddings_dict = {f"paper-{i}": vector for i, vector in enumerate(vectors[:5])}
+    compressed = CompressedEmbeddings.encode(embeddings_dict, EmbeddingCodec("float16"))
+
+    assert list(compressed) == list(embeddings_dict)
+    assert len(compressed) == 5 and "paper-3" in compressed and "missing" not in compressed
+    np.testing.assert_allclose(compressed["paper-3"], vectors[3], atol=1e-3)
+    assert [paper_id for paper_id, _ in compressed.items()] == list(embeddings_dict)
+    assert compressed.nbytes == 5 * 32 * 2
+
+    paper_ids, matrix = embeddings_to_matrix(compressed)
+    assert paper_ids == list(embeddings_dict)
+    assert matrix.dtype == np.float32 and matrix.shape == (5, 32)
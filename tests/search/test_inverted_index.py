@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from arxiv_discoverer.search import InvertedIndex, delta_decode, delta_encode, tokenize
+
+FIELDS = ["title", "authors", "primary_category"]
+
+
+@pytest.fixture
+def index():
+    documents = [
+        {"title": "Attention Is All You Need", "authors": "['Ashish Vaswani', 'Noam Shazeer']", "primary_category": "cs.CL"},
+        {"title": "Deep Residual Learning", "authors": "['Kaiming He']", "primary_category": "cs.CV"},
+        {"title": "Learning to Attend", "authors": "['Noam Brown']", "primary_category": "cs.LG"},
+        {"title": None, "authors": "['Ashish Vaswani']", "primary_category": "astro-ph.GA"},
+    ]
+    return InvertedIndex.build(documents, FIELDS)
+
+
+def test_tokenize_keeps_categories_whole():
+    assert tokenize("cs.LG, astro-ph.GA & Deep-Learning!") == ["cs.lg", "astro-ph.ga", "deep-learning"]
+
+
+def test_delta_roundtrip():
+    values = np.array([3, 4, 10, 200])
+
+    assert delta_encode(values) == [3, 1, 6, 190]
+    np.testing.assert_array_equal(delta_decode(delta_encode(values)), values)
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("attention", [0]),
+        ("ATTEN", [0, 2]),
+        ("learn", [1, 2]),
+        ("noam", [0, 2]),
+        ("noam learn", [2]),
+        ("vaswani attention", [0]),
+        ("cs.", [0, 1, 2]),
+        ("cs.l", [2]),
+        ("astro", [3]),
+        ("tention", []),
+        ("noam kaiming", []),
+        ("", []),
+        ("  ,; ", []),
+    ],
+)
+def test_search_semantics(index, query, expected):
+    assert index.search(query).tolist() == expected
+
+
+def test_serialization_roundtrip(index):
+    restored = InvertedIndex.from_dict(index.to_dict())
+
+    assert restored.search("noam").tolist() == [0, 2]
+    assert restored.to_dict() == index.to_dict()
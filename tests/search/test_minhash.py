@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from arxiv_discoverer.search import (
+    MinHasher,
+    lsh_parameters,
+    near_duplicate_representatives,
+    normalize_text,
+)
+
+
+def jaccard(a, b, k=5):
+    a, b = normalize_text(a), normalize_text(b)
+    shingles_a = {a[i : i + k] for i in range(len(a) - k + 1)}
+    shingles_b = {b[i : i + k] for i in range(len(b) - k + 1)}
+    return len(shingles_a & shingles_b) / len(shingles_a | shingles_b)
+
+
+@pytest.fixture
+def corpus():
+    rng = np.random.default_rng(0)
+    words = [f"w{i}" for i in range(2000)]
+    return [" ".join(rng.choice(words, 60)) for _ in range(300)]
+
+
+def test_normalization_ignores_case_punctuation_and_whitespace():
+    assert normalize_text("Deep  Learning:\n a Survey!") == normalize_text("deep learning a survey")
+
+
+def test_signature_agreement_estimates_jaccard_similarity(corpus):
+    edited = corpus[0].replace(corpus[0].split()[10], "changed", 1)
+    signatures = MinHasher(n_permutations=256).signatures([corpus[0], edited, corpus[1]])
+
+    assert np.mean(signatures[0] == signatures[1]) == pytest.approx(jaccard(corpus[0], edited), abs=0.08)
+    assert np.mean(signatures[0] == signatures[2]) < 0.1
+
+
+def test_signatures_do_not_depend_on_batching(corpus):
+    hasher = MinHasher(n_permutations=64)
+
+    np.testing.assert_array_equal(hasher.signatures(corpus, batch_size=7), hasher.signatures(corpus, batch_size=1000))
+
+
+@pytest.mark.parametrize("threshold", [0.5, 0.8, 0.9])
+def test_lsh_parameters_fit_the_signature(threshold):
+    n_bands, rows_per_band = lsh_parameters(threshold, 128)
+
+    assert n_bands * rows_per_band <= 128
+    # The S-curve rises around the threshold, slightly below to favour recall.
+    assert threshold - 0.2 < (1 / n_bands) ** (1 / rows_per_band) < threshold + 0.05
+
+
+def test_near_duplicates_point_to_the_first_paper_of_their_group(corpus):
+    texts = list(corpus)
+    texts.append(corpus[5].upper())  # 300: exact duplicate after normalization
+    texts.append(corpus[5] + " erratum")  # 301: small edit
+    texts.append(corpus[7][: len(corpus[7]) // 2])  # 302: half of a paper, not a duplicate
+    texts.append("")  # 303: empty, never a duplicate
+    texts.append("")
+
+    signatures = MinHasher().signatures(texts)
+    representatives = near_duplicate_representatives(signatures, threshold=0.8)
+
+    expected = np.arange(len(texts))
+    expected[[300, 301]] = 5
+    np.testing.assert_array_equal(representatives, expected)
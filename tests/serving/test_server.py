@@ -0,0 +1,172 @@
+import gzip
+import http.client
+import json
+
+import numpy as np
+import pytest
+
+from arxiv_discoverer.serving import (
+    ArtifactServer,
+    ServingArtifacts,
+    negotiate_encoding,
+    parse_range,
+    visualization_id,
+    write_serving_artifacts,
+)
+from arxiv_discoverer.serving._http import RangeNotSatisfiable
+
+N_PAPERS = 250
+
+
+@pytest.fixture
+def artifacts_dir(tmp_path):
+    paper_ids = [f"2401.{i:05d}v1" for i in range(N_PAPERS)]
+    ids = [visualization_id(paper_id) for paper_id in paper_ids]
+    coordinates = np.arange(N_PAPERS * 3, dtype=np.float32).reshape(-1, 3)
+    details = ((paper_id, {"title": f"Paper {i} " * 20, "year_published": 2024}) for i, paper_id in enumerate(ids))
+    write_serving_artifacts(tmp_path, ids, coordinates, details, shard_size=100, metadata={"total_papers": N_PAPERS})
+    return tmp_path
+
+
+@pytest.fixture
+def server(artifacts_dir):
+    artifacts = ServingArtifacts(artifacts_dir)
+    server = ArtifactServer(artifacts, port=0)
+    thread = server.serve_in_background()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join(5)
+    artifacts.close()
+
+
+def get(server, path, headers=None, method="GET"):
+    host, port = server.server_address[:2]
+    connection = http.client.HTTPConnection(host, port, timeout=5)
+    connection.request(method, path, headers=headers or {})
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    return response, body
+
+
+def test_artifacts_look_up_papers_by_visualization_and_arxiv_id(artifacts_dir):
+    artifacts = ServingArtifacts(artifacts_dir)
+
+    assert len(artifacts) == N_PAPERS
+    assert artifacts.n_shards == 3
+    assert artifacts.row_of("2401.00042v1") == 42
+    assert artifacts.row_of(visualization_id("2401.00042v1")) == 42
+    assert artifacts.row_of("2401.99999v1") is None
+    assert json.loads(bytes(artifacts.detail_bytes(42)))["title"].startswith("Paper 42 ")
+    np.testing.assert_array_equal(artifacts.coordinates[42], [126, 127, 128])
+    assert len(bytes(artifacts.shard_bytes(2)).splitlines()) == 50
+    artifacts.close()
+
+
+def test_write_rejects_details_out_of_order(tmp_path):
+    ids = [visualization_id("a"), visualization_id("b")]
+    details = [(ids[1], {}), (ids[0], {})]
+
+    with pytest.raises(ValueError, match="does not match"):
+        write_serving_artifacts(tmp_path, ids, np.zeros((2, 3)), details)
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-9", (0, 10)),
+        ("bytes=90-", (90, 100)),
+        ("bytes=-10", (90, 100)),
+        ("bytes=95-200", (95, 100)),
+        ("bytes=0-1,5-6", None),
+        ("items=0-1", None),
+        (None, None),
+    ],
+)
+def test_parse_range(header, expected):
+    assert parse_range(header, 100) == expected
+
+
+def test_parse_range_past_the_end():
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range("bytes=100-", 100)
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip, deflate, br", "br"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("br;q=0, *", "gzip"),
+        ("identity", None),
+        (None, None),
+    ],
+)
+def test_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+def test_paper_lookup_and_conditional_request(server):
+    response, body = get(server, "/papers/2401.00007v1")
+
+    assert response.status == 200
+    assert json.loads(body)["id"] == visualization_id("2401.00007v1")
+    etag = response.getheader("ETag")
+
+    response, body = get(server, f"/papers/{visualization_id('2401.00007v1')}", {"If-None-Match": etag})
+    assert response.status == 304
+    assert body == b""
+
+    response, _ = get(server, "/papers/2401.00008v1", {"If-None-Match": etag})
+    assert response.status == 200
+    assert response.getheader("ETag") != etag
+
+
+def test_unknown_resources_are_not_found(server):
+    assert get(server, "/papers/unknown")[0].status == 404
+    assert get(server, "/details/shards/3")[0].status == 404
+    assert get(server, "/nothing")[0].status == 404
+
+
+def test_coordinate_rows_by_byte_range(server):
+    response, body = get(server, "/coordinates", {"Range": "bytes=120-143"})
+
+    assert response.status == 206
+    assert response.getheader("Content-Range") == f"bytes 120-143/{N_PAPERS * 12}"
+    np.testing.assert_array_equal(np.frombuffer(body, "<f4"), np.arange(30, 36))
+
+    response, _ = get(server, "/coordinates", {"Range": f"bytes={N_PAPERS * 12}-"})
+    assert response.status == 416
+
+    etag = get(server, "/coordinates", method="HEAD")[0].getheader("ETag")
+    response, body = get(server, "/coordinates", {"Range": "bytes=0-11", "If-Range": '"stale"'})
+    assert response.status == 200
+    assert len(body) == N_PAPERS * 12
+    assert get(server, "/coordinates", {"Range": "bytes=0-11", "If-Range": etag})[0].status == 206
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br"])
+def test_shards_are_compressed_when_accepted(server, encoding):
+    brotli = pytest.importorskip("brotli") if encoding == "br" else None
+    plain_response, plain = get(server, "/details/shards/0")
+    response, body = get(server, "/details/shards/0", {"Accept-Encoding": encoding})
+
+    assert response.getheader("Content-Encoding") == encoding
+    assert response.getheader("Vary") == "Accept-Encoding"
+    assert len(body) < len(plain)
+    assert (gzip.decompress(body) if encoding == "gzip" else brotli.decompress(body)) == plain
+    assert len(plain.splitlines()) == 100
+    # Each representation has its own ETag, any of them validates the resource.
+    assert response.getheader("ETag") != plain_response.getheader("ETag")
+    assert get(server, "/details/shards/0", {"If-None-Match": plain_response.getheader("ETag")})[0].status == 304
+
+
+def test_metadata(server):
+    response, body = get(server, "/metadata")
+    metadata = json.loads(body)
+
+    assert metadata["total_papers"] == N_PAPERS
+    assert metadata["n_shards"] == 3
+    assert metadata["files"]["coordinates.f32"] == N_PAPERS * 12
+    assert response.getheader("ETag") == f'"{metadata["build_id"][:20]}"'
@@ -0,0 +1,92 @@
+import threading
+
+import pandas as pd
+import pytest
+from moto import mock_aws
+
+from arxiv_discoverer.storage import S3Reader, get_s3_client
+
+BUCKET = "arxiv-file-storage"
+MB = 1 << 20
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        client = get_s3_client()
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def test_shared_client_is_reused_across_threads():
+    clients = set()
+    threads = [threading.Thread(target=lambda: clients.add(id(get_s3_client({"key": "a", "secret": "b"})))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(clients) == 1
+    assert get_s3_client({"key": "other", "secret": "b"}) is not get_s3_client({"key": "a", "secret": "b"})
+
+
+def test_open_streams_in_chunks(s3_client, mocker):
+    content = b"paper_id,title\n" + b"1,a\n" * 500_000
+    s3_client.put_object(Bucket=BUCKET, Key="papers.csv", Body=content)
+
+    with S3Reader(s3_client).open(BUCKET, "papers.csv") as f:
+        read = mocker.spy(f.raw._body, "read")
+        df = pd.read_csv(f)
+
+    assert len(df) == 500_000
+    assert read.call_count > 2
+    assert max(call.args[0] for call in read.call_args_list) < len(content) / 2
+
+
+def test_read_bytes_uses_parallel_ranged_gets(s3_client, mocker):
+    content = bytes(range(256)) * (3 * MB // 256) + b"tail"
+    s3_client.put_object(Bucket=BUCKET, Key="paper.pdf", Body=content)
+    get_object = mocker.spy(s3_client, "get_object")
+
+    assert S3Reader(s3_client, part_size=MB).read_bytes(BUCKET, "paper.pdf") == content
+    ranges = sorted(call.kwargs["Range"] for call in get_object.call_args_list)
+    assert len(ranges) == 4
+    assert ranges[0] == f"bytes=0-{MB - 1}"
+
+
+def test_cache_is_keyed_by_etag(s3_client, tmp_path, mocker):
+    s3_client.put_object(Bucket=BUCKET, Key="metadata/papers.csv", Body=b"v1")
+    reader = S3Reader(s3_client, cache_dir=str(tmp_path))
+    get_object = mocker.spy(s3_client, "get_object")
+
+    assert reader.read_bytes(BUCKET, "metadata/papers.csv") == b"v1"
+    assert reader.read_bytes(BUCKET, "metadata/papers.csv") == b"v1"
+    assert get_object.call_count == 1
+
+    s3_client.put_object(Bucket=BUCKET, Key="metadata/papers.csv", Body=b"v2")
+    assert reader.read_bytes(BUCKET, "metadata/papers.csv") == b"v2"
+    assert get_object.call_count == 2
+    assert len(list((tmp_path / BUCKET / "metadata").iterdir())) == 1
+
+
+def test_cache_refresh_keeps_other_keys_with_the_same_prefix(s3_client, tmp_path):
+    s3_client.put_object(Bucket=BUCKET, Key="viz/data.json", Body=b"v1")
+    s3_client.put_object(Bucket=BUCKET, Key="viz/data.json.gz", Body=b"gz")
+    reader = S3Reader(s3_client, cache_dir=str(tmp_path))
+    reader.read_bytes(BUCKET, "viz/data.json")
+    gz_path = reader.cached_path(BUCKET, "viz/data.json.gz")
+
+    s3_client.put_object(Bucket=BUCKET, Key="viz/data.json", Body=b"v2")
+    assert reader.read_bytes(BUCKET, "viz/data.json") == b"v2"
+    assert gz_path.exists()
+    assert len(list((tmp_path / BUCKET / "viz").iterdir())) == 2
+
+
+def test_missing_object_raises_file_not_found(s3_client):
+    reader = S3Reader(s3_client)
+    with pytest.raises(FileNotFoundError):
+        reader.open(BUCKET, "missing.csv")
+    with pytest.raises(FileNotFoundError):
+        reader.read_bytes(BUCKET, "missing.csv")
+
@@ -0,0 +1,80 @@
+import boto3
+import pytest
+from moto import mock_aws
+
+from arxiv_discoverer.storage import LocalSink, S3Sink, make_sink, write_to_sinks
+
+BUCKET = "arxiv-file-storage"
+MB = 1 << 20
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        client = boto3.client("s3")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def test_local_sink_replaces_file_atomically(tmp_path):
+    sink = LocalSink(str(tmp_path / "out" / "papers.csv"))
+    sink.write_bytes(b"first")
+    sink.write_bytes(b"second")
+
+    assert (tmp_path / "out" / "papers.csv").read_bytes() == b"second"
+    assert list((tmp_path / "out").iterdir()) == [tmp_path / "out" / "papers.csv"]
+
+
+def test_local_sink_keeps_previous_content_on_failure(tmp_path):
+    sink = LocalSink(str(tmp_path / "papers.csv"))
+    sink.write_bytes(b"previous")
+
+    with pytest.raises(FileNotFoundError):
+        sink.write_file(str(tmp_path / "missing.csv"))
+
+    assert sink.path.read_bytes() == b"previous"
+    assert list(tmp_path.iterdir()) == [sink.path]
+
+
+def test_s3_sink_multipart_upload(s3_client):
+    content = bytes(range(256)) * (11 * MB // 256)
+    sink = S3Sink(f"s3://{BUCKET}/large.bin", s3_client, multipart_threshold=5 * MB, part_size=5 * MB)
+    sink.write_bytes(content)
+
+    obj = s3_client.get_object(Bucket=BUCKET, Key="large.bin")
+    assert obj["Body"].read() == content
+    # Multipart ETags end with the number of parts.
+    assert obj["ETag"].strip('"').endswith("-3")
+
+
+def test_s3_sink_aborts_failed_multipart_upload(s3_client, monkeypatch):
+    sink = S3Sink(f"s3://{BUCKET}/large.bin", s3_client, multipart_threshold=5 * MB, part_size=5 * MB)
+
+    def failing_upload_part(**kwargs):
+        raise ConnectionError("network down")
+
+    monkeypatch.setattr(s3_client, "upload_part", failing_upload_part)
+    with pytest.raises(ConnectionError):
+        sink.write_bytes(b"x" * (11 * MB))
+
+    assert not sink.exists()
+    assert "Uploads" not in s3_client.list_multipart_uploads(Bucket=BUCKET)
+
+
+def test_write_to_sinks_fans_out(tmp_path, s3_client):
+    sinks = [
+        make_sink(str(tmp_path / "a.json")),
+        make_sink(f"s3://{BUCKET}/a.json", client=s3_client),
+        make_sink(f"s3://{BUCKET}/copy/a.json", client=s3_client),
+    ]
+    write_to_sinks(sinks, content=b'{"a": 1}')
+
+    assert (tmp_path / "a.json").read_bytes() == b'{"a": 1}'
+    for key in ("a.json", "copy/a.json"):
+        assert s3_client.get_object(Bucket=BUCKET, Key=key)["Body"].read() == b'{"a": 1}'
+
+
+def test_make_sink_rejects_unknown_protocol():
+    with pytest.raises(ValueError, match="Unsupported sink protocol"):
+        make_sink("gcs://bucket/a.json")
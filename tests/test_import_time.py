@@ -0,0 +1,71 @@
+"""
+Import-time budget of the `arxiv-discoverer` entry point: the CLI and the
+pipeline registry must not import the heavy dependencies of the nodes, which
+are imported when the nodes run.
+"""
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+ENTRY_POINT = """
+import arxiv_discoverer.__main__
+from kedro.framework.project import configure_project
+configure_project("arxiv_discoverer")
+import arxiv_discoverer.settings
+from arxiv_discoverer.pipeline_registry import register_pipelines
+register_pipelines()
+"""
+
+DEFERRED_MODULES = [
+    "boto3",
+    "bs4",
+    "fitz",
+    "numba",
+    "scipy",
+    "sentence_transformers",
+    "sklearn",
+    "torch",
+    "umap",
+]
+
+# Cumulative microseconds, generous so that slow CI machines do not fail.
+BUDGET_US = int(os.environ.get("ARXIV_IMPORT_BUDGET_US", "3000000"))
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def importtime(code: str) -> dict[str, tuple[int, int]]:
+    """Cumulative import time in microseconds and nesting depth of every module imported by `code`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            times[match.group(4)] = int(match.group(2)), (len(match.group(3)) - 1) // 2
+    return times
+
+
+@pytest.fixture(scope="module")
+def entry_point_times():
+    return importtime(ENTRY_POINT)
+
+
+@pytest.mark.parametrize("module", DEFERRED_MODULES)
+def test_heavy_dependency_is_deferred(entry_point_times, module):
+    imported = sorted(name for name in entry_point_times if name.split(".")[0] == module)
+    assert not imported, f"{module} is imported by the entry point, import it inside the node using it"
+
+
+def test_entry_point_import_budget(entry_point_times):
+    top_level = {name: time for name, (time, depth) in entry_point_times.items() if depth == 0}
+    total = sum(top_level.values())
+    slowest = sorted(top_level.items(), key=lambda item: -item[1])[:5]
+    assert total < BUDGET_US, f"Entry point imports take {total / 1e6:.2f}s, slowest: {slowest}"